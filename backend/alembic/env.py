@@ -14,15 +14,20 @@ from app.db.models import (  # noqa: F401
     DoctorAvailabilityRule,
     DoctorDocument,
     DoctorProfile,
+    DoctorPaymentDailyRollup,
     Message,
+    MessageThread,
     Notification,
     PatientRecord,
     Payment,
+    PaymentDailyRollup,
     Post,
     PostLike,
     RecordDocument,
     RecordEntry,
     Referral,
+    ReportRollupWatermark,
+    SlotHold,
     TreatmentRequest,
     User,
     WaitingListEntry,
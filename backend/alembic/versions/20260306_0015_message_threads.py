@@ -0,0 +1,87 @@
+"""add message threads with last-message summary
+
+Revision ID: 20260306_0015
+Revises: 20260305_0014
+Create Date: 2026-03-06 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260306_0015"
+down_revision = "20260305_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "message_threads",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_low_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_high_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("last_message_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("last_sender_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("last_message_preview", sa.String(length=255), nullable=True),
+        sa.Column("last_message_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("user_low_id", "user_high_id", name="uq_message_threads_pair"),
+    )
+    op.create_index(
+        "ix_message_threads_low_last_message", "message_threads", ["user_low_id", "last_message_at", "id"]
+    )
+    op.create_index(
+        "ix_message_threads_high_last_message", "message_threads", ["user_high_id", "last_message_at", "id"]
+    )
+
+    op.add_column(
+        "messages",
+        sa.Column(
+            "thread_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("message_threads.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+
+    # Backfill one thread per existing pair, summarised from its latest message.
+    op.execute(
+        """
+        INSERT INTO message_threads (
+            id, user_low_id, user_high_id, last_message_id, last_sender_user_id,
+            last_message_preview, last_message_at, created_at
+        )
+        SELECT DISTINCT ON (LEAST(sender_user_id, receiver_user_id), GREATEST(sender_user_id, receiver_user_id))
+            gen_random_uuid(),
+            LEAST(sender_user_id, receiver_user_id),
+            GREATEST(sender_user_id, receiver_user_id),
+            id,
+            sender_user_id,
+            LEFT(body, 255),
+            created_at,
+            created_at
+        FROM messages
+        ORDER BY LEAST(sender_user_id, receiver_user_id), GREATEST(sender_user_id, receiver_user_id), created_at DESC
+        """
+    )
+    op.execute(
+        """
+        UPDATE messages AS m
+        SET thread_id = t.id
+        FROM message_threads AS t
+        WHERE t.user_low_id = LEAST(m.sender_user_id, m.receiver_user_id)
+          AND t.user_high_id = GREATEST(m.sender_user_id, m.receiver_user_id)
+        """
+    )
+    op.create_index("ix_messages_thread_created", "messages", ["thread_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_thread_created", table_name="messages")
+    op.drop_column("messages", "thread_id")
+    op.drop_index("ix_message_threads_high_last_message", table_name="message_threads")
+    op.drop_index("ix_message_threads_low_last_message", table_name="message_threads")
+    op.drop_table("message_threads")
@@ -0,0 +1,37 @@
+"""add unread-message partial index and inbox ordering indexes
+
+Revision ID: 20260306_0016
+Revises: 20260306_0015
+Create Date: 2026-03-06 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260306_0016"
+down_revision = "20260306_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messages_unread_receiver_sender",
+        "messages",
+        ["receiver_user_id", "sender_user_id"],
+        postgresql_where=sa.text("read_at IS NULL"),
+    )
+    op.create_index("ix_messages_receiver_created", "messages", ["receiver_user_id", "created_at"])
+    op.create_index("ix_messages_sender_created", "messages", ["sender_user_id", "created_at"])
+    op.drop_index("ix_messages_receiver_user_id", table_name="messages")
+    op.drop_index("ix_messages_sender_user_id", table_name="messages")
+
+
+def downgrade() -> None:
+    op.create_index("ix_messages_sender_user_id", "messages", ["sender_user_id"])
+    op.create_index("ix_messages_receiver_user_id", "messages", ["receiver_user_id"])
+    op.drop_index("ix_messages_sender_created", table_name="messages")
+    op.drop_index("ix_messages_receiver_created", table_name="messages")
+    op.drop_index("ix_messages_unread_receiver_sender", table_name="messages")
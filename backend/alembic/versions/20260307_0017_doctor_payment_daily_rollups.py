@@ -0,0 +1,56 @@
+"""add per-doctor daily payment rollups
+
+Revision ID: 20260307_0017
+Revises: 20260306_0016
+Create Date: 2026-03-07 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260307_0017"
+down_revision = "20260306_0016"
+branch_labels = None
+depends_on = None
+
+
+payment_status = postgresql.ENUM(
+    "PENDING",
+    "PAID",
+    "FAILED",
+    "REFUNDED",
+    name="payment_status",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "doctor_payment_daily_rollups",
+        sa.Column(
+            "doctor_user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", payment_status, primary_key=True),
+        sa.Column("amount_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("payment_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        INSERT INTO doctor_payment_daily_rollups (doctor_user_id, day, status, amount_total, payment_count)
+        SELECT a.doctor_user_id, (p.created_at AT TIME ZONE 'UTC')::date, p.status, SUM(p.amount), COUNT(p.id)
+        FROM payments AS p
+        JOIN appointments AS a ON a.id = p.appointment_id
+        GROUP BY a.doctor_user_id, (p.created_at AT TIME ZONE 'UTC')::date, p.status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("doctor_payment_daily_rollups")
@@ -0,0 +1,75 @@
+"""add platform payment daily rollups for financial reports
+
+Revision ID: 20260307_0018
+Revises: 20260307_0017
+Create Date: 2026-03-07 12:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260307_0018"
+down_revision = "20260307_0017"
+branch_labels = None
+depends_on = None
+
+
+payment_status = postgresql.ENUM(
+    "PENDING",
+    "PAID",
+    "FAILED",
+    "REFUNDED",
+    name="payment_status",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_index("ix_payments_created_at", "payments", ["created_at"])
+    op.create_index("ix_payments_updated_at", "payments", ["updated_at"])
+
+    op.create_table(
+        "payment_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", payment_status, primary_key=True),
+        sa.Column("insurance_provider", sa.String(length=120), primary_key=True),
+        sa.Column("amount_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("payment_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "report_rollup_watermarks",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("covered_until", sa.Date(), nullable=False),
+    )
+
+    # Backfill every closed UTC day; today stays live until the refresh job runs.
+    op.execute(
+        """
+        INSERT INTO payment_daily_rollups (day, status, insurance_provider, amount_total, payment_count)
+        SELECT (created_at AT TIME ZONE 'UTC')::date,
+               status,
+               COALESCE(insurance_provider, 'SELF_PAY'),
+               SUM(amount),
+               COUNT(id)
+        FROM payments
+        WHERE created_at < date_trunc('day', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        GROUP BY 1, 2, 3
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO report_rollup_watermarks (name, refreshed_at, covered_until)
+        VALUES ('payment_daily', now(), (now() AT TIME ZONE 'UTC')::date)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("report_rollup_watermarks")
+    op.drop_table("payment_daily_rollups")
+    op.drop_index("ix_payments_updated_at", table_name="payments")
+    op.drop_index("ix_payments_created_at", table_name="payments")
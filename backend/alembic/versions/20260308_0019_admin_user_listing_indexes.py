@@ -0,0 +1,40 @@
+"""add keyset and trigram search indexes for the admin user listing
+
+Revision ID: 20260308_0019
+Revises: 20260307_0018
+Create Date: 2026-03-08 09:00:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260308_0019"
+down_revision = "20260307_0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index("ix_users_role_created_at", "users", ["role", "created_at", "id"])
+    op.create_index(
+        "ix_users_email_trgm",
+        "users",
+        ["email"],
+        postgresql_using="gin",
+        postgresql_ops={"email": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_users_phone_trgm",
+        "users",
+        ["phone"],
+        postgresql_using="gin",
+        postgresql_ops={"phone": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_phone_trgm", table_name="users")
+    op.drop_index("ix_users_email_trgm", table_name="users")
+    op.drop_index("ix_users_role_created_at", table_name="users")
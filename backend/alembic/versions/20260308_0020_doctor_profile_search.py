@@ -0,0 +1,60 @@
+"""add doctor directory full-text and trigram search
+
+Revision ID: 20260308_0020
+Revises: 20260308_0019
+Create Date: 2026-03-08 12:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260308_0020"
+down_revision = "20260308_0019"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_EXPRESSION = " || ".join(
+    f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+    for column, weight in (("display_name", "A"), ("headline", "B"), ("bio", "C"))
+    for config in ("english", "arabic")
+)
+
+TRIGRAM_COLUMNS = ("display_name", "location_city", "location_country")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "doctor_profiles",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_doctor_profiles_search_vector",
+        "doctor_profiles",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_doctor_profiles_{column}_trgm",
+            "doctor_profiles",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(TRIGRAM_COLUMNS):
+        op.drop_index(f"ix_doctor_profiles_{column}_trgm", table_name="doctor_profiles")
+    op.drop_index("ix_doctor_profiles_search_vector", table_name="doctor_profiles")
+    op.drop_column("doctor_profiles", "search_vector")
@@ -0,0 +1,29 @@
+"""add keyset indexes for the admin application listing
+
+Revision ID: 20260309_0021
+Revises: 20260308_0020
+Create Date: 2026-03-09 09:00:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260309_0021"
+down_revision = "20260308_0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_doctor_applications_created_at", "doctor_applications", ["created_at", "id"])
+    op.create_index(
+        "ix_doctor_applications_status_created_at",
+        "doctor_applications",
+        ["status", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_doctor_applications_status_created_at", table_name="doctor_applications")
+    op.drop_index("ix_doctor_applications_created_at", table_name="doctor_applications")
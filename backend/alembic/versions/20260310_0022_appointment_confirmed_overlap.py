@@ -0,0 +1,52 @@
+"""exclude overlapping confirmed appointments per doctor
+
+Revision ID: 20260310_0022
+Revises: 20260309_0021
+Create Date: 2026-03-10 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260310_0022"
+down_revision = "20260309_0021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    overlapping = op.get_bind().scalar(
+        sa.text(
+            """
+            SELECT count(*)
+            FROM appointments a
+            JOIN appointments b
+              ON a.doctor_user_id = b.doctor_user_id
+             AND a.id < b.id
+             AND tstzrange(a.start_at, a.end_at) && tstzrange(b.start_at, b.end_at)
+            WHERE a.status = 'CONFIRMED' AND b.status = 'CONFIRMED'
+            """
+        )
+    )
+    if overlapping:
+        raise RuntimeError(
+            f"{overlapping} pairs of overlapping CONFIRMED appointments exist; "
+            "cancel or reschedule them before adding ex_appointments_doctor_confirmed_overlap"
+        )
+
+    op.execute(
+        """
+        ALTER TABLE appointments
+        ADD CONSTRAINT ex_appointments_doctor_confirmed_overlap
+        EXCLUDE USING gist (doctor_user_id WITH =, tstzrange(start_at, end_at) WITH &&)
+        WHERE (status = 'CONFIRMED')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE appointments DROP CONSTRAINT IF EXISTS ex_appointments_doctor_confirmed_overlap")
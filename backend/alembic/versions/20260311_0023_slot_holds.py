@@ -0,0 +1,54 @@
+"""add short-lived slot holds
+
+Revision ID: 20260311_0023
+Revises: 20260310_0022
+Create Date: 2026-03-11 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260311_0023"
+down_revision = "20260310_0022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_table(
+        "slot_holds",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "doctor_user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_slot_holds_expires_at", "slot_holds", ["expires_at"])
+    op.create_index("ix_slot_holds_user_id", "slot_holds", ["user_id"])
+    op.execute(
+        """
+        ALTER TABLE slot_holds
+        ADD CONSTRAINT ex_slot_holds_doctor_overlap
+        EXCLUDE USING gist (doctor_user_id WITH =, tstzrange(start_at, end_at) WITH &&)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("slot_holds")
@@ -0,0 +1,68 @@
+"""order waiting lists by a monotonic sequence instead of dense positions
+
+Revision ID: 20260312_0024
+Revises: 20260311_0023
+Create Date: 2026-03-12 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260312_0024"
+down_revision = "20260311_0023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE waiting_list_queue_seq")
+    op.add_column("waiting_list", sa.Column("queue_seq", sa.BigInteger(), nullable=True))
+    op.execute(
+        """
+        UPDATE waiting_list AS w
+        SET queue_seq = ranked.seq
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY appointment_id, position, created_at) AS seq
+            FROM waiting_list
+        ) AS ranked
+        WHERE ranked.id = w.id
+        """
+    )
+    op.execute(
+        "SELECT setval('waiting_list_queue_seq', COALESCE((SELECT max(queue_seq) FROM waiting_list), 0) + 1, false)"
+    )
+    op.execute("ALTER SEQUENCE waiting_list_queue_seq OWNED BY waiting_list.queue_seq")
+    op.alter_column(
+        "waiting_list",
+        "queue_seq",
+        nullable=False,
+        server_default=sa.text("nextval('waiting_list_queue_seq')"),
+    )
+    op.create_index(
+        "ix_waiting_list_appointment_queue", "waiting_list", ["appointment_id", "queue_seq"], unique=True
+    )
+    op.drop_constraint("uq_waiting_list_appointment_position", "waiting_list", type_="unique")
+    op.drop_column("waiting_list", "position")
+
+
+def downgrade() -> None:
+    op.add_column("waiting_list", sa.Column("position", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE waiting_list AS w
+        SET position = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY appointment_id ORDER BY queue_seq) AS position
+            FROM waiting_list
+        ) AS ranked
+        WHERE ranked.id = w.id
+        """
+    )
+    op.alter_column("waiting_list", "position", nullable=False)
+    op.create_unique_constraint(
+        "uq_waiting_list_appointment_position", "waiting_list", ["appointment_id", "position"]
+    )
+    op.drop_index("ix_waiting_list_appointment_queue", table_name="waiting_list")
+    op.drop_column("waiting_list", "queue_seq")
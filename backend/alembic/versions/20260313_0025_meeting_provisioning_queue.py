@@ -0,0 +1,40 @@
+"""queue zoom meeting provisioning on appointments
+
+Revision ID: 20260313_0025
+Revises: 20260312_0024
+Create Date: 2026-03-13 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260313_0025"
+down_revision = "20260312_0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE appointment_call_status ADD VALUE IF NOT EXISTS 'PROVISIONING' AFTER 'NOT_READY'")
+    op.add_column(
+        "appointments",
+        sa.Column("call_provisioning_attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("appointments", sa.Column("call_provisioning_due_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_appointments_call_provisioning_due",
+        "appointments",
+        ["call_provisioning_due_at"],
+        postgresql_where=sa.text("call_status = 'PROVISIONING'"),
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE appointments SET call_status = 'NOT_READY' WHERE call_status = 'PROVISIONING'")
+    op.drop_index("ix_appointments_call_provisioning_due", table_name="appointments")
+    op.drop_column("appointments", "call_provisioning_due_at")
+    op.drop_column("appointments", "call_provisioning_attempts")
+    # PostgreSQL cannot drop an enum value; PROVISIONING stays defined but unused.
@@ -0,0 +1,43 @@
+"""track asynchronous prescription pdf rendering
+
+Revision ID: 20260314_0026
+Revises: 20260313_0025
+Create Date: 2026-03-14 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260314_0026"
+down_revision = "20260313_0025"
+branch_labels = None
+depends_on = None
+
+
+document_status = postgresql.ENUM("PENDING", "READY", "FAILED", name="prescription_document_status")
+
+
+def upgrade() -> None:
+    document_status.create(op.get_bind(), checkfirst=True)
+    # Existing prescriptions were rendered inline and already have their PDF.
+    op.add_column(
+        "prescriptions",
+        sa.Column(
+            "document_status",
+            postgresql.ENUM(name="prescription_document_status", create_type=False),
+            nullable=False,
+            server_default="READY",
+        ),
+    )
+    op.alter_column("prescriptions", "document_status", server_default="PENDING")
+    op.alter_column("prescriptions", "pdf_url", existing_type=sa.String(length=1000), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE prescriptions SET pdf_url = '' WHERE pdf_url IS NULL")
+    op.alter_column("prescriptions", "pdf_url", existing_type=sa.String(length=1000), nullable=False)
+    op.drop_column("prescriptions", "document_status")
+    document_status.drop(op.get_bind(), checkfirst=True)
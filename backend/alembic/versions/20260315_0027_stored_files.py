@@ -0,0 +1,40 @@
+"""reference-counted content-addressed stored files
+
+Revision ID: 20260315_0027
+Revises: 20260314_0026
+Create Date: 2026-03-15 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260315_0027"
+down_revision = "20260314_0026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stored_files",
+        sa.Column("key", sa.String(length=255), primary_key=True),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String(length=120), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_stored_files_orphaned",
+        "stored_files",
+        ["updated_at"],
+        postgresql_where=sa.text("ref_count <= 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stored_files_orphaned", table_name="stored_files")
+    op.drop_table("stored_files")
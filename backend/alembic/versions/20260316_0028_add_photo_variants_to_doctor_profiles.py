@@ -0,0 +1,25 @@
+"""add photo_variants to doctor_profiles
+
+Revision ID: 20260316_0028
+Revises: 20260315_0027
+Create Date: 2026-03-16 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260316_0028"
+down_revision = "20260315_0027"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("doctor_profiles", sa.Column("photo_variants", postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("doctor_profiles", "photo_variants")
@@ -16,6 +16,7 @@ from . import (
     public_doctors,
     referrals,
     treatment_requests,
+    uploads,
     user_appointments,
     vr_sessions,
 )
@@ -2,11 +2,12 @@ import uuid
 from datetime import UTC, datetime
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import String, case, cast, func, or_, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy import case, func, or_, select, true, tuple_
 from sqlalchemy.orm import Session
 
-from app.core.deps import require_roles
+from app.core.deps import require_roles, user_status_cache
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from app.db.models import (
     ApplicationStatus,
     Appointment,
@@ -24,6 +25,8 @@ from app.db.session import get_db
 from app.schemas.admin import (
     AdminApplicationNoteRequest,
     ApproveApplicationRequest,
+    BulkReviewOut,
+    BulkReviewRequest,
     RejectApplicationRequest,
     RequestChangesRequest,
     SetDocumentStatusRequest,
@@ -40,24 +43,46 @@ from app.schemas.doctor_application import ApplicationOut
 from app.schemas.doctor_document import DoctorDocumentOut
 from app.schemas.doctor_profile import DoctorProfileOut
 from app.schemas.users import UserOut
-from app.services.professional_type_service import get_application_verification_status
-from app.services.approval_service import approve_application, reject_application, request_changes
+from app.services.professional_type_service import verification_status_from_statuses
+from app.services.approval_service import (
+    BULK_APPROVED,
+    approve_application,
+    bulk_review_applications,
+    reject_application,
+    request_changes,
+)
+from app.services.photo_variant_service import build_profile_photo_variants
+from app.services.bookability_service import doctor_bookability_cache
+from app.services.export_service import export_query
+from app.services.payment_service import forget_user_payments
+from app.services.reports_service import financial_report_cache, rebuild_payment_rollup_days, user_payment_days
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def _to_application_out(db: Session, app: DoctorApplication) -> ApplicationOut:
-    documents = list(
-        db.scalars(
+def _to_application_outs(db: Session, apps: list[DoctorApplication]) -> list[ApplicationOut]:
+    """Serialize applications with their documents using one documents query for the batch."""
+    documents_by_app: dict[uuid.UUID, list[DoctorDocument]] = {app.id: [] for app in apps}
+    if apps:
+        for doc in db.scalars(
             select(DoctorDocument)
-            .where(DoctorDocument.application_id == app.id)
+            .where(DoctorDocument.application_id.in_(list(documents_by_app)))
             .order_by(DoctorDocument.uploaded_at.desc())
-        )
-    )
-    payload = ApplicationOut.model_validate(app).model_dump()
-    payload["documents"] = [DoctorDocumentOut.model_validate(doc).model_dump() for doc in documents]
-    payload["verification_status"] = get_application_verification_status(db, application_id=app.id)
-    return ApplicationOut.model_validate(payload)
+        ):
+            documents_by_app[doc.application_id].append(doc)
+
+    response: list[ApplicationOut] = []
+    for app in apps:
+        documents = documents_by_app[app.id]
+        payload = ApplicationOut.model_validate(app).model_dump()
+        payload["documents"] = [DoctorDocumentOut.model_validate(doc).model_dump() for doc in documents]
+        payload["verification_status"] = verification_status_from_statuses([doc.status for doc in documents])
+        response.append(ApplicationOut.model_validate(payload))
+    return response
+
+
+def _to_application_out(db: Session, app: DoctorApplication) -> ApplicationOut:
+    return _to_application_outs(db, [app])[0]
 
 
 def _refresh_doctor_rating_stats(db: Session, *, doctor_user_id: uuid.UUID) -> None:
@@ -81,15 +106,27 @@ def _refresh_doctor_rating_stats(db: Session, *, doctor_user_id: uuid.UUID) -> N
 
 @router.get("/applications", response_model=list[ApplicationOut])
 def list_applications(
+    response: Response,
     status_filter: ApplicationStatus | None = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     _ = current_user
-    query = select(DoctorApplication).order_by(DoctorApplication.created_at.desc())
+    query = select(DoctorApplication).order_by(DoctorApplication.created_at.desc(), DoctorApplication.id.desc())
     if status_filter is not None:
         query = query.where(DoctorApplication.status == status_filter)
-    return [_to_application_out(db, app) for app in db.scalars(query)]
+    if cursor:
+        query = query.where(
+            tuple_(DoctorApplication.created_at, DoctorApplication.id) < tuple_(*decode_cursor(cursor))
+        )
+    apps = list(db.scalars(query.limit(limit + 1)))
+
+    page = apps[:limit]
+    if len(apps) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1].created_at, page[-1].id)
+    return _to_application_outs(db, page)
 
 
 @router.get("/applications/{application_id}", response_model=ApplicationOut)
@@ -125,6 +162,7 @@ def review_start(
 @router.post("/applications/{application_id}/approve", response_model=ApplicationOut)
 def approve(
     application_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
     payload: ApproveApplicationRequest | None = None,
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
     db: Session = Depends(get_db),
@@ -133,9 +171,31 @@ def approve(
     if not app:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
     approved = approve_application(db, app, admin=current_user, note=payload.note if payload else None)
+    background_tasks.add_task(build_profile_photo_variants, approved.doctor_user_id)
     return _to_application_out(db, approved)
 
 
+@router.post("/applications/bulk-review", response_model=BulkReviewOut)
+def bulk_review(
+    payload: BulkReviewRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    result = bulk_review_applications(
+        db,
+        application_ids=payload.application_ids,
+        admin=current_user,
+        approve=payload.action == "APPROVE",
+        reason=payload.reason,
+        note=payload.note,
+    )
+    for item in result.items:
+        if item.outcome == BULK_APPROVED:
+            background_tasks.add_task(build_profile_photo_variants, item.doctor_user_id)
+    return BulkReviewOut.model_validate(result)
+
+
 @router.post("/applications/{application_id}/reject", response_model=ApplicationOut)
 def reject(
     application_id: uuid.UUID,
@@ -215,6 +275,7 @@ def toggle_public(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor profile not found")
     profile.is_public = payload.is_public
     db.commit()
+    doctor_bookability_cache.invalidate(doctor_user_id)
     db.refresh(profile)
     return profile
 
@@ -252,104 +313,89 @@ def delete_doctor_account(
 
     db.delete(doctor_user)
     db.commit()
+    doctor_bookability_cache.invalidate(doctor_user_id)
 
     return {"message": "Doctor account deleted", "doctor_user_id": str(doctor_user_id), "deleted_by": str(current_user.id)}
 
 
-@router.get("/users", response_model=list[AdminUserListItem])
-def list_users(
-    search: str | None = Query(default=None, min_length=1, max_length=255),
-    status_filter: UserStatus | None = Query(default=None, alias="status"),
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
-    db: Session = Depends(get_db),
-):
-    _ = current_user
-
-    query = select(User).where(User.role == UserRole.USER)
-
-    if status_filter is not None:
-        query = query.where(User.status == status_filter)
+def _admin_users_statement(*, search: str | None, status_filter: UserStatus | None):
+    """USER rows joined to their appointment stats, newest first.
 
-    if search is not None:
-        term = f"%{search.strip()}%"
-        query = query.where(
-            or_(
-                User.email.ilike(term),
-                User.phone.ilike(term),
-                cast(User.id, String).ilike(term),
-            )
-        )
-
-    users = list(db.scalars(query.order_by(User.created_at.desc())))
-    if not users:
-        return []
-
-    user_ids = [user.id for user in users]
-
-    stats_rows = db.execute(
+    The stats come from a LATERAL aggregate over ``ix_appointments_user_id``, so
+    they are only computed for the rows a page (or export) actually returns.
+    """
+    stats = (
         select(
-            Appointment.user_id.label("user_id"),
             func.count(Appointment.id).label("appointments_count"),
             func.count(
-                case(
-                    (
-                        Appointment.status.in_([
-                            AppointmentStatus.REQUESTED,
-                            AppointmentStatus.CONFIRMED,
-                        ]),
-                        1,
-                    )
-                )
+                case((Appointment.status.in_([AppointmentStatus.REQUESTED, AppointmentStatus.CONFIRMED]), 1))
             ).label("upcoming_count"),
             func.count(case((Appointment.status == AppointmentStatus.COMPLETED, 1))).label("completed_count"),
             func.count(case((Appointment.status == AppointmentStatus.CANCELLED, 1))).label("cancelled_count"),
             func.max(Appointment.start_at).label("last_appointment_at"),
         )
-        .where(Appointment.user_id.in_(user_ids))
-        .group_by(Appointment.user_id)
-    ).all()
-
-    stats_by_user = {
-        row.user_id: {
-            "appointments_count": int(row.appointments_count or 0),
-            "upcoming_count": int(row.upcoming_count or 0),
-            "completed_count": int(row.completed_count or 0),
-            "cancelled_count": int(row.cancelled_count or 0),
-            "last_appointment_at": row.last_appointment_at,
-        }
-        for row in stats_rows
-    }
-
-    response: list[AdminUserListItem] = []
-    for user in users:
-        stats = stats_by_user.get(
-            user.id,
-            {
-                "appointments_count": 0,
-                "upcoming_count": 0,
-                "completed_count": 0,
-                "cancelled_count": 0,
-                "last_appointment_at": None,
-            },
-        )
-        response.append(
-            AdminUserListItem(
-                id=user.id,
-                email=user.email,
-                phone=user.phone,
-                role=user.role,
-                status=user.status,
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-                appointments_count=stats["appointments_count"],
-                upcoming_count=stats["upcoming_count"],
-                completed_count=stats["completed_count"],
-                cancelled_count=stats["cancelled_count"],
-                last_appointment_at=stats["last_appointment_at"],
-            )
+        .where(Appointment.user_id == User.id)
+        .lateral("appointment_stats")
+    )
+    query = (
+        select(
+            User.id.label("id"),
+            User.email.label("email"),
+            User.phone.label("phone"),
+            User.role.label("role"),
+            User.status.label("status"),
+            User.created_at.label("created_at"),
+            User.updated_at.label("updated_at"),
+            stats.c.appointments_count,
+            stats.c.upcoming_count,
+            stats.c.completed_count,
+            stats.c.cancelled_count,
+            stats.c.last_appointment_at,
         )
+        .join(stats, true())
+        .where(User.role == UserRole.USER)
+    )
 
-    return response
+    if status_filter is not None:
+        query = query.where(User.status == status_filter)
+
+    if search is not None:
+        term = search.strip()
+        try:
+            query = query.where(User.id == uuid.UUID(term))
+        except ValueError:
+            # Served by the trigram indexes on email and phone.
+            pattern = f"%{term}%"
+            query = query.where(or_(User.email.ilike(pattern), User.phone.ilike(pattern)))
+
+    return query.order_by(User.created_at.desc(), User.id.desc())
+
+
+@router.get("/users", response_model=list[AdminUserListItem])
+def list_users(
+    response: Response,
+    search: str | None = Query(default=None, min_length=1, max_length=255),
+    status_filter: UserStatus | None = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    output: str = Query(default="json", pattern="^(json|csv|ndjson)$"),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    _ = current_user
+
+    query = _admin_users_statement(search=search, status_filter=status_filter)
+    if output != "json":
+        return export_query(query, output=output, filename="users")
+
+    if cursor:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*decode_cursor(cursor)))
+    rows = db.execute(query.limit(limit + 1)).all()
+
+    page = rows[:limit]
+    if len(rows) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1].created_at, page[-1].id)
+    return [AdminUserListItem.model_validate(dict(row._mapping)) for row in page]
 
 
 @router.get("/users/{user_id}", response_model=AdminUserDetailOut)
@@ -449,12 +495,21 @@ def delete_user_account(
         )
     )
 
+    # The cascade below removes the user's payments; their doctors' rollup buckets must follow.
+    forget_user_payments(db, user_id=user_id)
+    payment_days = user_payment_days(db, user_id=user_id)
     db.delete(user)
     db.flush()
 
     for doctor_user_id in affected_doctor_ids:
         _refresh_doctor_rating_stats(db, doctor_user_id=doctor_user_id)
+    if payment_days:
+        rebuild_payment_rollup_days(db, payment_days)
 
     db.commit()
+    if payment_days:
+        financial_report_cache.reset()
+    # Websocket handshakes trust this cache; a deleted user must not keep reconnecting until it expires.
+    user_status_cache.invalidate(user_id)
 
     return {"message": "User account deleted", "user_id": str(user_id), "deleted_by": str(current_user.id)}
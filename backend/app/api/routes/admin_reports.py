@@ -1,29 +1,39 @@
-from datetime import date
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
 
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import require_roles
-from app.db.models import User, UserRole
+from app.db.models import Appointment, AppointmentStatus, Payment, PaymentStatus, User, UserRole
 from app.db.session import get_db
 from app.schemas.financial_report import FinancialReportOut
+from app.schemas.storage import StorageUsageOut
+from app.services.export_service import csv_chunks, export_query, ndjson_chunks, streaming_export
 from app.services.reports_service import build_financial_report
+from app.services.storage_service import storage_usage
 
 router = APIRouter(tags=["admin-reports"])
 
+PERIOD_COLUMNS = ["period", "total_amount", "paid_count", "pending_count", "failed_count"]
+INSURANCE_COLUMNS = ["insurance_provider", "total_amount", "payments_count"]
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=UTC)
 
-def _build_csv(report: dict) -> str:
-    lines = ["period,total_amount,paid_count,pending_count,failed_count"]
-    for row in report["rows"]:
-        lines.append(
-            f'{row["period"]},{row["total_amount"]},{row["paid_count"]},{row["pending_count"]},{row["failed_count"]}'
-        )
-    lines.append("")
-    lines.append("insurance_provider,total_amount,payments_count")
-    for row in report["insurance_breakdown"]:
-        lines.append(f'{row["insurance_provider"]},{row["total_amount"]},{row["payments_count"]}')
-    return "\n".join(lines)
+
+def _financial_report_chunks(report: dict, output: str) -> Iterator[str]:
+    period_rows = [[row[column] for column in PERIOD_COLUMNS] for row in report["rows"]]
+    insurance_rows = [[row[column] for column in INSURANCE_COLUMNS] for row in report["insurance_breakdown"]]
+    if output == "ndjson":
+        yield from ndjson_chunks(PERIOD_COLUMNS, [period_rows], extra={"section": "period"})
+        yield from ndjson_chunks(INSURANCE_COLUMNS, [insurance_rows], extra={"section": "insurance"})
+        return
+    yield from csv_chunks(PERIOD_COLUMNS, [period_rows])
+    yield "\n"
+    yield from csv_chunks(INSURANCE_COLUMNS, [insurance_rows])
 
 
 @router.get("/admin/financial-reports", response_model=FinancialReportOut)
@@ -31,7 +41,7 @@ def get_financial_reports(
     from_date: date = Query(...),
     to_date: date = Query(...),
     granularity: str = Query(default="daily", pattern="^(daily|monthly)$"),
-    output: str = Query(default="json", pattern="^(json|csv)$"),
+    output: str = Query(default="json", pattern="^(json|csv|ndjson)$"),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
@@ -42,11 +52,82 @@ def get_financial_reports(
         to_date=to_date,
         granularity=granularity,
     )
-    if output == "csv":
-        content = _build_csv(report)
-        return PlainTextResponse(
-            content=content,
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=financial_report.csv"},
+    if output != "json":
+        return streaming_export(
+            _financial_report_chunks(report, output), output=output, filename="financial_report"
         )
     return FinancialReportOut.model_validate(report)
+
+
+@router.get("/admin/exports/payments")
+def export_payments(
+    from_date: date | None = Query(default=None),
+    to_date: date | None = Query(default=None),
+    status_filter: PaymentStatus | None = Query(default=None, alias="status"),
+    output: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    _ = current_user
+    statement = select(
+        Payment.id.label("id"),
+        Payment.appointment_id.label("appointment_id"),
+        Payment.user_id.label("user_id"),
+        Appointment.doctor_user_id.label("doctor_user_id"),
+        Payment.amount.label("amount"),
+        Payment.method.label("method"),
+        Payment.insurance_provider.label("insurance_provider"),
+        Payment.status.label("status"),
+        Payment.provider_reference.label("provider_reference"),
+        Payment.created_at.label("created_at"),
+        Payment.updated_at.label("updated_at"),
+    ).join(Appointment, Appointment.id == Payment.appointment_id)
+    if from_date is not None:
+        statement = statement.where(Payment.created_at >= _day_start(from_date))
+    if to_date is not None:
+        statement = statement.where(Payment.created_at < _day_start(to_date + timedelta(days=1)))
+    if status_filter is not None:
+        statement = statement.where(Payment.status == status_filter)
+    return export_query(statement.order_by(Payment.created_at, Payment.id), output=output, filename="payments")
+
+
+@router.get("/admin/exports/appointments")
+def export_appointments(
+    from_date: date | None = Query(default=None),
+    to_date: date | None = Query(default=None),
+    status_filter: AppointmentStatus | None = Query(default=None, alias="status"),
+    output: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+):
+    _ = current_user
+    statement = select(
+        Appointment.id.label("id"),
+        Appointment.doctor_user_id.label("doctor_user_id"),
+        Appointment.user_id.label("user_id"),
+        Appointment.start_at.label("start_at"),
+        Appointment.end_at.label("end_at"),
+        Appointment.timezone.label("timezone"),
+        Appointment.status.label("status"),
+        Appointment.call_status.label("call_status"),
+        Appointment.fee_paid.label("fee_paid"),
+        Appointment.feedback_rating.label("feedback_rating"),
+        Appointment.created_at.label("created_at"),
+    )
+    if from_date is not None:
+        statement = statement.where(Appointment.start_at >= _day_start(from_date))
+    if to_date is not None:
+        statement = statement.where(Appointment.start_at < _day_start(to_date + timedelta(days=1)))
+    if status_filter is not None:
+        statement = statement.where(Appointment.status == status_filter)
+    return export_query(
+        statement.order_by(Appointment.start_at, Appointment.id), output=output, filename="appointments"
+    )
+
+
+@router.get("/admin/storage/usage", response_model=StorageUsageOut)
+def get_storage_usage(
+    scan_disk: bool = Query(default=False),
+    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    _ = current_user
+    return StorageUsageOut.model_validate(storage_usage(db, scan_disk=scan_disk))
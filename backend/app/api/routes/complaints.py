@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -8,6 +8,7 @@ from app.core.deps import require_roles
 from app.db.models import Complaint, ComplaintStatus, User, UserRole
 from app.db.session import get_db
 from app.schemas.complaint import AdminComplaintOut, ComplaintCreateIn, ComplaintOut
+from app.services.export_service import export_query
 
 router = APIRouter(tags=["complaints"])
 
@@ -48,10 +49,29 @@ def list_my_complaints(
 
 @router.get("/admin/complaints", response_model=list[AdminComplaintOut])
 def list_admin_complaints(
+    output: str = Query(default="json", pattern="^(json|csv|ndjson)$"),
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     _ = current_user
+    if output != "json":
+        statement = (
+            select(
+                Complaint.id.label("id"),
+                Complaint.reporter_user_id.label("reporter_user_id"),
+                Complaint.reporter_role.label("reporter_role"),
+                User.email.label("reporter_email"),
+                User.name.label("reporter_name"),
+                Complaint.subject.label("subject"),
+                Complaint.text.label("text"),
+                Complaint.status.label("status"),
+                Complaint.created_at.label("created_at"),
+            )
+            .join(User, User.id == Complaint.reporter_user_id)
+            .order_by(Complaint.created_at.desc(), Complaint.id.desc())
+        )
+        return export_query(statement, output=output, filename="complaints")
+
     rows = db.execute(
         select(Complaint, User)
         .join(User, User.id == Complaint.reporter_user_id)
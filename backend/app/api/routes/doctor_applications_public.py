@@ -16,7 +16,12 @@ from app.schemas.public_doctor_application import (
     PublicDoctorApplicationCreate,
     PublicDoctorApplicationCreateOut,
 )
-from app.services.storage_service import save_application_photo, save_license_document
+from app.services.storage_service import (
+    LICENSE_CONTENT_TYPES,
+    PHOTO_CONTENT_TYPES,
+    discard_uploads,
+    save_uploads,
+)
 
 router = APIRouter(tags=["public"])
 
@@ -274,28 +279,35 @@ async def submit_public_doctor_application(
     except ValidationError as exc:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.errors()) from exc
 
-    photo_url = await save_application_photo(photo) if photo is not None else None
-    national_id_photo_url = await save_application_photo(national_id_photo) if national_id_photo is not None else None
-    license_document_url = await save_license_document(license_document) if _is_file(license_document) else None
-    medical_degree_url = (
-        await save_license_document(medical_degree_certificate) if _is_file(medical_degree_certificate) else None
-    )
-    psychiatry_specialization_url = (
-        await save_license_document(psychiatry_specialization_certificate)
-        if _is_file(psychiatry_specialization_certificate)
-        else None
-    )
-    active_practice_proof_url = (
-        await save_license_document(active_practice_proof) if _is_file(active_practice_proof) else None
-    )
-    therapy_specialization_url = (
-        await save_license_document(therapy_specialization_certificate)
-        if _is_file(therapy_specialization_certificate)
-        else None
-    )
-    specialization_certificate_url = (
-        await save_license_document(specialization_certificate) if _is_file(specialization_certificate) else None
-    )
+    # Saved concurrently; a rejected file removes the whole batch.
+    upload_specs = {
+        "photo": (photo, PHOTO_CONTENT_TYPES, "photo"),
+        "national_id_photo": (national_id_photo, PHOTO_CONTENT_TYPES, "photo"),
+        "license_document": (license_document, LICENSE_CONTENT_TYPES, "license"),
+        "medical_degree_certificate": (medical_degree_certificate, LICENSE_CONTENT_TYPES, "license"),
+        "psychiatry_specialization_certificate": (
+            psychiatry_specialization_certificate,
+            LICENSE_CONTENT_TYPES,
+            "license",
+        ),
+        "active_practice_proof": (active_practice_proof, LICENSE_CONTENT_TYPES, "license"),
+        "therapy_specialization_certificate": (therapy_specialization_certificate, LICENSE_CONTENT_TYPES, "license"),
+        "specialization_certificate": (specialization_certificate, LICENSE_CONTENT_TYPES, "license"),
+    }
+    uploads = await save_uploads({name: spec for name, spec in upload_specs.items() if _is_file(spec[0])})
+
+    def uploaded_url(name: str) -> str | None:
+        upload = uploads.get(name)
+        return upload.url if upload else None
+
+    photo_url = uploaded_url("photo")
+    national_id_photo_url = uploaded_url("national_id_photo")
+    license_document_url = uploaded_url("license_document")
+    medical_degree_url = uploaded_url("medical_degree_certificate")
+    psychiatry_specialization_url = uploaded_url("psychiatry_specialization_certificate")
+    active_practice_proof_url = uploaded_url("active_practice_proof")
+    therapy_specialization_url = uploaded_url("therapy_specialization_certificate")
+    specialization_certificate_url = uploaded_url("specialization_certificate")
     now = datetime.now(UTC)
     specialty_values = [payload.specialty]
     if payload.sub_specialties:
@@ -312,9 +324,11 @@ async def submit_public_doctor_application(
         db.flush()
     except IntegrityError as exc:
         db.rollback()
+        discard_uploads(uploads.values())
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email or phone already registered") from exc
     except ProgrammingError as exc:
         db.rollback()
+        discard_uploads(uploads.values())
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database schema is outdated. Run: alembic upgrade head",
@@ -369,6 +383,7 @@ async def submit_public_doctor_application(
         db.flush()
     except ProgrammingError as exc:
         db.rollback()
+        discard_uploads(uploads.values())
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database schema is outdated. Run: alembic upgrade head",
@@ -418,6 +433,7 @@ async def submit_public_doctor_application(
         db.refresh(application)
     except ProgrammingError as exc:
         db.rollback()
+        discard_uploads(uploads.values())
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database schema is outdated. Run: alembic upgrade head",
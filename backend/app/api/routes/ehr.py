@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 
@@ -29,6 +29,8 @@ from app.services.ehr_service import (
     upload_record_document,
     verify_document_download_access,
 )
+from app.services.storage_service import upload_key
+from app.services.upload_serving import upload_response
 
 router = APIRouter(tags=["ehr"])
 
@@ -149,6 +151,7 @@ def get_doc_secure_url(
 @router.get("/records/documents/{document_id}/download")
 def download_doc(
     document_id: uuid.UUID,
+    request: Request,
     token: str = Query(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -159,4 +162,7 @@ def download_doc(
         token=token,
         actor_user=current_user,
     )
-    return RedirectResponse(url=doc.file_url, status_code=307)
+    key = upload_key(doc.file_url)
+    if key is None:
+        return RedirectResponse(url=doc.file_url, status_code=307)
+    return upload_response(request, key, private=True, filename=doc.file_name)
@@ -1,13 +1,31 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.db.models import User
 from app.db.session import get_db
-from app.schemas.message import MessageCreateIn, MessageOut
-from app.services.messaging_service import list_messages, mark_message_read, send_message
+from app.schemas.message import (
+    MessageCreateIn,
+    MessageOut,
+    MessageThreadOut,
+    MessageThreadPageOut,
+    MessageThreadReadOut,
+    ThreadMessagePageOut,
+)
+from app.services.messaging_service import (
+    get_thread_for_actor,
+    list_messages,
+    list_thread_messages,
+    list_threads,
+    mark_message_read,
+    mark_thread_read,
+    send_message,
+    thread_peer_id,
+    unread_counts_by_peer,
+)
 
 router = APIRouter(tags=["messages"])
 
@@ -30,14 +48,71 @@ def create_message(
 
 @router.get("/messages", response_model=list[MessageOut])
 def list_my_messages(
+    response: Response,
     box: str = Query(default="inbox", pattern="^(inbox|outbox)$"),
+    limit: int = Query(default=200, ge=1, le=500),
+    cursor: str | None = Query(default=None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    rows = list_messages(db, actor_user=current_user, box=box)
+    rows, next_cursor = list_messages(db, actor_user=current_user, box=box, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [MessageOut.model_validate(item) for item in rows]
 
 
+@router.get("/messages/threads", response_model=MessageThreadPageOut)
+def list_my_threads(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    rows, next_cursor = list_threads(db, actor_user=current_user, limit=limit, cursor=cursor)
+    peer_ids = [thread_peer_id(thread, current_user.id) for thread in rows]
+    unread = unread_counts_by_peer(db, actor_user=current_user, peer_user_ids=peer_ids)
+    items = [
+        MessageThreadOut(
+            id=thread.id,
+            peer_user_id=peer_id,
+            last_message_id=thread.last_message_id,
+            last_sender_user_id=thread.last_sender_user_id,
+            last_message_preview=thread.last_message_preview,
+            last_message_at=thread.last_message_at,
+            unread_count=unread.get(peer_id, 0),
+        )
+        for thread, peer_id in zip(rows, peer_ids)
+    ]
+    return MessageThreadPageOut(items=items, next_cursor=next_cursor)
+
+
+@router.get("/messages/threads/{thread_id}/messages", response_model=ThreadMessagePageOut)
+def list_my_thread_messages(
+    thread_id: uuid.UUID,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    thread = get_thread_for_actor(db, thread_id=thread_id, actor_user=current_user)
+    rows, next_cursor = list_thread_messages(db, thread=thread, limit=limit, cursor=cursor)
+    return ThreadMessagePageOut(
+        items=[MessageOut.model_validate(item) for item in rows],
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/messages/threads/{thread_id}/read", response_model=MessageThreadReadOut)
+def mark_my_thread_read(
+    thread_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    thread = get_thread_for_actor(db, thread_id=thread_id, actor_user=current_user)
+    marked = mark_thread_read(db, thread=thread, actor_user=current_user)
+    return MessageThreadReadOut(thread_id=thread.id, marked=marked)
+
+
 @router.patch("/messages/{message_id}/read", response_model=MessageOut)
 def mark_read(
     message_id: uuid.UUID,
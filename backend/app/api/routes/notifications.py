@@ -1,12 +1,11 @@
 import uuid
-import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_current_user_from_token
+from app.core.deps import get_current_user, get_websocket_principal
 from app.db.models import User
-from app.db.session import SessionLocal, get_db
+from app.db.session import get_db
 from app.schemas.notification import NotificationDeleteOut, NotificationMarkReadOut, NotificationOut
 from app.services.notification_service import delete_notifications, list_notifications, mark_notifications_read
 from app.services.notification_realtime import notification_realtime_hub
@@ -64,26 +63,21 @@ async def notifications_websocket(websocket: WebSocket):
         return
 
     try:
-        with SessionLocal() as db:
-            current_user = get_current_user_from_token(token, db)
+        user_uuid, _role = get_websocket_principal(token)
     except HTTPException:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    user_id = str(current_user.id)
+    user_id = str(user_uuid)
     await notification_realtime_hub.connect(user_id=user_id, websocket=websocket)
 
+    # Keepalive pings come from the hub's shared heartbeat wheel; this loop only
+    # waits for the client to go away.
     try:
         await websocket.send_json({"type": "notifications:connected"})
         while True:
-            try:
-                await asyncio.wait_for(websocket.receive_text(), timeout=25)
-            except asyncio.TimeoutError:
-                try:
-                    await websocket.send_json({"type": "notifications:ping"})
-                except (WebSocketDisconnect, RuntimeError):
-                    break
-            except WebSocketDisconnect:
-                break
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
     finally:
         await notification_realtime_hub.disconnect(user_id=user_id, websocket=websocket)
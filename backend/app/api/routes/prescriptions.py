@@ -1,12 +1,13 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.core.deps import require_roles
 from app.db.models import User, UserRole
 from app.db.session import get_db
 from app.schemas.prescription import PrescriptionCreateIn, PrescriptionOut, PrescriptionVerifyOut
+from app.services.prescription_rendering_service import render_prescription_document
 from app.services.prescription_service import create_prescription, list_doctor_prescriptions, verify_prescription
 
 router = APIRouter(tags=["prescriptions"])
@@ -15,10 +16,13 @@ router = APIRouter(tags=["prescriptions"])
 @router.post("/doctor/prescriptions", response_model=PrescriptionOut)
 def create_doctor_prescription(
     payload: PrescriptionCreateIn,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_roles(UserRole.DOCTOR)),
     db: Session = Depends(get_db),
 ):
     row, verification_url, qr_data_url = create_prescription(db, doctor_user=current_user, payload=payload)
+    # Returns with document_status=PENDING; pdf_url is set once the render pool is done.
+    background_tasks.add_task(render_prescription_document, row.id)
     body = PrescriptionOut.model_validate(row).model_dump()
     body["verification_url"] = verification_url
     body["verification_qr_data_url"] = qr_data_url
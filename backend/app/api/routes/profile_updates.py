@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.core.deps import require_roles
@@ -11,6 +11,7 @@ from app.schemas.profile_update_request import (
     ProfileUpdateRequestOut,
     ProfileUpdateReviewIn,
 )
+from app.services.photo_variant_service import build_profile_photo_variants
 from app.services.profile_update_service import (
     list_my_profile_update_requests,
     list_profile_update_requests_for_admin,
@@ -55,6 +56,7 @@ def list_updates_for_admin(
 def review_update(
     request_id: uuid.UUID,
     payload: ProfileUpdateReviewIn,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_roles(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
@@ -65,4 +67,6 @@ def review_update(
         status_update=payload.status,
         admin_note=payload.admin_note,
     )
+    if item.status == ProfileUpdateStatus.APPROVED and "photo_url" in item.payload_json:
+        background_tasks.add_task(build_profile_photo_variants, item.doctor_user_id)
     return ProfileUpdateRequestOut.model_validate(item)
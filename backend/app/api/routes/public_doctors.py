@@ -19,7 +19,7 @@ from app.db.session import get_db
 from app.schemas.availability import AvailabilitySlotOut
 from app.schemas.doctor_profile import DoctorProfileListItem, DoctorProfileOut, DoctorReviewOut
 from app.services.availability_service import generate_slots
-from app.services.doctor_directory_service import getDoctorBySlug, getTopDoctor
+from app.services.doctor_directory_service import getDoctorBySlug, getTopDoctor, search_doctors
 
 router = APIRouter(tags=["public"])
 
@@ -106,6 +106,26 @@ def get_top_doctor(db: Session = Depends(get_db)):
     return getTopDoctor(db)
 
 
+@router.get(
+    "/doctors/search",
+    response_model=list[DoctorProfileListItem],
+    summary="Search public therapists",
+    description=(
+        "Free-text search over therapist name, headline and bio in English and Arabic, best match first.\n\n"
+        "Examples:\n"
+        "- `/doctors/search?q=anxiety therapist`\n"
+        "- `/doctors/search?q=اكتئاب`"
+    ),
+)
+def search_public_doctors(
+    q: str = Query(min_length=1, max_length=200, description="Search text; supports quoted phrases and -exclusions."),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+):
+    return search_doctors(db, q=q, limit=limit, offset=offset)
+
+
 @router.get(
     "/doctors",
     response_model=list[DoctorProfileListItem],
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Request
+
+from app.core.config import settings
+from app.services.upload_serving import upload_response
+
+router = APIRouter(tags=["public"])
+
+
+@router.api_route(f"{settings.upload_base_url}/{{key:path}}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_upload(key: str, request: Request):
+    return upload_response(request, key)
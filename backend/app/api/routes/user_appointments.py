@@ -7,6 +7,7 @@ from app.core.deps import get_current_user, require_roles
 from app.db.models import User, UserRole
 from app.db.session import get_db
 from app.schemas.appointment import AppointmentFeedbackIn, AppointmentOut, AppointmentRequestIn, AppointmentRescheduleIn
+from app.schemas.slot_hold import SlotHoldIn, SlotHoldOut
 from app.schemas.waiting_list import WaitingListJoinResponse, WaitingListItemOut, WaitingListViewOut
 from app.services.appointment_service import (
     cancel_appointment,
@@ -16,6 +17,7 @@ from app.services.appointment_service import (
     reschedule_appointment,
     user_appointments,
 )
+from app.services.slot_hold_service import hold_slot, release_hold
 from app.services.video_call_service import end_video_call, generate_video_join_token, submit_video_feedback
 
 router = APIRouter(tags=["appointments"])
@@ -36,6 +38,25 @@ def create_appointment_request(
     )
 
 
+@router.post("/appointments/holds", response_model=SlotHoldOut)
+def create_slot_hold(
+    payload: SlotHoldIn,
+    current_user: User = Depends(require_roles(UserRole.USER)),
+    db: Session = Depends(get_db),
+):
+    return hold_slot(db, user=current_user, doctor_user_id=payload.doctor_user_id, start_at=payload.start_at)
+
+
+@router.delete("/appointments/holds/{hold_id}")
+def delete_slot_hold(
+    hold_id: uuid.UUID,
+    current_user: User = Depends(require_roles(UserRole.USER)),
+    db: Session = Depends(get_db),
+):
+    release_hold(db, user=current_user, hold_id=hold_id)
+    return {"message": "Slot hold released", "hold_id": str(hold_id)}
+
+
 @router.get("/appointments/my", response_model=list[AppointmentOut])
 def list_my_appointments(
     current_user: User = Depends(require_roles(UserRole.USER)),
@@ -75,11 +96,11 @@ def join_appointment_waiting_list(
     current_user: User = Depends(require_roles(UserRole.USER)),
     db: Session = Depends(get_db),
 ):
-    entry = join_waiting_list(db, appointment_id=appointment_id, user=current_user)
+    entry, position = join_waiting_list(db, appointment_id=appointment_id, user=current_user)
     return WaitingListJoinResponse(
         appointment_id=entry.appointment_id,
         user_id=entry.user_id,
-        position=entry.position,
+        position=position,
         created_at=entry.created_at,
     )
 
@@ -90,16 +111,21 @@ def get_appointment_waiting_list(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    entries, my_position = get_waiting_list(db, appointment_id=appointment_id, actor_user=current_user)
-    if current_user.role == UserRole.USER:
-        filtered_entries = [entry for entry in entries if entry.user_id == current_user.id]
-    else:
-        filtered_entries = entries
+    entries, total, my_position = get_waiting_list(db, appointment_id=appointment_id, actor_user=current_user)
     return WaitingListViewOut(
         appointment_id=appointment_id,
-        total=len(entries),
+        total=total,
         my_position=my_position,
-        entries=[WaitingListItemOut.model_validate(entry) for entry in filtered_entries],
+        entries=[
+            WaitingListItemOut(
+                id=entry.id,
+                appointment_id=entry.appointment_id,
+                user_id=entry.user_id,
+                position=position,
+                created_at=entry.created_at,
+            )
+            for entry, position in entries
+        ],
     )
 
 
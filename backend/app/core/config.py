@@ -16,10 +16,32 @@ class Settings(BaseSettings):
     upload_dir: str = "uploads"
     upload_base_url: str = "/uploads"
     max_upload_mb: int = 10
+    storage_backend: str = "local"
+    storage_gc_grace_hours: int = 24
+    upload_serve_mode: str = "app"
+    upload_accel_redirect_prefix: str = "/_protected_uploads"
+    upload_legacy_cache_seconds: int = 3600
+    prescription_render_workers: int = 2
+    prescription_rerender_batch_size: int = 100
+    photo_variant_workers: int = 1
+    bulk_review_batch_size: int = 50
 
     auth_rate_limit_window_seconds: int = 60
     auth_rate_limit_max_requests: int = 20
 
+    ws_heartbeat_interval_seconds: int = 25
+    ws_heartbeat_slots: int = 25
+    ws_heartbeat_batch_size: int = 500
+    ws_heartbeat_send_timeout_seconds: float = 5.0
+    ws_user_status_cache_seconds: int = 60
+
+    vr_session_backend: str = "memory"
+    vr_session_ttl_seconds: int = 1800
+    vr_session_reconnect_grace_seconds: int = 120
+    vr_session_sweep_interval_seconds: int = 30
+    vr_peer_queue_size: int = 64
+    vr_control_coalesce_ms: int = 50
+
     seed_admin_email: str = "admin@sabina.dev"
     seed_admin_password: str = "Admin12345!"
 
@@ -32,6 +54,17 @@ class Settings(BaseSettings):
     stripe_publishable_key: str | None = None
     stripe_webhook_secret: str | None = None
     sabina_platform_fee_percent: Decimal = Decimal("20.00")
+    doctor_payment_rollup_enabled: bool = True
+    financial_rollup_refresh_interval_seconds: int = 900
+    financial_rollup_overlap_seconds: int = 300
+    financial_report_cache_seconds: int = 600
+    financial_report_live_cache_seconds: int = 30
+    financial_report_cache_size: int = 128
+    export_batch_size: int = 1000
+    booking_cache_seconds: int = 30
+    slot_hold_seconds: int = 600
+    slot_hold_sweep_interval_seconds: int = 60
+    slot_hold_sweep_batch_size: int = 500
 
     video_provider: str = "TWILIO"
     video_token_secret: str = "dev-video-token-secret"
@@ -43,6 +76,21 @@ class Settings(BaseSettings):
     zoom_host_user_id: str | None = "me"
     zoom_join_before_host: bool = True
     zoom_waiting_room: bool = True
+    zoom_oauth_url: str = "https://zoom.us/oauth/token"
+    zoom_api_base_url: str = "https://api.zoom.us/v2"
+    zoom_timeout_seconds: float = 20.0
+    zoom_http2: bool = True
+    zoom_max_connections: int = 10
+    zoom_keepalive_seconds: float = 60.0
+    zoom_token_refresh_margin_seconds: int = 300
+    zoom_provisioning_poll_interval_seconds: int = 30
+    zoom_provisioning_batch_size: int = 20
+    zoom_provisioning_lease_seconds: int = 120
+    zoom_provisioning_max_attempts: int = 6
+    zoom_provisioning_backoff_base_seconds: float = 5.0
+    zoom_provisioning_backoff_max_seconds: float = 600.0
+    zoom_preprovision_interval_seconds: int = 3600
+    zoom_preprovision_horizon_hours: int = 24
 
     sendgrid_api_key: str | None = None
     twilio_account_sid: str | None = None
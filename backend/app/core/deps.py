@@ -1,29 +1,76 @@
+import time
 import uuid
 from collections.abc import Callable
+from threading import Lock
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.db.models import User, UserRole, UserStatus
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user_from_token(token: str, db: Session) -> User:
-    payload = decode_access_token(token)
+class UserStatusCache:
+    """Short-lived ``user_id -> status`` cache for long-lived connection auth.
+
+    Websocket handshakes only need to know that the token subject still exists
+    and is active, so a burst of reconnects should not open one DB session each.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[uuid.UUID, tuple[UserStatus, float]] = {}
+        self._lock = Lock()
+
+    def get(self, user_id: uuid.UUID) -> UserStatus | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user_status, expires_at = entry
+            if expires_at <= now:
+                self._entries.pop(user_id, None)
+                return None
+            return user_status
+
+    def set(self, user_id: uuid.UUID, user_status: UserStatus) -> None:
+        with self._lock:
+            self._entries[user_id] = (user_status, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_status_cache = UserStatusCache(ttl_seconds=settings.ws_user_status_cache_seconds)
+
+
+def _token_subject(payload: dict) -> uuid.UUID:
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
     try:
-        user_uuid = uuid.UUID(str(user_id))
+        return uuid.UUID(str(user_id))
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject") from exc
 
+
+def get_current_user_from_token(token: str, db: Session) -> User:
+    payload = decode_access_token(token)
+    user_uuid = _token_subject(payload)
+
     user = db.scalar(select(User).where(User.id == user_uuid))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
@@ -32,6 +79,31 @@ def get_current_user_from_token(token: str, db: Session) -> User:
     return user
 
 
+def get_websocket_principal(token: str) -> tuple[uuid.UUID, UserRole]:
+    """Authenticate a websocket token from its claims plus a cached status check.
+
+    Only a cache miss opens a DB session, and it reads the status column alone.
+    """
+    payload = decode_access_token(token)
+    user_uuid = _token_subject(payload)
+    try:
+        role = UserRole(payload.get("role"))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload") from exc
+
+    user_status = user_status_cache.get(user_uuid)
+    if user_status is None:
+        with SessionLocal() as db:
+            user_status = db.scalar(select(User.status).where(User.id == user_uuid))
+        if user_status is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        user_status_cache.set(user_uuid, user_status)
+
+    if user_status != UserStatus.ACTIVE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User account is not active")
+    return user_uuid, role
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ) -> User:
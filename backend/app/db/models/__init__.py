@@ -1,6 +1,11 @@
 from app.db.models.admin_action import AdminAction
 from app.db.models.auth_login_code import AuthCodeChannel, AuthLoginCode
-from app.db.models.appointment import Appointment, AppointmentCallStatus, AppointmentStatus
+from app.db.models.appointment import (
+    CONFIRMED_OVERLAP_CONSTRAINT,
+    Appointment,
+    AppointmentCallStatus,
+    AppointmentStatus,
+)
 from app.db.models.complaint import Complaint, ComplaintStatus
 from app.db.models.availability_exception import DoctorAvailabilityException, RecurrenceType
 from app.db.models.availability_rule import DoctorAvailabilityRule
@@ -11,13 +16,21 @@ from app.db.models.doctor_profile_update_request import (
 from app.db.models.doctor_application import APPROVED_APPLICATION_STATUSES, ApplicationStatus, DoctorApplication
 from app.db.models.doctor_document import DoctorDocument, DocumentStatus, DocumentType
 from app.db.models.doctor_profile import DoctorProfile
-from app.db.models.message import Message
+from app.db.models.message import Message, MessageThread
 from app.db.models.notification import Notification, NotificationChannel
 from app.db.models.patient_record import PatientRecord, RecordDocument, RecordEntry, RecordEntryType
-from app.db.models.payment import Payment, PaymentStatus
+from app.db.models.payment import (
+    DoctorPaymentDailyRollup,
+    Payment,
+    PaymentDailyRollup,
+    PaymentStatus,
+    ReportRollupWatermark,
+)
 from app.db.models.post import Post, PostLike
-from app.db.models.prescription import Prescription, PrescriptionStatus
+from app.db.models.prescription import Prescription, PrescriptionDocumentStatus, PrescriptionStatus
 from app.db.models.referral import Referral, ReferralStatus
+from app.db.models.slot_hold import SLOT_HOLD_OVERLAP_CONSTRAINT, SlotHold
+from app.db.models.stored_file import StoredFile
 from app.db.models.treatment_request import TreatmentRequest, TreatmentRequestStatus
 from app.db.models.user import User, UserRole, UserStatus
 from app.db.models.waiting_list import WaitingListEntry
@@ -27,6 +40,7 @@ __all__ = [
     "AuthCodeChannel",
     "AuthLoginCode",
     "Appointment",
+    "CONFIRMED_OVERLAP_CONSTRAINT",
     "AppointmentCallStatus",
     "AppointmentStatus",
     "Complaint",
@@ -41,15 +55,19 @@ __all__ = [
     "DocumentStatus",
     "DocumentType",
     "DoctorProfile",
+    "DoctorPaymentDailyRollup",
     "Message",
+    "MessageThread",
     "Notification",
     "NotificationChannel",
     "PatientRecord",
     "Payment",
+    "PaymentDailyRollup",
     "PaymentStatus",
     "Post",
     "PostLike",
     "Prescription",
+    "PrescriptionDocumentStatus",
     "PrescriptionStatus",
     "ProfileUpdateStatus",
     "RecordDocument",
@@ -58,6 +76,10 @@ __all__ = [
     "RecurrenceType",
     "Referral",
     "ReferralStatus",
+    "ReportRollupWatermark",
+    "SLOT_HOLD_OVERLAP_CONSTRAINT",
+    "SlotHold",
+    "StoredFile",
     "TreatmentRequest",
     "TreatmentRequestStatus",
     "User",
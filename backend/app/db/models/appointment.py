@@ -2,8 +2,8 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, column, func, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -19,11 +19,17 @@ class AppointmentStatus(str, enum.Enum):
 
 class AppointmentCallStatus(str, enum.Enum):
     NOT_READY = "NOT_READY"
+    PROVISIONING = "PROVISIONING"
     READY = "READY"
     LIVE = "LIVE"
     ENDED = "ENDED"
 
 
+# Two CONFIRMED appointments of one doctor may not overlap; the database rejects
+# the second one with an exclusion violation (SQLSTATE 23P01).
+CONFIRMED_OVERLAP_CONSTRAINT = "ex_appointments_doctor_confirmed_overlap"
+
+
 class Appointment(Base):
     __tablename__ = "appointments"
     __table_args__ = (
@@ -31,6 +37,18 @@ class Appointment(Base):
         Index("ix_appointments_user_id", "user_id"),
         Index("ix_appointments_start_at", "start_at"),
         Index("ix_appointments_doctor_range", "doctor_user_id", "start_at", "end_at"),
+        Index(
+            "ix_appointments_call_provisioning_due",
+            "call_provisioning_due_at",
+            postgresql_where=text("call_status = 'PROVISIONING'"),
+        ),
+        ExcludeConstraint(
+            ("doctor_user_id", "="),
+            (func.tstzrange(column("start_at"), column("end_at")), "&&"),
+            where=text("status = 'CONFIRMED'"),
+            using="gist",
+            name=CONFIRMED_OVERLAP_CONSTRAINT,
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -58,6 +76,11 @@ class Appointment(Base):
         default=AppointmentCallStatus.NOT_READY,
         server_default=AppointmentCallStatus.NOT_READY.value,
     )
+    # Meeting provisioning job state, used while call_status is PROVISIONING.
+    call_provisioning_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    call_provisioning_due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     fee_paid: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     feedback_rating: Mapped[int | None] = mapped_column(nullable=True)
@@ -38,6 +38,8 @@ class DoctorApplication(Base, TimestampMixin):
     __tablename__ = "doctor_applications"
     __table_args__ = (
         Index("ix_doctor_applications_doctor_user_id", "doctor_user_id", unique=True),
+        Index("ix_doctor_applications_created_at", "created_at", "id"),
+        Index("ix_doctor_applications_status_created_at", "status", "created_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
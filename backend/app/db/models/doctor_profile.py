@@ -2,8 +2,8 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Numeric, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, Numeric, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.professional_roles import ProfessionalType, badge_payload_for_professional_type, can_prescribe_medication
@@ -11,6 +11,15 @@ from app.db.base import Base, TimestampMixin
 from app.db.models.professional_type_enum import ProfessionalTypeDBEnum
 
 
+# Weighted English + Arabic document for ``/doctors/search``; Postgres recomputes
+# it on every insert/update of the profile.
+SEARCH_VECTOR_EXPRESSION = " || ".join(
+    f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+    for column, weight in (("display_name", "A"), ("headline", "B"), ("bio", "C"))
+    for config in ("english", "arabic")
+)
+
+
 class DoctorProfile(Base, TimestampMixin):
     __tablename__ = "doctor_profiles"
     __table_args__ = (
@@ -22,6 +31,25 @@ class DoctorProfile(Base, TimestampMixin):
         Index("ix_doctor_profiles_gender_identity", "gender_identity"),
         Index("ix_doctor_profiles_type_code", "doctor_type_code"),
         Index("ix_doctor_profiles_next_available_at", "next_available_at"),
+        Index("ix_doctor_profiles_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_doctor_profiles_display_name_trgm",
+            "display_name",
+            postgresql_using="gin",
+            postgresql_ops={"display_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_doctor_profiles_location_city_trgm",
+            "location_city",
+            postgresql_using="gin",
+            postgresql_ops={"location_city": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_doctor_profiles_location_country_trgm",
+            "location_country",
+            postgresql_using="gin",
+            postgresql_ops={"location_country": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -34,6 +62,8 @@ class DoctorProfile(Base, TimestampMixin):
     bio: Mapped[str | None] = mapped_column(Text, nullable=True)
     approach_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     photo_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    # {"source": <photo_url they were built from>, "urls": {"small": ..., "medium": ..., "large": ...}}
+    photo_variants: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     languages: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
     specialties: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
     concerns: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
@@ -67,6 +97,21 @@ class DoctorProfile(Base, TimestampMixin):
     is_top_doctor: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
     is_public: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True), deferred=True
+    )
+
+    @property
+    def photo_variant_urls(self) -> dict[str, str]:
+        """WebP variants of the current photo; empty until they are built for it."""
+        variants = self.photo_variants or {}
+        if not self.photo_url or variants.get("source") != self.photo_url:
+            return {}
+        return variants.get("urls") or {}
+
+    @property
+    def photo_thumbnail_url(self) -> str | None:
+        return self.photo_variant_urls.get("small") or self.photo_url
 
     @property
     def can_prescribe_medication(self) -> bool:
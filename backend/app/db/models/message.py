@@ -1,21 +1,64 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
 
 
+class MessageThread(Base):
+    """One row per user pair, holding the summary of the latest message.
+
+    The pair is stored in canonical order (``user_low_id < user_high_id``) so both
+    directions of a conversation share the same thread.
+    """
+
+    __tablename__ = "message_threads"
+    __table_args__ = (
+        UniqueConstraint("user_low_id", "user_high_id", name="uq_message_threads_pair"),
+        Index("ix_message_threads_low_last_message", "user_low_id", "last_message_at", "id"),
+        Index("ix_message_threads_high_last_message", "user_high_id", "last_message_at", "id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_low_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    user_high_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    last_message_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    last_sender_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    last_message_preview: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_message_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class Message(Base):
     __tablename__ = "messages"
     __table_args__ = (
-        Index("ix_messages_sender_user_id", "sender_user_id"),
-        Index("ix_messages_receiver_user_id", "receiver_user_id"),
+        Index("ix_messages_sender_created", "sender_user_id", "created_at"),
+        Index("ix_messages_receiver_created", "receiver_user_id", "created_at"),
+        # Unread rows only: keeps the notify-once probe and unread badges cheap on long threads.
+        Index(
+            "ix_messages_unread_receiver_sender",
+            "receiver_user_id",
+            "sender_user_id",
+            postgresql_where=text("read_at IS NULL"),
+        ),
+        Index("ix_messages_thread_created", "thread_id", "created_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    thread_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("message_threads.id", ondelete="CASCADE"), nullable=True
+    )
     sender_user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
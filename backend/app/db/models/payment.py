@@ -1,8 +1,9 @@
 import enum
 import uuid
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Enum, ForeignKey, Index, Numeric, String
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -22,6 +23,8 @@ class Payment(Base, TimestampMixin):
         Index("ix_payments_appointment_id", "appointment_id"),
         Index("ix_payments_user_id", "user_id"),
         Index("ix_payments_status", "status"),
+        Index("ix_payments_created_at", "created_at"),
+        Index("ix_payments_updated_at", "updated_at"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -41,3 +44,49 @@ class Payment(Base, TimestampMixin):
         server_default=PaymentStatus.PENDING.value,
     )
     provider_reference: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+
+class DoctorPaymentDailyRollup(Base):
+    """Per-doctor, per-day payment totals by status, kept in step with payment writes.
+
+    ``day`` is the UTC date the payment was created, so status transitions move
+    amounts between rows of the same day.
+    """
+
+    __tablename__ = "doctor_payment_daily_rollups"
+
+    doctor_user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[PaymentStatus] = mapped_column(
+        Enum(PaymentStatus, name="payment_status", native_enum=True), primary_key=True
+    )
+    amount_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    payment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+class PaymentDailyRollup(Base):
+    """Platform-wide payment totals per UTC day, status and insurance provider.
+
+    Rows only exist for closed days; ``reports_service`` refreshes them and
+    merges anything newer than the watermark in live from ``payments``.
+    """
+
+    __tablename__ = "payment_daily_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[PaymentStatus] = mapped_column(
+        Enum(PaymentStatus, name="payment_status", native_enum=True), primary_key=True
+    )
+    insurance_provider: Mapped[str] = mapped_column(String(120), primary_key=True)
+    amount_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    payment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ReportRollupWatermark(Base):
+    __tablename__ = "report_rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    covered_until: Mapped[date] = mapped_column(Date, nullable=False)
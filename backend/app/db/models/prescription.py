@@ -15,6 +15,12 @@ class PrescriptionStatus(str, enum.Enum):
     EXPIRED = "EXPIRED"
 
 
+class PrescriptionDocumentStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    READY = "READY"
+    FAILED = "FAILED"
+
+
 class Prescription(Base, TimestampMixin):
     __tablename__ = "prescriptions"
     __table_args__ = (
@@ -42,7 +48,14 @@ class Prescription(Base, TimestampMixin):
 
     verification_code: Mapped[str] = mapped_column(String(80), nullable=False)
     data_hash: Mapped[str] = mapped_column(String(128), nullable=False)
-    pdf_url: Mapped[str] = mapped_column(String(1000), nullable=False)
+    # Filled in by the render pool once the PDF exists; see prescription_rendering_service.
+    pdf_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    document_status: Mapped[PrescriptionDocumentStatus] = mapped_column(
+        Enum(PrescriptionDocumentStatus, name="prescription_document_status", native_enum=True),
+        nullable=False,
+        default=PrescriptionDocumentStatus.PENDING,
+        server_default=PrescriptionDocumentStatus.PENDING.value,
+    )
     status: Mapped[PrescriptionStatus] = mapped_column(
         Enum(PrescriptionStatus, name="prescription_status", native_enum=True),
         nullable=False,
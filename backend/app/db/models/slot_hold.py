@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, column, func
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# At most one hold per doctor and time range; expired rows keep blocking until
+# they are reclaimed, either by the next hold on that range or by the sweeper.
+SLOT_HOLD_OVERLAP_CONSTRAINT = "ex_slot_holds_doctor_overlap"
+
+
+class SlotHold(Base):
+    __tablename__ = "slot_holds"
+    __table_args__ = (
+        Index("ix_slot_holds_expires_at", "expires_at"),
+        Index("ix_slot_holds_user_id", "user_id"),
+        ExcludeConstraint(
+            ("doctor_user_id", "="),
+            (func.tstzrange(column("start_at"), column("end_at")), "&&"),
+            using="gist",
+            name=SLOT_HOLD_OVERLAP_CONSTRAINT,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    doctor_user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class StoredFile(Base):
+    """One content-addressed blob and how many rows reference it.
+
+    Rows at ``ref_count = 0`` are orphans; ``collect_orphaned_files`` deletes
+    them (and their blobs) once they have been unreferenced for the grace period.
+    """
+
+    __tablename__ = "stored_files"
+    __table_args__ = (
+        Index("ix_stored_files_orphaned", "updated_at", postgresql_where=text("ref_count <= 0")),
+    )
+
+    # Backend key, e.g. ``3f/a2/3fa2...e1.pdf``.
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_type: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -24,6 +24,9 @@ class User(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_users_email", "email", unique=True),
         Index("ix_users_phone", "phone", unique=True),
+        Index("ix_users_role_created_at", "role", "created_at", "id"),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_phone_trgm", "phone", postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
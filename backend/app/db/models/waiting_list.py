@@ -1,20 +1,25 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, UniqueConstraint, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Sequence, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
 
+# Queue order comes from one global, monotonic sequence: joining never reads the
+# queue and promotion never renumbers it. A user's 1-based position is the
+# number of entries of the appointment with ``queue_seq`` <= theirs.
+waiting_list_queue_seq = Sequence("waiting_list_queue_seq")
+
 
 class WaitingListEntry(Base):
     __tablename__ = "waiting_list"
     __table_args__ = (
         Index("ix_waiting_list_appointment_id", "appointment_id"),
         Index("ix_waiting_list_user_id", "user_id"),
+        Index("ix_waiting_list_appointment_queue", "appointment_id", "queue_seq", unique=True),
         UniqueConstraint("appointment_id", "user_id", name="uq_waiting_list_appointment_user"),
-        UniqueConstraint("appointment_id", "position", name="uq_waiting_list_appointment_position"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -24,7 +29,12 @@ class WaitingListEntry(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    queue_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        waiting_list_queue_seq,
+        server_default=waiting_list_queue_seq.next_value(),
+        nullable=False,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
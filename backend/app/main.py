@@ -2,7 +2,6 @@ import asyncio
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from sqlalchemy import select
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
@@ -24,16 +23,24 @@ from app.api.routes import (
     public_doctors,
     referrals,
     treatment_requests,
+    uploads,
     user_appointments,
     vr_sessions,
 )
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.security import hash_password
 from app.db.base import Base
 from app.db.models import User, UserRole, UserStatus
 from app.db.session import SessionLocal, engine
+from app.services.meeting_provisioning_service import meeting_provisioner
 from app.services.notification_realtime import notification_realtime_hub
+from app.services.photo_variant_service import shutdown_variant_pool
+from app.services.prescription_rendering_service import shutdown_render_pool
+from app.services.reports_service import financial_rollup_refresher
+from app.services.slot_hold_service import slot_hold_sweeper
 from app.services.storage_service import ensure_upload_dir
+from app.services.vr_session_broker import vr_session_broker
 
 app = FastAPI(title="doctrs API", version="1.0.0")
 
@@ -43,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth.router)
@@ -64,14 +72,30 @@ app.include_router(notifications.router)
 app.include_router(admin_reports.router)
 app.include_router(profile_updates.router)
 app.include_router(vr_sessions.router)
+app.include_router(uploads.router)
 
 ensure_upload_dir()
-app.mount(settings.upload_base_url, StaticFiles(directory=settings.upload_dir), name="uploads")
 
 
 @app.on_event("startup")
 async def init_realtime_hub() -> None:
-    notification_realtime_hub.attach_loop(asyncio.get_running_loop())
+    loop = asyncio.get_running_loop()
+    notification_realtime_hub.attach_loop(loop)
+    vr_session_broker.start(loop)
+    financial_rollup_refresher.start(loop)
+    slot_hold_sweeper.start(loop)
+    meeting_provisioner.start(loop)
+
+
+@app.on_event("shutdown")
+async def stop_realtime_hub() -> None:
+    await notification_realtime_hub.shutdown()
+    await vr_session_broker.shutdown()
+    await financial_rollup_refresher.shutdown()
+    await slot_hold_sweeper.shutdown()
+    await meeting_provisioner.shutdown()
+    await asyncio.to_thread(shutdown_render_pool)
+    await asyncio.to_thread(shutdown_variant_pool)
 
 
 @app.on_event("startup")
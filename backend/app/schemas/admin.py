@@ -1,6 +1,8 @@
+import uuid
 from decimal import Decimal
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.db.models import DocumentStatus
 
@@ -14,6 +16,40 @@ class ApproveApplicationRequest(BaseModel):
     note: str | None = Field(default=None, max_length=2000)
 
 
+class BulkReviewRequest(BaseModel):
+    action: Literal["APPROVE", "REJECT"]
+    application_ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
+    reason: str | None = Field(default=None, min_length=3, max_length=2000)
+    note: str | None = Field(default=None, max_length=2000)
+
+    @model_validator(mode="after")
+    def require_reason_for_reject(self):
+        if self.action == "REJECT" and not self.reason:
+            raise ValueError("reason is required to reject applications")
+        return self
+
+
+class BulkReviewItemOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    application_id: uuid.UUID
+    outcome: Literal["APPROVED", "REJECTED", "NOT_FOUND", "INVALID", "FAILED"]
+    detail: str | dict | None = None
+    doctor_user_id: uuid.UUID | None = None
+    slug: str | None = None
+
+
+class BulkReviewOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    action: Literal["APPROVE", "REJECT"]
+    total: int
+    succeeded: int
+    failed: int
+    batches: int
+    items: list[BulkReviewItemOut]
+
+
 class RequestChangesRequest(BaseModel):
     notes: str = Field(min_length=3, max_length=2000)
 
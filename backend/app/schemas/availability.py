@@ -71,7 +71,7 @@ class AvailabilitySlotOut(BaseModel):
     start_at: datetime
     end_at: datetime
     timezone: str
-    status: Literal["available", "booked"] = "available"
+    status: Literal["available", "held", "booked"] = "available"
 
 
 class AvailabilityBulkIn(BaseModel):
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 from app.core.professional_roles import ProfessionalType
 
@@ -29,6 +29,7 @@ class DoctorProfileOut(BaseModel):
     bio: str | None
     approach_text: str | None
     photo_url: str | None
+    photo_variant_urls: dict[str, str] = Field(default_factory=dict)
     languages: list[str] | None
     specialties: list[str] | None
     concerns: list[str] | None
@@ -71,7 +72,8 @@ class DoctorProfileListItem(BaseModel):
     slug: str
     display_name: str
     headline: str | None
-    photo_url: str | None
+    # Directory cards get the small WebP variant when it has been built.
+    photo_url: str | None = Field(validation_alias=AliasChoices("photo_thumbnail_url", "photo_url"))
     specialties: list[str] | None
     languages: list[str] | None
     concerns: list[str] | None
@@ -14,9 +14,35 @@ class MessageOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: uuid.UUID
+    thread_id: uuid.UUID | None = None
     sender_user_id: uuid.UUID
     receiver_user_id: uuid.UUID
     subject: str | None
     body: str
     read_at: datetime | None
     created_at: datetime
+
+
+class MessageThreadOut(BaseModel):
+    id: uuid.UUID
+    peer_user_id: uuid.UUID
+    last_message_id: uuid.UUID | None
+    last_sender_user_id: uuid.UUID | None
+    last_message_preview: str | None
+    last_message_at: datetime
+    unread_count: int = 0
+
+
+class MessageThreadPageOut(BaseModel):
+    items: list[MessageThreadOut]
+    next_cursor: str | None
+
+
+class ThreadMessagePageOut(BaseModel):
+    items: list[MessageOut]
+    next_cursor: str | None
+
+
+class MessageThreadReadOut(BaseModel):
+    thread_id: uuid.UUID
+    marked: int
@@ -3,7 +3,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from app.db.models import PrescriptionStatus
+from app.db.models import PrescriptionDocumentStatus, PrescriptionStatus
 
 
 class PrescriptionCreateIn(BaseModel):
@@ -29,7 +29,8 @@ class PrescriptionOut(BaseModel):
     valid_until: datetime | None
     verification_code: str
     data_hash: str
-    pdf_url: str
+    pdf_url: str | None
+    document_status: PrescriptionDocumentStatus
     status: PrescriptionStatus
     verification_url: str = ""
     verification_qr_data_url: str = ""
@@ -45,4 +46,5 @@ class PrescriptionVerifyOut(BaseModel):
     patient: dict[str, str | None]
     medication: dict[str, str]
     data_hash: str
-    pdf_url: str
+    pdf_url: str | None
+    document_status: PrescriptionDocumentStatus
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SlotHoldIn(BaseModel):
+    doctor_user_id: uuid.UUID
+    start_at: datetime
+
+
+class SlotHoldOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    doctor_user_id: uuid.UUID
+    user_id: uuid.UUID
+    start_at: datetime
+    end_at: datetime
+    expires_at: datetime
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class StorageUsageOut(BaseModel):
+    files: int
+    references: int
+    stored_bytes: int
+    logical_bytes: int
+    dedup_ratio: float
+    orphaned_files: int
+    orphaned_bytes: int
+    # Only filled in when the disk was scanned (``?scan_disk=true``).
+    disk_files: int | None = None
+    disk_bytes: int | None = None
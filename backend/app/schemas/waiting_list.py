@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
 
 
 class WaitingListJoinResponse(BaseModel):
@@ -12,8 +12,6 @@ class WaitingListJoinResponse(BaseModel):
 
 
 class WaitingListItemOut(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
     id: uuid.UUID
     appointment_id: uuid.UUID
     user_id: uuid.UUID
@@ -2,29 +2,24 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select, text
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.db.models import (
-    APPROVED_APPLICATION_STATUSES,
+    CONFIRMED_OVERLAP_CONSTRAINT,
     Appointment,
     AppointmentCallStatus,
     AppointmentStatus,
-    DoctorApplication,
-    DoctorProfile,
     User,
     UserRole,
-    UserStatus,
     WaitingListEntry,
 )
-from app.services.availability_service import resolve_slot
+from app.services.availability_service import find_active_conflict, match_slot, resolve_slot
+from app.services.bookability_service import get_doctor_bookability
+from app.services.meeting_provisioning_service import mark_for_provisioning, meeting_provisioner
 from app.services.notification_service import create_notification
-from app.services.zoom_service import create_zoom_meeting_for_appointment, zoom_is_configured
-
-ACTIVE_APPOINTMENT_STATUSES = (
-    AppointmentStatus.REQUESTED,
-    AppointmentStatus.CONFIRMED,
-)
+from app.services.slot_hold_service import consume_holds, find_foreign_hold
 
 
 @dataclass
@@ -38,79 +33,36 @@ class _ReleasedSlot:
     call_room_id: str | None
 
 
-def _ensure_doctor_bookable(db: Session, doctor_user_id):
-    profile = db.scalar(
-        select(DoctorProfile).where(
-            DoctorProfile.doctor_user_id == doctor_user_id,
-            DoctorProfile.is_public.is_(True),
-        )
-    )
-    if not profile:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor is not bookable")
-
-    doctor_user = db.scalar(select(User).where(User.id == doctor_user_id))
-    if not doctor_user or doctor_user.status != UserStatus.ACTIVE:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor is not active")
-
-    app = db.scalar(
-        select(DoctorApplication).where(
-            DoctorApplication.doctor_user_id == doctor_user_id,
-            DoctorApplication.status.in_(APPROVED_APPLICATION_STATUSES),
-        )
-    )
-    if not app:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor is not approved")
-
-
-def _find_conflicting_active_appointment(
-    db: Session,
-    *,
-    doctor_user_id,
-    start_at,
-    end_at,
-):
+def _waiting_position(db: Session, *, appointment_id, queue_seq: int) -> int:
     return db.scalar(
-        select(Appointment).where(
-            Appointment.doctor_user_id == doctor_user_id,
-            Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES),
-            Appointment.start_at < end_at,
-            Appointment.end_at > start_at,
-        )
-    )
-
-
-def _next_waiting_position(db: Session, *, appointment_id) -> int:
-    max_position = db.scalar(
-        select(func.max(WaitingListEntry.position)).where(WaitingListEntry.appointment_id == appointment_id)
+        select(func.count())
+        .select_from(WaitingListEntry)
+        .where(WaitingListEntry.appointment_id == appointment_id, WaitingListEntry.queue_seq <= queue_seq)
     )
-    return int(max_position or 0) + 1
-
-
-def _rebalance_waiting_list_positions(db: Session, *, appointment_id) -> None:
-    entries = list(
-        db.scalars(
-            select(WaitingListEntry)
-            .where(WaitingListEntry.appointment_id == appointment_id)
-            .order_by(WaitingListEntry.position, WaitingListEntry.created_at)
-        )
-    )
-    for index, entry in enumerate(entries, start=1):
-        entry.position = index
 
 
 def _promote_first_waiting_user(db: Session, *, released_appointment) -> Appointment | None:
-    first_in_line = db.scalar(
-        select(WaitingListEntry)
+    # Pop the head of the queue in one statement; the rest keep their queue_seq.
+    head_id = (
+        select(WaitingListEntry.id)
         .where(WaitingListEntry.appointment_id == released_appointment.id)
-        .order_by(WaitingListEntry.position, WaitingListEntry.created_at)
+        .order_by(WaitingListEntry.queue_seq)
+        .limit(1)
         .with_for_update()
+        .scalar_subquery()
+    )
+    promoted_user_id = db.scalar(
+        delete(WaitingListEntry)
+        .where(WaitingListEntry.id == head_id)
+        .returning(WaitingListEntry.user_id)
+        .execution_options(synchronize_session=False)
     )
-    if not first_in_line:
+    if promoted_user_id is None:
         return None
 
     promoted_appointment = Appointment(
         doctor_user_id=released_appointment.doctor_user_id,
-        user_id=first_in_line.user_id,
+        user_id=promoted_user_id,
         start_at=released_appointment.start_at,
         end_at=released_appointment.end_at,
         timezone=released_appointment.timezone,
@@ -121,9 +73,7 @@ def _promote_first_waiting_user(db: Session, *, released_appointment) -> Appoint
         fee_paid=False,
     )
     db.add(promoted_appointment)
-    db.delete(first_in_line)
     db.flush()
-    _rebalance_waiting_list_positions(db, appointment_id=released_appointment.id)
 
     create_notification(
         db,
@@ -162,31 +112,32 @@ def request_appointment(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="start_at must be timezone-aware")
 
     requested_start_at_utc = start_at.astimezone(UTC)
-    _ensure_doctor_bookable(db, doctor_user_id)
+    # Doctor status and schedule come from the per-process cache, so a warm
+    # request only reads the database for the conflict check below.
+    bookability = get_doctor_bookability(db, doctor_user_id)
+    bookability.ensure_bookable()
 
-    end_at_utc, has_conflict = resolve_slot(
-        db,
-        doctor_user_id=doctor_user_id,
-        requested_start_at_utc=requested_start_at_utc,
-        check_active_conflict=True,
-    )
+    end_at_utc = match_slot(bookability.rules, bookability.exceptions, requested_start_at_utc)
     if end_at_utc is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Requested slot is invalid")
-    if has_conflict:
-        conflicting = _find_conflicting_active_appointment(
-            db,
-            doctor_user_id=doctor_user_id,
-            start_at=requested_start_at_utc,
-            end_at=end_at_utc,
-        )
+    conflicting_id = find_active_conflict(db, doctor_user_id, requested_start_at_utc, end_at_utc)
+    if conflicting_id is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
                 "message": "Requested slot is already booked",
-                "conflicting_appointment_id": str(conflicting.id) if conflicting else None,
+                "conflicting_appointment_id": str(conflicting_id),
             },
         )
 
+    if find_foreign_hold(
+        db, doctor_user_id=doctor_user_id, user_id=user.id, start_at=requested_start_at_utc, end_at=end_at_utc
+    ):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Requested slot is held by another patient")
+    consume_holds(
+        db, doctor_user_id=doctor_user_id, user_id=user.id, start_at=requested_start_at_utc, end_at=end_at_utc
+    )
+
     appointment = Appointment(
         doctor_user_id=doctor_user_id,
         user_id=user.id,
@@ -219,9 +170,12 @@ def request_appointment(
     return appointment
 
 
-def confirm_appointment(db: Session, appointment_id, doctor_user: User) -> Appointment:
-    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"), {"lock_key": str(doctor_user.id)})
+def _is_confirmed_overlap(exc: IntegrityError) -> bool:
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == CONFIRMED_OVERLAP_CONSTRAINT
 
+
+def confirm_appointment(db: Session, appointment_id, doctor_user: User) -> Appointment:
     appointment = db.scalar(
         select(Appointment)
         .where(Appointment.id == appointment_id, Appointment.doctor_user_id == doctor_user.id)
@@ -233,41 +187,22 @@ def confirm_appointment(db: Session, appointment_id, doctor_user: User) -> Appoi
     if appointment.status != AppointmentStatus.REQUESTED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Appointment is not requestable")
 
-    conflict = db.scalar(
-        select(Appointment.id)
-        .where(
-            Appointment.doctor_user_id == doctor_user.id,
-            Appointment.status == AppointmentStatus.CONFIRMED,
-            Appointment.id != appointment.id,
-            Appointment.start_at < appointment.end_at,
-            Appointment.end_at > appointment.start_at,
-        )
-        .with_for_update()
-    )
-    if conflict:
+    # ex_appointments_doctor_confirmed_overlap rejects the flush when another
+    # confirmed appointment of this doctor overlaps; concurrent confirms of the
+    # same slot race on the constraint instead of on a per-doctor lock.
+    appointment.status = AppointmentStatus.CONFIRMED
+    try:
+        db.flush()
+    except IntegrityError as exc:
         db.rollback()
+        if not _is_confirmed_overlap(exc):
+            raise
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This slot conflicts with another confirmed appointment",
-        )
+        ) from exc
 
-    appointment.status = AppointmentStatus.CONFIRMED
-    if zoom_is_configured() and not appointment.meeting_link:
-        try:
-            zoom_meeting = create_zoom_meeting_for_appointment(
-                appointment_id=str(appointment.id),
-                doctor_user_id=str(appointment.doctor_user_id),
-                patient_user_id=str(appointment.user_id),
-                start_at=appointment.start_at,
-                end_at=appointment.end_at,
-            )
-            if zoom_meeting:
-                appointment.meeting_link = zoom_meeting["meeting_link"]
-                appointment.call_provider = zoom_meeting["provider"]
-                appointment.call_room_id = zoom_meeting["room_id"]
-        except Exception:
-            # Keep appointment confirmation successful even if Zoom API is temporarily unavailable.
-            pass
+    provisioning = mark_for_provisioning(appointment)
     create_notification(
         db,
         user_id=appointment.user_id,
@@ -285,6 +220,8 @@ def confirm_appointment(db: Session, appointment_id, doctor_user: User) -> Appoi
         metadata_json={"appointment_id": str(appointment.id), "user_id": str(appointment.user_id)},
     )
     db.commit()
+    if provisioning:
+        meeting_provisioner.notify()
     db.refresh(appointment)
     return appointment
 
@@ -358,14 +295,12 @@ def reschedule_appointment(
     if new_end_at_utc is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Requested slot is invalid")
 
-    conflict = db.scalar(
-        select(Appointment.id).where(
-            Appointment.doctor_user_id == appointment.doctor_user_id,
-            Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES),
-            Appointment.id != appointment.id,
-            Appointment.start_at < new_end_at_utc,
-            Appointment.end_at > new_start_at_utc,
-        )
+    conflict = find_active_conflict(
+        db,
+        appointment.doctor_user_id,
+        new_start_at_utc,
+        new_end_at_utc,
+        exclude_appointment_id=appointment.id,
     )
     if conflict:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Requested slot is already booked")
@@ -408,7 +343,7 @@ def reschedule_appointment(
     return appointment
 
 
-def join_waiting_list(db: Session, *, appointment_id, user: User) -> WaitingListEntry:
+def join_waiting_list(db: Session, *, appointment_id, user: User) -> tuple[WaitingListEntry, int]:
     appointment = db.scalar(select(Appointment).where(Appointment.id == appointment_id))
     if not appointment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found")
@@ -426,15 +361,12 @@ def join_waiting_list(db: Session, *, appointment_id, user: User) -> WaitingList
         )
     )
     if existing:
-        return existing
+        return existing, _waiting_position(db, appointment_id=appointment_id, queue_seq=existing.queue_seq)
 
-    entry = WaitingListEntry(
-        appointment_id=appointment_id,
-        user_id=user.id,
-        position=_next_waiting_position(db, appointment_id=appointment_id),
-    )
+    entry = WaitingListEntry(appointment_id=appointment_id, user_id=user.id)
     db.add(entry)
     db.flush()
+    position = _waiting_position(db, appointment_id=appointment_id, queue_seq=entry.queue_seq)
 
     create_notification(
         db,
@@ -442,7 +374,7 @@ def join_waiting_list(db: Session, *, appointment_id, user: User) -> WaitingList
         event_type="WAITING_LIST_JOINED",
         title="User joined waiting list",
         body="A user joined the waiting list for one of your appointments.",
-        metadata_json={"appointment_id": str(appointment_id), "user_id": str(user.id), "position": entry.position},
+        metadata_json={"appointment_id": str(appointment_id), "user_id": str(user.id), "position": position},
     )
     create_notification(
         db,
@@ -450,40 +382,56 @@ def join_waiting_list(db: Session, *, appointment_id, user: User) -> WaitingList
         event_type="WAITING_LIST_JOIN_CONFIRMED",
         title="Added to waiting list",
         body="You were added to the waiting list.",
-        metadata_json={"appointment_id": str(appointment_id), "position": entry.position},
+        metadata_json={"appointment_id": str(appointment_id), "position": position},
     )
     db.commit()
     db.refresh(entry)
-    return entry
+    return entry, position
 
 
-def get_waiting_list(db: Session, *, appointment_id, actor_user: User) -> tuple[list[WaitingListEntry], int | None]:
+def get_waiting_list(
+    db: Session, *, appointment_id, actor_user: User
+) -> tuple[list[tuple[WaitingListEntry, int]], int, int | None]:
+    """Return ``(entries with positions, total, actor's position)``.
+
+    Patients only get their own entry back, so for them the queue is counted
+    rather than loaded.
+    """
     appointment = db.scalar(select(Appointment).where(Appointment.id == appointment_id))
     if not appointment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found")
 
     is_related = actor_user.id in {appointment.user_id, appointment.doctor_user_id}
     is_admin = actor_user.role == UserRole.ADMIN
-    if not is_related and not is_admin:
-        # A queued user can still access own position.
-        queued = db.scalar(
-            select(WaitingListEntry.id).where(
-                WaitingListEntry.appointment_id == appointment_id,
-                WaitingListEntry.user_id == actor_user.id,
-            )
+    own_entry = db.scalar(
+        select(WaitingListEntry).where(
+            WaitingListEntry.appointment_id == appointment_id,
+            WaitingListEntry.user_id == actor_user.id,
+        )
+    )
+    # A queued user can still access own position.
+    if not is_related and not is_admin and own_entry is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to view waiting list")
+
+    if actor_user.role == UserRole.USER:
+        total = db.scalar(
+            select(func.count()).select_from(WaitingListEntry).where(WaitingListEntry.appointment_id == appointment_id)
         )
-        if not queued:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to view waiting list")
+        if own_entry is None:
+            return [], total, None
+        my_position = _waiting_position(db, appointment_id=appointment_id, queue_seq=own_entry.queue_seq)
+        return [(own_entry, my_position)], total, my_position
 
     entries = list(
         db.scalars(
             select(WaitingListEntry)
             .where(WaitingListEntry.appointment_id == appointment_id)
-            .order_by(WaitingListEntry.position, WaitingListEntry.created_at)
+            .order_by(WaitingListEntry.queue_seq)
         )
     )
-    my_position = next((entry.position for entry in entries if entry.user_id == actor_user.id), None)
-    return entries, my_position
+    positioned = list(zip(entries, range(1, len(entries) + 1)))
+    my_position = next((position for entry, position in positioned if entry.user_id == actor_user.id), None)
+    return positioned, len(entries), my_position
 
 
 def doctor_appointments(db: Session, doctor_user_id) -> list[Appointment]:
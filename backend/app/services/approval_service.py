@@ -1,10 +1,17 @@
+from dataclasses import dataclass
 from datetime import UTC, datetime, time
+import logging
 import re
 import secrets
+import uuid
 
-from sqlalchemy import func, select
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.deps import user_status_cache
 from app.core.security import hash_password
 from app.db.models import (
     AdminAction,
@@ -16,10 +23,21 @@ from app.db.models import (
     UserRole,
     UserStatus,
 )
-from app.services.professional_type_service import validate_application_by_professional_type
-from app.services.notification_service import create_notification
+from app.services.professional_type_service import uploaded_document_types, validate_application_by_professional_type
+from app.services.bookability_service import doctor_bookability_cache
+from app.services.notification_service import create_notification, create_notifications
+from app.services.slug_service import (
+    PLACEHOLDER_SLUG_PREFIX,
+    SLUG_ALLOCATION_ATTEMPTS,
+    allocate_slugs,
+    assign_profile_slug,
+    is_slug_conflict,
+    placeholder_slug,
+)
 from app.core.professional_roles import ProfessionalType
 
+logger = logging.getLogger(__name__)
+
 
 def _sanitize_licenses_public(licenses: list[dict] | None) -> list[dict] | None:
     if not licenses:
@@ -33,28 +51,6 @@ def _sanitize_licenses_public(licenses: list[dict] | None) -> list[dict] | None:
     return sanitized
 
 
-def _slugify(value: str) -> str:
-    lowered = value.strip().lower()
-    lowered = re.sub(r"[^a-z0-9]+", "-", lowered)
-    return lowered.strip("-")
-
-
-def _build_unique_slug(db: Session, preferred_value: str, doctor_user_id) -> str:
-    base = _slugify(preferred_value) or f"doctor-{str(doctor_user_id)[:8]}"
-    slug = base
-    suffix = 2
-    while True:
-        existing = db.scalar(
-            select(DoctorProfile).where(
-                DoctorProfile.slug == slug, DoctorProfile.doctor_user_id != doctor_user_id
-            )
-        )
-        if not existing:
-            return slug
-        slug = f"{base}-{suffix}"
-        suffix += 1
-
-
 def _schedule_day_to_weekday(day: str | None) -> int | None:
     if not day:
         return None
@@ -85,6 +81,32 @@ def _parse_time_value(value: str) -> time:
     return time.fromisoformat(value)
 
 
+def _availability_rule_rows(doctor_user_id, schedule: list[dict] | None) -> list[dict]:
+    """``doctor_availability_rules`` rows for the valid slots of an application schedule."""
+    rows: list[dict] = []
+    for slot in schedule or []:
+        if not isinstance(slot, dict):
+            continue
+        day_of_week = _schedule_day_to_weekday(slot.get("day"))
+        start_time = _normalize_time_value(slot.get("start"))
+        end_time = _normalize_time_value(slot.get("end"))
+        if day_of_week is None or not start_time or not end_time or end_time <= start_time:
+            continue
+        rows.append(
+            {
+                "doctor_user_id": doctor_user_id,
+                "day_of_week": day_of_week,
+                "start_time": _parse_time_value(start_time),
+                "end_time": _parse_time_value(end_time),
+                "timezone": "Asia/Amman",
+                "slot_duration_minutes": 50,
+                "buffer_minutes": 10,
+                "is_blocked": False,
+            }
+        )
+    return rows
+
+
 def _seed_availability_from_application_schedule(
     db: Session, *, doctor_user_id, schedule: list[dict] | None
 ) -> None:
@@ -97,28 +119,7 @@ def _seed_availability_from_application_schedule(
     if existing_rule:
         return
 
-    parsed_rules: list[DoctorAvailabilityRule] = []
-    for slot in schedule:
-        if not isinstance(slot, dict):
-            continue
-        day_of_week = _schedule_day_to_weekday(slot.get("day"))
-        start_time = _normalize_time_value(slot.get("start"))
-        end_time = _normalize_time_value(slot.get("end"))
-        if day_of_week is None or not start_time or not end_time or end_time <= start_time:
-            continue
-        parsed_rules.append(
-            DoctorAvailabilityRule(
-                doctor_user_id=doctor_user_id,
-                day_of_week=day_of_week,
-                start_time=_parse_time_value(start_time),
-                end_time=_parse_time_value(end_time),
-                timezone="Asia/Amman",
-                slot_duration_minutes=50,
-                buffer_minutes=10,
-                is_blocked=False,
-            )
-        )
-
+    parsed_rules = [DoctorAvailabilityRule(**row) for row in _availability_rule_rows(doctor_user_id, schedule)]
     if parsed_rules:
         db.add_all(parsed_rules)
 
@@ -135,45 +136,86 @@ def log_admin_action(
     db.add(action)
 
 
-def _resolve_or_create_doctor_user(db: Session, application: DoctorApplication) -> User:
-    if application.doctor_user_id:
-        existing = db.scalar(select(User).where(User.id == application.doctor_user_id))
-        if not existing:
-            raise ValueError("Application references a missing doctor user")
-        return existing
-
-    if not application.email:
-        raise ValueError("Application email is required for approval")
-
-    doctor_user = db.scalar(select(User).where(func.lower(User.email) == application.email.lower()))
-    if doctor_user:
-        if doctor_user.role != UserRole.DOCTOR:
-            doctor_user.role = UserRole.DOCTOR
-        if application.phone and not doctor_user.phone:
-            doctor_user.phone = application.phone
-        if doctor_user.status != UserStatus.ACTIVE:
-            doctor_user.status = UserStatus.ACTIVE
-    else:
-        doctor_user = User(
-            email=application.email.lower(),
-            phone=application.phone,
-            password_hash=hash_password(secrets.token_urlsafe(20)),
-            role=UserRole.DOCTOR,
-            status=UserStatus.ACTIVE,
-        )
-        db.add(doctor_user)
+def _resolve_or_create_doctor_users(
+    db: Session, applications: list[DoctorApplication]
+) -> tuple[dict[uuid.UUID, User], dict[uuid.UUID, str]]:
+    """Doctor user of every application (by application id), plus why it could not be resolved for the rest.
+
+    Linked users and users matching the application emails are each loaded in
+    one query; missing users are created with a single flush.
+    """
+    linked_ids = {application.doctor_user_id for application in applications if application.doctor_user_id}
+    linked = {user.id: user for user in db.scalars(select(User).where(User.id.in_(linked_ids)))} if linked_ids else {}
+    emails = {
+        application.email.lower()
+        for application in applications
+        if not application.doctor_user_id and application.email
+    }
+    by_email = (
+        {user.email.lower(): user for user in db.scalars(select(User).where(func.lower(User.email).in_(emails)))}
+        if emails
+        else {}
+    )
+
+    users: dict[uuid.UUID, User] = {}
+    errors: dict[uuid.UUID, str] = {}
+    created: list[User] = []
+    unusable_password_hash: str | None = None
+    for application in applications:
+        if application.doctor_user_id:
+            existing = linked.get(application.doctor_user_id)
+            if existing is None:
+                errors[application.id] = "Application references a missing doctor user"
+            else:
+                users[application.id] = existing
+            continue
+
+        if not application.email:
+            errors[application.id] = "Application email is required for approval"
+            continue
+
+        email = application.email.lower()
+        doctor_user = by_email.get(email)
+        if doctor_user is None:
+            if unusable_password_hash is None:
+                # Nobody knows this password, so one bcrypt hash can serve the whole batch.
+                unusable_password_hash = hash_password(secrets.token_urlsafe(20))
+            doctor_user = User(
+                email=email,
+                phone=application.phone,
+                password_hash=unusable_password_hash,
+                role=UserRole.DOCTOR,
+                status=UserStatus.ACTIVE,
+            )
+            by_email[email] = doctor_user
+            created.append(doctor_user)
+        else:
+            if doctor_user.role != UserRole.DOCTOR:
+                doctor_user.role = UserRole.DOCTOR
+            if application.phone and not doctor_user.phone:
+                doctor_user.phone = application.phone
+            if doctor_user.status != UserStatus.ACTIVE:
+                doctor_user.status = UserStatus.ACTIVE
+                user_status_cache.invalidate(doctor_user.id)
+        users[application.id] = doctor_user
+
+    if created:
+        db.add_all(created)
         db.flush()
+    for application in applications:
+        if application.id in users:
+            application.doctor_user_id = users[application.id].id
+    return users, errors
 
-    application.doctor_user_id = doctor_user.id
-    return doctor_user
 
+def _resolve_or_create_doctor_user(db: Session, application: DoctorApplication) -> User:
+    users, errors = _resolve_or_create_doctor_users(db, [application])
+    if application.id in errors:
+        raise ValueError(errors[application.id])
+    return users[application.id]
 
-def approve_application(
-    db: Session, application: DoctorApplication, admin: User, note: str | None = None
-) -> DoctorApplication:
-    validate_application_by_professional_type(db, application)
-    now = datetime.now(UTC)
-    doctor_user = _resolve_or_create_doctor_user(db, application)
+
+def _mark_approved(application: DoctorApplication, *, admin: User, note: str | None, now: datetime) -> None:
     if application.professional_type == ProfessionalType.PSYCHIATRIST:
         application.status = ApplicationStatus.APPROVED_MD
     else:
@@ -185,22 +227,20 @@ def approve_application(
         application.admin_note = note
         application.internal_notes = note
 
-    profile = db.scalar(
-        select(DoctorProfile).where(DoctorProfile.doctor_user_id == doctor_user.id)
-    )
-    if not profile:
-        profile = DoctorProfile(
-            doctor_user_id=doctor_user.id,
-            display_name="Doctor",
-            slug=f"doctor-{str(doctor_user.id)[:8]}",
-        )
-        db.add(profile)
 
-    profile.display_name = (
-        application.full_name or application.display_name or profile.display_name or "Doctor"
-    )
-    if not profile.slug or profile.slug.startswith("doctor-"):
-        profile.slug = _build_unique_slug(db, profile.display_name, doctor_user.id)
+def _mark_rejected(
+    application: DoctorApplication, *, admin: User, reason: str, note: str | None, now: datetime
+) -> None:
+    application.status = ApplicationStatus.REJECTED
+    application.reviewer_admin_id = admin.id
+    application.reviewed_at = now
+    application.rejection_reason = reason
+    if note is not None:
+        application.admin_note = note
+        application.internal_notes = note
+
+
+def _apply_application_to_profile(profile: DoctorProfile, application: DoctorApplication, now: datetime) -> None:
     profile.headline = application.short_bio or application.headline
     profile.bio = application.about or application.bio
     profile.photo_url = application.photo_url
@@ -235,6 +275,33 @@ def approve_application(
     if profile.published_at is None:
         profile.published_at = now
 
+
+def approve_application(
+    db: Session, application: DoctorApplication, admin: User, note: str | None = None
+) -> DoctorApplication:
+    validate_application_by_professional_type(db, application)
+    now = datetime.now(UTC)
+    doctor_user = _resolve_or_create_doctor_user(db, application)
+    _mark_approved(application, admin=admin, note=note, now=now)
+
+    profile = db.scalar(
+        select(DoctorProfile).where(DoctorProfile.doctor_user_id == doctor_user.id)
+    )
+    if not profile:
+        profile = DoctorProfile(
+            doctor_user_id=doctor_user.id,
+            display_name="Doctor",
+            slug=placeholder_slug(doctor_user.id),
+        )
+        db.add(profile)
+
+    profile.display_name = (
+        application.full_name or application.display_name or profile.display_name or "Doctor"
+    )
+    if not profile.slug or profile.slug.startswith(PLACEHOLDER_SLUG_PREFIX):
+        assign_profile_slug(db, profile, profile.display_name)
+    _apply_application_to_profile(profile, application, now)
+
     _seed_availability_from_application_schedule(
         db, doctor_user_id=doctor_user.id, schedule=application.schedule
     )
@@ -265,6 +332,8 @@ def approve_application(
     )
 
     db.commit()
+    if application.doctor_user_id is not None:
+        doctor_bookability_cache.invalidate(application.doctor_user_id)
     db.refresh(application)
     return application
 
@@ -272,13 +341,7 @@ def approve_application(
 def reject_application(
     db: Session, application: DoctorApplication, admin: User, reason: str, note: str | None = None
 ) -> DoctorApplication:
-    application.status = ApplicationStatus.REJECTED
-    application.reviewer_admin_id = admin.id
-    application.reviewed_at = datetime.now(UTC)
-    application.rejection_reason = reason
-    if note is not None:
-        application.admin_note = note
-        application.internal_notes = note
+    _mark_rejected(application, admin=admin, reason=reason, note=note, now=datetime.now(UTC))
 
     log_admin_action(
         db,
@@ -307,6 +370,8 @@ def reject_application(
     )
 
     db.commit()
+    if application.doctor_user_id is not None:
+        doctor_bookability_cache.invalidate(application.doctor_user_id)
     db.refresh(application)
     return application
 
@@ -347,5 +412,314 @@ def request_changes(
     )
 
     db.commit()
+    if application.doctor_user_id is not None:
+        doctor_bookability_cache.invalidate(application.doctor_user_id)
     db.refresh(application)
     return application
+
+
+BULK_APPROVED = "APPROVED"
+BULK_REJECTED = "REJECTED"
+BULK_NOT_FOUND = "NOT_FOUND"
+BULK_INVALID = "INVALID"
+BULK_FAILED = "FAILED"
+
+
+@dataclass
+class BulkReviewItem:
+    application_id: uuid.UUID
+    outcome: str
+    detail: str | dict | None = None
+    doctor_user_id: uuid.UUID | None = None
+    slug: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.outcome in {BULK_APPROVED, BULK_REJECTED}
+
+
+@dataclass
+class BulkReviewResult:
+    action: str
+    batches: int
+    items: list[BulkReviewItem]
+
+    @property
+    def total(self) -> int:
+        return len(self.items)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(item.succeeded for item in self.items)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.succeeded
+
+
+def _lock_applications(db: Session, application_ids: list[uuid.UUID]) -> dict[uuid.UUID, DoctorApplication]:
+    return {
+        application.id: application
+        for application in db.scalars(
+            select(DoctorApplication)
+            .where(DoctorApplication.id.in_(application_ids))
+            .order_by(DoctorApplication.id)
+            .with_for_update()
+        )
+    }
+
+
+def _log_admin_actions(db: Session, admin: User, action_type: str, entries: list[tuple[uuid.UUID, dict]]) -> None:
+    """``log_admin_action`` for many targets with one multi-row INSERT."""
+    if entries:
+        db.execute(
+            insert(AdminAction),
+            [
+                {"admin_user_id": admin.id, "action_type": action_type, "target_id": target_id, "metadata_json": metadata}
+                for target_id, metadata in entries
+            ],
+        )
+
+
+def _approve_batch(
+    db: Session, application_ids: list[uuid.UUID], *, admin: User, note: str | None
+) -> list[BulkReviewItem]:
+    now = datetime.now(UTC)
+    applications = _lock_applications(db, application_ids)
+    uploaded = uploaded_document_types(db, list(applications))
+
+    items: dict[uuid.UUID, BulkReviewItem] = {}
+    valid: list[DoctorApplication] = []
+    for application_id in application_ids:
+        application = applications.get(application_id)
+        if application is None:
+            items[application_id] = BulkReviewItem(application_id, BULK_NOT_FOUND, "Application not found")
+            continue
+        try:
+            validate_application_by_professional_type(db, application, uploaded_types=uploaded[application_id])
+        except HTTPException as exc:
+            items[application_id] = BulkReviewItem(application_id, BULK_INVALID, exc.detail)
+            continue
+        valid.append(application)
+
+    users, errors = _resolve_or_create_doctor_users(db, valid)
+    for application_id, error in errors.items():
+        items[application_id] = BulkReviewItem(application_id, BULK_FAILED, error)
+    approved = [application for application in valid if application.id in users]
+
+    doctor_ids = {users[application.id].id for application in approved}
+    profiles = (
+        {
+            profile.doctor_user_id: profile
+            for profile in db.scalars(select(DoctorProfile).where(DoctorProfile.doctor_user_id.in_(doctor_ids)))
+        }
+        if doctor_ids
+        else {}
+    )
+    for application in approved:
+        doctor_user = users[application.id]
+        _mark_approved(application, admin=admin, note=note, now=now)
+        profile = profiles.get(doctor_user.id)
+        if profile is None:
+            profile = DoctorProfile(
+                doctor_user_id=doctor_user.id,
+                display_name="Doctor",
+                slug=placeholder_slug(doctor_user.id),
+            )
+            db.add(profile)
+            profiles[doctor_user.id] = profile
+        profile.display_name = (
+            application.full_name or application.display_name or profile.display_name or "Doctor"
+        )
+        _apply_application_to_profile(profile, application, now)
+
+    allocated = allocate_slugs(
+        db,
+        {
+            doctor_id: profile.display_name
+            for doctor_id, profile in profiles.items()
+            if not profile.slug or profile.slug.startswith(PLACEHOLDER_SLUG_PREFIX)
+        },
+    )
+    for doctor_id, slug in allocated.items():
+        profiles[doctor_id].slug = slug
+
+    schedules = {users[application.id].id: application.schedule for application in approved if application.schedule}
+    if schedules:
+        seeded = set(
+            db.scalars(
+                select(DoctorAvailabilityRule.doctor_user_id)
+                .where(DoctorAvailabilityRule.doctor_user_id.in_(schedules))
+                .distinct()
+            )
+        )
+        rule_rows = [
+            row
+            for doctor_id, schedule in schedules.items()
+            if doctor_id not in seeded
+            for row in _availability_rule_rows(doctor_id, schedule)
+        ]
+        if rule_rows:
+            db.execute(insert(DoctorAvailabilityRule), rule_rows)
+
+    if approved:
+        _log_admin_actions(
+            db,
+            admin,
+            "APPLICATION_APPROVED",
+            [(application.id, {"doctor_user_id": str(users[application.id].id), "bulk": True}) for application in approved],
+        )
+        create_notifications(
+            db,
+            [
+                {
+                    "user_id": users[application.id].id,
+                    "event_type": "APPLICATION_APPROVED",
+                    "title": "Application approved",
+                    "body": "Your doctor application has been approved.",
+                    "metadata_json": {"application_id": str(application.id)},
+                }
+                for application in approved
+            ]
+            + [
+                {
+                    "user_id": admin.id,
+                    "event_type": "APPLICATION_BULK_APPROVAL_COMPLETED",
+                    "title": "Applications approved",
+                    "body": f"You approved {len(approved)} doctor applications.",
+                    "metadata_json": {"application_ids": [str(application.id) for application in approved]},
+                }
+            ],
+        )
+    for application in approved:
+        doctor_id = users[application.id].id
+        items[application.id] = BulkReviewItem(
+            application.id, BULK_APPROVED, doctor_user_id=doctor_id, slug=profiles[doctor_id].slug
+        )
+
+    db.commit()
+    return [items[application_id] for application_id in application_ids]
+
+
+def _reject_batch(
+    db: Session, application_ids: list[uuid.UUID], *, admin: User, reason: str, note: str | None
+) -> list[BulkReviewItem]:
+    now = datetime.now(UTC)
+    applications = _lock_applications(db, application_ids)
+
+    items: dict[uuid.UUID, BulkReviewItem] = {}
+    rejected: list[DoctorApplication] = []
+    for application_id in application_ids:
+        application = applications.get(application_id)
+        if application is None:
+            items[application_id] = BulkReviewItem(application_id, BULK_NOT_FOUND, "Application not found")
+            continue
+        _mark_rejected(application, admin=admin, reason=reason, note=note, now=now)
+        rejected.append(application)
+        items[application_id] = BulkReviewItem(application_id, BULK_REJECTED, doctor_user_id=application.doctor_user_id)
+
+    if rejected:
+        _log_admin_actions(
+            db,
+            admin,
+            "APPLICATION_REJECTED",
+            [(application.id, {"reason": reason, "bulk": True}) for application in rejected],
+        )
+        create_notifications(
+            db,
+            [
+                {
+                    "user_id": application.doctor_user_id,
+                    "event_type": "APPLICATION_REJECTED",
+                    "title": "Application rejected",
+                    "body": "Your doctor application was rejected.",
+                    "metadata_json": {"application_id": str(application.id), "reason": reason},
+                }
+                for application in rejected
+                if application.doctor_user_id is not None
+            ]
+            + [
+                {
+                    "user_id": admin.id,
+                    "event_type": "APPLICATION_BULK_REJECTION_COMPLETED",
+                    "title": "Applications rejected",
+                    "body": f"You rejected {len(rejected)} doctor applications.",
+                    "metadata_json": {"application_ids": [str(application.id) for application in rejected]},
+                }
+            ],
+        )
+
+    db.commit()
+    return [items[application_id] for application_id in application_ids]
+
+
+def _review_batch(
+    db: Session,
+    application_ids: list[uuid.UUID],
+    *,
+    admin: User,
+    approve: bool,
+    reason: str | None,
+    note: str | None,
+) -> list[BulkReviewItem]:
+    """Review one batch in its own transaction; a failed batch is rolled back as a whole."""
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            if approve:
+                items = _approve_batch(db, application_ids, admin=admin, note=note)
+            else:
+                items = _reject_batch(db, application_ids, admin=admin, reason=reason or "", note=note)
+        except SQLAlchemyError as exc:
+            db.rollback()
+            if isinstance(exc, IntegrityError) and is_slug_conflict(exc) and attempts < SLUG_ALLOCATION_ATTEMPTS:
+                # A concurrent approval took one of the slugs: reload and allocate again.
+                continue
+            logger.exception("Bulk review batch of %s applications failed", len(application_ids))
+            return [
+                BulkReviewItem(application_id, BULK_FAILED, "Batch failed and was rolled back")
+                for application_id in application_ids
+            ]
+        for item in items:
+            if item.doctor_user_id is not None:
+                doctor_bookability_cache.invalidate(item.doctor_user_id)
+        return items
+
+
+def bulk_review_applications(
+    db: Session,
+    *,
+    application_ids: list[uuid.UUID],
+    admin: User,
+    approve: bool,
+    reason: str | None = None,
+    note: str | None = None,
+    batch_size: int | None = None,
+) -> BulkReviewResult:
+    """Approve or reject many applications, ``BULK_REVIEW_BATCH_SIZE`` per transaction.
+
+    Each batch loads its applications, users, profiles and existing slugs with
+    a handful of queries, seeds availability and logs admin actions with
+    multi-row INSERTs and commits on its own, so a failing batch does not undo
+    the batches before it. Every id gets a result in the order given.
+    """
+    ordered_ids = list(dict.fromkeys(application_ids))
+    batch_size = batch_size or settings.bulk_review_batch_size
+    batches = [ordered_ids[start : start + batch_size] for start in range(0, len(ordered_ids), batch_size)]
+    action = "APPROVE" if approve else "REJECT"
+    admin_id = admin.id
+
+    items: list[BulkReviewItem] = []
+    for number, batch in enumerate(batches, start=1):
+        items.extend(_review_batch(db, batch, admin=admin, approve=approve, reason=reason, note=note))
+        logger.info(
+            "Bulk %s by admin %s: batch %s/%s done, %s/%s applications processed",
+            action,
+            admin_id,
+            number,
+            len(batches),
+            len(items),
+            len(ordered_ids),
+        )
+    return BulkReviewResult(action=action, batches=len(batches), items=items)
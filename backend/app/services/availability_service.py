@@ -10,13 +10,16 @@ from app.db.models import (
     DoctorAvailabilityException,
     DoctorAvailabilityRule,
     RecurrenceType,
+    SlotHold,
 )
 from app.schemas.availability import AvailabilityExceptionIn, AvailabilityRuleIn, AvailabilitySlotOut
+from app.services.bookability_service import doctor_bookability_cache
 
 ACTIVE_APPOINTMENT_STATUSES = (
     AppointmentStatus.REQUESTED,
     AppointmentStatus.CONFIRMED,
 )
+SLOT_STATUS_RANK = {"available": 0, "held": 1, "booked": 2}
 
 
 def replace_rules(db: Session, doctor_user_id, rules: list[AvailabilityRuleIn]) -> list[DoctorAvailabilityRule]:
@@ -40,6 +43,7 @@ def replace_rules(db: Session, doctor_user_id, rules: list[AvailabilityRuleIn])
     ]
     db.add_all(new_rules)
     db.commit()
+    doctor_bookability_cache.invalidate(doctor_user_id)
     return list(
         db.scalars(
             select(DoctorAvailabilityRule)
@@ -76,6 +80,7 @@ def replace_exceptions(
     ]
     db.add_all(new_items)
     db.commit()
+    doctor_bookability_cache.invalidate(doctor_user_id)
     return list(
         db.scalars(
             select(DoctorAvailabilityException)
@@ -179,24 +184,26 @@ def _get_rules(db: Session, doctor_user_id) -> list[DoctorAvailabilityRule]:
     )
 
 
+def _exceptions_query(doctor_user_id, date_from: date, date_to: date):
+    return (
+        select(DoctorAvailabilityException)
+        .where(
+            DoctorAvailabilityException.doctor_user_id == doctor_user_id,
+            DoctorAvailabilityException.date <= date_to,
+            or_(
+                DoctorAvailabilityException.is_recurring.is_(False),
+                DoctorAvailabilityException.recurrence_until.is_(None),
+                DoctorAvailabilityException.recurrence_until >= date_from,
+            ),
+        )
+        .order_by(DoctorAvailabilityException.date, DoctorAvailabilityException.created_at)
+    )
+
+
 def _get_exceptions_map(
     db: Session, doctor_user_id, date_from: date, date_to: date
 ) -> dict[date, list[DoctorAvailabilityException]]:
-    exceptions = list(
-        db.scalars(
-            select(DoctorAvailabilityException)
-            .where(
-                DoctorAvailabilityException.doctor_user_id == doctor_user_id,
-                DoctorAvailabilityException.date <= date_to,
-                or_(
-                    DoctorAvailabilityException.is_recurring.is_(False),
-                    DoctorAvailabilityException.recurrence_until.is_(None),
-                    DoctorAvailabilityException.recurrence_until >= date_from,
-                ),
-            )
-            .order_by(DoctorAvailabilityException.date, DoctorAvailabilityException.created_at)
-        )
-    )
+    exceptions = list(db.scalars(_exceptions_query(doctor_user_id, date_from, date_to)))
 
     by_date: dict[date, list[DoctorAvailabilityException]] = {}
     day = date_from
@@ -223,6 +230,21 @@ def _get_active_appointments(
     )
 
 
+def _get_active_holds(
+    db: Session, doctor_user_id, window_start_utc: datetime, window_end_utc: datetime
+) -> list[tuple[datetime, datetime]]:
+    return list(
+        db.execute(
+            select(SlotHold.start_at, SlotHold.end_at).where(
+                SlotHold.doctor_user_id == doctor_user_id,
+                SlotHold.expires_at > datetime.now(UTC),
+                SlotHold.start_at < window_end_utc,
+                SlotHold.end_at > window_start_utc,
+            )
+        ).tuples()
+    )
+
+
 def generate_slots(
     db: Session,
     doctor_user_id,
@@ -244,6 +266,7 @@ def generate_slots(
     active_appointments = _get_active_appointments(
         db, doctor_user_id, window_start_utc, window_end_utc
     )
+    active_holds = _get_active_holds(db, doctor_user_id, window_start_utc, window_end_utc)
 
     slots_by_start: dict[str, AvailabilitySlotOut] = {}
     day = date_from
@@ -285,14 +308,19 @@ def generate_slots(
                     for appt in active_appointments
                 )
                 slot_status: str = "booked" if is_overlapping_active_appointment else "available"
-                if slot_status == "booked" and not include_booked:
+                if slot_status == "available" and any(
+                    _slot_overlaps(slot_start_utc, slot_end_utc, hold_start, hold_end)
+                    for hold_start, hold_end in active_holds
+                ):
+                    slot_status = "held"
+                if slot_status != "available" and not include_booked:
                     slot_start_local += step
                     continue
 
                 slot_key = slot_start_utc.isoformat()
                 existing = slots_by_start.get(slot_key)
-                # Prefer "booked" over "available" if overlapping rules generate same start.
-                if existing is None or (existing.status == "available" and slot_status == "booked"):
+                # Prefer "booked" over "held" over "available" if overlapping rules generate same start.
+                if existing is None or SLOT_STATUS_RANK[slot_status] > SLOT_STATUS_RANK[existing.status]:
                     slots_by_start[slot_key] = AvailabilitySlotOut(
                         start_at=slot_start_utc,
                         end_at=slot_end_utc,
@@ -308,24 +336,16 @@ def generate_slots(
     return slots
 
 
-def resolve_slot(
-    db: Session,
-    doctor_user_id,
-    requested_start_at_utc: datetime,
-    check_active_conflict: bool,
-) -> tuple[datetime | None, bool]:
-    """
-    Returns: (slot_end_at_utc, has_conflict_with_active_appointment).
-    If slot does not match rules/exceptions, slot_end_at_utc is None.
-    """
-    all_rules = _get_rules(db, doctor_user_id)
-    if not all_rules:
-        return None, False
+def match_slot(rules, exceptions, requested_start_at_utc: datetime) -> datetime | None:
+    """Return the end of the slot starting at ``requested_start_at_utc``, or None if there is none.
 
-    blocked_rules = [rule for rule in all_rules if rule.is_blocked]
-    rules = [rule for rule in all_rules if not rule.is_blocked]
+    Works on any objects shaped like availability rules/exceptions, so it accepts
+    ORM rows as well as the cached snapshots from ``bookability_service``.
+    """
+    blocked_rules = [rule for rule in rules if rule.is_blocked]
+    open_rules = [rule for rule in rules if not rule.is_blocked]
 
-    for rule in rules:
+    for rule in open_rules:
         tz = ZoneInfo(rule.timezone)
         local_start = requested_start_at_utc.astimezone(tz)
         if local_start.weekday() != rule.day_of_week:
@@ -352,7 +372,7 @@ def resolve_slot(
         if step_seconds == 0 or delta_seconds % step_seconds != 0:
             continue
 
-        day_exceptions = _get_exceptions_map(db, doctor_user_id, local_day, local_day).get(local_day, [])
+        day_exceptions = [item for item in exceptions if _exception_applies_on_day(item, local_day)]
         if _is_blocked_by_exception(day_exceptions, local_start, local_end):
             continue
 
@@ -365,21 +385,52 @@ def resolve_slot(
         ):
             continue
 
-        if check_active_conflict:
-            conflict_exists = db.scalar(
-                select(Appointment.id).where(
-                    Appointment.doctor_user_id == doctor_user_id,
-                    Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES),
-                    Appointment.start_at < end_utc,
-                    Appointment.end_at > requested_start_at_utc,
-                )
-            )
-            if conflict_exists:
-                return end_utc, True
+        return end_utc
+
+    return None
 
-        return end_utc, False
 
-    return None, False
+def find_active_conflict(
+    db: Session, doctor_user_id, start_at: datetime, end_at: datetime, *, exclude_appointment_id=None
+):
+    """Id of the earliest active appointment overlapping ``[start_at, end_at)``, if any."""
+    query = select(Appointment.id).where(
+        Appointment.doctor_user_id == doctor_user_id,
+        Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES),
+        Appointment.start_at < end_at,
+        Appointment.end_at > start_at,
+    )
+    if exclude_appointment_id is not None:
+        query = query.where(Appointment.id != exclude_appointment_id)
+    return db.scalar(query.order_by(Appointment.start_at).limit(1))
+
+
+def resolve_slot(
+    db: Session,
+    doctor_user_id,
+    requested_start_at_utc: datetime,
+    check_active_conflict: bool,
+) -> tuple[datetime | None, bool]:
+    """
+    Returns: (slot_end_at_utc, has_conflict_with_active_appointment).
+    If slot does not match rules/exceptions, slot_end_at_utc is None.
+    """
+    all_rules = _get_rules(db, doctor_user_id)
+    if not all_rules:
+        return None, False
+
+    # The slot's local day is within a day of its UTC date whatever the rule timezone.
+    utc_day = requested_start_at_utc.date()
+    exceptions = list(
+        db.scalars(_exceptions_query(doctor_user_id, utc_day - timedelta(days=1), utc_day + timedelta(days=1)))
+    )
+    end_utc = match_slot(all_rules, exceptions, requested_start_at_utc)
+    if end_utc is None:
+        return None, False
+
+    if check_active_conflict and find_active_conflict(db, doctor_user_id, requested_start_at_utc, end_utc):
+        return end_utc, True
+    return end_utc, False
 
 
 def has_confirmed_overlap(db: Session, doctor_user_id, start_at: datetime, end_at: datetime) -> bool:
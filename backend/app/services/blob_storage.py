@@ -0,0 +1,107 @@
+"""Content-addressed blob backends for uploaded and generated files.
+
+A blob's key is derived from its sha256 and fanned out over two directory
+levels (``3f/a2/3fa2...e1.pdf``), so identical content is stored once and no
+directory grows past a few thousand entries. Backends expose the small subset
+of the S3 object API the app needs; ``LocalBlobBackend`` keeps the objects
+under ``UPLOAD_DIR`` and is what runs in development, tests and single-host
+deployments. An object-store backend only has to implement ``BlobBackend``
+and be selected in ``get_blob_backend``.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from functools import cache
+from pathlib import Path
+from typing import Protocol
+
+from app.core.config import settings
+
+# Where uploads are staged while they stream in and are hashed.
+INCOMING_DIR_NAME = ".incoming"
+
+
+def content_key(sha256: str, extension: str) -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def is_content_key(key: str) -> bool:
+    parts = key.split("/")
+    return (
+        len(parts) == 3
+        and len(parts[0]) == len(parts[1]) == 2
+        and parts[2].startswith(parts[0] + parts[1])
+        and len(parts[2].split(".", 1)[0]) == 64
+    )
+
+
+class BlobBackend(Protocol):
+    def put_object(self, key: str, source: Path) -> None:
+        """Store the staged file ``source`` under ``key``; ``source`` is consumed."""
+
+    def head_object(self, key: str) -> int | None:
+        """Size of the object, or None if it does not exist."""
+
+    def delete_object(self, key: str) -> None:
+        """Delete the object; missing objects are ignored."""
+
+    def list_objects(self) -> Iterator[tuple[str, int]]:
+        """Every stored object as ``(key, size)``."""
+
+    def url_for(self, key: str) -> str:
+        """Public URL the API hands out for ``key``."""
+
+
+class LocalBlobBackend:
+    def __init__(self, root: Path, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key
+
+    def put_object(self, key: str, source: Path) -> None:
+        target = self.path_for(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Same key means same bytes: an atomic rename over an existing copy is harmless.
+        os.replace(source, target)
+
+    def head_object(self, key: str) -> int | None:
+        try:
+            return self.path_for(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def delete_object(self, key: str) -> None:
+        path = self.path_for(key)
+        path.unlink(missing_ok=True)
+        # Drop the fan-out directories once they are empty.
+        for directory in (path.parent, path.parent.parent):
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+
+    def list_objects(self) -> Iterator[tuple[str, int]]:
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if name != INCOMING_DIR_NAME]
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                yield path.relative_to(self.root).as_posix(), path.stat().st_size
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+@cache
+def _local_backend(root: str, base_url: str) -> LocalBlobBackend:
+    return LocalBlobBackend(Path(root), base_url)
+
+
+def get_blob_backend() -> BlobBackend:
+    backend = settings.storage_backend.lower()
+    if backend == "local":
+        return _local_backend(settings.upload_dir, settings.upload_base_url)
+    raise RuntimeError(f"Unsupported STORAGE_BACKEND: {settings.storage_backend}")
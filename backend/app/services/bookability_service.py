@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, fields
+from datetime import date, datetime, time
+from threading import Lock
+from time import monotonic
+
+from fastapi import HTTPException, status
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import (
+    APPROVED_APPLICATION_STATUSES,
+    DoctorApplication,
+    DoctorAvailabilityException,
+    DoctorAvailabilityRule,
+    DoctorProfile,
+    RecurrenceType,
+    User,
+    UserStatus,
+)
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    day_of_week: int
+    start_time: time
+    end_time: time
+    timezone: str
+    slot_duration_minutes: int
+    buffer_minutes: int
+    is_blocked: bool
+    effective_from: date | None
+    effective_to: date | None
+
+
+@dataclass(frozen=True)
+class ExceptionSnapshot:
+    date: date
+    is_unavailable: bool
+    is_blocking: bool
+    is_recurring: bool
+    recurrence_type: RecurrenceType | None
+    recurrence_interval: int
+    recurrence_until: date | None
+    weekday: int | None
+    start_time: time | None
+    end_time: time | None
+    created_at: datetime
+
+
+def _snapshot(model_cls, instance):
+    return model_cls(**{field.name: getattr(instance, field.name) for field in fields(model_cls)})
+
+
+@dataclass(frozen=True)
+class DoctorBookability:
+    """Everything ``request_appointment`` needs about a doctor before the conflict check."""
+
+    unbookable_reason: str | None
+    rules: tuple[RuleSnapshot, ...] = ()
+    exceptions: tuple[ExceptionSnapshot, ...] = ()
+
+    def ensure_bookable(self) -> None:
+        if self.unbookable_reason is not None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=self.unbookable_reason)
+
+
+class DoctorBookabilityCache:
+    """Per-process ``doctor_user_id -> DoctorBookability`` cache.
+
+    Writers in this process invalidate the doctor's entry after committing;
+    the TTL bounds how long other workers can serve a stale schedule.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[uuid.UUID, tuple[DoctorBookability, float]] = {}
+        self._lock = Lock()
+
+    def get(self, doctor_user_id: uuid.UUID) -> DoctorBookability | None:
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(doctor_user_id)
+            if entry is None:
+                return None
+            bookability, expires_at = entry
+            if expires_at <= now:
+                self._entries.pop(doctor_user_id, None)
+                return None
+            return bookability
+
+    def set(self, doctor_user_id: uuid.UUID, bookability: DoctorBookability) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[doctor_user_id] = (bookability, monotonic() + self.ttl_seconds)
+
+    def invalidate(self, doctor_user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(doctor_user_id, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+doctor_bookability_cache = DoctorBookabilityCache(ttl_seconds=settings.booking_cache_seconds)
+
+
+def _load_doctor_bookability(db: Session, doctor_user_id) -> DoctorBookability:
+    approved = exists().where(
+        DoctorApplication.doctor_user_id == User.id,
+        DoctorApplication.status.in_(APPROVED_APPLICATION_STATUSES),
+    )
+    row = db.execute(
+        select(DoctorProfile.is_public, User.status, approved)
+        .select_from(User)
+        .outerjoin(DoctorProfile, DoctorProfile.doctor_user_id == User.id)
+        .where(User.id == doctor_user_id)
+    ).first()
+    if row is None or not row[0]:
+        return DoctorBookability(unbookable_reason="Doctor is not bookable")
+    if row[1] != UserStatus.ACTIVE:
+        return DoctorBookability(unbookable_reason="Doctor is not active")
+    if not row[2]:
+        return DoctorBookability(unbookable_reason="Doctor is not approved")
+
+    rules = db.scalars(
+        select(DoctorAvailabilityRule)
+        .where(DoctorAvailabilityRule.doctor_user_id == doctor_user_id)
+        .order_by(DoctorAvailabilityRule.day_of_week, DoctorAvailabilityRule.start_time)
+    )
+    exceptions = db.scalars(
+        select(DoctorAvailabilityException)
+        .where(DoctorAvailabilityException.doctor_user_id == doctor_user_id)
+        .order_by(DoctorAvailabilityException.date, DoctorAvailabilityException.created_at)
+    )
+    return DoctorBookability(
+        unbookable_reason=None,
+        rules=tuple(_snapshot(RuleSnapshot, rule) for rule in rules),
+        exceptions=tuple(_snapshot(ExceptionSnapshot, item) for item in exceptions),
+    )
+
+
+def get_doctor_bookability(db: Session, doctor_user_id) -> DoctorBookability:
+    cached = doctor_bookability_cache.get(doctor_user_id)
+    if cached is not None:
+        return cached
+    bookability = _load_doctor_bookability(db, doctor_user_id)
+    doctor_bookability_cache.set(doctor_user_id, bookability)
+    return bookability
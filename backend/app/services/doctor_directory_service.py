@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import websearch_to_tsquery
 from sqlalchemy.orm import Session
 
 from app.db.models import APPROVED_APPLICATION_STATUSES, DoctorApplication, DoctorProfile, User, UserStatus
@@ -40,6 +41,28 @@ def filter_doctors(db: Session, *, specialty: str | None = None, public_only: bo
     return list(db.scalars(query.order_by(DoctorProfile.display_name.asc())))
 
 
+def search_doctors(db: Session, *, q: str, limit: int = 20, offset: int = 0) -> list[DoctorProfile]:
+    """Rank public profiles against free text in English and Arabic.
+
+    Whole-word matches come from ``search_vector`` (display name > headline > bio);
+    partial names such as "Moham" match through the display-name trigram index.
+    """
+    term = q.strip()
+    if not term:
+        return []
+
+    ts_query = websearch_to_tsquery("english", term).op("||")(websearch_to_tsquery("arabic", term))
+    rank = func.ts_rank_cd(DoctorProfile.search_vector, ts_query) + func.similarity(DoctorProfile.display_name, term)
+    query = _public_profile_query().where(
+        or_(
+            DoctorProfile.search_vector.op("@@")(ts_query),
+            DoctorProfile.display_name.ilike(f"%{term}%"),
+        )
+    )
+    query = query.order_by(rank.desc(), DoctorProfile.rating.desc().nullslast(), DoctorProfile.id)
+    return list(db.scalars(query.offset(offset).limit(limit)))
+
+
 # Compatibility helpers matching requested names.
 def getTopDoctor(db: Session) -> DoctorProfile | None:
     return get_top_doctor(db)
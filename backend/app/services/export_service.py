@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return str(value)
+
+
+def iter_query_batches(statement: Select, *, batch_size: int | None = None) -> Iterator[Sequence]:
+    """Yield result rows in batches off a server-side cursor.
+
+    Opens its own session: a streaming body is consumed after the request's
+    ``get_db`` session has already been closed.
+    """
+    with SessionLocal() as db:
+        result = db.execute(statement.execution_options(yield_per=batch_size or settings.export_batch_size))
+        yield from result.partitions()
+
+
+def csv_chunks(columns: Sequence[str], batches: Iterable[Sequence[Sequence]], *, header: bool = True) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(columns)
+    for batch in batches:
+        for row in batch:
+            writer.writerow(["" if value is None else _plain(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(
+    columns: Sequence[str], batches: Iterable[Sequence[Sequence]], *, extra: dict | None = None
+) -> Iterator[str]:
+    for batch in batches:
+        lines = []
+        for row in batch:
+            record = dict(extra or {})
+            record.update(zip(columns, (_plain(value) for value in row)))
+            lines.append(json.dumps(record, ensure_ascii=False))
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+
+def export_chunks(output: str, columns: Sequence[str], batches: Iterable[Sequence[Sequence]]) -> Iterator[str]:
+    if output == "ndjson":
+        return ndjson_chunks(columns, batches)
+    return csv_chunks(columns, batches)
+
+
+def streaming_export(chunks: Iterable[str], *, output: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[output],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{output}"},
+    )
+
+
+def export_query(statement: Select, *, output: str, filename: str) -> StreamingResponse:
+    """Stream ``statement`` as CSV or NDJSON; column labels become the header/keys."""
+    columns = [column.name for column in statement.selected_columns]
+    return streaming_export(
+        export_chunks(output, columns, iter_query_batches(statement)),
+        output=output,
+        filename=filename,
+    )
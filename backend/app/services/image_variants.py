@@ -0,0 +1,35 @@
+"""Resized WebP variants of doctor photos.
+
+Pure Pillow code with no database or settings access, so it can run in the
+photo variant process pool.
+"""
+
+from __future__ import annotations
+
+import io
+
+from PIL import Image, ImageOps
+
+# Longest edge in pixels; ``small`` is what directory cards show (2x their CSS size).
+PHOTO_VARIANT_SIZES = {"small": 160, "medium": 480, "large": 960}
+WEBP_QUALITY = 80
+
+
+def render_webp_variants(source_path: str, sizes: dict[str, int] = PHOTO_VARIANT_SIZES) -> dict[str, bytes]:
+    """Encode ``source_path`` as WebP at every size in ``sizes``, never upscaling."""
+    largest = max(sizes.values())
+    with Image.open(source_path) as original:
+        # Let the JPEG decoder downscale while decoding: far cheaper than a full-size decode.
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in {"RGBA", "LA", "PA"} or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants: dict[str, bytes] = {}
+    # Largest first, each step resampling the previous result instead of the original.
+    for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=WEBP_QUALITY, method=4)
+        variants[name] = output.getvalue()
+    return variants
@@ -0,0 +1,293 @@
+"""Create Zoom meetings for confirmed appointments outside the request path.
+
+The queue is the ``appointments`` table itself: ``confirm_appointment`` marks a
+row ``PROVISIONING`` with ``call_provisioning_due_at = now()`` and commits, and
+``MeetingProvisioner`` claims due rows (``FOR UPDATE SKIP LOCKED``, so several
+API workers can run it), calls Zoom without holding any database transaction,
+and records the meeting or schedules a retry with exponential backoff. Once
+per ``ZOOM_PREPROVISION_INTERVAL_SECONDS`` it also queues the next
+``ZOOM_PREPROVISION_HORIZON_HOURS`` of confirmed appointments that still have
+no meeting because they were confirmed while Zoom was off, so those are
+created in calm batches ahead of time rather than at join time. Appointments
+the provisioner already gave up on keep their attempt count and are not
+queued again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import case, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Appointment, AppointmentCallStatus, AppointmentStatus
+from app.db.session import SessionLocal
+from app.services.zoom_service import create_zoom_meeting_for_appointment, zoom_client, zoom_is_configured
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MeetingJob:
+    appointment_id: object
+    doctor_user_id: object
+    user_id: object
+    start_at: datetime
+    end_at: datetime
+    attempt: int
+
+
+def mark_for_provisioning(appointment: Appointment) -> bool:
+    """Queue a meeting for ``appointment`` in the caller's transaction; False if Zoom is off or a link exists."""
+    if not zoom_is_configured() or appointment.meeting_link:
+        return False
+    appointment.call_status = AppointmentCallStatus.PROVISIONING
+    appointment.call_provisioning_attempts = 0
+    appointment.call_provisioning_due_at = datetime.now(UTC)
+    return True
+
+
+def queue_upcoming_meetings(db: Session, *, within: timedelta) -> int:
+    """Queue every confirmed appointment starting in ``within`` that has no meeting; returns the count.
+
+    Appointments that used up ``ZOOM_PROVISIONING_MAX_ATTEMPTS`` are skipped, so
+    one Zoom keeps rejecting is not retried every pass until it starts.
+    """
+    now = datetime.now(UTC)
+    result = db.execute(
+        update(Appointment)
+        .where(
+            Appointment.status == AppointmentStatus.CONFIRMED,
+            Appointment.meeting_link.is_(None),
+            Appointment.call_status.in_((AppointmentCallStatus.NOT_READY, AppointmentCallStatus.READY)),
+            Appointment.call_provisioning_attempts < settings.zoom_provisioning_max_attempts,
+            Appointment.start_at >= now,
+            Appointment.start_at < now + within,
+        )
+        .values(call_status=AppointmentCallStatus.PROVISIONING, call_provisioning_due_at=now)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait after failed ``attempt`` (1-based): capped exponential with jitter."""
+    ceiling = min(
+        settings.zoom_provisioning_backoff_max_seconds,
+        settings.zoom_provisioning_backoff_base_seconds * 2 ** (attempt - 1),
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def claim_due_jobs(db: Session, *, limit: int) -> list[MeetingJob]:
+    """Lease up to ``limit`` due jobs; a crashed worker's lease simply runs out and the job is retried."""
+    now = datetime.now(UTC)
+    appointments = list(
+        db.scalars(
+            select(Appointment)
+            .where(
+                Appointment.call_status == AppointmentCallStatus.PROVISIONING,
+                Appointment.call_provisioning_due_at <= now,
+                Appointment.status == AppointmentStatus.CONFIRMED,
+            )
+            .order_by(Appointment.call_provisioning_due_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    jobs = []
+    for appointment in appointments:
+        appointment.call_provisioning_attempts += 1
+        appointment.call_provisioning_due_at = now + timedelta(seconds=settings.zoom_provisioning_lease_seconds)
+        jobs.append(
+            MeetingJob(
+                appointment_id=appointment.id,
+                doctor_user_id=appointment.doctor_user_id,
+                user_id=appointment.user_id,
+                start_at=appointment.start_at,
+                end_at=appointment.end_at,
+                attempt=appointment.call_provisioning_attempts,
+            )
+        )
+    db.commit()
+    return jobs
+
+
+def _provisioning_row(appointment_id):
+    # Only rows still waiting for this job are touched: a cancellation or a
+    # fallback join in the meantime wins over a late Zoom response.
+    return update(Appointment).where(
+        Appointment.id == appointment_id,
+        Appointment.status == AppointmentStatus.CONFIRMED,
+        Appointment.call_status == AppointmentCallStatus.PROVISIONING,
+    )
+
+
+# Evaluated inside the UPDATE, so a payment committed while Zoom was being
+# called is still seen (the row lock makes the UPDATE re-read ``fee_paid``).
+_SETTLED_CALL_STATUS = case(
+    (Appointment.fee_paid.is_(True), literal(AppointmentCallStatus.READY, Appointment.call_status.type)),
+    else_=literal(AppointmentCallStatus.NOT_READY, Appointment.call_status.type),
+)
+
+
+def record_meeting(db: Session, job: MeetingJob, meeting: dict[str, str]) -> None:
+    db.execute(
+        _provisioning_row(job.appointment_id).values(
+            meeting_link=meeting["meeting_link"],
+            call_provider=meeting["provider"],
+            call_room_id=meeting["room_id"],
+            call_status=_SETTLED_CALL_STATUS,
+            call_provisioning_due_at=None,
+        )
+    )
+    db.commit()
+
+
+def record_failure(db: Session, job: MeetingJob) -> None:
+    if job.attempt >= settings.zoom_provisioning_max_attempts:
+        # Give up; joining falls back to the built-in video room.
+        values = {"call_status": _SETTLED_CALL_STATUS, "call_provisioning_due_at": None}
+    else:
+        values = {"call_provisioning_due_at": datetime.now(UTC) + timedelta(seconds=backoff_delay(job.attempt))}
+    db.execute(_provisioning_row(job.appointment_id).values(**values))
+    db.commit()
+
+
+class MeetingProvisioner:
+    """Works off the provisioning queue inside the API process.
+
+    ``notify`` wakes it right after a confirmation commits; the poll interval
+    picks up retries, leases that ran out and work queued by other workers.
+    """
+
+    def __init__(self, *, poll_interval_seconds: int, batch_size: int, preprovision_interval_seconds: int = 0):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self.preprovision_interval_seconds = preprovision_interval_seconds
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @staticmethod
+    def _claim(batch_size: int) -> list[MeetingJob]:
+        with SessionLocal() as db:
+            return claim_due_jobs(db, limit=batch_size)
+
+    @staticmethod
+    def _finish(job: MeetingJob, meeting: dict[str, str] | None) -> None:
+        with SessionLocal() as db:
+            if meeting is None:
+                record_failure(db, job)
+            else:
+                record_meeting(db, job, meeting)
+
+    async def _provision(self, job: MeetingJob) -> None:
+        try:
+            meeting = await create_zoom_meeting_for_appointment(
+                appointment_id=str(job.appointment_id),
+                doctor_user_id=str(job.doctor_user_id),
+                patient_user_id=str(job.user_id),
+                start_at=job.start_at,
+                end_at=job.end_at,
+            )
+        except Exception:
+            logger.warning(
+                "Zoom meeting creation failed for appointment %s (attempt %s)",
+                job.appointment_id,
+                job.attempt,
+                exc_info=True,
+            )
+            meeting = None
+        await asyncio.to_thread(self._finish, job, meeting)
+
+    async def run_once(self) -> int:
+        """Claim and work off one batch of due jobs; returns how many were claimed."""
+        jobs = await asyncio.to_thread(self._claim, self.batch_size)
+        await asyncio.gather(*(self._provision(job) for job in jobs))
+        return len(jobs)
+
+    @staticmethod
+    def _queue_upcoming() -> int:
+        with SessionLocal() as db:
+            return queue_upcoming_meetings(db, within=timedelta(hours=settings.zoom_preprovision_horizon_hours))
+
+    async def drain(self) -> int:
+        """Work off batches until the queue has nothing due; returns how many jobs were claimed."""
+        claimed = 0
+        while True:
+            count = await self.run_once()
+            claimed += count
+            if count < self.batch_size:
+                return claimed
+
+    async def preprovision(self) -> int:
+        """Queue the upcoming appointments that still lack a meeting and create them now."""
+        if not zoom_is_configured():
+            return 0
+        queued = await asyncio.to_thread(self._queue_upcoming)
+        if queued:
+            await self.drain()
+        return queued
+
+    async def _run(self) -> None:
+        wakeup = self._wakeup
+        next_preprovision = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.poll_interval_seconds)
+            except TimeoutError:
+                pass
+            wakeup.clear()
+            try:
+                if self.preprovision_interval_seconds > 0 and time.monotonic() >= next_preprovision:
+                    next_preprovision = time.monotonic() + self.preprovision_interval_seconds
+                    await self.preprovision()
+                await self.drain()
+            except Exception:
+                logger.exception("Meeting provisioning failed")
+
+    def notify(self) -> None:
+        """Thread-safe: ask the running provisioner to look at the queue now."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or not loop.is_running():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            logger.debug("Meeting provisioning wakeup skipped: event loop not available")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self.poll_interval_seconds <= 0 or not zoom_is_configured():
+            return
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        self._loop = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await zoom_client.aclose()
+
+
+meeting_provisioner = MeetingProvisioner(
+    poll_interval_seconds=settings.zoom_provisioning_poll_interval_seconds,
+    batch_size=settings.zoom_provisioning_batch_size,
+    preprovision_interval_seconds=settings.zoom_preprovision_interval_seconds,
+)
@@ -1,14 +1,47 @@
 from __future__ import annotations
 
+import uuid
 from datetime import UTC, datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.db.models import Message, User, UserRole
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.models import Message, MessageThread, User, UserRole
+from app.services.notification_realtime import notification_realtime_hub
 from app.services.notification_service import create_notification
 
+PREVIEW_LENGTH = 255
+
+
+def thread_key(first_user_id: uuid.UUID, second_user_id: uuid.UUID) -> tuple[uuid.UUID, uuid.UUID]:
+    """Canonical ``(low, high)`` pair shared by both directions of a conversation."""
+    return (first_user_id, second_user_id) if first_user_id < second_user_id else (second_user_id, first_user_id)
+
+
+def thread_peer_id(thread: MessageThread, actor_user_id: uuid.UUID) -> uuid.UUID:
+    return thread.user_high_id if thread.user_low_id == actor_user_id else thread.user_low_id
+
+
+def _touch_thread(db: Session, *, message_id: uuid.UUID, sender_user_id, receiver_user_id, body: str) -> uuid.UUID:
+    """Upsert the pair's thread row with the new last-message summary in one statement."""
+    low, high = thread_key(sender_user_id, receiver_user_id)
+    summary = {
+        "last_message_id": message_id,
+        "last_sender_user_id": sender_user_id,
+        "last_message_preview": body[:PREVIEW_LENGTH],
+        "last_message_at": func.now(),
+    }
+    stmt = (
+        pg_insert(MessageThread)
+        .values(id=uuid.uuid4(), user_low_id=low, user_high_id=high, **summary)
+        .on_conflict_do_update(constraint="uq_message_threads_pair", set_=summary)
+        .returning(MessageThread.id)
+    )
+    return db.execute(stmt).scalar_one()
+
 
 def send_message(
     db: Session,
@@ -25,25 +58,41 @@ def send_message(
     if not receiver:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Receiver not found")
 
-    existing_unread_from_sender = db.scalar(
-        select(func.count(Message.id)).where(
-            Message.sender_user_id == sender_user.id,
-            Message.receiver_user_id == receiver_user_id,
-            Message.read_at.is_(None),
+    has_unread_from_sender = (
+        db.scalar(
+            select(Message.id)
+            .where(
+                Message.receiver_user_id == receiver_user_id,
+                Message.sender_user_id == sender_user.id,
+                Message.read_at.is_(None),
+            )
+            .limit(1)
         )
-    ) or 0
+        is not None
+    )
 
+    body = body.strip()
+    message_id = uuid.uuid4()
+    thread_id = _touch_thread(
+        db,
+        message_id=message_id,
+        sender_user_id=sender_user.id,
+        receiver_user_id=receiver_user_id,
+        body=body,
+    )
     message = Message(
+        id=message_id,
+        thread_id=thread_id,
         sender_user_id=sender_user.id,
         receiver_user_id=receiver_user_id,
         subject=subject.strip() if subject else None,
-        body=body.strip(),
+        body=body,
     )
     db.add(message)
     db.flush()
 
     # Notify receiver only once while unread messages from this sender exist.
-    if existing_unread_from_sender == 0:
+    if not has_unread_from_sender:
         if sender_user.role == UserRole.DOCTOR:
             title = "New message from your doctor"
             body_text = "Your doctor sent you a new message."
@@ -68,25 +117,102 @@ def send_message(
 
     db.commit()
     db.refresh(message)
+    notification_realtime_hub.publish_message(message)
     return message
 
 
-def list_messages(db: Session, *, actor_user: User, box: str) -> list[Message]:
-    if box == "outbox":
-        return list(
-            db.scalars(
-                select(Message)
-                .where(Message.sender_user_id == actor_user.id)
-                .order_by(Message.created_at.desc())
-            )
+def list_messages(
+    db: Session, *, actor_user: User, box: str, limit: int = 200, cursor: str | None = None
+) -> tuple[list[Message], str | None]:
+    column = Message.sender_user_id if box == "outbox" else Message.receiver_user_id
+    query = select(Message).where(column == actor_user.id)
+    if cursor:
+        query = query.where(tuple_(Message.created_at, Message.id) < tuple_(*decode_cursor(cursor)))
+    rows = list(db.scalars(query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1)))
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return page, next_cursor
+
+
+def list_threads(
+    db: Session, *, actor_user: User, limit: int, cursor: str | None = None
+) -> tuple[list[MessageThread], str | None]:
+    """Keyset page of the actor's threads, newest activity first.
+
+    Each side of the pair is read through its own ``(user, last_message_at, id)``
+    index with ``LIMIT``, so the cost depends on the page size, not the history.
+    """
+    boundary = decode_cursor(cursor) if cursor else None
+    order = (MessageThread.last_message_at.desc(), MessageThread.id.desc())
+
+    rows: list[MessageThread] = []
+    for column in (MessageThread.user_low_id, MessageThread.user_high_id):
+        query = select(MessageThread).where(column == actor_user.id)
+        if boundary is not None:
+            query = query.where(tuple_(MessageThread.last_message_at, MessageThread.id) < tuple_(*boundary))
+        rows.extend(db.scalars(query.order_by(*order).limit(limit + 1)))
+
+    rows.sort(key=lambda item: (item.last_message_at, item.id), reverse=True)
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.last_message_at, last.id)
+    return page, next_cursor
+
+
+def unread_counts_by_peer(db: Session, *, actor_user: User, peer_user_ids: list[uuid.UUID]) -> dict[uuid.UUID, int]:
+    """Unread message counts for one page of threads, served by the partial unread index."""
+    if not peer_user_ids:
+        return {}
+    rows = db.execute(
+        select(Message.sender_user_id, func.count())
+        .where(
+            Message.receiver_user_id == actor_user.id,
+            Message.sender_user_id.in_(peer_user_ids),
+            Message.read_at.is_(None),
         )
-    return list(
-        db.scalars(
-            select(Message)
-            .where(Message.receiver_user_id == actor_user.id)
-            .order_by(Message.created_at.desc())
+        .group_by(Message.sender_user_id)
+    ).all()
+    return {sender_user_id: int(count) for sender_user_id, count in rows}
+
+
+def get_thread_for_actor(db: Session, *, thread_id, actor_user: User) -> MessageThread:
+    thread = db.scalar(select(MessageThread).where(MessageThread.id == thread_id))
+    if not thread:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
+    if actor_user.id not in (thread.user_low_id, thread.user_high_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+    return thread
+
+
+def list_thread_messages(
+    db: Session, *, thread: MessageThread, limit: int, cursor: str | None = None
+) -> tuple[list[Message], str | None]:
+    query = select(Message).where(Message.thread_id == thread.id)
+    if cursor:
+        query = query.where(tuple_(Message.created_at, Message.id) < tuple_(*decode_cursor(cursor)))
+    rows = list(db.scalars(query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1)))
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+    return page, next_cursor
+
+
+def mark_thread_read(db: Session, *, thread: MessageThread, actor_user: User) -> int:
+    result = db.execute(
+        update(Message)
+        .where(
+            Message.thread_id == thread.id,
+            Message.receiver_user_id == actor_user.id,
+            Message.read_at.is_(None),
         )
+        .values(read_at=datetime.now(UTC))
     )
+    db.commit()
+    return int(result.rowcount or 0)
 
 
 def mark_message_read(db: Session, *, message_id, actor_user: User) -> Message:
@@ -3,32 +3,151 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections import defaultdict
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import DefaultDict
 
 from fastapi import WebSocket
 
-from app.db.models import Notification
+from app.core.config import settings
+from app.db.models import Message, Notification
 
 logger = logging.getLogger(__name__)
 
 
+class HeartbeatWheel:
+    """One shared timer that pings every registered socket once per interval.
+
+    Sockets are spread over ``slots`` buckets and each tick pings a single
+    bucket in batches, so idle connections cost no per-socket timers. A ping
+    that does not complete within ``send_timeout_seconds`` (a client that
+    stopped reading) marks its socket stale instead of stalling the wheel.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        slots: int,
+        batch_size: int,
+        payload: dict,
+        send_timeout_seconds: float = 5.0,
+        on_stale: Callable[[WebSocket], Awaitable[None]] | None = None,
+    ) -> None:
+        self.slots = max(1, slots)
+        self.tick_seconds = interval_seconds / self.slots
+        self.batch_size = max(1, batch_size)
+        self.payload = payload
+        self.send_timeout_seconds = send_timeout_seconds
+        self.on_stale = on_stale
+        self._buckets: list[set[WebSocket]] = [set() for _ in range(self.slots)]
+        self._slot_of: dict[WebSocket, int] = {}
+        self._cursor = 0
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, websocket: WebSocket) -> None:
+        if websocket in self._slot_of:
+            return
+        # Park new sockets in the bucket that is furthest from being pinged.
+        slot = (self._cursor - 1) % self.slots
+        self._buckets[slot].add(websocket)
+        self._slot_of[websocket] = slot
+
+    def discard(self, websocket: WebSocket) -> None:
+        slot = self._slot_of.pop(websocket, None)
+        if slot is not None:
+            self._buckets[slot].discard(websocket)
+
+    async def _ping(self, websocket: WebSocket) -> bool:
+        try:
+            await asyncio.wait_for(websocket.send_json(self.payload), timeout=self.send_timeout_seconds)
+        except Exception:
+            # Includes TimeoutError: a socket whose transport never drains is as dead as a closed one.
+            return False
+        return True
+
+    async def tick(self) -> int:
+        bucket = list(self._buckets[self._cursor])
+        self._cursor = (self._cursor + 1) % self.slots
+
+        stale: list[WebSocket] = []
+        for start in range(0, len(bucket), self.batch_size):
+            batch = bucket[start : start + self.batch_size]
+            results = await asyncio.gather(*(self._ping(websocket) for websocket in batch))
+            stale.extend(websocket for websocket, ok in zip(batch, results) if not ok)
+
+        for websocket in stale:
+            self.discard(websocket)
+            if self.on_stale is not None:
+                await self.on_stale(websocket)
+        return len(bucket)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Websocket heartbeat tick failed")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 class NotificationRealtimeHub:
     def __init__(self) -> None:
         self._loop: asyncio.AbstractEventLoop | None = None
         self._connections: DefaultDict[str, set[WebSocket]] = defaultdict(set)
+        self._socket_users: dict[WebSocket, str] = {}
         self._lock = asyncio.Lock()
+        self.heartbeat = HeartbeatWheel(
+            interval_seconds=settings.ws_heartbeat_interval_seconds,
+            slots=settings.ws_heartbeat_slots,
+            batch_size=settings.ws_heartbeat_batch_size,
+            payload={"type": "notifications:ping"},
+            send_timeout_seconds=settings.ws_heartbeat_send_timeout_seconds,
+            on_stale=self._drop_stale,
+        )
 
     def attach_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         self._loop = loop
+        self.heartbeat.start(loop)
+
+    async def shutdown(self) -> None:
+        await self.heartbeat.stop()
 
     async def connect(self, *, user_id: str, websocket: WebSocket) -> None:
         await websocket.accept()
         async with self._lock:
             self._connections[user_id].add(websocket)
+            self._socket_users[websocket] = user_id
+        self.heartbeat.add(websocket)
+
+    async def _drop_stale(self, websocket: WebSocket) -> None:
+        user_id = self._socket_users.get(websocket)
+        if user_id is not None:
+            await self.disconnect(user_id=user_id, websocket=websocket)
 
     async def disconnect(self, *, user_id: str, websocket: WebSocket) -> None:
+        self.heartbeat.discard(websocket)
         async with self._lock:
+            self._socket_users.pop(websocket, None)
             sockets = self._connections.get(user_id)
             if not sockets:
                 return
@@ -59,14 +178,26 @@ class NotificationRealtimeHub:
                 return
             for websocket in stale:
                 current.discard(websocket)
+                self._socket_users.pop(websocket, None)
+                self.heartbeat.discard(websocket)
             if not current:
                 self._connections.pop(user_id, None)
 
-    def publish_notification(self, notification: Notification) -> None:
+    def publish(self, *, user_ids: list[str], payload: dict) -> None:
         loop = self._loop
         if loop is None or not loop.is_running():
             return
 
+        def _schedule() -> None:
+            for user_id in user_ids:
+                asyncio.create_task(self._broadcast(user_id=user_id, payload=payload))
+
+        try:
+            loop.call_soon_threadsafe(_schedule)
+        except RuntimeError:
+            logger.debug("Realtime publish skipped: event loop not available")
+
+    def publish_notification(self, notification: Notification) -> None:
         sent_at = notification.sent_at
         sent_at_iso = sent_at.isoformat() if isinstance(sent_at, datetime) else None
         payload = {
@@ -75,14 +206,28 @@ class NotificationRealtimeHub:
             "user_id": str(notification.user_id),
             "sent_at": sent_at_iso,
         }
+        self.publish(user_ids=[str(notification.user_id)], payload=payload)
 
-        def _schedule() -> None:
-            asyncio.create_task(self._broadcast(user_id=str(notification.user_id), payload=payload))
-
-        try:
-            loop.call_soon_threadsafe(_schedule)
-        except RuntimeError:
-            logger.debug("Notification realtime publish skipped: event loop not available")
+    def publish_message(self, message: Message) -> None:
+        """Push a new message body to both participants' open sockets."""
+        created_at = message.created_at
+        payload = {
+            "type": "message:new",
+            "thread_id": str(message.thread_id) if message.thread_id else None,
+            "message": {
+                "id": str(message.id),
+                "sender_user_id": str(message.sender_user_id),
+                "receiver_user_id": str(message.receiver_user_id),
+                "subject": message.subject,
+                "body": message.body,
+                "read_at": None,
+                "created_at": created_at.isoformat() if isinstance(created_at, datetime) else None,
+            },
+        }
+        self.publish(
+            user_ids=[str(message.receiver_user_id), str(message.sender_user_id)],
+            payload=payload,
+        )
 
 
 notification_realtime_hub = NotificationRealtimeHub()
@@ -81,6 +81,24 @@ def create_notification(
     return notification
 
 
+def create_notifications(db: Session, notifications: list[dict]) -> list[Notification]:
+    """Insert many in-app notifications with a single flush, then publish them.
+
+    Each item holds the ``create_notification`` keyword arguments
+    (``user_id``, ``event_type``, ``title``, ``body``, ``metadata_json``).
+    """
+    if not notifications:
+        return []
+    source = _resolve_notification_source()
+    rows = [Notification(channel=NotificationChannel.IN_APP, **item) for item in notifications]
+    db.add_all(rows)
+    db.flush()
+    logger.info("Notifications created: count=%s source=%s", len(rows), source)
+    for notification in rows:
+        notification_realtime_hub.publish_notification(notification)
+    return rows
+
+
 def list_notifications(db: Session, *, user_id, limit: int = 30) -> list[Notification]:
     return list(
         db.scalars(
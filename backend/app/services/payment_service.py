@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import secrets
 import uuid
+from datetime import UTC
 from decimal import Decimal, ROUND_HALF_UP
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.models import (
     Appointment,
     AppointmentCallStatus,
+    DoctorPaymentDailyRollup,
     DoctorProfile,
     Payment,
     PaymentStatus,
@@ -122,7 +125,59 @@ def _payment_by_reference_or_metadata(db: Session, provider_reference: str | Non
     return None
 
 
+def _bump_doctor_rollup(
+    db: Session, *, doctor_user_id, payment: Payment, payment_status: PaymentStatus, sign: int
+) -> None:
+    stmt = pg_insert(DoctorPaymentDailyRollup).values(
+        doctor_user_id=doctor_user_id,
+        day=payment.created_at.astimezone(UTC).date(),
+        status=payment_status,
+        amount_total=Decimal(payment.amount) * sign,
+        payment_count=sign,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["doctor_user_id", "day", "status"],
+            set_={
+                "amount_total": DoctorPaymentDailyRollup.amount_total + stmt.excluded.amount_total,
+                "payment_count": DoctorPaymentDailyRollup.payment_count + stmt.excluded.payment_count,
+            },
+        )
+    )
+
+
+def _record_status_change(
+    db: Session, *, payment: Payment, doctor_user_id, previous: PaymentStatus | None, current: PaymentStatus
+) -> None:
+    """Move the payment between rollup buckets in the same transaction as the status write."""
+    if not settings.doctor_payment_rollup_enabled or doctor_user_id is None or previous == current:
+        return
+    if previous is not None:
+        _bump_doctor_rollup(db, doctor_user_id=doctor_user_id, payment=payment, payment_status=previous, sign=-1)
+    _bump_doctor_rollup(db, doctor_user_id=doctor_user_id, payment=payment, payment_status=current, sign=1)
+
+
+def _lock_payment(db: Session, payment: Payment) -> Payment:
+    """Re-read ``payment`` under a row lock.
+
+    Webhook redeliveries and an admin confirm can race on the same payment; the
+    lock makes them take turns, so each sees the status the previous one wrote
+    and the rollup is moved only once per real transition.
+    """
+    return db.scalar(
+        select(Payment)
+        .where(Payment.id == payment.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+
+
 def _apply_paid_state(db: Session, payment: Payment) -> Payment:
+    payment = _lock_payment(db, payment)
+    previous = payment.status
+    if previous == PaymentStatus.PAID:
+        db.commit()
+        return payment
     payment.status = PaymentStatus.PAID
 
     appointment = db.scalar(select(Appointment).where(Appointment.id == payment.appointment_id))
@@ -131,13 +186,31 @@ def _apply_paid_state(db: Session, payment: Payment) -> Payment:
         if appointment.call_status == AppointmentCallStatus.NOT_READY:
             appointment.call_status = AppointmentCallStatus.READY
 
+    _record_status_change(
+        db,
+        payment=payment,
+        doctor_user_id=appointment.doctor_user_id if appointment else None,
+        previous=previous,
+        current=PaymentStatus.PAID,
+    )
     db.commit()
     db.refresh(payment)
     return payment
 
 
 def _apply_failed_state(db: Session, payment: Payment) -> Payment:
+    payment = _lock_payment(db, payment)
+    previous = payment.status
+    # A late failure/expiry event never overrides a completed payment.
+    if previous in {PaymentStatus.PAID, PaymentStatus.FAILED}:
+        db.commit()
+        return payment
     payment.status = PaymentStatus.FAILED
+    if settings.doctor_payment_rollup_enabled:
+        doctor_user_id = db.scalar(select(Appointment.doctor_user_id).where(Appointment.id == payment.appointment_id))
+        _record_status_change(
+            db, payment=payment, doctor_user_id=doctor_user_id, previous=previous, current=PaymentStatus.FAILED
+        )
     db.commit()
     db.refresh(payment)
     return payment
@@ -216,6 +289,13 @@ def initialize_payment(
     )
     db.add(payment)
     db.flush()
+    _record_status_change(
+        db,
+        payment=payment,
+        doctor_user_id=appointment.doctor_user_id,
+        previous=None,
+        current=PaymentStatus.PENDING,
+    )
 
     checkout_session = _create_stripe_checkout_session(payment=payment, quote=quote, user=user)
     payment.provider_reference = checkout_session.id
@@ -259,12 +339,11 @@ def handle_stripe_webhook(db: Session, *, payload: bytes, signature: str) -> dic
     if not payment:
         return {"received": True, "event_type": event_type, "payment_found": False}
 
+    # Both helpers re-check the status under a row lock, so redeliveries are no-ops.
     if event_type == "checkout.session.completed":
-        if payment.status != PaymentStatus.PAID:
-            _apply_paid_state(db, payment)
+        _apply_paid_state(db, payment)
     elif event_type in {"checkout.session.async_payment_failed", "checkout.session.expired"}:
-        if payment.status != PaymentStatus.PAID:
-            _apply_failed_state(db, payment)
+        _apply_failed_state(db, payment)
 
     return {"received": True, "event_type": event_type, "payment_found": True}
 
@@ -277,41 +356,27 @@ def doctor_financial_summary(
     profile = db.scalar(select(DoctorProfile).where(DoctorProfile.doctor_user_id == doctor_user_id))
     currency = profile.pricing_currency if profile and profile.pricing_currency else "JOD"
 
-    paid_amount = db.scalar(
-        select(func.coalesce(func.sum(Payment.amount), 0))
-        .join(Appointment, Appointment.id == Payment.appointment_id)
-        .where(
-            Appointment.doctor_user_id == doctor_user_id,
-            Payment.status == PaymentStatus.PAID,
-        )
-    ) or Decimal("0.00")
-
-    pending_amount = db.scalar(
-        select(func.coalesce(func.sum(Payment.amount), 0))
-        .join(Appointment, Appointment.id == Payment.appointment_id)
-        .where(
-            Appointment.doctor_user_id == doctor_user_id,
-            Payment.status == PaymentStatus.PENDING,
-        )
-    ) or Decimal("0.00")
-
-    paid_count = db.scalar(
-        select(func.count(Payment.id))
-        .join(Appointment, Appointment.id == Payment.appointment_id)
-        .where(
-            Appointment.doctor_user_id == doctor_user_id,
-            Payment.status == PaymentStatus.PAID,
+    if settings.doctor_payment_rollup_enabled:
+        source = DoctorPaymentDailyRollup
+        totals = select(
+            func.coalesce(func.sum(case((source.status == PaymentStatus.PAID, source.amount_total), else_=0)), 0),
+            func.coalesce(func.sum(case((source.status == PaymentStatus.PENDING, source.amount_total), else_=0)), 0),
+            func.coalesce(func.sum(case((source.status == PaymentStatus.PAID, source.payment_count), else_=0)), 0),
+            func.coalesce(func.sum(case((source.status == PaymentStatus.PENDING, source.payment_count), else_=0)), 0),
+        ).where(source.doctor_user_id == doctor_user_id)
+    else:
+        # Single pass over the doctor's payments with conditional aggregation.
+        totals = (
+            select(
+                func.coalesce(func.sum(case((Payment.status == PaymentStatus.PAID, Payment.amount), else_=0)), 0),
+                func.coalesce(func.sum(case((Payment.status == PaymentStatus.PENDING, Payment.amount), else_=0)), 0),
+                func.count(case((Payment.status == PaymentStatus.PAID, 1))),
+                func.count(case((Payment.status == PaymentStatus.PENDING, 1))),
+            )
+            .join(Appointment, Appointment.id == Payment.appointment_id)
+            .where(Appointment.doctor_user_id == doctor_user_id)
         )
-    ) or 0
-
-    pending_count = db.scalar(
-        select(func.count(Payment.id))
-        .join(Appointment, Appointment.id == Payment.appointment_id)
-        .where(
-            Appointment.doctor_user_id == doctor_user_id,
-            Payment.status == PaymentStatus.PENDING,
-        )
-    ) or 0
+    paid_amount, pending_amount, paid_count, pending_count = db.execute(totals).one()
 
     fee_percent = _to_money(Decimal(settings.sabina_platform_fee_percent))
     sabina_share = _to_money(_to_money(Decimal(paid_amount)) * fee_percent / Decimal("100"))
@@ -327,3 +392,74 @@ def doctor_financial_summary(
         "paid_payments_count": int(paid_count),
         "pending_payments_count": int(pending_count),
     }
+
+
+def forget_user_payments(db: Session, *, user_id) -> None:
+    """Take a user's payments out of the doctor rollups ahead of deleting the user.
+
+    The delete cascades to ``payments`` without going through the status
+    helpers, so the buckets are decremented here, in the caller's transaction.
+    """
+    if not settings.doctor_payment_rollup_enabled:
+        return
+    # Lock first so a webhook cannot move one of these payments between buckets meanwhile.
+    db.execute(select(Payment.id).where(Payment.user_id == user_id).with_for_update())
+    day_expr = func.date(func.timezone("UTC", Payment.created_at))
+    rows = db.execute(
+        select(
+            Appointment.doctor_user_id,
+            day_expr,
+            Payment.status,
+            func.sum(Payment.amount),
+            func.count(Payment.id),
+        )
+        .join(Appointment, Appointment.id == Payment.appointment_id)
+        .where(Payment.user_id == user_id)
+        .group_by(Appointment.doctor_user_id, day_expr, Payment.status)
+    ).all()
+    for doctor_user_id, day, payment_status, amount_total, payment_count in rows:
+        stmt = pg_insert(DoctorPaymentDailyRollup).values(
+            doctor_user_id=doctor_user_id,
+            day=day,
+            status=payment_status,
+            amount_total=-Decimal(amount_total),
+            payment_count=-payment_count,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["doctor_user_id", "day", "status"],
+                set_={
+                    "amount_total": DoctorPaymentDailyRollup.amount_total + stmt.excluded.amount_total,
+                    "payment_count": DoctorPaymentDailyRollup.payment_count + stmt.excluded.payment_count,
+                },
+            )
+        )
+
+
+def rebuild_doctor_payment_rollups(db: Session, *, doctor_user_id=None) -> int:
+    """Recompute rollup rows from ``payments`` (backfill or repair); returns rows written."""
+    day_expr = func.date(func.timezone("UTC", Payment.created_at))
+    source = (
+        select(
+            Appointment.doctor_user_id,
+            day_expr,
+            Payment.status,
+            func.sum(Payment.amount),
+            func.count(Payment.id),
+        )
+        .join(Appointment, Appointment.id == Payment.appointment_id)
+        .group_by(Appointment.doctor_user_id, day_expr, Payment.status)
+    )
+    clear = delete(DoctorPaymentDailyRollup)
+    if doctor_user_id is not None:
+        source = source.where(Appointment.doctor_user_id == doctor_user_id)
+        clear = clear.where(DoctorPaymentDailyRollup.doctor_user_id == doctor_user_id)
+
+    db.execute(clear)
+    result = db.execute(
+        pg_insert(DoctorPaymentDailyRollup).from_select(
+            ["doctor_user_id", "day", "status", "amount_total", "payment_count"], source
+        )
+    )
+    db.commit()
+    return int(result.rowcount or 0)
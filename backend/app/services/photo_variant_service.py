@@ -0,0 +1,127 @@
+"""WebP variants of doctor profile photos, built off the request path.
+
+When a photo reaches a profile (application approval or an approved profile
+update) the route schedules ``build_profile_photo_variants``, which resizes the
+photo in a process pool (``image_variants``), stores every variant as a
+content-addressed upload and records them on the profile together with the
+photo URL they were built from, so a replaced photo never shows stale
+thumbnails. ``backfill_photo_variants`` does the same for every profile still
+missing them (``make photo-variants``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models import DoctorProfile
+from app.db.session import SessionLocal
+from app.services.image_variants import render_webp_variants
+from app.services.process_pool import LazyProcessPool
+from app.services.storage_service import release_stored_file, save_generated_document_bytes, upload_key
+
+logger = logging.getLogger(__name__)
+
+_variant_pool = LazyProcessPool(lambda: settings.photo_variant_workers)
+
+
+def shutdown_variant_pool() -> None:
+    _variant_pool.shutdown()
+
+
+def _source_path(photo_url: str) -> str | None:
+    key = upload_key(photo_url)
+    if key is None:
+        return None
+    path = Path(settings.upload_dir) / key
+    return str(path) if path.is_file() else None
+
+
+async def build_photo_variants(photo_url: str) -> dict[str, str] | None:
+    """Resize and store ``photo_url``; the variant URLs by size name, or None if it is not a local upload."""
+    source = await asyncio.to_thread(_source_path, photo_url)
+    if source is None:
+        return None
+    variants = await _variant_pool.run(render_webp_variants, source)
+    urls = {}
+    for name, content in variants.items():
+        urls[name] = await asyncio.to_thread(save_generated_document_bytes, content, extension=".webp")
+    return urls
+
+
+def _photo_url_needing_variants(doctor_user_id: uuid.UUID) -> str | None:
+    with SessionLocal() as db:
+        profile = db.scalar(select(DoctorProfile).where(DoctorProfile.doctor_user_id == doctor_user_id))
+        if profile is None or not profile.photo_url or profile.photo_variant_urls:
+            return None
+        return profile.photo_url
+
+
+def _record_variants(doctor_user_id: uuid.UUID, photo_url: str, urls: dict[str, str]) -> bool:
+    with SessionLocal() as db:
+        profile = db.scalar(
+            select(DoctorProfile).where(DoctorProfile.doctor_user_id == doctor_user_id).with_for_update()
+        )
+        if profile is None or profile.photo_url != photo_url:
+            # The photo changed while we were resizing it; these variants belong to nobody.
+            recorded, released = False, list(urls.values())
+        else:
+            recorded, released = True, list(((profile.photo_variants or {}).get("urls") or {}).values())
+            profile.photo_variants = {"source": photo_url, "urls": urls}
+            db.commit()
+    for url in released:
+        release_stored_file(url)
+    return recorded
+
+
+async def build_profile_photo_variants(doctor_user_id: uuid.UUID) -> bool:
+    """Build and attach the variants of a profile's current photo; False if there was nothing to do or it failed."""
+    photo_url = await asyncio.to_thread(_photo_url_needing_variants, doctor_user_id)
+    if photo_url is None:
+        return False
+    try:
+        urls = await build_photo_variants(photo_url)
+    except Exception:
+        logger.exception("Building photo variants for doctor %s failed", doctor_user_id)
+        return False
+    if urls is None:
+        return False
+    return await asyncio.to_thread(_record_variants, doctor_user_id, photo_url, urls)
+
+
+def _profiles_missing_variants(*, after: uuid.UUID | None, limit: int) -> list[uuid.UUID]:
+    query = (
+        select(DoctorProfile.doctor_user_id)
+        .where(
+            DoctorProfile.photo_url.is_not(None),
+            # Also true when there are no variants at all (NULL ->> 'source').
+            DoctorProfile.photo_variants["source"].astext.is_distinct_from(DoctorProfile.photo_url),
+        )
+        .order_by(DoctorProfile.doctor_user_id)
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(DoctorProfile.doctor_user_id > after)
+    with SessionLocal() as db:
+        return list(db.scalars(query))
+
+
+async def backfill_photo_variants(*, batch_size: int = 50) -> tuple[int, int]:
+    """Build variants for every profile whose photo has none; returns ``(built, skipped_or_failed)``."""
+    built = skipped = 0
+    after = None
+    while True:
+        doctor_ids = await asyncio.to_thread(_profiles_missing_variants, after=after, limit=batch_size)
+        if not doctor_ids:
+            break
+        after = doctor_ids[-1]
+        results = await asyncio.gather(*(build_profile_photo_variants(doctor_id) for doctor_id in doctor_ids))
+        built += sum(results)
+        skipped += len(results) - sum(results)
+    logger.info("Built photo variants for %s profiles (%s skipped or failed)", built, skipped)
+    return built, skipped
@@ -0,0 +1,202 @@
+"""Prescription PDF rendering.
+
+Kept free of database and app imports: ``render_prescription_pdf`` runs in
+the prescription render process pool, whose workers import only this module.
+
+Every page shares one fixed layout. Its static layer (title, section headings,
+field labels, QR caption) is laid out once per process into a cached PDF
+content stream, which each document embeds as a form XObject; per
+prescription only the field values and the QR code are drawn, the QR code as
+vector modules rather than an encoded PNG.
+"""
+
+from __future__ import annotations
+
+import io
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cache
+
+import qrcode
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+
+@dataclass(frozen=True)
+class PrescriptionDocument:
+    prescription_id: uuid.UUID
+    doctor_name: str
+    doctor_email: str | None
+    patient_name: str
+    patient_email: str | None
+    medication_name: str
+    dosage: str
+    instructions: str
+    quantity: str
+    issued_at: datetime
+    valid_until: datetime | None
+    verification_code: str
+    verification_url: str
+    data_hash: str
+
+
+def qr_png_bytes(value: str) -> bytes:
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=8,
+        border=2,
+    )
+    qr.add_data(value)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    output = io.BytesIO()
+    img.save(output, format="PNG")
+    return output.getvalue()
+
+
+STATIC_FORM_NAME = "prescription-static"
+# The cached stream names fonts by their per-document resource names (/F1, ...),
+# so every document registers these first, in this order.
+_STATIC_FONTS = ("Helvetica", "Helvetica-Bold")
+_LABEL_X = 18 * mm
+_QR_X = A4[0] - 65 * mm
+_QR_Y = 20 * mm
+_QR_SIZE = 40 * mm
+_INSTRUCTION_LINE_LIMIT = 140
+
+
+@dataclass(frozen=True)
+class _Field:
+    x: float
+    y: float
+    size: float
+
+
+@dataclass(frozen=True)
+class _Template:
+    static_code: str
+    fields: dict[str, _Field]
+    instructions_y: float
+
+
+def _register_static_fonts(pdf: canvas.Canvas) -> None:
+    for font_name in _STATIC_FONTS:
+        pdf.setFont(font_name, 10)
+
+
+@cache
+def _template() -> _Template:
+    """Lay out the static layer once and keep its content stream."""
+    scratch = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    _register_static_fonts(scratch)
+    text = scratch.beginText()
+    fields: dict[str, _Field] = {}
+
+    def label(y: float, value: str, font_name: str, size: float, field: str | None = None) -> None:
+        text.setTextOrigin(_LABEL_X, y)
+        text.setFont(font_name, size)
+        text.textOut(value)
+        if field is not None:
+            fields[field] = _Field(x=_LABEL_X + stringWidth(value, font_name, size), y=y, size=size)
+
+    y = A4[1] - 22 * mm
+    label(y, "Medication Prescription", "Helvetica-Bold", 18)
+    y -= 10 * mm
+    label(y, "Prescription ID: ", "Helvetica", 10, "prescription_id")
+    y -= 6 * mm
+    label(y, "Issued at (UTC): ", "Helvetica", 10, "issued_at")
+    y -= 6 * mm
+    label(y, "Valid until (UTC): ", "Helvetica", 10, "valid_until")
+
+    for section, rows in (
+        ("Doctor", (("Name: ", "doctor_name"), ("Email: ", "doctor_email"))),
+        ("Patient", (("Name: ", "patient_name"), ("Email: ", "patient_email"))),
+        (
+            "Medication",
+            (("Medicine: ", "medication_name"), ("Dosage: ", "dosage"), ("Quantity: ", "quantity")),
+        ),
+    ):
+        y -= 10 * mm
+        label(y, section, "Helvetica-Bold", 12)
+        for caption, field in rows:
+            y -= 6 * mm
+            label(y, caption, "Helvetica", 10, field)
+    y -= 6 * mm
+    label(y, "Instructions:", "Helvetica", 10)
+    instructions_y = y - 5 * mm
+
+    label(44 * mm, "Pharmacy Verification QR", "Helvetica-Bold", 11)
+    label(39 * mm, "Scan to verify prescription authenticity", "Helvetica", 9)
+    label(34 * mm, "Verification code: ", "Helvetica", 9, "verification_code")
+    label(29 * mm, "Data hash: ", "Helvetica", 9, "data_hash")
+    return _Template(static_code=text.getCode(), fields=fields, instructions_y=instructions_y)
+
+
+def _draw_qr(pdf: canvas.Canvas, value: str) -> None:
+    """Draw the QR code as filled rectangles, one per run of dark modules in a row."""
+    qr = qrcode.QRCode(version=None, error_correction=qrcode.constants.ERROR_CORRECT_M, border=2)
+    qr.add_data(value)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    module = _QR_SIZE / len(matrix)
+    path = pdf.beginPath()
+    for row_index, row in enumerate(matrix):
+        y = _QR_Y + _QR_SIZE - (row_index + 1) * module
+        run_start = None
+        for column_index, dark in enumerate([*row, False]):
+            if dark and run_start is None:
+                run_start = column_index
+            elif not dark and run_start is not None:
+                path.rect(_QR_X + run_start * module, y, (column_index - run_start) * module, module)
+                run_start = None
+    pdf.drawPath(path, stroke=0, fill=1)
+
+
+def render_prescription_pdf(document: PrescriptionDocument) -> bytes:
+    template = _template()
+    output = io.BytesIO()
+    # invariant: no timestamps or random ids, so re-rendering a prescription
+    # yields the same bytes and the same content-addressed file.
+    pdf = canvas.Canvas(output, pagesize=A4, invariant=1)
+    _register_static_fonts(pdf)
+
+    pdf.beginForm(STATIC_FORM_NAME)
+    pdf.addLiteral(template.static_code)
+    pdf.endForm()
+    pdf.doForm(STATIC_FORM_NAME)
+
+    values = {
+        "prescription_id": str(document.prescription_id),
+        "issued_at": document.issued_at.isoformat(),
+        "valid_until": document.valid_until.isoformat() if document.valid_until else "N/A",
+        "doctor_name": document.doctor_name,
+        "doctor_email": document.doctor_email or "N/A",
+        "patient_name": document.patient_name,
+        "patient_email": document.patient_email or "N/A",
+        "medication_name": document.medication_name,
+        "dosage": document.dosage,
+        "quantity": document.quantity,
+        "verification_code": document.verification_code,
+        "data_hash": document.data_hash,
+    }
+    text = pdf.beginText()
+    for field, value in values.items():
+        position = template.fields[field]
+        text.setTextOrigin(position.x, position.y)
+        text.setFont("Helvetica", position.size)
+        text.textOut(value)
+    text.setTextOrigin(20 * mm, template.instructions_y)
+    text.setFont("Helvetica", 10)
+    for line in document.instructions.splitlines() or ["N/A"]:
+        text.textLine(line[:_INSTRUCTION_LINE_LIMIT])
+    pdf.drawText(text)
+
+    _draw_qr(pdf, document.verification_url)
+
+    pdf.showPage()
+    pdf.save()
+    return output.getvalue()
@@ -0,0 +1,160 @@
+"""Render prescription PDFs off the request path.
+
+``create_prescription`` commits the row as ``PENDING`` and the route schedules
+``render_prescription_document``, which builds the PDF in a process pool (the
+QR code and ReportLab layout are pure CPU work), stores it and flips the row
+to ``READY`` with its ``pdf_url``. ``rerender_prescriptions`` pushes many
+prescriptions through the same pool, e.g. after a crash left rows pending or
+when the layout changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.db.models import DoctorProfile, Prescription, PrescriptionDocumentStatus, User
+from app.db.session import SessionLocal
+from app.services.prescription_pdf import PrescriptionDocument, render_prescription_pdf
+from app.services.prescription_service import build_verification_url
+from app.services.process_pool import LazyProcessPool
+from app.services.storage_service import release_stored_file, save_generated_document_bytes
+
+logger = logging.getLogger(__name__)
+
+_render_pool = LazyProcessPool(lambda: settings.prescription_render_workers)
+
+
+def shutdown_render_pool() -> None:
+    _render_pool.shutdown()
+
+
+async def render_pdf(document: PrescriptionDocument) -> bytes:
+    return await _render_pool.run(render_prescription_pdf, document)
+
+
+def load_documents(db: Session, prescription_ids: list[uuid.UUID]) -> list[PrescriptionDocument]:
+    """Everything the PDF shows for ``prescription_ids``, in one query."""
+    doctor = aliased(User)
+    patient = aliased(User)
+    rows = db.execute(
+        select(Prescription, doctor, DoctorProfile.display_name, patient)
+        .join(doctor, doctor.id == Prescription.doctor_user_id)
+        .join(patient, patient.id == Prescription.user_id)
+        .outerjoin(DoctorProfile, DoctorProfile.doctor_user_id == Prescription.doctor_user_id)
+        .where(Prescription.id.in_(prescription_ids))
+    ).all()
+    return [
+        PrescriptionDocument(
+            prescription_id=row.id,
+            doctor_name=display_name or doctor_user.name or doctor_user.email or "Doctor",
+            doctor_email=doctor_user.email,
+            patient_name=patient_user.name or patient_user.email or f"User {str(patient_user.id)[:8]}",
+            patient_email=patient_user.email,
+            medication_name=row.medication_name,
+            dosage=row.dosage,
+            instructions=row.instructions,
+            quantity=row.quantity,
+            issued_at=row.issued_at,
+            valid_until=row.valid_until,
+            verification_code=row.verification_code,
+            verification_url=build_verification_url(row.id, row.verification_code),
+            data_hash=row.data_hash,
+        )
+        for row, doctor_user, display_name, patient_user in rows
+    ]
+
+
+def _load_documents(prescription_ids: list[uuid.UUID]) -> list[PrescriptionDocument]:
+    with SessionLocal() as db:
+        return load_documents(db, prescription_ids)
+
+
+def _record_document(prescription_id: uuid.UUID, pdf_url: str | None) -> None:
+    with SessionLocal() as db:
+        previous_url = db.scalar(select(Prescription.pdf_url).where(Prescription.id == prescription_id))
+        db.execute(
+            update(Prescription)
+            .where(Prescription.id == prescription_id)
+            .values(
+                pdf_url=pdf_url or previous_url,
+                document_status=PrescriptionDocumentStatus.READY if pdf_url else PrescriptionDocumentStatus.FAILED,
+            )
+        )
+        db.commit()
+    if pdf_url:
+        # The new render holds its own reference, even when it is byte-identical.
+        release_stored_file(previous_url)
+
+
+async def _render_and_store(document: PrescriptionDocument) -> bool:
+    try:
+        pdf = await render_pdf(document)
+        pdf_url = await asyncio.to_thread(save_generated_document_bytes, pdf, extension=".pdf")
+    except Exception:
+        logger.exception("Rendering prescription %s failed", document.prescription_id)
+        pdf_url = None
+    await asyncio.to_thread(_record_document, document.prescription_id, pdf_url)
+    return pdf_url is not None
+
+
+async def render_prescription_document(prescription_id: uuid.UUID) -> bool:
+    """Render, store and attach the PDF of one prescription; False if it failed."""
+    documents = await asyncio.to_thread(_load_documents, [prescription_id])
+    if not documents:
+        return False
+    return await _render_and_store(documents[0])
+
+
+@dataclass(frozen=True)
+class RenderStats:
+    rendered: int
+    failed: int
+    elapsed_seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.rendered / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def _pending_ids(*, include_ready: bool, after: uuid.UUID | None, limit: int) -> list[uuid.UUID]:
+    query = select(Prescription.id).order_by(Prescription.id).limit(limit)
+    if not include_ready:
+        query = query.where(Prescription.document_status != PrescriptionDocumentStatus.READY)
+    if after is not None:
+        query = query.where(Prescription.id > after)
+    with SessionLocal() as db:
+        return list(db.scalars(query))
+
+
+async def rerender_prescriptions(*, include_ready: bool = False, batch_size: int | None = None) -> RenderStats:
+    """Re-render pending and failed prescriptions (every one with ``include_ready``) through the pool."""
+    batch_size = batch_size or settings.prescription_rerender_batch_size
+    started = time.perf_counter()
+    rendered = failed = 0
+    after = None
+    while True:
+        ids = await asyncio.to_thread(_pending_ids, include_ready=include_ready, after=after, limit=batch_size)
+        if not ids:
+            break
+        after = ids[-1]
+        documents = await asyncio.to_thread(_load_documents, ids)
+        results = await asyncio.gather(*(_render_and_store(document) for document in documents))
+        rendered += sum(results)
+        failed += len(results) - sum(results)
+    stats = RenderStats(rendered=rendered, failed=failed, elapsed_seconds=time.perf_counter() - started)
+    logger.info(
+        "Re-rendered %s prescriptions (%s failed) in %.2fs: %.1f/s",
+        stats.rendered,
+        stats.failed,
+        stats.elapsed_seconds,
+        stats.per_second,
+    )
+    return stats
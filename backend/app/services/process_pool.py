@@ -0,0 +1,49 @@
+"""Lazily started process pools for CPU-bound work off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class LazyProcessPool:
+    """A ``ProcessPoolExecutor`` created on first use and sized by ``workers()``.
+
+    ``workers()`` is read when the pool starts (so tests can patch the setting);
+    0 or less runs the work on a thread instead.
+    """
+
+    def __init__(self, workers: Callable[[], int]):
+        self._workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+
+    def executor(self) -> ProcessPoolExecutor | None:
+        if self._workers() <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs threads and an event loop is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        pool = self.executor()
+        if pool is None:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import uuid
+
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -20,14 +22,41 @@ _THERAPIST_REQUIRED_DOC_TYPES = {
 }
 
 
-def _missing_doc_types(db: Session, *, application_id, required_types: set[DocumentType]) -> list[DocumentType]:
-    uploaded_types = set(
-        db.scalars(select(DoctorDocument.type).where(DoctorDocument.application_id == application_id))
+def uploaded_document_types(db: Session, application_ids: list[uuid.UUID]) -> dict[uuid.UUID, set[DocumentType]]:
+    """Document types uploaded for each application, in one query."""
+    uploaded: dict[uuid.UUID, set[DocumentType]] = {application_id: set() for application_id in application_ids}
+    rows = db.execute(
+        select(DoctorDocument.application_id, DoctorDocument.type).where(
+            DoctorDocument.application_id.in_(application_ids)
+        )
     )
+    for application_id, document_type in rows:
+        uploaded[application_id].add(document_type)
+    return uploaded
+
+
+def _missing_doc_types(
+    db: Session,
+    *,
+    application_id,
+    required_types: set[DocumentType],
+    uploaded_types: set[DocumentType] | None = None,
+) -> list[DocumentType]:
+    if uploaded_types is None:
+        uploaded_types = set(
+            db.scalars(select(DoctorDocument.type).where(DoctorDocument.application_id == application_id))
+        )
     return sorted(required_types - uploaded_types, key=lambda item: item.value)
 
 
-def validate_application_by_professional_type(db: Session, application: DoctorApplication) -> None:
+def validate_application_by_professional_type(
+    db: Session, application: DoctorApplication, *, uploaded_types: set[DocumentType] | None = None
+) -> None:
+    """Raise 422 if the application lacks what its professional type requires.
+
+    ``uploaded_types`` skips the document query when the caller already loaded
+    them (see ``uploaded_document_types``).
+    """
     if application.professional_type is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -47,7 +76,10 @@ def validate_application_by_professional_type(db: Session, application: DoctorAp
         if application.psychiatrist_prescription_ack is not True:
             missing_fields.append("psychiatrist_prescription_ack")
         missing_docs = _missing_doc_types(
-            db, application_id=application.id, required_types=_PSYCHIATRIST_REQUIRED_DOC_TYPES
+            db,
+            application_id=application.id,
+            required_types=_PSYCHIATRIST_REQUIRED_DOC_TYPES,
+            uploaded_types=uploaded_types,
         )
         if missing_docs:
             missing_fields.append(
@@ -74,7 +106,10 @@ def validate_application_by_professional_type(db: Session, application: DoctorAp
     if application.therapist_no_prescription_ack is not True:
         missing_fields.append("therapist_no_prescription_ack")
     missing_docs = _missing_doc_types(
-        db, application_id=application.id, required_types=_THERAPIST_REQUIRED_DOC_TYPES
+        db,
+        application_id=application.id,
+        required_types=_THERAPIST_REQUIRED_DOC_TYPES,
+        uploaded_types=uploaded_types,
     )
     if missing_docs:
         missing_fields.append("documents:" + ",".join(item.value for item in missing_docs))
@@ -102,6 +137,10 @@ def get_application_verification_status(db: Session, *, application_id) -> str:
     statuses = list(
         db.scalars(select(DoctorDocument.status).where(DoctorDocument.application_id == application_id))
     )
+    return verification_status_from_statuses(statuses)
+
+
+def verification_status_from_statuses(statuses: list[DocumentStatus]) -> str:
     if not statuses:
         return "NO_DOCUMENTS"
     if all(status_item == DocumentStatus.ACCEPTED for status_item in statuses):
@@ -1,12 +1,69 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections import OrderedDict
 from datetime import UTC, date, datetime, time, timedelta
 from decimal import Decimal
+from threading import Lock
+from time import monotonic
 
-from sqlalchemy import case, func, select
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.db.models import Payment, PaymentStatus
+from app.core.config import settings
+from app.db.models import Payment, PaymentDailyRollup, PaymentStatus, ReportRollupWatermark
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_ROLLUP_NAME = "payment_daily"
+SELF_PAY = "SELF_PAY"
+# Serializes concurrent refreshes (several workers, or the job racing a manual run).
+_REFRESH_LOCK_KEY = 7_302_418_001
+
+
+class FinancialReportCache:
+    """Bounded ``(window, granularity, watermark) -> report`` cache.
+
+    Keys carry the rollup watermark, so a refresh in any worker makes older
+    entries unreachable; they then age out by TTL or LRU eviction.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[dict, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            report, expires_at = entry
+            if expires_at <= now:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return report
+
+    def set(self, key: tuple, report: dict, ttl_seconds: int) -> None:
+        if ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (report, monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+financial_report_cache = FinancialReportCache(max_entries=settings.financial_report_cache_size)
 
 
 def _window_bounds(from_date: date, to_date: date) -> tuple[datetime, datetime]:
@@ -15,6 +72,128 @@ def _window_bounds(from_date: date, to_date: date) -> tuple[datetime, datetime]:
     return start_at, end_at
 
 
+def _payment_day():
+    return func.date(func.timezone("UTC", Payment.created_at))
+
+
+def _payment_provider():
+    return func.coalesce(Payment.insurance_provider, SELF_PAY)
+
+
+def _grouped_payments():
+    day_expr = _payment_day()
+    provider_expr = _payment_provider()
+    return select(
+        day_expr,
+        Payment.status,
+        provider_expr,
+        func.sum(Payment.amount),
+        func.count(Payment.id),
+    ).group_by(day_expr, Payment.status, provider_expr)
+
+
+def _created_on_days(days: set[date]):
+    # Day ranges rather than ``date(created_at) IN (...)`` so the created_at index applies.
+    return or_(
+        *(
+            and_(Payment.created_at >= start_at, Payment.created_at < end_at)
+            for start_at, end_at in (_window_bounds(day, day) for day in sorted(days))
+        )
+    )
+
+
+def refresh_payment_daily_rollups(db: Session, *, full: bool = False, now: datetime | None = None) -> int:
+    """Bring ``payment_daily_rollups`` up to date for every closed UTC day.
+
+    Incremental runs only rebuild days that closed since the last run or that
+    hold payments updated since then; ``full`` rebuilds everything. Returns the
+    number of rollup rows written.
+    """
+    now = now or datetime.now(UTC)
+    today = now.date()
+    today_start = datetime.combine(today, time.min, tzinfo=UTC)
+
+    db.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+    watermark = db.get(ReportRollupWatermark, PAYMENT_ROLLUP_NAME, populate_existing=True)
+
+    source = _grouped_payments().where(Payment.created_at < today_start)
+    clear = delete(PaymentDailyRollup)
+    dirty_days: set[date] = set()
+    if watermark is not None and not full:
+        since = watermark.refreshed_at - timedelta(seconds=settings.financial_rollup_overlap_seconds)
+        dirty_days.update(
+            db.scalars(
+                select(_payment_day())
+                .where(Payment.updated_at >= since, Payment.created_at < today_start)
+                .distinct()
+            )
+        )
+        day = watermark.covered_until
+        while day < today:
+            dirty_days.add(day)
+            day += timedelta(days=1)
+
+        if dirty_days:
+            source = source.where(_created_on_days(dirty_days))
+            clear = clear.where(PaymentDailyRollup.day.in_(dirty_days))
+
+    written = 0
+    if full or watermark is None or dirty_days:
+        db.execute(clear)
+        result = db.execute(
+            pg_insert(PaymentDailyRollup).from_select(
+                ["day", "status", "insurance_provider", "amount_total", "payment_count"], source
+            )
+        )
+        written = int(result.rowcount or 0)
+
+    db.execute(
+        pg_insert(ReportRollupWatermark)
+        .values(name=PAYMENT_ROLLUP_NAME, refreshed_at=now, covered_until=today)
+        .on_conflict_do_update(
+            index_elements=[ReportRollupWatermark.name],
+            set_={"refreshed_at": now, "covered_until": today},
+        )
+    )
+    db.commit()
+    financial_report_cache.reset()
+    return written
+
+
+def user_payment_days(db: Session, *, user_id) -> set[date]:
+    return set(db.scalars(select(_payment_day()).where(Payment.user_id == user_id).distinct()))
+
+
+def rebuild_payment_rollup_days(db: Session, days: set[date]) -> int:
+    """Recompute the rollup rows of the already closed ``days``, in the caller's transaction.
+
+    For deleted payments: they leave no ``updated_at`` behind, so the
+    incremental refresh would never revisit their days. Call after the delete
+    is flushed and reset ``financial_report_cache`` once committed. Returns the
+    number of rollup rows written.
+    """
+    db.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+    watermark = db.get(ReportRollupWatermark, PAYMENT_ROLLUP_NAME, populate_existing=True)
+    if watermark is None:
+        return 0
+    closed_days = {day for day in days if day < watermark.covered_until}
+    if not closed_days:
+        return 0
+
+    db.execute(delete(PaymentDailyRollup).where(PaymentDailyRollup.day.in_(closed_days)))
+    result = db.execute(
+        pg_insert(PaymentDailyRollup).from_select(
+            ["day", "status", "insurance_provider", "amount_total", "payment_count"],
+            _grouped_payments().where(_created_on_days(closed_days)),
+        )
+    )
+    return int(result.rowcount or 0)
+
+
+def _period_key(day: date, granularity: str) -> date:
+    return day.replace(day=1) if granularity == "monthly" else day
+
+
 def build_financial_report(
     db: Session,
     *,
@@ -22,60 +201,121 @@ def build_financial_report(
     to_date: date,
     granularity: str,
 ) -> dict:
-    start_at, end_at = _window_bounds(from_date, to_date)
-    period_expr = func.date_trunc("month" if granularity == "monthly" else "day", Payment.created_at)
-
-    rows = db.execute(
-        select(
-            period_expr.label("period"),
-            func.coalesce(func.sum(Payment.amount), 0).label("total_amount"),
-            func.count(case((Payment.status == PaymentStatus.PAID, 1))).label("paid_count"),
-            func.count(case((Payment.status == PaymentStatus.PENDING, 1))).label("pending_count"),
-            func.count(case((Payment.status == PaymentStatus.FAILED, 1))).label("failed_count"),
+    watermark = db.get(ReportRollupWatermark, PAYMENT_ROLLUP_NAME)
+    # Days before ``live_from`` come from the rollup; later ones straight from payments.
+    live_from = watermark.covered_until if watermark is not None else from_date
+    cache_key = (from_date, to_date, granularity, watermark.refreshed_at if watermark is not None else None)
+    cached = financial_report_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    cells = []
+    if from_date < live_from:
+        rollup_to = min(to_date, live_from - timedelta(days=1))
+        cells.extend(
+            db.execute(
+                select(
+                    PaymentDailyRollup.day,
+                    PaymentDailyRollup.status,
+                    PaymentDailyRollup.insurance_provider,
+                    PaymentDailyRollup.amount_total,
+                    PaymentDailyRollup.payment_count,
+                ).where(PaymentDailyRollup.day >= from_date, PaymentDailyRollup.day <= rollup_to)
+            ).all()
         )
-        .where(Payment.created_at >= start_at, Payment.created_at < end_at)
-        .group_by(period_expr)
-        .order_by(period_expr)
-    ).all()
-
-    insurance_rows = db.execute(
-        select(
-            func.coalesce(Payment.insurance_provider, "SELF_PAY").label("insurance_provider"),
-            func.coalesce(func.sum(Payment.amount), 0).label("total_amount"),
-            func.count(Payment.id).label("payments_count"),
+    includes_live = to_date >= live_from
+    if includes_live:
+        start_at, end_at = _window_bounds(max(from_date, live_from), to_date)
+        cells.extend(
+            db.execute(
+                _grouped_payments().where(Payment.created_at >= start_at, Payment.created_at < end_at)
+            ).all()
         )
-        .where(Payment.created_at >= start_at, Payment.created_at < end_at)
-        .group_by(Payment.insurance_provider)
-        .order_by(func.coalesce(func.sum(Payment.amount), 0).desc())
-    ).all()
-
-    total_amount = db.scalar(
-        select(func.coalesce(func.sum(Payment.amount), 0)).where(
-            Payment.created_at >= start_at, Payment.created_at < end_at
+
+    periods: dict[date, dict] = {}
+    providers: dict[str, dict] = {}
+    total_amount = Decimal("0")
+    for day, payment_status, provider, amount, count in cells:
+        amount = Decimal(amount or 0)
+        count = int(count or 0)
+        total_amount += amount
+
+        period = periods.setdefault(
+            _period_key(day, granularity),
+            {"total_amount": Decimal("0"), "paid_count": 0, "pending_count": 0, "failed_count": 0},
         )
-    )
+        period["total_amount"] += amount
+        if payment_status == PaymentStatus.PAID:
+            period["paid_count"] += count
+        elif payment_status == PaymentStatus.PENDING:
+            period["pending_count"] += count
+        elif payment_status == PaymentStatus.FAILED:
+            period["failed_count"] += count
+
+        breakdown = providers.setdefault(provider or SELF_PAY, {"total_amount": Decimal("0"), "payments_count": 0})
+        breakdown["total_amount"] += amount
+        breakdown["payments_count"] += count
 
-    return {
+    report = {
         "from_date": from_date,
         "to_date": to_date,
         "granularity": granularity,
-        "total_amount": Decimal(total_amount or 0),
+        "total_amount": total_amount,
         "rows": [
-            {
-                "period": row.period.strftime("%Y-%m-%d"),
-                "total_amount": Decimal(row.total_amount or 0),
-                "paid_count": int(row.paid_count or 0),
-                "pending_count": int(row.pending_count or 0),
-                "failed_count": int(row.failed_count or 0),
-            }
-            for row in rows
+            {"period": period.strftime("%Y-%m-%d"), **values} for period, values in sorted(periods.items())
         ],
         "insurance_breakdown": [
-            {
-                "insurance_provider": row.insurance_provider or "SELF_PAY",
-                "total_amount": Decimal(row.total_amount or 0),
-                "payments_count": int(row.payments_count or 0),
-            }
-            for row in insurance_rows
+            {"insurance_provider": provider, **values}
+            for provider, values in sorted(providers.items(), key=lambda item: item[1]["total_amount"], reverse=True)
         ],
     }
+    financial_report_cache.set(
+        cache_key,
+        report,
+        settings.financial_report_live_cache_seconds if includes_live else settings.financial_report_cache_seconds,
+    )
+    return report
+
+
+class FinancialRollupRefresher:
+    """Runs the incremental rollup refresh on an interval inside the API process."""
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def refresh_once() -> int:
+        with SessionLocal() as db:
+            return refresh_payment_daily_rollups(db)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.refresh_once)
+            except Exception:
+                logger.exception("Financial rollup refresh failed")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self.interval_seconds <= 0:
+            return
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+financial_rollup_refresher = FinancialRollupRefresher(
+    interval_seconds=settings.financial_rollup_refresh_interval_seconds
+)
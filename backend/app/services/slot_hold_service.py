@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import SLOT_HOLD_OVERLAP_CONSTRAINT, SlotHold, User
+from app.db.session import SessionLocal
+from app.services.availability_service import find_active_conflict, match_slot
+from app.services.bookability_service import get_doctor_bookability
+
+logger = logging.getLogger(__name__)
+
+
+def _overlaps(start_at: datetime, end_at: datetime):
+    return (SlotHold.start_at < end_at) & (SlotHold.end_at > start_at)
+
+
+def hold_slot(db: Session, *, user: User, doctor_user_id, start_at: datetime) -> SlotHold:
+    """Reserve a bookable slot for ``user`` for ``SLOT_HOLD_SECONDS``.
+
+    A patient keeps at most one hold per doctor: holding another slot (or the
+    same one again) replaces the previous hold and restarts the timer.
+    """
+    if start_at.tzinfo is None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="start_at must be timezone-aware")
+
+    start_at_utc = start_at.astimezone(UTC)
+    bookability = get_doctor_bookability(db, doctor_user_id)
+    bookability.ensure_bookable()
+    end_at_utc = match_slot(bookability.rules, bookability.exceptions, start_at_utc)
+    if end_at_utc is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Requested slot is invalid")
+    if find_active_conflict(db, doctor_user_id, start_at_utc, end_at_utc) is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Requested slot is already booked")
+
+    now = datetime.now(UTC)
+    # Drop this patient's previous hold and reclaim expired holds on the range
+    # the sweeper has not reached yet, so they do not trip the constraint.
+    db.execute(
+        delete(SlotHold).where(
+            SlotHold.doctor_user_id == doctor_user_id,
+            or_(
+                SlotHold.user_id == user.id,
+                (SlotHold.expires_at <= now) & _overlaps(start_at_utc, end_at_utc),
+            ),
+        )
+    )
+    hold = SlotHold(
+        doctor_user_id=doctor_user_id,
+        user_id=user.id,
+        start_at=start_at_utc,
+        end_at=end_at_utc,
+        expires_at=now + timedelta(seconds=settings.slot_hold_seconds),
+    )
+    db.add(hold)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        diag = getattr(exc.orig, "diag", None)
+        if getattr(diag, "constraint_name", None) != SLOT_HOLD_OVERLAP_CONSTRAINT:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Requested slot is held by another patient"
+        ) from exc
+    db.commit()
+    db.refresh(hold)
+    return hold
+
+
+def release_hold(db: Session, *, user: User, hold_id) -> None:
+    result = db.execute(delete(SlotHold).where(SlotHold.id == hold_id, SlotHold.user_id == user.id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slot hold not found")
+    db.commit()
+
+
+def find_foreign_hold(db: Session, *, doctor_user_id, user_id, start_at: datetime, end_at: datetime):
+    """Id of a live hold by someone other than ``user_id`` on the range, if any."""
+    return db.scalar(
+        select(SlotHold.id)
+        .where(
+            SlotHold.doctor_user_id == doctor_user_id,
+            SlotHold.user_id != user_id,
+            SlotHold.expires_at > datetime.now(UTC),
+            _overlaps(start_at, end_at),
+        )
+        .limit(1)
+    )
+
+
+def consume_holds(db: Session, *, doctor_user_id, user_id, start_at: datetime, end_at: datetime) -> None:
+    """Drop ``user_id``'s holds on the range once the appointment row takes over; no commit."""
+    db.execute(
+        delete(SlotHold).where(
+            SlotHold.doctor_user_id == doctor_user_id,
+            SlotHold.user_id == user_id,
+            _overlaps(start_at, end_at),
+        )
+    )
+
+
+def sweep_expired_holds(db: Session, *, batch_size: int | None = None) -> int:
+    """Delete expired holds in batches, committing each one; returns the number removed."""
+    batch_size = batch_size or settings.slot_hold_sweep_batch_size
+    removed = 0
+    while True:
+        expired_ids = (
+            select(SlotHold.id)
+            .where(SlotHold.expires_at <= func.now())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = db.execute(delete(SlotHold).where(SlotHold.id.in_(expired_ids)))
+        db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
+
+
+class SlotHoldSweeper:
+    """Reclaims expired slot holds on an interval inside the API process."""
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def sweep_once() -> int:
+        with SessionLocal() as db:
+            return sweep_expired_holds(db)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.sweep_once)
+            except Exception:
+                logger.exception("Slot hold sweep failed")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self.interval_seconds <= 0:
+            return
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+slot_hold_sweeper = SlotHoldSweeper(interval_seconds=settings.slot_hold_sweep_interval_seconds)
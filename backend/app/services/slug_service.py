@@ -0,0 +1,165 @@
+"""Public profile slugs (``dr-lina-sabri``, ``dr-lina-sabri-2``, ...).
+
+Slugs are allocated from the display name. One query fetches every existing
+slug of the form ``base`` or ``base-N`` for all the requested bases and the
+next free suffix is picked in memory, so a common name costs one round trip
+instead of one per taken suffix. The unique index on ``doctor_profiles.slug``
+remains the source of truth: ``assign_profile_slug`` writes the slug inside a
+savepoint and allocates again if a concurrent approval claimed it first.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models import DoctorProfile
+
+SLUG_INDEX_NAME = "ix_doctor_profiles_slug"
+SLUG_ALLOCATION_ATTEMPTS = 5
+PLACEHOLDER_SLUG_PREFIX = "doctor-"
+
+
+def slugify(value: str) -> str:
+    lowered = value.strip().lower()
+    lowered = re.sub(r"[^a-z0-9]+", "-", lowered)
+    return lowered.strip("-")
+
+
+def placeholder_slug(doctor_user_id: uuid.UUID) -> str:
+    return f"{PLACEHOLDER_SLUG_PREFIX}{str(doctor_user_id)[:8]}"
+
+
+def slug_base(preferred_value: str | None, doctor_user_id: uuid.UUID) -> str:
+    return slugify(preferred_value or "") or placeholder_slug(doctor_user_id)
+
+
+def _suffix(slug: str, base: str) -> int | None:
+    """1 for ``base`` itself, N for ``base-N``, None for anything else."""
+    if slug == base:
+        return 1
+    match = re.fullmatch(re.escape(base) + r"-(\d+)", slug)
+    if match is None or match.group(1).startswith("0"):
+        return None
+    return int(match.group(1))
+
+
+def _taken_suffixes(db: Session, bases: set[str]) -> dict[str, dict[int, uuid.UUID]]:
+    """For every base, the suffixes in use and the doctor holding each."""
+    # slugify only produces [a-z0-9-], so the bases never contain LIKE wildcards.
+    conditions = [or_(DoctorProfile.slug == base, DoctorProfile.slug.like(f"{base}-%")) for base in bases]
+    rows = db.execute(select(DoctorProfile.slug, DoctorProfile.doctor_user_id).where(or_(*conditions)))
+    taken: dict[str, dict[int, uuid.UUID]] = defaultdict(dict)
+    for slug, owner in rows:
+        for base in bases:
+            suffix = _suffix(slug, base)
+            if suffix is not None:
+                taken[base][suffix] = owner
+    return taken
+
+
+def _slug_for(base: str, suffix: int) -> str:
+    return base if suffix == 1 else f"{base}-{suffix}"
+
+
+def allocate_slugs(db: Session, preferred: Mapping[uuid.UUID, str | None]) -> dict[uuid.UUID, str]:
+    """Pick a free slug for every ``doctor_user_id -> display name``, with one query for the whole batch.
+
+    A doctor keeps a slug of the same base they already hold, and two doctors
+    of the same batch never get the same slug.
+    """
+    if not preferred:
+        return {}
+    bases = {doctor_user_id: slug_base(value, doctor_user_id) for doctor_user_id, value in preferred.items()}
+    taken = _taken_suffixes(db, set(bases.values()))
+
+    allocated: dict[uuid.UUID, str] = {}
+    for doctor_user_id, base in bases.items():
+        in_use = taken[base]
+        owned = [suffix for suffix, owner in in_use.items() if owner == doctor_user_id]
+        if owned:
+            suffix = min(owned)
+        else:
+            suffix = 1
+            while suffix in in_use:
+                suffix += 1
+            in_use[suffix] = doctor_user_id
+        allocated[doctor_user_id] = _slug_for(base, suffix)
+    return allocated
+
+
+def is_slug_conflict(exc: IntegrityError) -> bool:
+    diag = getattr(exc.orig, "diag", None)
+    constraint = getattr(diag, "constraint_name", None)
+    return constraint == SLUG_INDEX_NAME or (constraint is None and SLUG_INDEX_NAME in str(exc.orig))
+
+
+def assign_profile_slug(db: Session, profile: DoctorProfile, preferred_value: str | None) -> str:
+    """Give ``profile`` a unique slug, retrying when a concurrent transaction takes the one picked."""
+    for _ in range(SLUG_ALLOCATION_ATTEMPTS):
+        slug = allocate_slugs(db, {profile.doctor_user_id: preferred_value})[profile.doctor_user_id]
+        try:
+            # begin_nested flushes pending changes first, so only the slug write can fail in here.
+            with db.begin_nested():
+                profile.slug = slug
+        except IntegrityError as exc:
+            if not is_slug_conflict(exc):
+                raise
+            continue
+        return slug
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Could not allocate a profile slug, try again")
+
+
+@dataclass(frozen=True)
+class ReslugStats:
+    checked: int
+    changed: int
+
+
+def reslug_profiles(
+    db: Session, *, placeholders_only: bool = False, batch_size: int = 500, dry_run: bool = False
+) -> ReslugStats:
+    """Recompute slugs from display names in batches (e.g. after the slug rules change).
+
+    Profiles whose slug already matches their display name (``base`` or
+    ``base-N``) keep it. New slugs are never held by another profile, even one
+    of the same batch that is about to move, so the batch UPDATE cannot
+    collide with itself.
+    """
+    checked = changed = 0
+    after = None
+    while True:
+        query = select(DoctorProfile.id, DoctorProfile.doctor_user_id, DoctorProfile.display_name, DoctorProfile.slug)
+        if placeholders_only:
+            query = query.where(DoctorProfile.slug.startswith(PLACEHOLDER_SLUG_PREFIX))
+        if after is not None:
+            query = query.where(DoctorProfile.id > after)
+        rows = db.execute(query.order_by(DoctorProfile.id).limit(batch_size)).all()
+        if not rows:
+            break
+        after = rows[-1].id
+        checked += len(rows)
+
+        stale = {
+            row.doctor_user_id: row
+            for row in rows
+            if _suffix(row.slug, slug_base(row.display_name, row.doctor_user_id)) is None
+        }
+        if stale:
+            allocated = allocate_slugs(db, {doctor_user_id: row.display_name for doctor_user_id, row in stale.items()})
+            changed += len(allocated)
+            if not dry_run:
+                db.execute(
+                    update(DoctorProfile),
+                    [{"id": stale[doctor_user_id].id, "slug": slug} for doctor_user_id, slug in allocated.items()],
+                )
+                db.commit()
+    return ReslugStats(checked=checked, changed=changed)
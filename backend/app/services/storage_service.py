@@ -1,9 +1,32 @@
+"""Uploaded and generated files.
+
+Files are stored content-addressed through ``blob_storage`` and reference
+counted in ``stored_files``: every stored upload or generated document takes a
+reference, ``release_stored_file`` / ``discard_uploads`` drop one, and
+``collect_orphaned_files`` deletes blobs nobody has referenced for
+``STORAGE_GC_GRACE_HOURS``. Files written before content addressing keep their
+flat ``<uuid>.<ext>`` names and are not tracked.
+"""
+
+import asyncio
+import hashlib
 import uuid
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.db.models import StoredFile
+from app.db.session import SessionLocal
+from app.services.blob_storage import INCOMING_DIR_NAME, content_key, get_blob_backend, is_content_key
 
 DOCUMENT_CONTENT_TYPES = {"application/pdf", "image/jpeg", "image/png"}
 PHOTO_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
@@ -14,6 +37,7 @@ CONTENT_TYPE_TO_EXTENSION = {
     "image/png": ".png",
     "image/webp": ".webp",
 }
+EXTENSION_TO_CONTENT_TYPE = {extension: content_type for content_type, extension in CONTENT_TYPE_TO_EXTENSION.items()}
 
 
 def ensure_upload_dir() -> Path:
@@ -22,37 +46,142 @@ def ensure_upload_dir() -> Path:
     return upload_dir
 
 
-async def save_uploaded_file(file: UploadFile, *, allowed_content_types: set[str], label: str) -> str:
+def _incoming_path() -> Path:
+    incoming_dir = ensure_upload_dir() / INCOMING_DIR_NAME
+    incoming_dir.mkdir(exist_ok=True)
+    return incoming_dir / f"{uuid.uuid4()}.part"
+
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    url: str
+    key: str
+    size: int
+    sha256: str
+
+
+def _acquire_reference(key: str, *, sha256: str, size: int, content_type: str | None) -> None:
+    statement = pg_insert(StoredFile).values(
+        key=key, sha256=sha256, size_bytes=size, content_type=content_type, ref_count=1
+    )
+    with SessionLocal() as db:
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[StoredFile.key],
+                set_={"ref_count": StoredFile.ref_count + 1, "updated_at": func.now()},
+            )
+        )
+        db.commit()
+
+
+def _release_references(keys: Iterable[str]) -> None:
+    counts = Counter(keys)
+    if not counts:
+        return
+    with SessionLocal() as db:
+        for key, count in counts.items():
+            db.execute(
+                update(StoredFile)
+                .where(StoredFile.key == key)
+                .values(ref_count=func.greatest(StoredFile.ref_count - count, 0), updated_at=func.now())
+            )
+        db.commit()
+
+
+def _commit_blob(staged: Path, *, sha256: str, size: int, extension: str) -> StoredUpload:
+    """Take a reference to the blob for ``staged`` and move it into place."""
+    key = content_key(sha256, extension)
+    # The reference is committed before the blob is written: the collector
+    # locks orphan rows while deleting their blobs, so this either waits for
+    # it to finish or keeps the row from being collected at all.
+    _acquire_reference(key, sha256=sha256, size=size, content_type=EXTENSION_TO_CONTENT_TYPE.get(extension))
+    backend = get_blob_backend()
+    try:
+        backend.put_object(key, staged)
+    except BaseException:
+        staged.unlink(missing_ok=True)
+        _release_references([key])
+        raise
+    return StoredUpload(url=backend.url_for(key), key=key, size=size, sha256=sha256)
+
+
+def _write_chunk(out: BinaryIO, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def store_upload(file: UploadFile, *, allowed_content_types: set[str], label: str) -> StoredUpload:
+    """Stream ``file`` to disk off the event loop, hashing it on the way; nothing is left behind on failure."""
     if file.content_type not in allowed_content_types:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported {label} file type.",
         )
 
-    upload_dir = ensure_upload_dir()
     extension = CONTENT_TYPE_TO_EXTENSION.get(file.content_type or "", ".bin")
-    file_name = f"{uuid.uuid4()}{extension}"
-    full_path = upload_dir / file_name
+    staged = _incoming_path()
 
     max_size = settings.max_upload_mb * 1024 * 1024
     total_size = 0
+    digest = hashlib.sha256()
 
-    with full_path.open("wb") as out:
+    out = await asyncio.to_thread(staged.open, "wb")
+    try:
         while True:
-            chunk = await file.read(1024 * 1024)
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
             if not chunk:
                 break
             total_size += len(chunk)
             if total_size > max_size:
-                out.close()
-                full_path.unlink(missing_ok=True)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File too large. Max {settings.max_upload_mb}MB",
                 )
-            out.write(chunk)
+            await asyncio.to_thread(_write_chunk, out, digest, chunk)
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        staged.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(out.close)
 
-    return f"{settings.upload_base_url}/{file_name}"
+    return await asyncio.to_thread(
+        _commit_blob, staged, sha256=digest.hexdigest(), size=total_size, extension=extension
+    )
+
+
+async def save_uploaded_file(file: UploadFile, *, allowed_content_types: set[str], label: str) -> str:
+    stored = await store_upload(file, allowed_content_types=allowed_content_types, label=label)
+    return stored.url
+
+
+def discard_uploads(uploads: Iterable[StoredUpload]) -> None:
+    """Drop the references taken for a request that did not go through."""
+    _release_references(upload.key for upload in uploads)
+
+
+async def save_uploads(files: dict[str, tuple[UploadFile, set[str], str]]) -> dict[str, StoredUpload]:
+    """Store several uploads concurrently, keyed like ``files`` (``name -> (file, content types, label)``).
+
+    If any file is rejected every other file of the batch is released and the
+    first error is raised.
+    """
+    names = list(files)
+    results = await asyncio.gather(
+        *(
+            store_upload(file, allowed_content_types=content_types, label=label)
+            for file, content_types, label in files.values()
+        ),
+        return_exceptions=True,
+    )
+    stored = {name: result for name, result in zip(names, results) if isinstance(result, StoredUpload)}
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        await asyncio.to_thread(discard_uploads, stored.values())
+        raise errors[0]
+    return stored
 
 
 async def save_document(file: UploadFile) -> str:
@@ -68,12 +197,95 @@ async def save_license_document(file: UploadFile) -> str:
 
 
 def save_generated_document_bytes(content: bytes, *, extension: str = ".pdf") -> str:
-    upload_dir = ensure_upload_dir()
     suffix = extension if extension.startswith(".") else f".{extension}"
-    file_name = f"{uuid.uuid4()}{suffix}"
-    full_path = upload_dir / file_name
+    staged = _incoming_path()
+    staged.write_bytes(content)
+    stored = _commit_blob(staged, sha256=hashlib.sha256(content).hexdigest(), size=len(content), extension=suffix)
+    return stored.url
+
 
-    with full_path.open("wb") as out:
-        out.write(content)
+def upload_key(url: str | None) -> str | None:
+    """The storage key behind an upload URL, or None for URLs not served from ``UPLOAD_DIR``."""
+    prefix = f"{settings.upload_base_url}/"
+    if not url or not url.startswith(prefix):
+        return None
+    key = url[len(prefix) :]
+    if is_content_key(key):
+        return key
+    # Legacy flat files live directly under the upload directory.
+    if "/" in key or "\\" in key or key in {"", ".", ".."}:
+        return None
+    return key
 
-    return f"{settings.upload_base_url}/{file_name}"
+
+def release_stored_file(url: str | None) -> None:
+    """Drop one reference to a stored file; untracked legacy files are deleted outright."""
+    key = upload_key(url)
+    if key is None:
+        return
+    if is_content_key(key):
+        _release_references([key])
+        return
+    (Path(settings.upload_dir) / key).unlink(missing_ok=True)
+
+
+def collect_orphaned_files(db: Session, *, grace: timedelta | None = None, batch_size: int = 500) -> int:
+    """Delete blobs unreferenced for longer than ``grace``, in batches; returns how many were removed."""
+    grace = grace if grace is not None else timedelta(hours=settings.storage_gc_grace_hours)
+    backend = get_blob_backend()
+    removed = 0
+    while True:
+        cutoff = datetime.now(UTC) - grace
+        keys = list(
+            db.scalars(
+                select(StoredFile.key)
+                .where(StoredFile.ref_count <= 0, StoredFile.updated_at < cutoff)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        for key in keys:
+            backend.delete_object(key)
+        if keys:
+            db.execute(delete(StoredFile).where(StoredFile.key.in_(keys)))
+        db.commit()
+        removed += len(keys)
+        if len(keys) < batch_size:
+            return removed
+
+
+def storage_usage(db: Session, *, scan_disk: bool = False) -> dict:
+    """Deduplication and disk usage of the upload store.
+
+    The totals come from ``stored_files``. ``scan_disk`` also lists every stored
+    object to report ``disk_files`` / ``disk_bytes``; that is O(files) in I/O, so
+    it is left to ``make storage-usage`` and explicit admin requests.
+    """
+    files, stored_bytes, logical_bytes, references, orphaned_files, orphaned_bytes = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(StoredFile.size_bytes), 0),
+            func.coalesce(func.sum(StoredFile.size_bytes * StoredFile.ref_count), 0),
+            func.coalesce(func.sum(StoredFile.ref_count), 0),
+            func.count().filter(StoredFile.ref_count <= 0),
+            func.coalesce(func.sum(StoredFile.size_bytes).filter(StoredFile.ref_count <= 0), 0),
+        )
+    ).one()
+    referenced_bytes = stored_bytes - orphaned_bytes
+    disk_files = disk_bytes = None
+    if scan_disk:
+        disk_files = disk_bytes = 0
+        for _, size in get_blob_backend().list_objects():
+            disk_files += 1
+            disk_bytes += size
+    return {
+        "files": files,
+        "references": references,
+        "stored_bytes": stored_bytes,
+        "logical_bytes": logical_bytes,
+        "dedup_ratio": round(logical_bytes / referenced_bytes, 3) if referenced_bytes else 1.0,
+        "orphaned_files": orphaned_files,
+        "orphaned_bytes": orphaned_bytes,
+        "disk_files": disk_files,
+        "disk_bytes": disk_bytes,
+    }
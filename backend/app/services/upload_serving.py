@@ -0,0 +1,121 @@
+"""HTTP delivery of stored uploads.
+
+Content-addressed blobs never change, so they are served with their sha256 as a
+strong ETag and cached as immutable; legacy flat files get an mtime/size ETag
+and a short max-age. Conditional requests are answered with 304 and byte ranges
+are honoured (``FileResponse`` handles ``Range`` / ``If-Range``).
+
+With ``UPLOAD_SERVE_MODE=x-accel`` the API only authorizes the request and
+answers with an ``X-Accel-Redirect`` to ``UPLOAD_ACCEL_REDIRECT_PREFIX``; nginx
+then streams the file from disk itself (sendfile, ranges) so API workers never
+carry file bodies. See ``deploy/nginx/sabina.conf`` for the matching internal
+location.
+"""
+
+import hashlib
+import os
+import stat
+from dataclasses import dataclass
+from email.utils import formatdate
+from mimetypes import guess_type
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.services.blob_storage import INCOMING_DIR_NAME, is_content_key
+
+SERVE_MODE_APP = "app"
+SERVE_MODE_X_ACCEL = "x-accel"
+IMMUTABLE_MAX_AGE_SECONDS = 365 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class ServedFile:
+    key: str
+    path: Path
+    stat_result: os.stat_result
+
+    @property
+    def content_type(self) -> str:
+        return guess_type(self.path.name)[0] or "application/octet-stream"
+
+    @property
+    def etag(self) -> str:
+        if is_content_key(self.key):
+            return f'"{self.path.name.split(".", 1)[0]}"'
+        version = f"{self.stat_result.st_mtime_ns}-{self.stat_result.st_size}"
+        return f'"{hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def resolve_upload(key: str) -> ServedFile | None:
+    """The stored file behind ``key``; None for missing files and keys escaping ``UPLOAD_DIR``."""
+    parts = key.split("/")
+    if not key or any(part in {"", ".", "..", INCOMING_DIR_NAME} for part in parts) or "\\" in key:
+        return None
+    path = Path(settings.upload_dir) / key
+    try:
+        stat_result = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+    return ServedFile(key=key, path=path, stat_result=stat_result)
+
+
+def cache_control(upload: ServedFile, *, private: bool = False) -> str:
+    scope = "private" if private else "public"
+    if is_content_key(upload.key):
+        return f"{scope}, max-age={IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+    return f"{scope}, max-age={settings.upload_legacy_cache_seconds}"
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def upload_response(
+    request: Request,
+    key: str,
+    *,
+    private: bool = False,
+    filename: str | None = None,
+) -> Response:
+    """Serve the stored file ``key`` honouring conditional and range requests.
+
+    ``private`` keeps shared caches from storing the response (used for
+    documents that were handed out after an access check).
+    """
+    upload = resolve_upload(key)
+    if upload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    headers = {
+        "ETag": upload.etag,
+        "Cache-Control": cache_control(upload, private=private),
+        "Last-Modified": formatdate(upload.stat_result.st_mtime, usegmt=True),
+    }
+    if _not_modified(request, upload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if filename is not None:
+        headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+    if settings.upload_serve_mode.lower() == SERVE_MODE_X_ACCEL:
+        prefix = settings.upload_accel_redirect_prefix.rstrip("/")
+        headers["X-Accel-Redirect"] = f"{prefix}/{quote(upload.key)}"
+        return Response(media_type=upload.content_type, headers=headers)
+    return FileResponse(
+        upload.path,
+        media_type=upload.content_type,
+        headers=headers,
+        stat_result=upload.stat_result,
+    )
@@ -21,7 +21,6 @@ from app.db.models import (
     User,
     UserRole,
 )
-from app.services.zoom_service import create_zoom_meeting_for_appointment, zoom_is_configured
 
 
 def _sign_payload(payload: dict) -> str:
@@ -60,27 +59,10 @@ def generate_video_join_token(db: Session, *, appointment_id, actor_user: User)
     if not appointment.fee_paid and actor_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail="Payment required before joining")
 
-    # If Zoom is enabled and this appointment still has no link, try creating it lazily on join.
-    if not appointment.meeting_link and zoom_is_configured():
-        try:
-            zoom_meeting = create_zoom_meeting_for_appointment(
-                appointment_id=str(appointment.id),
-                doctor_user_id=str(appointment.doctor_user_id),
-                patient_user_id=str(appointment.user_id),
-                start_at=appointment.start_at,
-                end_at=appointment.end_at,
-            )
-            if zoom_meeting:
-                appointment.meeting_link = zoom_meeting["meeting_link"]
-                appointment.call_provider = zoom_meeting["provider"]
-                appointment.call_room_id = zoom_meeting["room_id"]
-                db.commit()
-                db.refresh(appointment)
-        except Exception:
-            # Keep join flow usable even if Zoom API fails temporarily.
-            pass
-
     _assert_join_window(appointment)
+    # Zoom meetings are created by the provisioning queue, never on this path; if
+    # one is not ready yet the call falls back to the built-in room and leaving
+    # PROVISIONING stops the queue from attaching a meeting afterwards.
     _ensure_room(appointment)
     appointment.call_status = AppointmentCallStatus.LIVE
     db.commit()
@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VR_ROLES = ("doctor", "patient")
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+def _initial_state() -> dict:
+    return {"video_id": None, "is_playing": False, "timestamp": 0, "anchor_at": None}
+
+
+def playback_position(state: dict, now: float) -> float:
+    """Server-authoritative position: ``timestamp`` was the position at ``anchor_at``."""
+    position = float(state.get("timestamp") or 0)
+    anchor_at = state.get("anchor_at")
+    if state.get("is_playing") and anchor_at is not None:
+        position += max(0.0, now - anchor_at)
+    return position
+
+
+def playback_clock(state: dict, now: float) -> dict:
+    """Clock frame a client extrapolates from: ``position + (its_now - server_time)`` while playing."""
+    return {
+        "position": playback_position(state, now),
+        "is_playing": bool(state.get("is_playing")),
+        "server_time": now,
+    }
+
+
+@dataclass
+class VRSessionRecord:
+    session_id: str
+    doctor_id: str
+    patient_id: str
+    state: dict = field(default_factory=_initial_state)
+    version: int = 0
+    connected: dict[str, int] = field(default_factory=lambda: {role: 0 for role in VR_ROLES})
+    # Wall-clock epoch seconds: monotonic clocks are per process, and a shared backend is read by every worker.
+    expires_at: float = 0.0
+
+    @property
+    def peer_count(self) -> int:
+        return sum(self.connected.values())
+
+
+class VRSessionBackend(ABC):
+    """Shared session state plus per-session pub/sub.
+
+    Every worker talks to the same backend, so a session created on one worker
+    can be joined on another and relayed frames reach peers wherever they are
+    connected. ``InMemoryVRSessionBackend`` is the single-process stand-in.
+    """
+
+    @abstractmethod
+    async def create(self, record: VRSessionRecord) -> None: ...
+
+    @abstractmethod
+    async def get(self, session_id: str) -> VRSessionRecord | None: ...
+
+    @abstractmethod
+    async def apply_state(self, session_id: str, patch: dict, *, ttl_seconds: float) -> VRSessionRecord | None:
+        """Merge ``patch`` into the state, bump the version and refresh the TTL."""
+
+    @abstractmethod
+    async def set_connected(
+        self, session_id: str, role: str, delta: int, *, ttl_seconds: float
+    ) -> VRSessionRecord | None: ...
+
+    @abstractmethod
+    async def evict_expired(self, now: float) -> list[str]: ...
+
+    @abstractmethod
+    async def publish(self, session_id: str, message: dict) -> None: ...
+
+    @abstractmethod
+    async def subscribe(self, session_id: str, handler: Handler) -> Callable[[], Awaitable[None]]: ...
+
+
+class InMemoryVRSessionBackend(VRSessionBackend):
+    def __init__(self) -> None:
+        self._records: dict[str, VRSessionRecord] = {}
+        self._subscribers: defaultdict[str, list[Handler]] = defaultdict(list)
+
+    async def create(self, record: VRSessionRecord) -> None:
+        self._records[record.session_id] = record
+
+    async def get(self, session_id: str) -> VRSessionRecord | None:
+        record = self._records.get(session_id)
+        if record is None or (record.peer_count == 0 and record.expires_at <= time.time()):
+            return None
+        return copy.deepcopy(record)
+
+    async def apply_state(self, session_id: str, patch: dict, *, ttl_seconds: float) -> VRSessionRecord | None:
+        record = self._records.get(session_id)
+        if record is None:
+            return None
+        record.state.update(patch)
+        record.version += 1
+        record.expires_at = time.time() + ttl_seconds
+        return copy.deepcopy(record)
+
+    async def set_connected(
+        self, session_id: str, role: str, delta: int, *, ttl_seconds: float
+    ) -> VRSessionRecord | None:
+        record = self._records.get(session_id)
+        if record is None:
+            return None
+        record.connected[role] = max(0, record.connected[role] + delta)
+        record.expires_at = time.time() + ttl_seconds
+        return copy.deepcopy(record)
+
+    async def evict_expired(self, now: float) -> list[str]:
+        expired = [
+            session_id
+            for session_id, record in self._records.items()
+            if record.peer_count == 0 and record.expires_at <= now
+        ]
+        for session_id in expired:
+            self._records.pop(session_id, None)
+            self._subscribers.pop(session_id, None)
+        return expired
+
+    async def publish(self, session_id: str, message: dict) -> None:
+        for handler in list(self._subscribers.get(session_id, ())):
+            await handler(message)
+
+    async def subscribe(self, session_id: str, handler: Handler) -> Callable[[], Awaitable[None]]:
+        self._subscribers[session_id].append(handler)
+
+        async def unsubscribe() -> None:
+            handlers = self._subscribers.get(session_id)
+            if handlers and handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self._subscribers.pop(session_id, None)
+
+        return unsubscribe
+
+
+class PeerConnection:
+    """A local socket with its own bounded outbound queue and writer task.
+
+    Relaying only enqueues, so a slow patient link never blocks the doctor's
+    receive loop. When the queue is full the oldest frame is dropped; since it
+    may have been a SYNC_STATE or SET_VIDEO, the writer then sends a fresh
+    ``snapshot()`` before the next frame so the peer never keeps a stale state.
+    """
+
+    def __init__(
+        self,
+        *,
+        websocket: WebSocket,
+        role: str,
+        queue_size: int,
+        snapshot: Callable[[], Awaitable[dict | None]] | None = None,
+    ) -> None:
+        self.websocket = websocket
+        self.role = role
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=max(1, queue_size))
+        self.dropped = 0
+        self._snapshot = snapshot
+        self._resync = False
+        self._writer: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._drain())
+
+    def enqueue(self, message: dict) -> None:
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+                self._resync = True
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(message)
+
+    async def _drain(self) -> None:
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                return
+            try:
+                if self._resync and self._snapshot is not None:
+                    self._resync = False
+                    snapshot = await self._snapshot()
+                    if snapshot is not None:
+                        await self.websocket.send_json(snapshot)
+                await self.websocket.send_json(message)
+            except Exception:
+                logger.debug("VR peer send failed; stopping writer for role=%s", self.role)
+                return
+
+    async def close(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        writer.cancel()
+        try:
+            await writer
+        except asyncio.CancelledError:
+            pass
+
+
+def _seek_time(value) -> float | None:
+    """A seek target in seconds, or None if ``value`` is not a finite non-negative number."""
+    if value is None:
+        return 0.0
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if not math.isfinite(seconds) or seconds < 0:
+        return None
+    return seconds
+
+
+@dataclass
+class _PendingControl:
+    seek_to: float | None = None
+    is_playing: bool | None = None
+    flush_task: asyncio.Task | None = None
+
+
+class VRSessionBroker:
+    def __init__(
+        self,
+        *,
+        backend: VRSessionBackend,
+        ttl_seconds: float,
+        reconnect_grace_seconds: float,
+        sweep_interval_seconds: float,
+        peer_queue_size: int,
+        control_coalesce_seconds: float = 0.0,
+    ) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.reconnect_grace_seconds = reconnect_grace_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.peer_queue_size = peer_queue_size
+        # 0 relays every CONTROL frame as it arrives; otherwise frames are merged per window.
+        self.control_coalesce_seconds = control_coalesce_seconds
+        self.control_events_in = 0
+        self.control_frames_out = 0
+        self._peers: defaultdict[str, dict[str, PeerConnection]] = defaultdict(dict)
+        self._unsubscribe: dict[str, Callable[[], Awaitable[None]]] = {}
+        self._pending: dict[str, _PendingControl] = {}
+        self._sweeper: asyncio.Task | None = None
+
+    async def create_session(self, *, doctor_id: str, patient_id: str) -> VRSessionRecord:
+        record = VRSessionRecord(
+            session_id=str(uuid.uuid4()),
+            doctor_id=doctor_id,
+            patient_id=patient_id,
+            expires_at=time.time() + self.ttl_seconds,
+        )
+        await self.backend.create(record)
+        return record
+
+    async def _deliver(self, session_id: str, envelope: dict) -> None:
+        peer = self._peers.get(session_id, {}).get(envelope["to"])
+        if peer is not None:
+            peer.enqueue(envelope["message"])
+
+    async def _route(self, session_id: str, *, to: str, message: dict) -> None:
+        await self.backend.publish(session_id, {"to": to, "message": message})
+
+    async def _snapshot(self, session_id: str) -> dict | None:
+        record = await self.backend.get(session_id)
+        if record is None:
+            return None
+        clock = playback_clock(record.state, time.time())
+        return {"type": "SYNC_STATE", "version": record.version, "payload": record.state, "clock": clock}
+
+    async def join(
+        self, *, session_id: str, role: str, websocket: WebSocket, known_version: int | None = None
+    ) -> PeerConnection | None:
+        record = await self.backend.get(session_id)
+        if record is None or role not in VR_ROLES:
+            return None
+
+        await websocket.accept()
+        peer = PeerConnection(
+            websocket=websocket,
+            role=role,
+            queue_size=self.peer_queue_size,
+            snapshot=lambda: self._snapshot(session_id),
+        )
+        previous = self._peers[session_id].get(role)
+        self._peers[session_id][role] = peer
+        if previous is not None:
+            await previous.close()
+        if session_id not in self._unsubscribe:
+            self._unsubscribe[session_id] = await self.backend.subscribe(
+                session_id, lambda envelope: self._deliver(session_id, envelope)
+            )
+        peer.start()
+
+        record = await self.backend.set_connected(session_id, role, 1, ttl_seconds=self.ttl_seconds) or record
+        clock = playback_clock(record.state, time.time())
+        if known_version is not None and known_version == record.version:
+            # Reconnecting peer already holds this snapshot; skip the full payload.
+            peer.enqueue({"type": "SYNC_STATE", "version": record.version, "unchanged": True, "clock": clock})
+        else:
+            peer.enqueue({"type": "SYNC_STATE", "version": record.version, "payload": record.state, "clock": clock})
+
+        other_role = "patient" if role == "doctor" else "doctor"
+        await self._route(session_id, to=other_role, message={"type": "USER_JOINED", "role": role})
+        return peer
+
+    async def handle_message(self, *, session_id: str, role: str, data: dict) -> None:
+        # Doctor controls the session; patient frames are ignored for now.
+        if role != "doctor":
+            return
+
+        message_type = data.get("type")
+        payload = data.get("payload") or {}
+        if not isinstance(payload, dict):
+            return
+        if message_type == "SET_VIDEO":
+            await self._cancel_pending(session_id)
+            patch = {"video_id": payload.get("video_id"), "is_playing": False, "timestamp": 0, "anchor_at": None}
+            record = await self.backend.apply_state(session_id, patch, ttl_seconds=self.ttl_seconds)
+            if record is not None:
+                await self._route(session_id, to="patient", message={**data, "version": record.version})
+            return
+
+        if message_type != "CONTROL":
+            return
+        command = payload.get("command")
+        if command not in {"play", "pause", "seek"}:
+            return
+
+        seek_to = None
+        if command == "seek":
+            seek_to = _seek_time(payload.get("time"))
+            if seek_to is None:
+                # Malformed seeks ("1:20", objects, NaN) are dropped, not allowed to close the socket.
+                return
+
+        self.control_events_in += 1
+        pending = self._pending.setdefault(session_id, _PendingControl())
+        if seek_to is not None:
+            pending.seek_to = seek_to
+        else:
+            pending.is_playing = command == "play"
+
+        if self.control_coalesce_seconds <= 0:
+            await self._flush_controls(session_id)
+        elif pending.flush_task is None:
+            pending.flush_task = asyncio.create_task(self._flush_after_window(session_id))
+
+    async def _flush_after_window(self, session_id: str) -> None:
+        await asyncio.sleep(self.control_coalesce_seconds)
+        await self._flush_controls(session_id)
+
+    async def _cancel_pending(self, session_id: str) -> None:
+        pending = self._pending.pop(session_id, None)
+        if pending is not None and pending.flush_task is not None:
+            pending.flush_task.cancel()
+
+    async def _flush_controls(self, session_id: str) -> None:
+        """Apply the merged seek/play state once and relay only the latest frames."""
+        pending = self._pending.pop(session_id, None)
+        if pending is None:
+            return
+        record = await self.backend.get(session_id)
+        if record is None:
+            return
+
+        now = time.time()
+        position = pending.seek_to if pending.seek_to is not None else playback_position(record.state, now)
+        is_playing = pending.is_playing if pending.is_playing is not None else bool(record.state.get("is_playing"))
+        record = await self.backend.apply_state(
+            session_id,
+            {"timestamp": position, "is_playing": is_playing, "anchor_at": now},
+            ttl_seconds=self.ttl_seconds,
+        )
+        if record is None:
+            return
+
+        clock = playback_clock(record.state, now)
+        frames: list[dict] = []
+        if pending.seek_to is not None:
+            frames.append({"command": "seek", "time": position})
+        if pending.is_playing is not None:
+            frames.append({"command": "play" if is_playing else "pause"})
+        for frame in frames:
+            self.control_frames_out += 1
+            await self._route(
+                session_id,
+                to="patient",
+                message={"type": "CONTROL", "payload": frame, "version": record.version, "clock": clock},
+            )
+
+    async def leave(self, *, session_id: str, role: str, peer: PeerConnection) -> None:
+        await peer.close()
+        if role == "doctor":
+            # Deliver whatever the doctor scrubbed to before disconnecting.
+            pending = self._pending.get(session_id)
+            if pending is not None and pending.flush_task is not None:
+                pending.flush_task.cancel()
+            await self._flush_controls(session_id)
+        local = self._peers.get(session_id)
+        if local is not None and local.get(role) is peer:
+            local.pop(role, None)
+            if not local:
+                self._peers.pop(session_id, None)
+                unsubscribe = self._unsubscribe.pop(session_id, None)
+                if unsubscribe is not None:
+                    await unsubscribe()
+
+        # Keep the session around briefly so either side can reconnect and resync.
+        await self.backend.set_connected(session_id, role, -1, ttl_seconds=self.reconnect_grace_seconds)
+        other_role = "patient" if role == "doctor" else "doctor"
+        await self._route(session_id, to=other_role, message={"type": "USER_LEFT", "role": role})
+
+    async def sweep(self) -> list[str]:
+        expired = await self.backend.evict_expired(time.time())
+        if expired:
+            logger.info("Evicted %s abandoned VR sessions", len(expired))
+        return expired
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("VR session sweep failed")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = self._sweeper
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._sweeper = loop.create_task(self._run_sweeper())
+
+    async def shutdown(self) -> None:
+        task, self._sweeper = self._sweeper, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def build_vr_session_backend(name: str) -> VRSessionBackend:
+    if name == "memory":
+        return InMemoryVRSessionBackend()
+    raise ValueError(f"Unsupported VR session backend: {name}")
+
+
+vr_session_broker = VRSessionBroker(
+    backend=build_vr_session_backend(settings.vr_session_backend),
+    ttl_seconds=settings.vr_session_ttl_seconds,
+    reconnect_grace_seconds=settings.vr_session_reconnect_grace_seconds,
+    sweep_interval_seconds=settings.vr_session_sweep_interval_seconds,
+    peer_queue_size=settings.vr_peer_queue_size,
+    control_coalesce_seconds=settings.vr_control_coalesce_ms / 1000,
+)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import importlib.util
+import time
 from datetime import UTC, datetime
 
 import httpx
@@ -18,27 +21,118 @@ def zoom_is_configured() -> bool:
     )
 
 
-def _zoom_access_token() -> str:
-    auth_plain = f"{settings.zoom_client_id}:{settings.zoom_client_secret}".encode("utf-8")
-    auth_header = base64.b64encode(auth_plain).decode("utf-8")
-    response = httpx.post(
-        "https://zoom.us/oauth/token",
-        params={
-            "grant_type": "account_credentials",
-            "account_id": settings.zoom_account_id,
-        },
-        headers={"Authorization": f"Basic {auth_header}"},
-        timeout=20.0,
-    )
-    response.raise_for_status()
-    payload = response.json()
-    token = payload.get("access_token")
-    if not token:
-        raise RuntimeError("Zoom access token was not returned")
-    return str(token)
+class ZoomClient:
+    """Process-wide Zoom API client.
+
+    One pooled ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed) keeps
+    connections to Zoom alive between meetings, and the account-credentials
+    token is cached until ``ZOOM_TOKEN_REFRESH_MARGIN_SECONDS`` before it
+    expires. Concurrent callers that find the token stale wait on one refresh
+    instead of each requesting their own.
+
+    The HTTP client and lock belong to the event loop that created them; a
+    call from another loop (a fresh ``asyncio.run``) builds new ones, while
+    the cached token carries over.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        # Overridden in tests to route requests to the fake Zoom app (``tests/fake_zoom.py``).
+        self.transport = transport
+        self._http: httpx.AsyncClient | None = None
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._token: str | None = None
+        self._token_refresh_at = 0.0
+
+    def _bind(self) -> tuple[httpx.AsyncClient, asyncio.Lock]:
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._loop is not loop or self._http.is_closed:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._http = httpx.AsyncClient(
+                timeout=settings.zoom_timeout_seconds,
+                http2=settings.zoom_http2 and importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=settings.zoom_max_connections,
+                    max_keepalive_connections=settings.zoom_max_connections,
+                    keepalive_expiry=settings.zoom_keepalive_seconds,
+                ),
+                transport=self.transport,
+            )
+        return self._http, self._lock
+
+    async def _fetch_token(self, http: httpx.AsyncClient) -> None:
+        auth_plain = f"{settings.zoom_client_id}:{settings.zoom_client_secret}".encode("utf-8")
+        auth_header = base64.b64encode(auth_plain).decode("utf-8")
+        response = await http.post(
+            settings.zoom_oauth_url,
+            params={
+                "grant_type": "account_credentials",
+                "account_id": settings.zoom_account_id,
+            },
+            headers={"Authorization": f"Basic {auth_header}"},
+        )
+        response.raise_for_status()
+        payload = response.json()
+        token = payload.get("access_token")
+        if not token:
+            raise RuntimeError("Zoom access token was not returned")
+        expires_in = float(payload.get("expires_in") or 3600)
+        self._token = str(token)
+        self._token_refresh_at = time.monotonic() + expires_in - settings.zoom_token_refresh_margin_seconds
+
+    async def access_token(self, *, stale: str | None = None) -> str:
+        """Cached access token; ``stale`` names a token Zoom just rejected."""
+        http, lock = self._bind()
+        token = self._token
+        if token is not None and token != stale and time.monotonic() < self._token_refresh_at:
+            return token
+        async with lock:
+            # Another caller may have refreshed while this one waited.
+            token = self._token
+            if token is None or token == stale or time.monotonic() >= self._token_refresh_at:
+                await self._fetch_token(http)
+            return self._token
+
+    async def post(self, path: str, *, json: dict) -> httpx.Response:
+        http, _ = self._bind()
+        token = await self.access_token()
+        response = await http.post(
+            f"{settings.zoom_api_base_url}{path}",
+            headers={"Authorization": f"Bearer {token}"},
+            json=json,
+        )
+        if response.status_code == httpx.codes.UNAUTHORIZED:
+            # Revoked or rotated early: refresh once and retry.
+            token = await self.access_token(stale=token)
+            response = await http.post(
+                f"{settings.zoom_api_base_url}{path}",
+                headers={"Authorization": f"Bearer {token}"},
+                json=json,
+            )
+        response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        http, self._http = self._http, None
+        self._lock = None
+        self._loop = None
+        if http is not None and not http.is_closed:
+            await http.aclose()
 
+    def reset(self) -> None:
+        """Forget the token and the HTTP client (tests, credential changes)."""
+        self._http = None
+        self._lock = None
+        self._loop = None
+        self._token = None
+        self._token_refresh_at = 0.0
 
-def create_zoom_meeting_for_appointment(
+
+zoom_client = ZoomClient()
+
+
+async def create_zoom_meeting_for_appointment(
     *,
     appointment_id: str,
     doctor_user_id: str,
@@ -52,14 +146,9 @@ def create_zoom_meeting_for_appointment(
     duration_minutes = max(15, int((end_at - start_at).total_seconds() // 60))
     start_time_utc = start_at.astimezone(UTC).isoformat().replace("+00:00", "Z")
 
-    token = _zoom_access_token()
     host_user = settings.zoom_host_user_id or "me"
-    response = httpx.post(
-        f"https://api.zoom.us/v2/users/{host_user}/meetings",
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        },
+    response = await zoom_client.post(
+        f"/users/{host_user}/meetings",
         json={
             "topic": f"Sabina session {appointment_id[:8]}",
             "type": 2,
@@ -72,9 +161,7 @@ def create_zoom_meeting_for_appointment(
                 "waiting_room": settings.zoom_waiting_room,
             },
         },
-        timeout=20.0,
     )
-    response.raise_for_status()
     payload = response.json()
     join_url = payload.get("join_url")
     meeting_id = payload.get("id")
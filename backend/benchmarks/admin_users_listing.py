@@ -0,0 +1,107 @@
+"""Page through and search the admin user listing over a large user table.
+
+Needs a migrated database (``DATABASE_URL``); it creates its own users and
+deletes them afterwards:
+
+    python -m benchmarks.admin_users_listing --users 1000000 --pages 20
+
+Reports latency for the first page, for walking ``--pages`` pages by cursor and
+for substring searches, plus the plan of the search query.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, insert, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.api.routes.admin import _admin_users_statement
+from app.db.base import Base
+from app.db.models import User, UserRole
+from app.db.session import SessionLocal, engine
+
+BATCH_SIZE = 10000
+EMAIL_DOMAIN = "bench-admin-users.dev"
+
+
+def _seed(db, *, users: int) -> None:
+    started = datetime.now(UTC) - timedelta(days=1000)
+    for offset in range(0, users, BATCH_SIZE):
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "email": f"user{index:07d}@{EMAIL_DOMAIN}",
+                    "phone": f"+9627{index:08d}",
+                    "role": UserRole.USER,
+                    "created_at": started + timedelta(seconds=index * 60),
+                    "updated_at": started + timedelta(seconds=index * 60),
+                }
+                for index in range(offset, min(offset + BATCH_SIZE, users))
+            ],
+        )
+    db.commit()
+
+
+def _timed(call) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = call()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        _seed(db, users=args.users)
+        db.execute(text("ANALYZE users"))
+        try:
+            query = _admin_users_statement(search=None, status_filter=None)
+            page_timings = []
+            boundary = None
+            for _ in range(args.pages):
+                page_query = query if boundary is None else query.where(
+                    tuple_(User.created_at, User.id) < tuple_(*boundary)
+                )
+                elapsed, rows = _timed(lambda: db.execute(page_query.limit(args.limit)).all())
+                page_timings.append(elapsed)
+                boundary = (rows[-1].created_at, rows[-1].id)
+
+            search_timings = []
+            for term in ["user0004242", "0007777", "+96270001"]:
+                search_query = _admin_users_statement(search=term, status_filter=None).limit(args.limit)
+                elapsed, _ = _timed(lambda: db.execute(search_query).all())
+                search_timings.append(elapsed)
+
+            compiled = search_query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            plan = db.execute(text(f"EXPLAIN {compiled}")).scalars()
+
+            print(f"users={args.users} limit={args.limit}")
+            print(f"first page={page_timings[0]:.2f}ms")
+            print(
+                f"cursor pages p50={statistics.median(page_timings):.2f}ms "
+                f"max={max(page_timings):.2f}ms over {args.pages} pages"
+            )
+            print(f"search p50={statistics.median(search_timings):.2f}ms max={max(search_timings):.2f}ms")
+            print("search plan:")
+            for line in plan:
+                print(f"  {line}")
+        finally:
+            db.rollback()
+            db.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Fire a burst of concurrent booking requests at one popular doctor.
+
+Needs a migrated database (``DATABASE_URL``); it creates its own doctor and
+patients and deletes them afterwards:
+
+    python -m benchmarks.booking_burst --requests 2000 --workers 8
+    python -m benchmarks.booking_burst --requests 2000 --workers 8 --no-cache
+
+Each request goes through ``request_appointment`` on its own session, picking a
+random slot over the next ``--days`` days so part of the burst collides.
+Reports p50/p99 latency and how many requests booked, conflicted or failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from datetime import time as clock_time
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert
+
+from app.db.base import Base
+from app.db.models import (
+    ApplicationStatus,
+    DoctorApplication,
+    DoctorAvailabilityRule,
+    DoctorProfile,
+    User,
+    UserRole,
+)
+from app.db.session import SessionLocal, engine
+from app.services.appointment_service import request_appointment
+from app.services.bookability_service import doctor_bookability_cache
+
+EMAIL_DOMAIN = "bench-booking-burst.dev"
+SLOT_MINUTES = 30
+
+
+def _seed(db, *, patients: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    doctor_id = uuid.uuid4()
+    db.execute(insert(User), [{"id": doctor_id, "email": f"doctor@{EMAIL_DOMAIN}", "role": UserRole.DOCTOR}])
+    db.execute(
+        insert(DoctorApplication),
+        [{"id": uuid.uuid4(), "doctor_user_id": doctor_id, "status": ApplicationStatus.APPROVED}],
+    )
+    db.execute(
+        insert(DoctorProfile),
+        [
+            {
+                "id": uuid.uuid4(),
+                "doctor_user_id": doctor_id,
+                "slug": "bench-booking-burst",
+                "display_name": "Dr. Popular",
+                "is_public": True,
+            }
+        ],
+    )
+    db.execute(
+        insert(DoctorAvailabilityRule),
+        [
+            {
+                "id": uuid.uuid4(),
+                "doctor_user_id": doctor_id,
+                "day_of_week": weekday,
+                "start_time": clock_time(0, 0),
+                "end_time": clock_time(23, 30),
+                "timezone": "UTC",
+                "slot_duration_minutes": SLOT_MINUTES,
+                "buffer_minutes": 0,
+            }
+            for weekday in range(7)
+        ],
+    )
+    patient_ids = [uuid.uuid4() for _ in range(patients)]
+    db.execute(
+        insert(User),
+        [
+            {"id": patient_id, "email": f"patient{index}@{EMAIL_DOMAIN}", "role": UserRole.USER}
+            for index, patient_id in enumerate(patient_ids)
+        ],
+    )
+    db.commit()
+    return doctor_id, patient_ids
+
+
+def _book(doctor_id: uuid.UUID, patient_id: uuid.UUID, start_at: datetime) -> tuple[str, float]:
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        patient = db.get(User, patient_id)
+        try:
+            request_appointment(db, patient, doctor_id, start_at, "UTC")
+            outcome = "booked"
+        except HTTPException as exc:
+            db.rollback()
+            outcome = "conflict" if exc.status_code == 409 else f"http_{exc.status_code}"
+    return outcome, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8, help="keep within the engine's pool size + overflow")
+    parser.add_argument("--patients", type=int, default=500)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--no-cache", action="store_true", help="load doctor status and schedule on every request")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        doctor_bookability_cache.ttl_seconds = 0
+    doctor_bookability_cache.reset()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        doctor_id, patient_ids = _seed(db, patients=args.patients)
+    try:
+        first_slot = datetime.combine(datetime.now(UTC).date() + timedelta(days=1), clock_time.min, tzinfo=UTC)
+        slots_per_day = (23 * 60 + 30) // SLOT_MINUTES
+        jobs = [
+            (
+                random.choice(patient_ids),
+                first_slot
+                + timedelta(days=random.randrange(args.days), minutes=SLOT_MINUTES * random.randrange(slots_per_day)),
+            )
+            for _ in range(args.requests)
+        ]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(lambda job: _book(doctor_id, *job), jobs))
+        wall = time.perf_counter() - started
+
+        timings = sorted(elapsed for _, elapsed in results)
+        outcomes: dict[str, int] = {}
+        for outcome, _ in results:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        print(
+            f"requests={args.requests} workers={args.workers} days={args.days} "
+            f"cache={'off' if args.no_cache else 'on'}"
+        )
+        print(
+            f"p50={statistics.median(timings):.2f}ms "
+            f"p99={timings[min(len(timings) - 1, int(len(timings) * 0.99))]:.2f}ms "
+            f"max={timings[-1]:.2f}ms throughput={args.requests / wall:.0f} req/s"
+        )
+        print(" ".join(f"{name}={count}" for name, count in sorted(outcomes.items())))
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
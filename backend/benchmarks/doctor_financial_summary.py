@@ -0,0 +1,139 @@
+"""Time the doctor financial summary against a doctor with a large payment history.
+
+Needs a migrated database (``DATABASE_URL``); it creates its own users and
+deletes them afterwards:
+
+    python -m benchmarks.doctor_financial_summary --payments 50000 --runs 50
+
+Compares the previous four-query summary, the single-pass conditional
+aggregation over ``payments`` and the read from ``doctor_payment_daily_rollups``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select, text
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import Appointment, AppointmentStatus, Payment, PaymentStatus, User, UserRole
+from app.db.session import SessionLocal, engine
+from app.services.payment_service import doctor_financial_summary, rebuild_doctor_payment_rollups
+
+BATCH_SIZE = 5000
+
+
+def _seed(db, *, payments: int) -> tuple[User, User]:
+    doctor = User(email=f"bench-doctor-{uuid.uuid4().hex[:8]}@bench.dev", role=UserRole.DOCTOR)
+    patient = User(email=f"bench-patient-{uuid.uuid4().hex[:8]}@bench.dev", role=UserRole.USER)
+    db.add_all([doctor, patient])
+    db.flush()
+
+    started = datetime.now(UTC) - timedelta(days=730)
+    statuses = [PaymentStatus.PAID, PaymentStatus.PAID, PaymentStatus.PENDING, PaymentStatus.FAILED]
+    for offset in range(0, payments, BATCH_SIZE):
+        appointments = []
+        rows = []
+        for index in range(offset, min(offset + BATCH_SIZE, payments)):
+            start_at = started + timedelta(minutes=20 * index)
+            appointment_id = uuid.uuid4()
+            appointments.append(
+                {
+                    "id": appointment_id,
+                    "doctor_user_id": doctor.id,
+                    "user_id": patient.id,
+                    "start_at": start_at,
+                    "end_at": start_at + timedelta(minutes=15),
+                    "timezone": "UTC",
+                    "status": AppointmentStatus.COMPLETED,
+                }
+            )
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "appointment_id": appointment_id,
+                    "user_id": patient.id,
+                    "amount": Decimal(random.choice(["45.00", "60.00", "80.00"])),
+                    "method": "STRIPE",
+                    "status": random.choice(statuses),
+                    "created_at": start_at,
+                    "updated_at": start_at,
+                }
+            )
+        db.execute(insert(Appointment), appointments)
+        db.execute(insert(Payment), rows)
+    db.commit()
+    return doctor, patient
+
+
+def _legacy_summary(db, *, doctor_user_id) -> tuple:
+    # The pre-rollup implementation: one aggregate round trip per figure.
+    base = select(Payment).join(Appointment, Appointment.id == Payment.appointment_id).where(
+        Appointment.doctor_user_id == doctor_user_id
+    )
+    paid = base.where(Payment.status == PaymentStatus.PAID).subquery()
+    pending = base.where(Payment.status == PaymentStatus.PENDING).subquery()
+    return (
+        db.scalar(select(func.coalesce(func.sum(paid.c.amount), 0))),
+        db.scalar(select(func.coalesce(func.sum(pending.c.amount), 0))),
+        db.scalar(select(func.count()).select_from(paid)),
+        db.scalar(select(func.count()).select_from(pending)),
+    )
+
+
+def _time(label: str, runs: int, call: Callable[[], object]) -> None:
+    call()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{label:<14} p50={statistics.median(timings):8.2f}ms p99={p99:8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payments", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    rollup_enabled = settings.doctor_payment_rollup_enabled
+    with SessionLocal() as db:
+        doctor, patient = _seed(db, payments=args.payments)
+        rows = rebuild_doctor_payment_rollups(db, doctor_user_id=doctor.id)
+        db.execute(text("ANALYZE payments"))
+        db.execute(text("ANALYZE doctor_payment_daily_rollups"))
+        try:
+            print(f"payments={args.payments} rollup_rows={rows} runs={args.runs}")
+            _time("four-query", args.runs, lambda: _legacy_summary(db, doctor_user_id=doctor.id))
+
+            settings.doctor_payment_rollup_enabled = False
+            single_pass = doctor_financial_summary(db, doctor_user_id=doctor.id)
+            _time("single-pass", args.runs, lambda: doctor_financial_summary(db, doctor_user_id=doctor.id))
+
+            settings.doctor_payment_rollup_enabled = True
+            from_rollup = doctor_financial_summary(db, doctor_user_id=doctor.id)
+            _time("rollup", args.runs, lambda: doctor_financial_summary(db, doctor_user_id=doctor.id))
+
+            if single_pass != from_rollup:
+                print(f"MISMATCH single-pass={single_pass} rollup={from_rollup}")
+        finally:
+            settings.doctor_payment_rollup_enabled = rollup_enabled
+            db.rollback()
+            db.execute(delete(User).where(User.id.in_([doctor.id, patient.id])))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
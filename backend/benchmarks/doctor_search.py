@@ -0,0 +1,122 @@
+"""Search and location-filter the public doctor directory over many profiles.
+
+Needs a migrated database (``DATABASE_URL``); it creates its own doctors and
+deletes them afterwards:
+
+    python -m benchmarks.doctor_search --profiles 100000 --runs 20
+
+Reports latency for ``/doctors/search`` style queries in English and Arabic and
+for the ``city`` substring filter, plus the plan of one search.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db.base import Base
+from app.db.models import ApplicationStatus, DoctorApplication, DoctorProfile, User, UserRole
+from app.db.session import SessionLocal, engine
+from app.services.doctor_directory_service import _public_profile_query, search_doctors
+
+BATCH_SIZE = 5000
+EMAIL_DOMAIN = "bench-doctor-search.dev"
+FIRST_NAMES = ["Mohammad", "Layla", "Omar", "Sara", "Khaled", "Noor", "Yousef", "Huda", "Rami", "Dana"]
+LAST_NAMES = ["Haddad", "Khoury", "Nasser", "Saleh", "Mansour", "Qasem", "Jaber", "Aziz"]
+HEADLINES = [
+    "Anxiety and depression specialist",
+    "Child and adolescent therapist",
+    "Trauma-focused CBT practitioner",
+    "معالج نفسي متخصص في القلق والاكتئاب",
+    "استشاري العلاج الأسري والزواجي",
+]
+BIOS = [
+    "I help adults manage panic attacks, insomnia and burnout with evidence-based therapy.",
+    "Working with families and couples on communication, grief and life transitions.",
+    "أساعد المراجعين على التعامل مع الصدمات واضطرابات النوم والضغط النفسي.",
+]
+CITIES = ["Amman", "Irbid", "Zarqa", "Aqaba", "Dubai", "Riyadh", "Cairo", "Beirut"]
+COUNTRIES = ["Jordan", "United Arab Emirates", "Saudi Arabia", "Egypt", "Lebanon"]
+QUERIES = ["anxiety", "family therapy", "Khou", "insomnia -children", "القلق", "الصدمات"]
+
+
+def _seed(db, *, profiles: int) -> None:
+    for offset in range(0, profiles, BATCH_SIZE):
+        users, applications, rows = [], [], []
+        for index in range(offset, min(offset + BATCH_SIZE, profiles)):
+            user_id = uuid.uuid4()
+            name = f"Dr. {random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}"
+            users.append({"id": user_id, "email": f"doctor{index}@{EMAIL_DOMAIN}", "role": UserRole.DOCTOR})
+            applications.append(
+                {"id": uuid.uuid4(), "doctor_user_id": user_id, "status": ApplicationStatus.APPROVED}
+            )
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "doctor_user_id": user_id,
+                    "slug": f"bench-doctor-{index}",
+                    "display_name": name,
+                    "headline": random.choice(HEADLINES),
+                    "bio": random.choice(BIOS),
+                    "location_city": random.choice(CITIES),
+                    "location_country": random.choice(COUNTRIES),
+                    "is_public": True,
+                }
+            )
+        db.execute(insert(User), users)
+        db.execute(insert(DoctorApplication), applications)
+        db.execute(insert(DoctorProfile), rows)
+    db.commit()
+
+
+def _time(runs: int, call) -> tuple[float, float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        _seed(db, profiles=args.profiles)
+        db.execute(text("ANALYZE doctor_profiles"))
+        try:
+            print(f"profiles={args.profiles} runs={args.runs}")
+            for term in QUERIES:
+                p50, worst = _time(args.runs, lambda: search_doctors(db, q=term, limit=20))
+                print(f"search {term!r:<22} p50={p50:7.2f}ms max={worst:7.2f}ms")
+
+            city_query = _public_profile_query().where(DoctorProfile.location_city.ilike("%mma%")).limit(50)
+            p50, worst = _time(args.runs, lambda: list(db.scalars(city_query)))
+            print(f"city ilike '%mma%'            p50={p50:7.2f}ms max={worst:7.2f}ms")
+
+            plan_query = (
+                select(DoctorProfile.id)
+                .where(DoctorProfile.search_vector.op("@@")(text("websearch_to_tsquery('english', 'anxiety')")))
+                .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            )
+            print("search plan:")
+            for line in db.execute(text(f"EXPLAIN {plan_query}")).scalars():
+                print(f"  {line}")
+        finally:
+            db.rollback()
+            db.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
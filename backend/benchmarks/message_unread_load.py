@@ -0,0 +1,102 @@
+"""Send messages on long-lived threads that already hold thousands of unread rows.
+
+Needs a migrated database (``DATABASE_URL``); it creates its own users and
+deletes them afterwards:
+
+    python -m benchmarks.message_unread_load --threads 5 --unread 5000 --sends 200
+
+Reports ``send_message`` latency percentiles and the plan of the notify-once
+probe, which should be an index-only scan of ``ix_messages_unread_receiver_sender``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, insert, text
+
+from app.db.base import Base
+from app.db.models import Message, MessageThread, User, UserRole
+from app.db.session import SessionLocal, engine
+from app.services.messaging_service import send_message, thread_key
+
+
+def _seed(db, *, threads: int, unread: int) -> tuple[User, list[User]]:
+    receiver = User(email=f"bench-receiver-{uuid.uuid4().hex[:8]}@bench.dev", role=UserRole.USER)
+    senders = [
+        User(email=f"bench-sender-{uuid.uuid4().hex[:8]}@bench.dev", role=UserRole.DOCTOR) for _ in range(threads)
+    ]
+    db.add_all([receiver, *senders])
+    db.flush()
+
+    started = datetime.now(UTC) - timedelta(days=365)
+    for sender in senders:
+        low, high = thread_key(sender.id, receiver.id)
+        thread = MessageThread(user_low_id=low, user_high_id=high, last_message_at=started)
+        db.add(thread)
+        db.flush()
+        db.execute(
+            insert(Message),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "thread_id": thread.id,
+                    "sender_user_id": sender.id,
+                    "receiver_user_id": receiver.id,
+                    "body": f"backlog message {index}",
+                    "created_at": started + timedelta(minutes=index),
+                }
+                for index in range(unread)
+            ],
+        )
+    db.commit()
+    return receiver, senders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=5)
+    parser.add_argument("--unread", type=int, default=5000, help="unread messages per thread")
+    parser.add_argument("--sends", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        receiver, senders = _seed(db, threads=args.threads, unread=args.unread)
+        db.execute(text("ANALYZE messages"))
+        try:
+            timings: list[float] = []
+            for _ in range(args.sends):
+                sender = random.choice(senders)
+                started = time.perf_counter()
+                send_message(db, sender_user=sender, receiver_user_id=receiver.id, subject=None, body="ping")
+                timings.append((time.perf_counter() - started) * 1000)
+
+            plan = db.execute(
+                text(
+                    "EXPLAIN SELECT id FROM messages "
+                    "WHERE receiver_user_id = :receiver AND sender_user_id = :sender AND read_at IS NULL LIMIT 1"
+                ),
+                {"receiver": receiver.id, "sender": senders[0].id},
+            ).scalars()
+
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            print(f"threads={args.threads} unread_per_thread={args.unread} sends={args.sends}")
+            print(f"send_message p50={statistics.median(timings):.2f}ms p99={p99:.2f}ms max={timings[-1]:.2f}ms")
+            print("notify-once probe plan:")
+            for line in plan:
+                print(f"  {line}")
+        finally:
+            db.rollback()
+            db.execute(delete(User).where(User.id.in_([receiver.id, *[sender.id for sender in senders]])))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Resize doctor photos into WebP variants and report throughput and page weight.
+
+No database needed:
+
+    python -m benchmarks.photo_variants --photos 50 --cards 20
+
+Generates camera-sized (3000x2000) JPEGs with detail at every scale, runs ``render_webp_variants`` on each and prints how
+many photos per second one process handles plus what a directory page of
+``--cards`` cards weighs with original photos versus the small variant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from app.services.image_variants import render_webp_variants
+
+
+def _photo(path: Path, seed: int) -> None:
+    rng = random.Random(seed)
+    image = Image.new("RGB", (3000, 2000), tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    # Shapes at every scale keep detail in the small variants too; noise stands in for sensor grain.
+    for _ in range(400):
+        x, y, size = rng.randrange(3000), rng.randrange(2000), rng.choice((8, 40, 200, 800))
+        draw.ellipse((x, y, x + size, y + size * rng.uniform(0.5, 1.5)), fill=tuple(rng.randrange(256) for _ in range(3)))
+    grain = Image.effect_noise(image.size, 24).convert("RGB")
+    Image.blend(image, grain, 0.15).save(path, format="JPEG", quality=90)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=50)
+    parser.add_argument("--cards", type=int, default=20, help="cards on one directory page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [Path(directory) / f"photo-{index}.jpg" for index in range(args.photos)]
+        for index, path in enumerate(paths):
+            _photo(path, index)
+        original_sizes = [os.path.getsize(path) for path in paths]
+
+        render_webp_variants(str(paths[0]))  # warm imports
+        started = time.perf_counter()
+        variants = [render_webp_variants(str(path)) for path in paths]
+        elapsed = time.perf_counter() - started
+
+    average = {name: sum(len(item[name]) for item in variants) / len(variants) for name in variants[0]}
+    average_original = sum(original_sizes) / len(original_sizes)
+    print(f"photos={args.photos}  {args.photos / elapsed:.1f} photos/s  {elapsed / args.photos * 1000:.1f}ms each")
+    print(f"original  avg {average_original / 1024:8.1f}KiB")
+    for name, size in average.items():
+        print(f"{name:<9} avg {size / 1024:8.1f}KiB")
+    print(
+        f"directory page ({args.cards} cards): {args.cards * average_original / 1024 / 1024:.1f}MiB originals -> "
+        f"{args.cards * average['small'] / 1024:.1f}KiB small variants"
+    )
+
+
+if __name__ == "__main__":
+    main()
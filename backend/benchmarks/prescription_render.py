@@ -0,0 +1,147 @@
+"""Render prescription PDFs back to back and report prescriptions per second.
+
+No database needed:
+
+    python -m benchmarks.prescription_render --count 500
+    python -m benchmarks.prescription_render --count 500 --workers 4
+
+Compares the template renderer (``render_prescription_pdf``: cached static
+layer as a form XObject, vector QR) with the previous per-document renderer,
+reproduced below as ``_baseline_render``, which redrew every label and embedded
+the QR code as a PNG. ``--workers`` also runs the template renderer through a
+process pool the size of the render pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from app.services.prescription_pdf import PrescriptionDocument, qr_png_bytes, render_prescription_pdf
+
+
+def _documents(count: int) -> list[PrescriptionDocument]:
+    issued_at = datetime.now(UTC)
+    documents = []
+    for index in range(count):
+        prescription_id = uuid.uuid4()
+        code = f"RX-{uuid.uuid4().hex[:10].upper()}"
+        documents.append(
+            PrescriptionDocument(
+                prescription_id=prescription_id,
+                doctor_name=f"Dr. Bench {index % 50}",
+                doctor_email=f"doctor{index % 50}@bench-prescriptions.dev",
+                patient_name=f"Patient {index}",
+                patient_email=f"patient{index}@bench-prescriptions.dev",
+                medication_name="Sertraline",
+                dosage="50mg once daily",
+                instructions="Take in the morning with food.\nReview after four weeks.",
+                quantity="30 tablets",
+                issued_at=issued_at,
+                valid_until=issued_at + timedelta(days=30),
+                verification_code=code,
+                verification_url=f"https://sabina.example/prescriptions/verify/{prescription_id}?code={code}",
+                data_hash=uuid.uuid4().hex * 2,
+            )
+        )
+    return documents
+
+
+def _baseline_render(document: PrescriptionDocument) -> bytes:
+    qr_img = ImageReader(io.BytesIO(qr_png_bytes(document.verification_url)))
+    output = io.BytesIO()
+    pdf = canvas.Canvas(output, pagesize=A4)
+    width, height = A4
+
+    y = height - 22 * mm
+    pdf.setFont("Helvetica-Bold", 18)
+    pdf.drawString(18 * mm, y, "Medication Prescription")
+    y -= 10 * mm
+    pdf.setFont("Helvetica", 10)
+    pdf.drawString(18 * mm, y, f"Prescription ID: {document.prescription_id}")
+    y -= 6 * mm
+    pdf.drawString(18 * mm, y, f"Issued at (UTC): {document.issued_at.isoformat()}")
+    if document.valid_until:
+        y -= 6 * mm
+        pdf.drawString(18 * mm, y, f"Valid until (UTC): {document.valid_until.isoformat()}")
+    for section, rows in (
+        ("Doctor", (f"Name: {document.doctor_name}", f"Email: {document.doctor_email or 'N/A'}")),
+        ("Patient", (f"Name: {document.patient_name}", f"Email: {document.patient_email or 'N/A'}")),
+        (
+            "Medication",
+            (
+                f"Medicine: {document.medication_name}",
+                f"Dosage: {document.dosage}",
+                f"Quantity: {document.quantity}",
+                "Instructions:",
+            ),
+        ),
+    ):
+        y -= 10 * mm
+        pdf.setFont("Helvetica-Bold", 12)
+        pdf.drawString(18 * mm, y, section)
+        pdf.setFont("Helvetica", 10)
+        for row in rows:
+            y -= 6 * mm
+            pdf.drawString(18 * mm, y, row)
+    y -= 5 * mm
+    text = pdf.beginText(20 * mm, y)
+    text.setFont("Helvetica", 10)
+    for line in document.instructions.splitlines() or ["N/A"]:
+        text.textLine(line[:140])
+    pdf.drawText(text)
+
+    pdf.setFont("Helvetica-Bold", 11)
+    pdf.drawString(18 * mm, 44 * mm, "Pharmacy Verification QR")
+    pdf.setFont("Helvetica", 9)
+    pdf.drawString(18 * mm, 39 * mm, "Scan to verify prescription authenticity")
+    pdf.drawString(18 * mm, 34 * mm, f"Verification code: {document.verification_code}")
+    pdf.drawString(18 * mm, 29 * mm, f"Data hash: {document.data_hash}")
+    pdf.drawImage(qr_img, width - 65 * mm, 20 * mm, width=40 * mm, height=40 * mm, mask="auto")
+    pdf.showPage()
+    pdf.save()
+    return output.getvalue()
+
+
+def _run(label: str, render, documents: list[PrescriptionDocument]) -> None:
+    render(documents[0])  # warm caches and imports
+    started = time.perf_counter()
+    sizes = [len(pdf) for pdf in map(render, documents)]
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<10} {len(documents) / elapsed:8.1f} prescriptions/s  "
+        f"{elapsed / len(documents) * 1000:6.2f}ms each  avg size={sum(sizes) / len(sizes) / 1024:.1f}KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=0, help="also render through a process pool of this size")
+    args = parser.parse_args()
+
+    documents = _documents(args.count)
+    print(f"count={args.count}")
+    _run("baseline", _baseline_render, documents)
+    _run("template", render_prescription_pdf, documents)
+
+    if args.workers > 0:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(render_prescription_pdf, documents[: args.workers]))
+            started = time.perf_counter()
+            list(pool.map(render_prescription_pdf, documents, chunksize=8))
+            elapsed = time.perf_counter() - started
+        print(f"{'pool x' + str(args.workers):<10} {len(documents) / elapsed:8.1f} prescriptions/s")
+
+
+if __name__ == "__main__":
+    main()
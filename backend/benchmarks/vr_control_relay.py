@@ -0,0 +1,119 @@
+"""Simulate many concurrent VR sessions where the doctor scrubs the timeline.
+
+In-process load harness for ``VRSessionBroker`` with the in-memory backend and
+patient sockets that add a fixed link latency:
+
+    python -m benchmarks.vr_control_relay --sessions 500 --coalesce-ms 50
+    python -m benchmarks.vr_control_relay --sessions 500 --coalesce-ms 0
+
+Reports control events in vs frames relayed, frames dropped by slow links, and
+how far the patient's last applied position lags the doctor's final seek.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.vr_session_broker import InMemoryVRSessionBackend, VRSessionBroker
+
+
+class LinkSocket:
+    __slots__ = ("latency", "frames", "last_seek", "last_frame_at")
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.frames = 0
+        self.last_seek: float | None = None
+        self.last_frame_at = 0.0
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_json(self, payload: dict) -> None:
+        await asyncio.sleep(self.latency)
+        self.frames += 1
+        self.last_frame_at = time.perf_counter()
+        if payload.get("type") == "CONTROL" and payload["payload"].get("command") == "seek":
+            self.last_seek = payload["payload"]["time"]
+
+
+async def _scrub(broker: VRSessionBroker, session_id: str, *, rate: float, duration: float) -> tuple[float, float]:
+    position = 0.0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        position += random.uniform(-2, 5)
+        await broker.handle_message(
+            session_id=session_id,
+            role="doctor",
+            data={"type": "CONTROL", "payload": {"command": "seek", "time": round(position, 3)}},
+        )
+        await asyncio.sleep(1 / rate)
+    return round(position, 3), time.perf_counter()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    broker = VRSessionBroker(
+        backend=InMemoryVRSessionBackend(),
+        ttl_seconds=600,
+        reconnect_grace_seconds=60,
+        sweep_interval_seconds=600,
+        peer_queue_size=args.queue_size,
+        control_coalesce_seconds=args.coalesce_ms / 1000,
+    )
+    sessions = []
+    for _ in range(args.sessions):
+        record = await broker.create_session(doctor_id="doctor", patient_id="patient")
+        patient = LinkSocket(latency=random.uniform(0, args.max_latency_ms / 1000))
+        peer = await broker.join(session_id=record.session_id, role="patient", websocket=patient)
+        await broker.join(session_id=record.session_id, role="doctor", websocket=LinkSocket(latency=0))
+        sessions.append((record.session_id, patient, peer))
+
+    finals = await asyncio.gather(
+        *(_scrub(broker, session_id, rate=args.rate, duration=args.duration) for session_id, _, _ in sessions)
+    )
+    await asyncio.sleep(args.coalesce_ms / 1000)
+    # Let slow links drain their queues before measuring.
+    while any(not peer.queue.empty() for _, _, peer in sessions):
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(args.max_latency_ms / 1000 + 0.05)
+
+    in_sync = sum(1 for (final, _), (_, patient, _) in zip(finals, sessions) if patient.last_seek == final)
+    lags_ms = [
+        (patient.last_frame_at - finished_at) * 1000
+        for (_, finished_at), (_, patient, _) in zip(finals, sessions)
+        if patient.last_frame_at >= finished_at
+    ]
+    dropped = sum(peer.dropped for _, _, peer in sessions)
+    lags_ms.sort()
+
+    print(
+        f"sessions={args.sessions} rate={args.rate}/s duration={args.duration}s "
+        f"coalesce={args.coalesce_ms}ms max_latency={args.max_latency_ms}ms"
+    )
+    print(
+        f"control_events_in={broker.control_events_in} frames_relayed={broker.control_frames_out} "
+        f"reduction={1 - broker.control_frames_out / max(1, broker.control_events_in):.1%} dropped={dropped}"
+    )
+    print(f"patients_on_final_position={in_sync}/{args.sessions}")
+    if lags_ms:
+        p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+        print(f"final_frame_lag p50={statistics.median(lags_ms):.1f}ms p99={p99:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=30.0, help="seek events per second per doctor")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--coalesce-ms", type=int, default=50)
+    parser.add_argument("--max-latency-ms", type=int, default=120)
+    parser.add_argument("--queue-size", type=int, default=64)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Hold N idle notification sockets and report memory/CPU of the keepalive path.
+
+Runs fully in-process against ``NotificationRealtimeHub`` with in-memory sockets,
+so it needs neither a database nor a running server:
+
+    python -m benchmarks.ws_idle_connections --connections 10000 --rotations 3
+    python -m benchmarks.ws_idle_connections --mode legacy
+
+``wheel`` uses the hub's shared heartbeat scheduler; ``legacy`` reproduces the
+previous one ``asyncio.wait_for`` timer per connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import time
+import tracemalloc
+
+from app.services.notification_realtime import HeartbeatWheel, NotificationRealtimeHub
+
+
+class IdleSocket:
+    """Websocket stand-in that never receives and counts outbound frames."""
+
+    __slots__ = ("frames", "_closed")
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self._closed = asyncio.Event()
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_json(self, payload: dict) -> None:
+        self.frames += 1
+
+    async def receive_text(self) -> str:
+        await self._closed.wait()
+        raise RuntimeError("closed")
+
+
+async def _run_wheel(connections: int, interval: float, rotations: int, slots: int, batch: int) -> int:
+    hub = NotificationRealtimeHub()
+    hub.heartbeat = HeartbeatWheel(
+        interval_seconds=interval,
+        slots=slots,
+        batch_size=batch,
+        payload={"type": "notifications:ping"},
+        on_stale=hub._drop_stale,
+    )
+    sockets = [IdleSocket() for _ in range(connections)]
+    for index, websocket in enumerate(sockets):
+        await hub.connect(user_id=f"user-{index}", websocket=websocket)
+
+    hub.attach_loop(asyncio.get_running_loop())
+    await asyncio.sleep(interval * rotations)
+    await hub.shutdown()
+    return sum(websocket.frames for websocket in sockets)
+
+
+async def _legacy_socket(websocket: IdleSocket, interval: float) -> None:
+    while True:
+        try:
+            await asyncio.wait_for(websocket.receive_text(), timeout=interval)
+        except asyncio.TimeoutError:
+            await websocket.send_json({"type": "notifications:ping"})
+
+
+async def _run_legacy(connections: int, interval: float, rotations: int) -> int:
+    sockets = [IdleSocket() for _ in range(connections)]
+    tasks = [asyncio.create_task(_legacy_socket(websocket, interval)) for websocket in sockets]
+    await asyncio.sleep(interval * rotations)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return sum(websocket.frames for websocket in sockets)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["wheel", "legacy"], default="wheel")
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--interval", type=float, default=1.0, help="heartbeat interval in seconds")
+    parser.add_argument("--rotations", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=25)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    if args.mode == "wheel":
+        pings = asyncio.run(_run_wheel(args.connections, args.interval, args.rotations, args.slots, args.batch))
+    else:
+        pings = asyncio.run(_run_legacy(args.connections, args.interval, args.rotations))
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"mode={args.mode} connections={args.connections} interval={args.interval}s rotations={args.rotations}")
+    print(f"pings_sent={pings} wall={wall:.2f}s cpu={cpu:.2f}s cpu_util={cpu / wall:.1%}")
+    print(f"python_heap_peak={peak / 1024 / 1024:.1f}MB max_rss={max_rss_mb:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
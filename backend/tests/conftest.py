@@ -1,10 +1,11 @@
 import os
 from collections.abc import Generator
+from contextlib import contextmanager
 from io import BytesIO
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 # Must be set before importing app modules that read settings.
 os.environ.setdefault(
@@ -17,10 +18,19 @@ os.environ.setdefault(
 os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
 os.environ.setdefault("SEED_ADMIN_EMAIL", "admin@sabina.dev")
 os.environ.setdefault("SEED_ADMIN_PASSWORD", "Admin12345!")
+# Resize photos on a thread: approvals in tests should not spawn worker processes.
+os.environ.setdefault("PHOTO_VARIANT_WORKERS", "0")
 
+from app.core.config import settings  # noqa: E402
 from app.db.base import Base  # noqa: E402
+from app.core.deps import user_status_cache  # noqa: E402
 from app.core.security import auth_rate_limiter  # noqa: E402
+from app.db.session import engine as app_engine  # noqa: E402
 from app.main import app  # noqa: E402
+from app.services.bookability_service import doctor_bookability_cache  # noqa: E402
+from app.services import zoom_service  # noqa: E402
+from app.services.reports_service import financial_report_cache  # noqa: E402
+from tests.fake_zoom import FakeZoom  # noqa: E402
 
 
 @pytest.fixture()
@@ -30,15 +40,52 @@ def client() -> Generator[TestClient, None, None]:
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     auth_rate_limiter.reset()
+    user_status_cache.reset()
+    financial_report_cache.reset()
+    doctor_bookability_cache.reset()
 
     with TestClient(app) as c:
         yield c
 
     auth_rate_limiter.reset()
+    user_status_cache.reset()
+    financial_report_cache.reset()
+    doctor_bookability_cache.reset()
     Base.metadata.drop_all(bind=engine)
     engine.dispose()
 
 
+@pytest.fixture()
+def fake_zoom(monkeypatch) -> Generator[FakeZoom, None, None]:
+    """Configure Zoom and route its HTTP calls to an in-process fake."""
+    fake = FakeZoom()
+    monkeypatch.setattr(settings, "video_provider", "ZOOM")
+    monkeypatch.setattr(settings, "zoom_account_id", "fake-account")
+    monkeypatch.setattr(settings, "zoom_client_id", "fake-client")
+    monkeypatch.setattr(settings, "zoom_client_secret", "fake-secret")
+    monkeypatch.setattr(settings, "zoom_oauth_url", "https://zoom.fake/oauth/token")
+    monkeypatch.setattr(settings, "zoom_api_base_url", "https://zoom.fake/v2")
+    monkeypatch.setattr(zoom_service.zoom_client, "transport", fake.transport())
+    zoom_service.zoom_client.reset()
+    yield fake
+    zoom_service.zoom_client.reset()
+
+
+@contextmanager
+def count_queries() -> Generator[list[str], None, None]:
+    """Collect every SQL statement the app engine executes inside the block."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(app_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(app_engine, "before_cursor_execute", _record)
+
+
 def register(client: TestClient, email: str, password: str, role: str):
     payload = {"email": email, "password": password, "role": role}
     if role == "USER":
@@ -0,0 +1,54 @@
+"""In-process stand-in for the Zoom OAuth and meetings APIs.
+
+Tests route ``zoom_service`` to it through ``httpx.ASGITransport`` (see the
+``fake_zoom`` fixture); it can also be served for manual runs with
+``uvicorn tests.fake_zoom:app --port 8765`` and ``ZOOM_OAUTH_URL`` /
+``ZOOM_API_BASE_URL`` pointed at it.
+"""
+
+from __future__ import annotations
+
+import httpx
+from fastapi import FastAPI, Header, HTTPException, Request
+
+
+class FakeZoom:
+    def __init__(self) -> None:
+        self.tokens_issued = 0
+        self.meetings: list[dict] = []
+        # Number of upcoming meeting creations to fail with 503.
+        self.fail_meetings = 0
+        self.token_expires_in = 3599
+        self._tokens: set[str] = set()
+        self.app = FastAPI()
+        self.app.post("/oauth/token")(self._token)
+        self.app.post("/v2/users/{host_user}/meetings", status_code=201)(self._create_meeting)
+
+    def transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.app)
+
+    async def _token(self, grant_type: str, account_id: str, authorization: str = Header(default="")):
+        if grant_type != "account_credentials" or not account_id or not authorization.startswith("Basic "):
+            raise HTTPException(status_code=400, detail="invalid_request")
+        self.tokens_issued += 1
+        token = f"fake-token-{self.tokens_issued}"
+        self._tokens.add(token)
+        return {"access_token": token, "token_type": "bearer", "expires_in": self.token_expires_in}
+
+    def revoke_tokens(self) -> None:
+        self._tokens.clear()
+
+    async def _create_meeting(self, host_user: str, request: Request, authorization: str = Header(default="")):
+        if authorization.removeprefix("Bearer ") not in self._tokens:
+            raise HTTPException(status_code=401, detail="Invalid access token")
+        if self.fail_meetings > 0:
+            self.fail_meetings -= 1
+            raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+        body = await request.json()
+        meeting_id = 9000000000 + len(self.meetings) + 1
+        meeting = {**body, "id": meeting_id, "host_user": host_user, "join_url": f"https://zoom.fake/j/{meeting_id}"}
+        self.meetings.append(meeting)
+        return meeting
+
+
+app = FakeZoom().app
@@ -1,6 +1,13 @@
+import uuid
 from io import BytesIO
 
-from tests.conftest import auth_headers, register
+from sqlalchemy import func, select, update
+
+from app.api.routes import admin as admin_routes
+from app.core.config import settings
+from app.db.models import AdminAction, DoctorApplication, DoctorAvailabilityRule, Notification
+from app.db.session import SessionLocal
+from tests.conftest import auth_headers, count_queries, register
 
 
 def _create_submitted_application(client, email: str):
@@ -105,3 +112,123 @@ def test_security_user_and_doctor_cannot_access_admin_endpoints(client, admin_to
 
     doctor_forbidden = client.get("/admin/applications", headers=auth_headers(doctor_token))
     assert doctor_forbidden.status_code == 403
+
+
+def test_admin_application_listing_is_batched_and_paginated(client, admin_token):
+    _create_submitted_application(client, "batched.one@testmail.dev")
+    with count_queries() as single:
+        res = client.get("/admin/applications", headers=auth_headers(admin_token))
+    assert res.status_code == 200, res.text
+    assert len(res.json()) == 1
+    assert res.json()[0]["verification_status"] == "PENDING"
+    assert len(res.json()[0]["documents"]) == 3
+
+    _create_submitted_application(client, "batched.two@testmail.dev")
+    _create_submitted_application(client, "batched.three@testmail.dev")
+    with count_queries() as several:
+        res = client.get("/admin/applications", headers=auth_headers(admin_token))
+    assert res.status_code == 200, res.text
+    assert len(res.json()) == 3
+    assert all(len(item["documents"]) == 3 for item in res.json())
+    assert len(several) == len(single)
+
+    first_page = client.get("/admin/applications", headers=auth_headers(admin_token), params={"limit": 2})
+    assert first_page.status_code == 200, first_page.text
+    assert len(first_page.json()) == 2
+    second_page = client.get(
+        "/admin/applications",
+        headers=auth_headers(admin_token),
+        params={"limit": 2, "cursor": first_page.headers["X-Next-Cursor"]},
+    )
+    assert second_page.status_code == 200, second_page.text
+    assert len(second_page.json()) == 1
+    assert "X-Next-Cursor" not in second_page.headers
+    seen = {item["id"] for item in first_page.json() + second_page.json()}
+    assert seen == {item["id"] for item in res.json()}
+
+
+
+def test_bulk_review_approves_in_batches_and_reports_every_item(client, admin_token, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_review_batch_size", 2)
+    app_ids = [
+        _create_submitted_application(client, f"bulk.{index}@testmail.dev")[1] for index in range(3)
+    ]
+    with SessionLocal() as db:
+        db.execute(
+            update(DoctorApplication)
+            .where(DoctorApplication.id.in_(app_ids))
+            .values(schedule=[{"day": "MONDAY", "start": "09:00", "end": "12:00"}, {"day": "TUESDAY", "start": "10:00", "end": "11:00"}])
+        )
+        # One application is missing a required field and must be reported, not approved.
+        db.execute(update(DoctorApplication).where(DoctorApplication.id == app_ids[2]).values(license_number=None))
+        db.commit()
+    missing_id = str(uuid.uuid4())
+
+    res = client.post(
+        "/admin/applications/bulk-review",
+        headers=auth_headers(admin_token),
+        json={"action": "APPROVE", "application_ids": [*app_ids, missing_id, app_ids[0]], "note": "Clinic onboarding"},
+    )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert (body["total"], body["succeeded"], body["failed"], body["batches"]) == (4, 2, 2, 2)
+    outcomes = [item["outcome"] for item in body["items"]]
+    assert outcomes == ["APPROVED", "APPROVED", "INVALID", "NOT_FOUND"]
+    assert "license_number" in body["items"][2]["detail"]["missing"]
+    # Same display name, one allocation query per batch, still unique.
+    assert [item["slug"] for item in body["items"][:2]] == ["dr-approved", "dr-approved-2"]
+
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count()).select_from(DoctorAvailabilityRule)) == 4
+        assert db.scalar(
+            select(func.count()).select_from(AdminAction).where(AdminAction.action_type == "APPLICATION_APPROVED")
+        ) == 2
+        assert db.scalar(
+            select(func.count())
+            .select_from(Notification)
+            .where(Notification.event_type == "APPLICATION_BULK_APPROVAL_COMPLETED")
+        ) == 1
+    for item in body["items"][:2]:
+        assert client.get(f"/doctors/slug/{item['slug']}").status_code == 200
+
+    rejected = client.post(
+        "/admin/applications/bulk-review",
+        headers=auth_headers(admin_token),
+        json={"action": "REJECT", "application_ids": [app_ids[2]], "reason": "Incomplete license"},
+    )
+    assert rejected.status_code == 200, rejected.text
+    assert rejected.json()["items"][0]["outcome"] == "REJECTED"
+    application = client.get(f"/admin/applications/{app_ids[2]}", headers=auth_headers(admin_token)).json()
+    assert application["status"] == "REJECTED"
+
+    no_reason = client.post(
+        "/admin/applications/bulk-review",
+        headers=auth_headers(admin_token),
+        json={"action": "REJECT", "application_ids": [app_ids[2]]},
+    )
+    assert no_reason.status_code == 422
+
+
+def test_bulk_review_query_count_does_not_grow_with_the_batch(client, admin_token, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_review_batch_size", 50)
+
+    async def _skip_photo_variants(doctor_user_id):
+        return False
+
+    # Photo variants are a per-doctor background task, not part of the review itself.
+    monkeypatch.setattr(admin_routes, "build_profile_photo_variants", _skip_photo_variants)
+    small = [_create_submitted_application(client, f"small.{index}@testmail.dev")[1] for index in range(2)]
+    large = [_create_submitted_application(client, f"large.{index}@testmail.dev")[1] for index in range(6)]
+
+    def approve(ids):
+        with count_queries() as statements:
+            res = client.post(
+                "/admin/applications/bulk-review",
+                headers=auth_headers(admin_token),
+                json={"action": "APPROVE", "application_ids": ids},
+            )
+        assert res.status_code == 200, res.text
+        assert res.json()["succeeded"] == len(ids)
+        return statements
+
+    assert len(approve(large)) == len(approve(small))
@@ -100,6 +100,24 @@ def test_admin_users_list_and_detail(client, admin_token):
     assert len(search_payload) >= 1
     assert all("user-one" in (item["email"] or "") for item in search_payload)
 
+    first_page = client.get("/admin/users", headers=auth_headers(admin_token), params={"limit": 1})
+    assert first_page.status_code == 200, first_page.text
+    assert len(first_page.json()) == 1
+    next_cursor = first_page.headers["X-Next-Cursor"]
+    second_page = client.get(
+        "/admin/users", headers=auth_headers(admin_token), params={"limit": 1, "cursor": next_cursor}
+    )
+    assert second_page.status_code == 200, second_page.text
+    assert len(second_page.json()) == 1
+    assert second_page.json()[0]["id"] != first_page.json()[0]["id"]
+
+    id_search = client.get("/admin/users", headers=auth_headers(admin_token), params={"search": user_one_id})
+    assert id_search.status_code == 200, id_search.text
+    assert [item["id"] for item in id_search.json()] == [user_one_id]
+
+    bad_cursor = client.get("/admin/users", headers=auth_headers(admin_token), params={"cursor": "not-a-cursor"})
+    assert bad_cursor.status_code == 400
+
     detail_res = client.get(f"/admin/users/{user_one_id}", headers=auth_headers(admin_token))
     assert detail_res.status_code == 200, detail_res.text
 
@@ -1,6 +1,17 @@
-from datetime import date, timedelta
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime, timedelta
 
-from tests.conftest import auth_headers, register, submit_psychiatrist_application
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+
+from app.db.models import Appointment, AppointmentStatus, SlotHold, User, UserRole
+from app.db.session import SessionLocal
+from app.services.appointment_service import confirm_appointment
+from app.services.slot_hold_service import sweep_expired_holds
+
+from tests.conftest import auth_headers, count_queries, register, submit_psychiatrist_application
 
 
 def _next_weekday(start: date, weekday: int) -> date:
@@ -98,3 +109,211 @@ def test_availability_booking_conflict_and_cancellation(client, admin_token):
     )
     assert cancel_by_user.status_code == 200, cancel_by_user.text
     assert cancel_by_user.json()["status"] == "CANCELLED"
+
+
+def test_booking_reads_cached_schedule_and_sees_invalidations(client, admin_token):
+    doctor_token, doctor_user_id = _setup_approved_doctor(
+        client, admin_token, "doctor-booking-cache@testmail.dev"
+    )
+    target_day = _next_weekday(date.today() + timedelta(days=1), 2)
+    rules = [
+        {
+            "day_of_week": target_day.weekday(),
+            "start_time": "09:00:00",
+            "end_time": "13:00:00",
+            "timezone": "Asia/Amman",
+            "slot_duration_minutes": 50,
+            "buffer_minutes": 10,
+        }
+    ]
+    set_rules = client.post("/doctor/availability/rules", headers=auth_headers(doctor_token), json=rules)
+    assert set_rules.status_code == 200, set_rules.text
+    slots = client.get(
+        f"/doctors/{doctor_user_id}/availability",
+        params={"date_from": target_day.isoformat(), "date_to": target_day.isoformat()},
+    ).json()
+    assert len(slots) == 4
+
+    register(client, "cache-user@testmail.dev", "UserPass123!", "USER")
+    user_token = client.post(
+        "/auth/login", json={"email": "cache-user@testmail.dev", "password": "UserPass123!"}
+    ).json()["access_token"]
+
+    def book(start_at: str):
+        return client.post(
+            "/appointments/request",
+            headers=auth_headers(user_token),
+            json={"doctor_user_id": doctor_user_id, "start_at": start_at, "timezone": "Asia/Amman"},
+        )
+
+    assert book(slots[0]["start_at"]).status_code == 200
+    with count_queries() as statements:
+        warm = book(slots[1]["start_at"])
+    assert warm.status_code == 200, warm.text
+    schedule_tables = ("doctor_profiles", "doctor_applications", "doctor_availability_rules")
+    assert not [sql for sql in statements if any(table in sql for table in schedule_tables)]
+
+    rules[0]["end_time"] = "11:00:00"
+    set_rules = client.post("/doctor/availability/rules", headers=auth_headers(doctor_token), json=rules)
+    assert set_rules.status_code == 200, set_rules.text
+    shrunk = book(slots[3]["start_at"])
+    assert shrunk.status_code == 400, shrunk.text
+
+    hidden = client.post(
+        f"/admin/doctors/{doctor_user_id}/toggle-public",
+        headers=auth_headers(admin_token),
+        json={"is_public": False},
+    )
+    assert hidden.status_code == 200, hidden.text
+    not_bookable = book(slots[2]["start_at"])
+    assert not_bookable.status_code == 404
+    assert not_bookable.json()["detail"] == "Doctor is not bookable"
+
+
+def test_concurrent_confirms_of_one_slot_leave_a_single_confirmed_appointment(client, admin_token):
+    doctor_token, doctor_user_id = _setup_approved_doctor(
+        client, admin_token, "doctor-confirm-race@testmail.dev"
+    )
+    target_day = _next_weekday(date.today() + timedelta(days=1), 3)
+    set_rules = client.post(
+        "/doctor/availability/rules",
+        headers=auth_headers(doctor_token),
+        json=[
+            {
+                "day_of_week": target_day.weekday(),
+                "start_time": "09:00:00",
+                "end_time": "10:00:00",
+                "timezone": "Asia/Amman",
+                "slot_duration_minutes": 50,
+                "buffer_minutes": 10,
+            }
+        ],
+    )
+    assert set_rules.status_code == 200, set_rules.text
+    slot = client.get(
+        f"/doctors/{doctor_user_id}/availability",
+        params={"date_from": target_day.isoformat(), "date_to": target_day.isoformat()},
+    ).json()[0]
+
+    contenders = 12
+    with SessionLocal() as db:
+        patients = [User(email=f"race-{index}@testmail.dev", role=UserRole.USER) for index in range(contenders)]
+        db.add_all(patients)
+        db.flush()
+        # Requests that slipped past the request-time check, as racing bookings can.
+        appointments = [
+            Appointment(
+                doctor_user_id=uuid.UUID(doctor_user_id),
+                user_id=patient.id,
+                start_at=datetime.fromisoformat(slot["start_at"]),
+                end_at=datetime.fromisoformat(slot["end_at"]),
+                timezone="Asia/Amman",
+                status=AppointmentStatus.REQUESTED,
+            )
+            for patient in patients
+        ]
+        db.add_all(appointments)
+        db.commit()
+        appointment_ids = [appointment.id for appointment in appointments]
+
+    barrier = threading.Barrier(contenders)
+
+    def confirm(appointment_id) -> int:
+        with SessionLocal() as db:
+            doctor_user = db.get(User, uuid.UUID(doctor_user_id))
+            barrier.wait()
+            try:
+                confirm_appointment(db, appointment_id, doctor_user)
+            except HTTPException as exc:
+                return exc.status_code
+            return 200
+
+    with ThreadPoolExecutor(max_workers=contenders) as pool:
+        outcomes = list(pool.map(confirm, appointment_ids))
+
+    assert sorted(outcomes) == [200] + [409] * (contenders - 1)
+    with SessionLocal() as db:
+        confirmed = db.scalar(
+            select(func.count())
+            .select_from(Appointment)
+            .where(
+                Appointment.doctor_user_id == uuid.UUID(doctor_user_id),
+                Appointment.status == AppointmentStatus.CONFIRMED,
+            )
+        )
+    assert confirmed == 1
+
+
+def test_slot_holds_block_other_patients_until_booked_or_expired(client, admin_token):
+    doctor_token, doctor_user_id = _setup_approved_doctor(client, admin_token, "doctor-holds@testmail.dev")
+    target_day = _next_weekday(date.today() + timedelta(days=1), 4)
+    set_rules = client.post(
+        "/doctor/availability/rules",
+        headers=auth_headers(doctor_token),
+        json=[
+            {
+                "day_of_week": target_day.weekday(),
+                "start_time": "09:00:00",
+                "end_time": "11:00:00",
+                "timezone": "Asia/Amman",
+                "slot_duration_minutes": 50,
+                "buffer_minutes": 10,
+            }
+        ],
+    )
+    assert set_rules.status_code == 200, set_rules.text
+
+    def slot_statuses():
+        return [
+            slot["status"]
+            for slot in client.get(
+                f"/doctors/{doctor_user_id}/availability",
+                params={"date_from": target_day.isoformat(), "date_to": target_day.isoformat()},
+            ).json()
+        ]
+
+    def user_token(email: str) -> str:
+        register(client, email, "UserPass123!", "USER")
+        return client.post("/auth/login", json={"email": email, "password": "UserPass123!"}).json()["access_token"]
+
+    first_token = user_token("holder-one@testmail.dev")
+    second_token = user_token("holder-two@testmail.dev")
+    slots = client.get(
+        f"/doctors/{doctor_user_id}/availability",
+        params={"date_from": target_day.isoformat(), "date_to": target_day.isoformat()},
+    ).json()
+    payload = {"doctor_user_id": doctor_user_id, "start_at": slots[0]["start_at"]}
+
+    held = client.post("/appointments/holds", headers=auth_headers(first_token), json=payload)
+    assert held.status_code == 200, held.text
+    assert slot_statuses() == ["held", "available"]
+
+    taken = client.post("/appointments/holds", headers=auth_headers(second_token), json=payload)
+    assert taken.status_code == 409, taken.text
+    blocked = client.post(
+        "/appointments/request",
+        headers=auth_headers(second_token),
+        json={**payload, "timezone": "Asia/Amman"},
+    )
+    assert blocked.status_code == 409, blocked.text
+
+    booked = client.post(
+        "/appointments/request",
+        headers=auth_headers(first_token),
+        json={**payload, "timezone": "Asia/Amman"},
+    )
+    assert booked.status_code == 200, booked.text
+    assert slot_statuses() == ["booked", "available"]
+
+    second_slot = {"doctor_user_id": doctor_user_id, "start_at": slots[1]["start_at"]}
+    stale = client.post("/appointments/holds", headers=auth_headers(second_token), json=second_slot)
+    assert stale.status_code == 200, stale.text
+    with SessionLocal() as db:
+        db.execute(
+            update(SlotHold)
+            .where(SlotHold.id == uuid.UUID(stale.json()["id"]))
+            .values(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+        )
+        db.commit()
+        assert sweep_expired_holds(db, batch_size=1) == 1
+    assert slot_statuses() == ["booked", "available"]
@@ -1,3 +1,5 @@
+import json
+
 from tests.conftest import auth_headers, login, register
 
 
@@ -46,3 +48,16 @@ def test_user_and_doctor_can_submit_and_admin_can_review(client, admin_token):
     )
     assert review.status_code == 200, review.text
     assert review.json()["status"] == "REVIEWED"
+
+    csv_export = client.get("/admin/complaints?output=csv", headers=auth_headers(admin_token))
+    assert csv_export.status_code == 200, csv_export.text
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    csv_lines = csv_export.text.strip().splitlines()
+    assert csv_lines[0].startswith("id,reporter_user_id,reporter_role,reporter_email")
+    assert len(csv_lines) == len(payload) + 1
+
+    ndjson_export = client.get("/admin/complaints?output=ndjson", headers=auth_headers(admin_token))
+    assert ndjson_export.status_code == 200, ndjson_export.text
+    records = [json.loads(line) for line in ndjson_export.text.splitlines()]
+    reviewed = next(item for item in records if item["id"] == doctor_row["id"])
+    assert reviewed["status"] == "REVIEWED"
@@ -0,0 +1,48 @@
+import json
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from app.db.models import PaymentStatus
+from app.services.export_service import csv_chunks, ndjson_chunks
+
+
+def _batches(batch_count: int, batch_size: int):
+    for batch_index in range(batch_count):
+        yield [
+            (uuid.UUID(int=batch_index * batch_size + offset), Decimal("12.50"), PaymentStatus.PAID, None)
+            for offset in range(batch_size)
+        ]
+
+
+def test_csv_chunks_yield_one_chunk_per_batch():
+    chunks = list(csv_chunks(["id", "amount", "status", "note"], _batches(3, 4)))
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert lines[0] == "id,amount,status,note"
+    assert lines[1] == f"{uuid.UUID(int=0)},12.50,PAID,"
+    assert len(lines) == 13
+
+
+def test_csv_chunks_quote_values_and_emit_header_without_rows():
+    assert list(csv_chunks(["name"], [])) == ["name\n"]
+    assert "".join(csv_chunks(["name"], [[("Doe, Jane",)]])) == 'name\n"Doe, Jane"\n'
+
+
+def test_ndjson_chunks_serialize_plain_values():
+    created_at = datetime(2026, 3, 1, 9, 30, tzinfo=UTC)
+    chunks = list(
+        ndjson_chunks(
+            ["amount", "status", "created_at"],
+            [[(Decimal("45.00"), PaymentStatus.PENDING, created_at)]],
+            extra={"section": "period"},
+        )
+    )
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == [
+        {
+            "section": "period",
+            "amount": "45.00",
+            "status": "PENDING",
+            "created_at": "2026-03-01T09:30:00+00:00",
+        }
+    ]
@@ -0,0 +1,210 @@
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.db.models import Appointment, AppointmentCallStatus
+from app.db.session import SessionLocal
+from app.services.meeting_provisioning_service import (
+    backoff_delay,
+    claim_due_jobs,
+    meeting_provisioner,
+    queue_upcoming_meetings,
+    record_meeting,
+)
+from app.services.zoom_service import create_zoom_meeting_for_appointment, zoom_client
+from tests.conftest import auth_headers, login, register, submit_psychiatrist_application
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    for attempt, ceiling in [(1, 5.0), (2, 10.0), (4, 40.0), (12, 600.0)]:
+        delays = [backoff_delay(attempt) for _ in range(50)]
+        assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+
+
+def test_zoom_meeting_is_created_against_fake_server(fake_zoom):
+    start_at = datetime(2026, 5, 4, 9, 0, tzinfo=UTC)
+    meeting = asyncio.run(
+        create_zoom_meeting_for_appointment(
+            appointment_id="0f0e0d0c-0000-0000-0000-000000000000",
+            doctor_user_id="doctor",
+            patient_user_id="patient",
+            start_at=start_at,
+            end_at=start_at + timedelta(minutes=50),
+        )
+    )
+    assert meeting["provider"] == "ZOOM"
+    assert meeting["meeting_link"] == fake_zoom.meetings[0]["join_url"]
+    assert fake_zoom.meetings[0]["duration"] == 50
+    assert fake_zoom.meetings[0]["start_time"] == "2026-05-04T09:00:00Z"
+
+
+def _requested_appointment(client, admin_token) -> tuple[str, str, str]:
+    """Book next week's slot with a fresh doctor; returns (appointment id, doctor token, patient token)."""
+    register(client, "doctor-zoom@testmail.dev", "DoctorPass123!", "DOCTOR")
+    doctor_token = login(client, "doctor-zoom@testmail.dev", "DoctorPass123!")
+    application = submit_psychiatrist_application(client, doctor_token)
+    client.post(f"/admin/applications/{application['id']}/approve", headers=auth_headers(admin_token))
+    doctor_user_id = application["doctor_user_id"]
+
+    target_day = date.today() + timedelta(days=(7 - date.today().weekday()) % 7 or 7)
+    client.post(
+        "/doctor/availability/rules",
+        headers=auth_headers(doctor_token),
+        json=[
+            {
+                "day_of_week": target_day.weekday(),
+                "start_time": "09:00:00",
+                "end_time": "10:00:00",
+                "timezone": "Asia/Amman",
+                "slot_duration_minutes": 50,
+                "buffer_minutes": 10,
+            }
+        ],
+    )
+    slot = client.get(
+        f"/doctors/{doctor_user_id}/availability",
+        params={"date_from": target_day.isoformat(), "date_to": target_day.isoformat()},
+    ).json()[0]
+    register(client, "patient-zoom@testmail.dev", "UserPass123!", "USER")
+    patient_token = login(client, "patient-zoom@testmail.dev", "UserPass123!")
+    requested = client.post(
+        "/appointments/request",
+        headers=auth_headers(patient_token),
+        json={"doctor_user_id": doctor_user_id, "start_at": slot["start_at"], "timezone": "Asia/Amman"},
+    )
+    return requested.json()["id"], doctor_token, patient_token
+
+
+def test_concurrent_meetings_share_one_cached_token(fake_zoom):
+    start_at = datetime(2026, 5, 4, 9, 0, tzinfo=UTC)
+
+    async def create_many(count: int):
+        return await asyncio.gather(
+            *(
+                create_zoom_meeting_for_appointment(
+                    appointment_id=f"{index:08d}-0000-0000-0000-000000000000",
+                    doctor_user_id="doctor",
+                    patient_user_id="patient",
+                    start_at=start_at,
+                    end_at=start_at + timedelta(minutes=50),
+                )
+                for index in range(count)
+            )
+        )
+
+    asyncio.run(create_many(5))
+    asyncio.run(create_many(3))
+    assert len(fake_zoom.meetings) == 8
+    assert fake_zoom.tokens_issued == 1
+
+    # A token Zoom rejects is refreshed once and the request retried.
+    fake_zoom.revoke_tokens()
+    asyncio.run(create_many(2))
+    assert len(fake_zoom.meetings) == 10
+    assert fake_zoom.tokens_issued == 2
+
+
+def test_token_is_refreshed_ahead_of_expiry(fake_zoom):
+    fake_zoom.token_expires_in = settings.zoom_token_refresh_margin_seconds
+    first = asyncio.run(zoom_client.access_token())
+    second = asyncio.run(zoom_client.access_token())
+    assert first != second
+    assert fake_zoom.tokens_issued == 2
+
+
+def test_preprovision_creates_meetings_for_upcoming_confirmed_appointments(
+    client, admin_token, fake_zoom, monkeypatch
+):
+    appointment_id, doctor_token, _ = _requested_appointment(client, admin_token)
+    client.post(f"/doctor/appointments/{appointment_id}/confirm", headers=auth_headers(doctor_token))
+    with SessionLocal() as db:
+        # As if confirmed while Zoom was unavailable.
+        db.execute(
+            update(Appointment)
+            .where(Appointment.id == appointment_id)
+            .values(call_status=AppointmentCallStatus.NOT_READY, call_provisioning_due_at=None)
+        )
+        db.commit()
+        assert queue_upcoming_meetings(db, within=timedelta(hours=1)) == 0
+
+    monkeypatch.setattr(settings, "zoom_preprovision_horizon_hours", 24 * 8)
+    assert asyncio.run(meeting_provisioner.preprovision()) == 1
+    assert len(fake_zoom.meetings) == 1
+    with SessionLocal() as db:
+        appointment = db.scalar(select(Appointment).where(Appointment.id == appointment_id))
+        assert appointment.call_status == AppointmentCallStatus.NOT_READY
+        assert appointment.meeting_link == fake_zoom.meetings[0]["join_url"]
+    assert asyncio.run(meeting_provisioner.preprovision()) == 0
+
+
+def test_confirm_queues_meeting_and_provisioner_retries_after_failure(client, admin_token, fake_zoom):
+    appointment_id, doctor_token, patient_token = _requested_appointment(client, admin_token)
+
+    confirmed = client.post(f"/doctor/appointments/{appointment_id}/confirm", headers=auth_headers(doctor_token))
+    assert confirmed.status_code == 200, confirmed.text
+    assert confirmed.json()["call_status"] == "PROVISIONING"
+    assert confirmed.json()["meeting_link"] is None
+    assert fake_zoom.meetings == []
+
+    fake_zoom.fail_meetings = 1
+    assert asyncio.run(meeting_provisioner.run_once()) == 1
+    with SessionLocal() as db:
+        appointment = db.scalar(select(Appointment).where(Appointment.id == appointment_id))
+        assert appointment.call_status.value == "PROVISIONING"
+        assert appointment.call_provisioning_attempts == 1
+        assert appointment.call_provisioning_due_at > datetime.now(UTC)
+        # Nothing is due until the backoff runs out.
+        assert asyncio.run(meeting_provisioner.run_once()) == 0
+        db.execute(
+            update(Appointment)
+            .where(Appointment.id == appointment.id)
+            .values(call_provisioning_due_at=datetime.now(UTC))
+        )
+        db.commit()
+
+    assert asyncio.run(meeting_provisioner.run_once()) == 1
+    listed = client.get("/appointments/my", headers=auth_headers(patient_token)).json()
+    assert listed[0]["call_status"] == "NOT_READY"
+    assert listed[0]["call_provider"] == "ZOOM"
+    assert listed[0]["meeting_link"] == fake_zoom.meetings[0]["join_url"]
+
+
+def test_meeting_settles_ready_when_fee_was_paid_during_provisioning(client, admin_token, fake_zoom):
+    appointment_id, doctor_token, _ = _requested_appointment(client, admin_token)
+    client.post(f"/doctor/appointments/{appointment_id}/confirm", headers=auth_headers(doctor_token))
+
+    with SessionLocal() as db:
+        [job] = claim_due_jobs(db, limit=10)
+        # The payment lands while Zoom is being called; it leaves PROVISIONING rows alone.
+        db.execute(update(Appointment).where(Appointment.id == appointment_id).values(fee_paid=True))
+        db.commit()
+        record_meeting(db, job, {"meeting_link": "https://zoom.test/j/1", "provider": "ZOOM", "room_id": "1"})
+        appointment = db.scalar(select(Appointment).where(Appointment.id == appointment_id))
+        assert appointment.call_status == AppointmentCallStatus.READY
+
+
+def test_preprovision_skips_appointments_the_provisioner_gave_up_on(client, admin_token, fake_zoom, monkeypatch):
+    monkeypatch.setattr(settings, "zoom_provisioning_max_attempts", 2)
+    monkeypatch.setattr(settings, "zoom_preprovision_horizon_hours", 24 * 8)
+    appointment_id, doctor_token, _ = _requested_appointment(client, admin_token)
+    client.post(f"/doctor/appointments/{appointment_id}/confirm", headers=auth_headers(doctor_token))
+
+    fake_zoom.fail_meetings = 10
+    for _ in range(2):
+        with SessionLocal() as db:
+            db.execute(
+                update(Appointment)
+                .where(Appointment.id == appointment_id)
+                .values(call_provisioning_due_at=datetime.now(UTC))
+            )
+            db.commit()
+        assert asyncio.run(meeting_provisioner.run_once()) == 1
+
+    with SessionLocal() as db:
+        appointment = db.scalar(select(Appointment).where(Appointment.id == appointment_id))
+        assert appointment.call_status == AppointmentCallStatus.NOT_READY
+        assert appointment.call_provisioning_attempts == 2
+        assert queue_upcoming_meetings(db, within=timedelta(hours=24 * 8)) == 0
+    assert asyncio.run(meeting_provisioner.preprovision()) == 0
@@ -0,0 +1,123 @@
+from tests.conftest import auth_headers, login, register
+
+
+def _user(client, email: str) -> tuple[str, str]:
+    register(client, email, "UserPass123!", "USER")
+    token = login(client, email, "UserPass123!")
+    me = client.get("/auth/me", headers=auth_headers(token))
+    assert me.status_code == 200, me.text
+    return token, me.json()["id"]
+
+
+def test_threads_are_keyset_paginated_and_marked_read_in_batch(client):
+    alice_token, alice_id = _user(client, "alice-thread@testmail.dev")
+    peers = [_user(client, f"peer-{index}@testmail.dev") for index in range(3)]
+
+    for index, (peer_token, _) in enumerate(peers):
+        for turn in range(2):
+            sent = client.post(
+                "/messages",
+                headers=auth_headers(peer_token),
+                json={"receiver_user_id": alice_id, "body": f"peer {index} message {turn}"},
+            )
+            assert sent.status_code == 200, sent.text
+            assert sent.json()["thread_id"]
+
+    # Replying from Alice reuses the same thread as the inbound direction.
+    reply = client.post(
+        "/messages",
+        headers=auth_headers(alice_token),
+        json={"receiver_user_id": peers[0][1], "body": "reply to peer 0"},
+    )
+    assert reply.status_code == 200, reply.text
+
+    first_page = client.get("/messages/threads", headers=auth_headers(alice_token), params={"limit": 2})
+    assert first_page.status_code == 200, first_page.text
+    first = first_page.json()
+    assert [item["peer_user_id"] for item in first["items"]] == [peers[0][1], peers[2][1]]
+    assert first["items"][0]["last_message_preview"] == "reply to peer 0"
+    assert first["next_cursor"]
+
+    second = client.get(
+        "/messages/threads",
+        headers=auth_headers(alice_token),
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+    assert [item["peer_user_id"] for item in second["items"]] == [peers[1][1]]
+    assert second["next_cursor"] is None
+
+    thread_id = first["items"][1]["id"]
+    history = client.get(f"/messages/threads/{thread_id}/messages", headers=auth_headers(alice_token)).json()
+    assert [item["body"] for item in history["items"]] == ["peer 2 message 1", "peer 2 message 0"]
+
+    marked = client.post(f"/messages/threads/{thread_id}/read", headers=auth_headers(alice_token))
+    assert marked.status_code == 200, marked.text
+    assert marked.json()["marked"] == 2
+
+    outsider = client.get(f"/messages/threads/{thread_id}/messages", headers=auth_headers(peers[0][0]))
+    assert outsider.status_code == 403
+
+
+def test_new_message_body_is_pushed_over_websocket(client):
+    sender_token, _ = _user(client, "ws-sender@testmail.dev")
+    receiver_token, receiver_id = _user(client, "ws-receiver@testmail.dev")
+
+    with client.websocket_connect(f"/notifications/ws?token={receiver_token}") as websocket:
+        assert websocket.receive_json()["type"] == "notifications:connected"
+
+        sent = client.post(
+            "/messages",
+            headers=auth_headers(sender_token),
+            json={"receiver_user_id": receiver_id, "body": "hello in realtime"},
+        )
+        assert sent.status_code == 200, sent.text
+
+        events = [websocket.receive_json(), websocket.receive_json()]
+        pushed = next(event for event in events if event["type"] == "message:new")
+        assert pushed["message"]["body"] == "hello in realtime"
+        assert pushed["thread_id"] == sent.json()["thread_id"]
+
+
+def test_receiver_is_notified_once_while_thread_has_unread_messages(client):
+    sender_token, _ = _user(client, "notify-sender@testmail.dev")
+    receiver_token, receiver_id = _user(client, "notify-receiver@testmail.dev")
+
+    for turn in range(3):
+        sent = client.post(
+            "/messages",
+            headers=auth_headers(sender_token),
+            json={"receiver_user_id": receiver_id, "body": f"unread {turn}"},
+        )
+        assert sent.status_code == 200, sent.text
+
+    notifications = client.get("/notifications", headers=auth_headers(receiver_token)).json()
+    assert len([item for item in notifications if item["event_type"].startswith("MESSAGE_")]) == 1
+
+    threads = client.get("/messages/threads", headers=auth_headers(receiver_token)).json()["items"]
+    assert threads[0]["unread_count"] == 3
+
+    client.post(f"/messages/threads/{threads[0]['id']}/read", headers=auth_headers(receiver_token))
+    client.post("/messages", headers=auth_headers(sender_token), json={"receiver_user_id": receiver_id, "body": "new"})
+
+    notifications = client.get("/notifications", headers=auth_headers(receiver_token)).json()
+    assert len([item for item in notifications if item["event_type"].startswith("MESSAGE_")]) == 2
+
+
+def test_message_box_returns_a_cursor_instead_of_truncating(client):
+    alice_token, alice_id = _user(client, "alice-box@testmail.dev")
+    bob_token, _ = _user(client, "bob-box@testmail.dev")
+    for index in range(3):
+        client.post(
+            "/messages",
+            headers=auth_headers(bob_token),
+            json={"receiver_user_id": alice_id, "body": f"message {index}"},
+        )
+
+    first = client.get("/messages", headers=auth_headers(alice_token), params={"box": "inbox", "limit": 2})
+    assert [item["body"] for item in first.json()] == ["message 2", "message 1"]
+    cursor = first.headers["X-Next-Cursor"]
+    rest = client.get(
+        "/messages", headers=auth_headers(alice_token), params={"box": "inbox", "limit": 2, "cursor": cursor}
+    )
+    assert [item["body"] for item in rest.json()] == ["message 0"]
+    assert "X-Next-Cursor" not in rest.headers
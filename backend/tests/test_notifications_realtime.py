@@ -1,3 +1,9 @@
+import asyncio
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.services.notification_realtime import HeartbeatWheel
 from tests.conftest import login, register
 
 
@@ -17,3 +23,79 @@ def test_notifications_websocket_pushes_new_notification(client):
         assert event["type"] == "notification:new"
         assert event["notification_id"]
         assert event["user_id"]
+
+
+class _FakeSocket:
+    def __init__(self, *, broken: bool = False, stuck: bool = False) -> None:
+        self.broken = broken
+        self.stuck = stuck
+        self.sent: list[dict] = []
+
+    async def send_json(self, payload: dict) -> None:
+        if self.broken:
+            raise RuntimeError("socket closed")
+        if self.stuck:
+            # A client that stopped reading: the send waits for a drain that never comes.
+            await asyncio.Event().wait()
+        self.sent.append(payload)
+
+
+def test_heartbeat_wheel_pings_each_socket_once_per_rotation_and_drops_stale():
+    dropped: list[_FakeSocket] = []
+
+    async def on_stale(websocket):
+        dropped.append(websocket)
+
+    wheel = HeartbeatWheel(
+        interval_seconds=4,
+        slots=4,
+        batch_size=2,
+        payload={"type": "notifications:ping"},
+        on_stale=on_stale,
+    )
+    healthy = [_FakeSocket() for _ in range(5)]
+    broken = _FakeSocket(broken=True)
+    for websocket in [*healthy, broken]:
+        wheel.add(websocket)
+
+    async def rotate() -> int:
+        return sum([await wheel.tick() for _ in range(wheel.slots)])
+
+    assert asyncio.run(rotate()) == 6
+    assert all(websocket.sent == [{"type": "notifications:ping"}] for websocket in healthy)
+    assert dropped == [broken]
+    assert len(wheel) == 5
+
+    assert asyncio.run(rotate()) == 5
+    assert all(len(websocket.sent) == 2 for websocket in healthy)
+
+
+def test_heartbeat_wheel_times_out_a_socket_that_stopped_reading():
+    dropped: list[_FakeSocket] = []
+
+    async def on_stale(websocket):
+        dropped.append(websocket)
+
+    wheel = HeartbeatWheel(
+        interval_seconds=1,
+        slots=1,
+        batch_size=10,
+        payload={"type": "notifications:ping"},
+        send_timeout_seconds=0.05,
+        on_stale=on_stale,
+    )
+    healthy = _FakeSocket()
+    stuck = _FakeSocket(stuck=True)
+    wheel.add(healthy)
+    wheel.add(stuck)
+
+    assert asyncio.run(asyncio.wait_for(wheel.tick(), timeout=2)) == 2
+    assert healthy.sent == [{"type": "notifications:ping"}]
+    assert dropped == [stuck]
+    assert len(wheel) == 1
+
+
+def test_notifications_websocket_rejects_invalid_token(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/notifications/ws?token=not-a-jwt") as websocket:
+            websocket.receive_json()
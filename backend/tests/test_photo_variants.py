@@ -0,0 +1,75 @@
+from io import BytesIO
+
+from PIL import Image
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models import DoctorProfile
+from app.db.session import SessionLocal
+from app.schemas.doctor_profile import DoctorProfileListItem
+from app.services.image_variants import PHOTO_VARIANT_SIZES, render_webp_variants
+from tests.conftest import auth_headers
+from tests.test_public_doctor_application import _application_payload
+
+
+def _photo_png(width: int = 1800, height: int = 1200) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", (width, height), (180, 120, 90)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def test_webp_variants_are_bounded_and_never_upscaled(tmp_path):
+    source = tmp_path / "photo.png"
+    source.write_bytes(_photo_png())
+    variants = render_webp_variants(str(source))
+    assert set(variants) == set(PHOTO_VARIANT_SIZES)
+    for name, content in variants.items():
+        with Image.open(BytesIO(content)) as image:
+            assert image.format == "WEBP"
+            assert max(image.size) == PHOTO_VARIANT_SIZES[name]
+            assert image.size[0] > image.size[1]
+    assert len(variants["small"]) < len(variants["large"]) < source.stat().st_size
+
+    source.write_bytes(_photo_png(200, 100))
+    with Image.open(BytesIO(render_webp_variants(str(source))["large"])) as image:
+        assert image.size == (200, 100)
+
+
+def test_approval_builds_photo_variants_and_cards_use_the_small_one(client, admin_token, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    submitted = client.post(
+        "/doctor-applications",
+        data=_application_payload("photo.doctor@testmail.dev"),
+        files={
+            "photo": ("photo.png", BytesIO(_photo_png()), "image/png"),
+            "license_document": ("license.pdf", BytesIO(b"%PDF-1.4 license"), "application/pdf"),
+            "medical_degree_certificate": ("medical-degree.pdf", BytesIO(b"%PDF-1.4 degree"), "application/pdf"),
+            "psychiatry_specialization_certificate": (
+                "psychiatry-specialization.pdf",
+                BytesIO(b"%PDF-1.4 specialization"),
+                "application/pdf",
+            ),
+            "active_practice_proof": ("active-practice.pdf", BytesIO(b"%PDF-1.4 practice"), "application/pdf"),
+        },
+    )
+    assert submitted.status_code == 201, submitted.text
+
+    application = client.get("/admin/applications?status=SUBMITTED", headers=auth_headers(admin_token)).json()[0]
+    # TestClient runs background tasks before returning the response.
+    approved = client.post(f"/admin/applications/{application['id']}/approve", headers=auth_headers(admin_token))
+    assert approved.status_code == 200, approved.text
+
+    profile_out = client.get(f"/doctors/{approved.json()['doctor_user_id']}").json()
+    assert set(profile_out["photo_variant_urls"]) == set(PHOTO_VARIANT_SIZES)
+    assert profile_out["photo_url"].endswith(".png")
+
+    with SessionLocal() as db:
+        profile = db.scalar(select(DoctorProfile).where(DoctorProfile.doctor_user_id == approved.json()["doctor_user_id"]))
+        card = DoctorProfileListItem.model_validate(profile)
+        assert card.photo_url == profile_out["photo_variant_urls"]["small"]
+        assert card.photo_url.endswith(".webp")
+
+        # A replaced photo falls back to the original until its own variants are built.
+        profile.photo_url = f"{settings.upload_base_url}/replaced.png"
+        assert DoctorProfileListItem.model_validate(profile).photo_url == profile.photo_url
+        db.rollback()
@@ -0,0 +1,130 @@
+import asyncio
+import base64
+import re
+import uuid
+import zlib
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models import StoredFile
+from app.db.session import SessionLocal
+from app.services.prescription_pdf import STATIC_FORM_NAME, PrescriptionDocument, render_prescription_pdf
+from app.services.prescription_rendering_service import render_pdf, rerender_prescriptions, shutdown_render_pool
+from tests.conftest import auth_headers, login, register, submit_psychiatrist_application
+
+
+def _document() -> PrescriptionDocument:
+    issued_at = datetime(2026, 5, 4, 9, 0, tzinfo=UTC)
+    prescription_id = uuid.uuid4()
+    return PrescriptionDocument(
+        prescription_id=prescription_id,
+        doctor_name="Dr. Rania",
+        doctor_email="rania@testmail.dev",
+        patient_name="Patient",
+        patient_email=None,
+        medication_name="Sertraline",
+        dosage="50mg daily",
+        instructions="Take in the morning.\nReview in four weeks.",
+        quantity="30 tablets",
+        issued_at=issued_at,
+        valid_until=issued_at + timedelta(days=30),
+        verification_code="RX-0123456789",
+        verification_url=f"https://sabina.example/prescriptions/verify/{prescription_id}?code=RX-0123456789",
+        data_hash="0" * 64,
+    )
+
+
+def test_prescription_pdf_renders_in_process_pool(monkeypatch):
+    monkeypatch.setattr(settings, "prescription_render_workers", 1)
+    try:
+        pdf = asyncio.run(render_pdf(_document()))
+    finally:
+        shutdown_render_pool()
+    assert pdf.startswith(b"%PDF")
+
+
+def _page_content(pdf: bytes) -> bytes:
+    """Every content stream of a ReportLab PDF (ASCII85 + Flate encoded), concatenated."""
+    streams = re.findall(rb"stream\r?\n(.*?)endstream", pdf, re.S)
+    return b"\n".join(zlib.decompress(base64.a85decode(stream.strip(), adobe=True)) for stream in streams)
+
+
+def test_prescription_pdf_reuses_static_layer_and_draws_vector_qr():
+    first = render_prescription_pdf(_document())
+    second = render_prescription_pdf(replace(_document(), valid_until=None, patient_email="p@testmail.dev"))
+    for pdf in (first, second):
+        assert b"/Subtype /Image" not in pdf
+        content = _page_content(pdf)
+        assert f"/FormXob.{STATIC_FORM_NAME} Do".encode() in content
+        assert content.count(b"(Medication Prescription) Tj") == 1
+        assert b" re" in content
+    assert b"(N/A) Tj" in _page_content(second)
+
+
+def _stored_path(pdf_url: str) -> Path:
+    return Path(settings.upload_dir) / pdf_url.removeprefix(f"{settings.upload_base_url}/")
+
+
+def test_prescription_returns_pending_and_renders_after_response(client, admin_token, monkeypatch):
+    monkeypatch.setattr(settings, "prescription_render_workers", 0)
+    register(client, "doctor-rx@testmail.dev", "DoctorPass123!", "DOCTOR")
+    doctor_token = login(client, "doctor-rx@testmail.dev", "DoctorPass123!")
+    application = submit_psychiatrist_application(client, doctor_token)
+    client.post(f"/admin/applications/{application['id']}/approve", headers=auth_headers(admin_token))
+
+    register(client, "patient-rx@testmail.dev", "UserPass123!", "USER")
+    patient_token = login(client, "patient-rx@testmail.dev", "UserPass123!")
+    patient_id = client.get("/auth/me", headers=auth_headers(patient_token)).json()["id"]
+    treatment_request = client.post(
+        "/treatment-requests",
+        headers=auth_headers(patient_token),
+        json={"doctor_id": application["doctor_user_id"], "message": "I need help."},
+    ).json()
+    client.patch(
+        f"/treatment-requests/{treatment_request['id']}",
+        headers=auth_headers(doctor_token),
+        json={"status": "ACCEPTED"},
+    )
+
+    created = client.post(
+        "/doctor/prescriptions",
+        headers=auth_headers(doctor_token),
+        json={
+            "user_id": patient_id,
+            "medication_name": "Sertraline",
+            "dosage": "50mg daily",
+            "instructions": "Take in the morning.",
+            "quantity": "30 tablets",
+        },
+    )
+    assert created.status_code == 200, created.text
+    assert created.json()["document_status"] == "PENDING"
+    assert created.json()["pdf_url"] is None
+    assert created.json()["verification_qr_data_url"].startswith("data:image/png;base64,")
+
+    # TestClient runs background tasks before returning the response.
+    listed = client.get("/doctor/prescriptions", headers=auth_headers(doctor_token)).json()
+    assert listed[0]["document_status"] == "READY"
+    first_path = _stored_path(listed[0]["pdf_url"])
+    verified = client.get(
+        f"/prescriptions/verify/{listed[0]['id']}", params={"code": listed[0]["verification_code"]}
+    ).json()
+    assert (verified["document_status"], verified["pdf_url"]) == ("READY", listed[0]["pdf_url"])
+    assert first_path.read_bytes().startswith(b"%PDF")
+
+    assert asyncio.run(rerender_prescriptions()).rendered == 0
+    stats = asyncio.run(rerender_prescriptions(include_ready=True))
+    assert (stats.rendered, stats.failed) == (1, 0)
+    assert stats.per_second > 0
+
+    rerendered = client.get("/doctor/prescriptions", headers=auth_headers(doctor_token)).json()[0]
+    # Rendering is deterministic, so the re-render lands on the same content-addressed file.
+    assert rerendered["pdf_url"] == listed[0]["pdf_url"]
+    assert first_path.exists()
+    key = listed[0]["pdf_url"].removeprefix(f"{settings.upload_base_url}/")
+    with SessionLocal() as db:
+        assert db.scalar(select(StoredFile.ref_count).where(StoredFile.key == key)) == 1
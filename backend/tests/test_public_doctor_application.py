@@ -1,7 +1,12 @@
 import json
 from io import BytesIO
 
-from tests.conftest import auth_headers, login
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models import StoredFile
+from app.db.session import SessionLocal
+from tests.conftest import auth_headers, login, register
 
 
 def _application_payload(email: str):
@@ -77,3 +82,29 @@ def test_public_application_submit_duplicate_and_admin_approve(client, admin_tok
     doctor_profile = client.get(f"/doctors/{approve.json()['doctor_user_id']}")
     assert doctor_profile.status_code == 200, doctor_profile.text
     assert doctor_profile.json()["is_public"] is True
+
+
+def test_public_application_rejected_after_upload_releases_its_files(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    register(client, "taken.applicant@testmail.dev", "UserPass123!", "USER")
+
+    response = client.post(
+        "/doctor-applications",
+        data=_application_payload("taken.applicant@testmail.dev"),
+        files={
+            "national_id_photo": ("national-id.png", BytesIO(b"\\x89PNG\\r\\n\\x1a\\n"), "image/png"),
+            "license_document": ("license.pdf", BytesIO(b"%PDF-1.4 license"), "application/pdf"),
+            "medical_degree_certificate": ("medical-degree.pdf", BytesIO(b"%PDF-1.4 degree"), "application/pdf"),
+            "psychiatry_specialization_certificate": (
+                "psychiatry-specialization.pdf",
+                BytesIO(b"%PDF-1.4 specialization"),
+                "application/pdf",
+            ),
+            "active_practice_proof": ("active-practice.pdf", BytesIO(b"%PDF-1.4 practice"), "application/pdf"),
+        },
+    )
+    assert response.status_code == 409, response.text
+    with SessionLocal() as db:
+        ref_counts = db.scalars(select(StoredFile.ref_count)).all()
+    assert len(ref_counts) == 5
+    assert set(ref_counts) == {0}
@@ -0,0 +1,96 @@
+import uuid
+
+from sqlalchemy import event, select
+
+from app.db.models import DoctorProfile, User, UserRole, UserStatus
+from app.db.session import SessionLocal
+from app.services import slug_service
+from app.services.slug_service import _suffix, allocate_slugs, assign_profile_slug, reslug_profiles, slugify
+
+
+def test_slug_suffixes_only_match_the_exact_base():
+    assert slugify("  Dr. Lina  Sabri ") == "dr-lina-sabri"
+    assert _suffix("dr-sam", "dr-sam") == 1
+    assert _suffix("dr-sam-12", "dr-sam") == 12
+    assert _suffix("dr-sam-smith", "dr-sam") is None
+    assert _suffix("dr-sam-02", "dr-sam") is None
+    assert _suffix("dr-samir-2", "dr-sam") is None
+
+
+def _doctor(db, slug: str | None = None, display_name: str = "Dr Sam") -> uuid.UUID:
+    user = User(
+        email=f"{uuid.uuid4().hex[:12]}@testmail.dev",
+        password_hash="x",
+        role=UserRole.DOCTOR,
+        status=UserStatus.ACTIVE,
+    )
+    db.add(user)
+    db.flush()
+    if slug is not None:
+        db.add(DoctorProfile(doctor_user_id=user.id, slug=slug, display_name=display_name))
+    return user.id
+
+
+def test_allocate_slugs_fills_gaps_in_one_query(client):
+    with SessionLocal() as db:
+        holder = _doctor(db, "dr-sam")
+        for slug in ("dr-sam-2", "dr-sam-4", "dr-sam-smith"):
+            _doctor(db, slug)
+        db.commit()
+        newcomers = [_doctor(db) for _ in range(3)]
+
+        statements = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            allocated = allocate_slugs(db, {doctor_id: "Dr Sam" for doctor_id in newcomers} | {holder: "Dr. Sam"})
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        assert sum("doctor_profiles" in statement for statement in statements) == 1
+        assert [allocated[doctor_id] for doctor_id in newcomers] == ["dr-sam-3", "dr-sam-5", "dr-sam-6"]
+        assert allocated[holder] == "dr-sam"
+
+
+def test_assign_profile_slug_retries_after_a_concurrent_claim(client, monkeypatch):
+    with SessionLocal() as db:
+        _doctor(db, "dr-rana")
+        doctor_id = _doctor(db)
+        profile = DoctorProfile(doctor_user_id=doctor_id, slug="doctor-pending", display_name="Dr Rana")
+        db.add(profile)
+
+        real_allocate = slug_service.allocate_slugs
+        calls = []
+
+        def racing_allocate(session, preferred):
+            calls.append(preferred)
+            if len(calls) == 1:
+                # Another approval committed "dr-rana" after we looked.
+                return {doctor_id: "dr-rana"}
+            return real_allocate(session, preferred)
+
+        monkeypatch.setattr(slug_service, "allocate_slugs", racing_allocate)
+        assert assign_profile_slug(db, profile, "Dr Rana") == "dr-rana-2"
+        db.commit()
+        assert len(calls) == 2
+        assert db.scalar(select(DoctorProfile.slug).where(DoctorProfile.doctor_user_id == doctor_id)) == "dr-rana-2"
+
+
+def test_reslug_profiles_moves_only_stale_slugs(client):
+    with SessionLocal() as db:
+        kept = _doctor(db, "dr-omar-3", "Dr Omar")
+        renamed = _doctor(db, "dr-omar", "Dr Omar Haddad")
+        placeholder = _doctor(db, "doctor-1234abcd", "Dr Omar")
+        db.commit()
+
+        assert reslug_profiles(db, dry_run=True).changed == 2
+        stats = reslug_profiles(db)
+        assert (stats.checked, stats.changed) == (3, 2)
+        slugs = dict(db.execute(select(DoctorProfile.doctor_user_id, DoctorProfile.slug)).all())
+    assert slugs[kept] == "dr-omar-3"
+    assert slugs[renamed] == "dr-omar-haddad"
+    # "dr-omar" was still held by the renamed profile when the batch was allocated.
+    assert slugs[placeholder] == "dr-omar-2"
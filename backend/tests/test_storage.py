@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from fastapi import FastAPI, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from starlette.datastructures import Headers
+
+from app.api.routes import uploads
+from app.core.config import settings
+from app.db.models import StoredFile
+from app.db.session import SessionLocal
+from app.services.blob_storage import LocalBlobBackend, content_key, get_blob_backend, is_content_key
+from app.services.storage_service import (
+    LICENSE_CONTENT_TYPES,
+    PHOTO_CONTENT_TYPES,
+    collect_orphaned_files,
+    discard_uploads,
+    release_stored_file,
+    save_generated_document_bytes,
+    save_uploads,
+    storage_usage,
+    upload_key,
+)
+
+
+def _upload(content: bytes, content_type: str, filename: str = "file") -> UploadFile:
+    return UploadFile(file=BytesIO(content), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+@pytest.fixture()
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    return tmp_path
+
+
+def _blobs(upload_dir) -> list[str]:
+    return sorted(key for key, _ in get_blob_backend().list_objects())
+
+
+def test_content_keys_fan_out_by_digest(tmp_path):
+    digest = hashlib.sha256(b"license").hexdigest()
+    key = content_key(digest, ".pdf")
+    assert key == f"{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+    assert is_content_key(key)
+    assert not is_content_key("0f6f3a1c-8d1e-4c55-9a40-0b7e8d3c2b11.pdf")
+
+    backend = LocalBlobBackend(tmp_path, "/uploads")
+    staged = tmp_path / "staged"
+    staged.write_bytes(b"license")
+    backend.put_object(key, staged)
+    assert not staged.exists()
+    assert backend.head_object(key) == len(b"license")
+    assert list(backend.list_objects()) == [(key, len(b"license"))]
+    assert backend.url_for(key) == f"/uploads/{key}"
+
+    backend.delete_object(key)
+    assert backend.head_object(key) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def _uploads_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(uploads.router)
+    return TestClient(app)
+
+
+def test_content_addressed_uploads_are_immutable_and_ranged(upload_dir):
+    content = b"%PDF-1.4 " + bytes(range(256)) * 64
+    digest = hashlib.sha256(content).hexdigest()
+    key = content_key(digest, ".pdf")
+    staged = upload_dir / "staged"
+    staged.write_bytes(content)
+    get_blob_backend().put_object(key, staged)
+    url = f"{settings.upload_base_url}/{key}"
+    assert upload_key(url) == key
+
+    client = _uploads_client()
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["etag"] == f'"{digest}"'
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["accept-ranges"] == "bytes"
+
+    assert client.get(url, headers={"If-None-Match": f'W/"{digest}"'}).status_code == 304
+
+    partial = client.get(url, headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206
+    assert partial.content == content[100:200]
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(content)}"
+    # A stale If-Range validator falls back to the full body.
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"other"'}).status_code == 200
+
+    for missing in ("../secret.txt", ".incoming/upload.part", "ab", f"{key}.bak"):
+        assert client.get(f"{settings.upload_base_url}/{missing}").status_code == 404
+
+
+def test_legacy_uploads_get_short_cache_and_x_accel_mode_skips_the_body(upload_dir, monkeypatch):
+    (upload_dir / "legacy.png").write_bytes(b"\x89PNG legacy")
+    client = _uploads_client()
+    response = client.get(f"{settings.upload_base_url}/legacy.png")
+    assert response.headers["cache-control"] == f"public, max-age={settings.upload_legacy_cache_seconds}"
+    etag = response.headers["etag"]
+    assert client.get(f"{settings.upload_base_url}/legacy.png", headers={"If-None-Match": etag}).status_code == 304
+
+    monkeypatch.setattr(settings, "upload_serve_mode", "x-accel")
+    accel = client.get(f"{settings.upload_base_url}/legacy.png")
+    assert accel.status_code == 200
+    assert accel.content == b""
+    assert accel.headers["x-accel-redirect"] == f"{settings.upload_accel_redirect_prefix}/legacy.png"
+    assert accel.headers["etag"] == etag
+    assert accel.headers["content-type"] == "image/png"
+
+
+def test_save_uploads_deduplicates_and_counts_references(client, upload_dir):
+    license_pdf = b"%PDF-1.4 license" * 100_000
+    photo = b"\x89PNG photo"
+    stored = asyncio.run(
+        save_uploads(
+            {
+                "license_document": (_upload(license_pdf, "application/pdf"), LICENSE_CONTENT_TYPES, "license"),
+                "photo": (_upload(photo, "image/png"), PHOTO_CONTENT_TYPES, "photo"),
+                # The same PDF sent again for another field is stored once.
+                "medical_degree_certificate": (
+                    _upload(license_pdf, "application/pdf"),
+                    LICENSE_CONTENT_TYPES,
+                    "license",
+                ),
+            }
+        )
+    )
+    license_digest = hashlib.sha256(license_pdf).hexdigest()
+    assert stored["license_document"].sha256 == license_digest
+    assert stored["license_document"].size == len(license_pdf)
+    assert stored["license_document"].url == f"{settings.upload_base_url}/{content_key(license_digest, '.pdf')}"
+    assert stored["medical_degree_certificate"].url == stored["license_document"].url
+    assert stored["photo"].url.endswith(".png")
+    assert len(_blobs(upload_dir)) == 2
+
+    with SessionLocal() as db:
+        license_row = db.scalar(select(StoredFile).where(StoredFile.key == stored["license_document"].key))
+        assert license_row.ref_count == 2
+        assert storage_usage(db)["disk_bytes"] is None
+        usage = storage_usage(db, scan_disk=True)
+    assert usage["files"] == 2
+    assert usage["references"] == 3
+    assert usage["stored_bytes"] == len(license_pdf) + len(photo)
+    assert usage["dedup_ratio"] > 1.9
+    assert usage["disk_bytes"] == len(license_pdf) + len(photo)
+
+    # Dropping every reference makes the blobs collectable once the grace period is over.
+    discard_uploads(stored.values())
+    with SessionLocal() as db:
+        assert collect_orphaned_files(db) == 0
+        assert storage_usage(db)["orphaned_files"] == 2
+        assert collect_orphaned_files(db, grace=timedelta(0)) == 2
+        assert storage_usage(db)["files"] == 0
+    assert _blobs(upload_dir) == []
+
+
+def test_save_uploads_releases_the_whole_batch_when_one_file_is_rejected(client, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "max_upload_mb", 1)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            save_uploads(
+                {
+                    "license_document": (_upload(b"%PDF ok", "application/pdf"), LICENSE_CONTENT_TYPES, "license"),
+                    "photo": (_upload(b"x" * (2 * 1024 * 1024), "image/png"), PHOTO_CONTENT_TYPES, "photo"),
+                }
+            )
+        )
+    assert "too large" in exc_info.value.detail
+    with SessionLocal() as db:
+        assert db.scalars(select(StoredFile.ref_count)).all() == [0]
+
+
+def test_regenerated_document_reuses_its_blob(client, upload_dir):
+    first = save_generated_document_bytes(b"%PDF-1.4 rendered")
+    second = save_generated_document_bytes(b"%PDF-1.4 rendered")
+    assert first == second
+    release_stored_file(first)
+    with SessionLocal() as db:
+        assert db.scalar(select(StoredFile.ref_count)) == 1
+    assert len(_blobs(upload_dir)) == 1
@@ -143,6 +143,53 @@ def test_waiting_list_promotion_on_cancellation(client, admin_token):
     assert waiting_list_view.status_code == 403, waiting_list_view.text
 
 
+def test_waiting_list_positions_follow_queue_order_after_promotion(client, admin_token):
+    doctor_token, doctor_user_id = _setup_approved_doctor(client, admin_token, "doctor.queue@testmail.dev")
+    slot_start = _setup_slot(client, doctor_token, doctor_user_id)
+
+    tokens = []
+    for index in range(4):
+        email = f"queue.user{index}@testmail.dev"
+        register(client, email, "UserPass123!", "USER")
+        tokens.append(
+            client.post("/auth/login", json={"email": email, "password": "UserPass123!"}).json()["access_token"]
+        )
+    owner_token, waiting_tokens = tokens[0], tokens[1:]
+
+    booked = client.post(
+        "/appointments/request",
+        headers=auth_headers(owner_token),
+        json={"doctor_user_id": doctor_user_id, "start_at": slot_start, "timezone": "Asia/Amman"},
+    )
+    assert booked.status_code == 200, booked.text
+    appointment_id = booked.json()["id"]
+
+    joined = [
+        client.post(f"/appointments/{appointment_id}/waiting-list", headers=auth_headers(token))
+        for token in waiting_tokens
+    ]
+    assert [res.json()["position"] for res in joined] == [1, 2, 3]
+    rejoined = client.post(f"/appointments/{appointment_id}/waiting-list", headers=auth_headers(waiting_tokens[1]))
+    assert rejoined.json()["position"] == 2
+
+    cancel = client.post(f"/appointments/{appointment_id}/cancel", headers=auth_headers(owner_token))
+    assert cancel.status_code == 200, cancel.text
+
+    promoted = client.get("/appointments/my", headers=auth_headers(waiting_tokens[0]))
+    assert [item["start_at"] for item in promoted.json()] == [slot_start]
+
+    for token, expected in zip(waiting_tokens[1:], [1, 2]):
+        view = client.get(f"/appointments/{appointment_id}/waiting-list", headers=auth_headers(token))
+        assert view.status_code == 200, view.text
+        assert view.json()["total"] == 2
+        assert view.json()["my_position"] == expected
+        assert [entry["position"] for entry in view.json()["entries"]] == [expected]
+
+    doctor_view = client.get(f"/appointments/{appointment_id}/waiting-list", headers=auth_headers(doctor_token))
+    assert doctor_view.status_code == 200, doctor_view.text
+    assert [entry["position"] for entry in doctor_view.json()["entries"]] == [1, 2]
+
+
 def test_treatment_request_workflow(client, admin_token):
     doctor_token, doctor_user_id = _setup_approved_doctor(
         client, admin_token, "doctor.treatment@testmail.dev"
@@ -236,6 +283,13 @@ def test_admin_financial_report_aggregate(client, admin_token, monkeypatch):
     assert payment_confirm.status_code == 200, payment_confirm.text
     assert payment_confirm.json()["event_type"] == "checkout.session.completed"
 
+    summary = client.get("/doctor/financial-summary", headers=auth_headers(doctor_token))
+    assert summary.status_code == 200, summary.text
+    summary_payload = summary.json()
+    assert summary_payload["paid_payments_count"] == 1
+    assert summary_payload["pending_payments_count"] == 0
+    assert float(summary_payload["total_paid_amount"]) == float(payment_init.json()["payment"]["amount"])
+
     today = date.today().isoformat()
     report = client.get(
         f"/admin/financial-reports?from_date={today}&to_date={today}&granularity=daily",
@@ -245,3 +299,249 @@ def test_admin_financial_report_aggregate(client, admin_token, monkeypatch):
     payload = report.json()
     assert float(payload["total_amount"]) >= 45.0
     assert any(item["insurance_provider"] == "TestInsurance" for item in payload["insurance_breakdown"])
+
+    csv_report = client.get(
+        f"/admin/financial-reports?from_date={today}&to_date={today}&granularity=daily&output=csv",
+        headers=auth_headers(admin_token),
+    )
+    assert csv_report.status_code == 200, csv_report.text
+    header, *_, insurance_header, insurance_row = csv_report.text.strip().splitlines()
+    assert header == "period,total_amount,paid_count,pending_count,failed_count"
+    assert insurance_header == "insurance_provider,total_amount,payments_count"
+    assert insurance_row.startswith("TestInsurance,")
+
+    payments_export = client.get("/admin/exports/payments?output=ndjson", headers=auth_headers(admin_token))
+    assert payments_export.status_code == 200, payments_export.text
+    assert payment_id in payments_export.text
+
+
+def _pending_stripe_payment(client, admin_token, monkeypatch, prefix: str):
+    doctor_token, doctor_user_id = _setup_approved_doctor(client, admin_token, f"{prefix}.doctor@testmail.dev")
+    slot_start = _setup_slot(client, doctor_token, doctor_user_id)
+    register(client, f"{prefix}.user@testmail.dev", "UserPass123!", "USER")
+    user_token = client.post(
+        "/auth/login", json={"email": f"{prefix}.user@testmail.dev", "password": "UserPass123!"}
+    ).json()["access_token"]
+    appointment = client.post(
+        "/appointments/request",
+        headers=auth_headers(user_token),
+        json={"doctor_user_id": doctor_user_id, "start_at": slot_start, "timezone": "Asia/Amman"},
+    )
+    assert appointment.status_code == 200, appointment.text
+
+    monkeypatch.setattr(
+        "app.services.payment_service._create_stripe_checkout_session",
+        lambda **kwargs: SimpleNamespace(id=f"cs_{prefix}", url=f"https://checkout.stripe.test/session/cs_{prefix}"),
+    )
+    payment_init = client.post(
+        "/payments",
+        headers=auth_headers(user_token),
+        json={"appointment_id": appointment.json()["id"], "method": "STRIPE", "package_sessions": 1},
+    )
+    assert payment_init.status_code == 200, payment_init.text
+    return doctor_token, payment_init.json()["payment"]
+
+
+def _deliver_stripe_event(client, monkeypatch, event_type: str, payment: dict):
+    monkeypatch.setattr(
+        "app.services.payment_service._construct_stripe_event",
+        lambda **kwargs: {
+            "type": event_type,
+            "data": {"object": {"id": payment["provider_reference"], "metadata": {"payment_id": payment["id"]}}},
+        },
+    )
+    res = client.post("/payments/stripe/webhook", headers={"stripe-signature": "test-signature"}, content=b"{}")
+    assert res.status_code == 200, res.text
+    assert res.json()["payment_found"] is True
+
+
+def _summary_counts(client, doctor_token) -> tuple[int, int]:
+    summary = client.get("/doctor/financial-summary", headers=auth_headers(doctor_token))
+    assert summary.status_code == 200, summary.text
+    return summary.json()["paid_payments_count"], summary.json()["pending_payments_count"]
+
+
+def test_duplicate_payment_confirmations_move_the_rollup_once(client, admin_token, monkeypatch):
+    doctor_token, payment = _pending_stripe_payment(client, admin_token, monkeypatch, "dup-webhook")
+    assert _summary_counts(client, doctor_token) == (0, 1)
+
+    # Stripe redelivers, an admin confirms on top and a stale expiry arrives last.
+    _deliver_stripe_event(client, monkeypatch, "checkout.session.completed", payment)
+    _deliver_stripe_event(client, monkeypatch, "checkout.session.completed", payment)
+    confirm = client.post(f"/payments/{payment['id']}/confirm", headers=auth_headers(admin_token))
+    assert confirm.status_code == 200, confirm.text
+    _deliver_stripe_event(client, monkeypatch, "checkout.session.expired", payment)
+
+    assert _summary_counts(client, doctor_token) == (1, 0)
+
+
+def test_failed_and_expired_payments_leave_pending_once(client, admin_token, monkeypatch):
+    from sqlalchemy import select
+
+    from app.db.models import DoctorPaymentDailyRollup, PaymentStatus
+    from app.db.session import SessionLocal
+
+    doctor_token, payment = _pending_stripe_payment(client, admin_token, monkeypatch, "failed-webhook")
+    _deliver_stripe_event(client, monkeypatch, "checkout.session.async_payment_failed", payment)
+    _deliver_stripe_event(client, monkeypatch, "checkout.session.expired", payment)
+
+    assert _summary_counts(client, doctor_token) == (0, 0)
+    with SessionLocal() as db:
+        counts = dict(db.execute(select(DoctorPaymentDailyRollup.status, DoctorPaymentDailyRollup.payment_count)).all())
+    assert counts[PaymentStatus.FAILED] == 1
+    assert counts[PaymentStatus.PENDING] == 0
+
+
+def test_deleting_a_patient_removes_their_payments_from_the_doctor_rollup(client, admin_token, monkeypatch):
+    doctor_token, payment = _pending_stripe_payment(client, admin_token, monkeypatch, "deleted-patient")
+    _deliver_stripe_event(client, monkeypatch, "checkout.session.completed", payment)
+    assert _summary_counts(client, doctor_token) == (1, 0)
+
+    deleted = client.delete(f"/admin/users/{payment['user_id']}", headers=auth_headers(admin_token))
+    assert deleted.status_code == 200, deleted.text
+
+    summary = client.get("/doctor/financial-summary", headers=auth_headers(doctor_token))
+    assert summary.status_code == 200, summary.text
+    assert summary.json()["paid_payments_count"] == 0
+    assert float(summary.json()["total_paid_amount"]) == 0.0
+
+
+def test_financial_report_merges_rollup_with_live_payments(client):
+    from datetime import UTC, datetime
+    from decimal import Decimal
+
+    from app.db.models import Appointment, Payment, PaymentStatus, User, UserRole
+    from app.db.session import SessionLocal
+    from app.services.reports_service import build_financial_report, refresh_payment_daily_rollups
+
+    _ = client
+    now = datetime.now(UTC)
+    today = now.date()
+    two_days_ago = now - timedelta(days=2)
+    with SessionLocal() as db:
+        doctor = User(email="rollup.doctor@testmail.dev", role=UserRole.DOCTOR)
+        patient = User(email="rollup.patient@testmail.dev", role=UserRole.USER)
+        db.add_all([doctor, patient])
+        db.flush()
+        appointment = Appointment(
+            doctor_user_id=doctor.id,
+            user_id=patient.id,
+            start_at=two_days_ago,
+            end_at=two_days_ago + timedelta(minutes=50),
+            timezone="UTC",
+        )
+        db.add(appointment)
+        db.flush()
+        closed_payment = Payment(
+            appointment_id=appointment.id,
+            user_id=patient.id,
+            amount=Decimal("50.00"),
+            method="STRIPE",
+            insurance_provider="RollupInsurance",
+            status=PaymentStatus.PENDING,
+            created_at=two_days_ago,
+            updated_at=two_days_ago,
+        )
+        live_payment = Payment(
+            appointment_id=appointment.id,
+            user_id=patient.id,
+            amount=Decimal("30.00"),
+            method="STRIPE",
+            status=PaymentStatus.PAID,
+        )
+        db.add_all([closed_payment, live_payment])
+        db.commit()
+
+        assert refresh_payment_daily_rollups(db, now=now) == 1
+
+        report = build_financial_report(
+            db, from_date=two_days_ago.date(), to_date=today, granularity="daily"
+        )
+        assert report["total_amount"] == Decimal("80.00")
+        assert [row["period"] for row in report["rows"]] == [two_days_ago.date().isoformat(), today.isoformat()]
+        assert report["rows"][0]["pending_count"] == 1
+        assert report["rows"][1]["paid_count"] == 1
+        assert {item["insurance_provider"] for item in report["insurance_breakdown"]} == {
+            "RollupInsurance",
+            "SELF_PAY",
+        }
+
+        closed_payment.status = PaymentStatus.PAID
+        db.commit()
+        assert refresh_payment_daily_rollups(db, now=now + timedelta(minutes=1)) == 1
+
+        report = build_financial_report(
+            db, from_date=two_days_ago.date(), to_date=two_days_ago.date(), granularity="monthly"
+        )
+        assert report["rows"][0]["paid_count"] == 1
+        assert report["rows"][0]["pending_count"] == 0
+
+
+def test_deleting_a_patient_rebuilds_their_closed_report_days(client, admin_token):
+    from datetime import UTC, datetime
+    from decimal import Decimal
+
+    from app.db.models import Appointment, Payment, PaymentStatus, User, UserRole
+    from app.db.session import SessionLocal
+    from app.services.reports_service import build_financial_report, refresh_payment_daily_rollups
+
+    now = datetime.now(UTC)
+    two_days_ago = now - timedelta(days=2)
+    with SessionLocal() as db:
+        doctor = User(email="rollup.delete.doctor@testmail.dev", role=UserRole.DOCTOR)
+        patient = User(email="rollup.delete.patient@testmail.dev", role=UserRole.USER)
+        db.add_all([doctor, patient])
+        db.flush()
+        appointment = Appointment(
+            doctor_user_id=doctor.id,
+            user_id=patient.id,
+            start_at=two_days_ago,
+            end_at=two_days_ago + timedelta(minutes=50),
+            timezone="UTC",
+        )
+        db.add(appointment)
+        db.flush()
+        db.add(
+            Payment(
+                appointment_id=appointment.id,
+                user_id=patient.id,
+                amount=Decimal("50.00"),
+                method="STRIPE",
+                status=PaymentStatus.PAID,
+                created_at=two_days_ago,
+                updated_at=two_days_ago,
+            )
+        )
+        db.commit()
+        patient_id = patient.id
+        assert refresh_payment_daily_rollups(db, now=now) == 1
+
+    deleted = client.delete(f"/admin/users/{patient_id}", headers=auth_headers(admin_token))
+    assert deleted.status_code == 200, deleted.text
+
+    with SessionLocal() as db:
+        report = build_financial_report(
+            db, from_date=two_days_ago.date(), to_date=two_days_ago.date(), granularity="daily"
+        )
+    assert report["total_amount"] == Decimal("0")
+    assert report["rows"] == []
+
+
+def test_doctor_search_ranks_text_and_partial_name_matches(client, admin_token):
+    _, doctor_user_id = _setup_approved_doctor(client, admin_token, "doctor.search@testmail.dev")
+
+    by_headline = client.get("/doctors/search", params={"q": "extensions"})
+    assert by_headline.status_code == 200, by_headline.text
+    assert [item["doctor_user_id"] for item in by_headline.json()] == [doctor_user_id]
+
+    by_partial_name = client.get("/doctors/search", params={"q": "Bookab"})
+    assert by_partial_name.status_code == 200, by_partial_name.text
+    assert [item["doctor_user_id"] for item in by_partial_name.json()] == [doctor_user_id]
+
+    no_match = client.get("/doctors/search", params={"q": "cardiology"})
+    assert no_match.status_code == 200, no_match.text
+    assert no_match.json() == []
+
+    by_city = client.get("/doctors", params={"city": "zzz-nowhere"})
+    assert by_city.status_code == 200, by_city.text
+    assert by_city.json() == []
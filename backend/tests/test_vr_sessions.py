@@ -0,0 +1,219 @@
+import asyncio
+
+from app.services.vr_session_broker import InMemoryVRSessionBackend, VRSessionBroker, playback_position
+
+
+class _FakeSocket:
+    def __init__(self, *, send_delay: float = 0.0) -> None:
+        self.send_delay = send_delay
+        self.sent: list[dict] = []
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_json(self, payload: dict) -> None:
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.sent.append(payload)
+
+
+def _broker(backend, **overrides) -> VRSessionBroker:
+    options = {
+        "ttl_seconds": 60,
+        "reconnect_grace_seconds": 60,
+        "sweep_interval_seconds": 60,
+        "peer_queue_size": 8,
+    }
+    options.update(overrides)
+    return VRSessionBroker(backend=backend, **options)
+
+
+def test_control_frames_route_across_workers_sharing_a_backend():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        worker_a, worker_b = _broker(backend), _broker(backend)
+        record = await worker_a.create_session(doctor_id="doc", patient_id="pat")
+
+        doctor_ws, patient_ws = _FakeSocket(), _FakeSocket()
+        await worker_a.join(session_id=record.session_id, role="doctor", websocket=doctor_ws)
+        await worker_b.join(session_id=record.session_id, role="patient", websocket=patient_ws)
+
+        await worker_a.handle_message(
+            session_id=record.session_id,
+            role="doctor",
+            data={"type": "CONTROL", "payload": {"command": "seek", "time": 42}},
+        )
+        await asyncio.sleep(0.01)
+        return patient_ws.sent
+
+    sent = asyncio.run(scenario())
+    assert sent[0]["type"] == "SYNC_STATE"
+    assert sent[-1]["type"] == "CONTROL"
+    assert sent[-1]["payload"] == {"command": "seek", "time": 42}
+    assert sent[-1]["version"] == 1
+    assert sent[-1]["clock"]["position"] == 42
+
+
+def test_slow_patient_does_not_stall_doctor_and_keeps_latest_frames():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        broker = _broker(backend, peer_queue_size=4)
+        record = await broker.create_session(doctor_id="doc", patient_id="pat")
+        patient_ws = _FakeSocket(send_delay=0.05)
+        patient = await broker.join(session_id=record.session_id, role="patient", websocket=patient_ws)
+        await broker.join(session_id=record.session_id, role="doctor", websocket=_FakeSocket())
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for second in range(50):
+            await broker.handle_message(
+                session_id=record.session_id,
+                role="doctor",
+                data={"type": "CONTROL", "payload": {"command": "seek", "time": second}},
+            )
+        elapsed = loop.time() - started
+        await asyncio.sleep(0.3)
+        return elapsed, patient.dropped, patient_ws.sent
+
+    elapsed, dropped, sent = asyncio.run(scenario())
+    assert elapsed < 0.05
+    assert dropped > 0
+    assert sent[-1]["payload"]["time"] == 49
+
+
+def test_dropped_frames_are_followed_by_a_fresh_snapshot():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        broker = _broker(backend, peer_queue_size=2)
+        record = await broker.create_session(doctor_id="doc", patient_id="pat")
+        patient_ws = _FakeSocket(send_delay=0.02)
+        await broker.join(session_id=record.session_id, role="patient", websocket=patient_ws)
+        await broker.join(session_id=record.session_id, role="doctor", websocket=_FakeSocket())
+
+        # SET_VIDEO is evicted by the seeks behind it while the patient link is slow.
+        await broker.handle_message(
+            session_id=record.session_id, role="doctor", data={"type": "SET_VIDEO", "payload": {"video_id": "abc"}}
+        )
+        for second in range(10):
+            await broker.handle_message(
+                session_id=record.session_id,
+                role="doctor",
+                data={"type": "CONTROL", "payload": {"command": "seek", "time": second}},
+            )
+        await asyncio.sleep(0.3)
+        return patient_ws.sent
+
+    sent = asyncio.run(scenario())
+    assert not any(frame["type"] == "SET_VIDEO" for frame in sent)
+    snapshots = [frame for frame in sent if frame["type"] == "SYNC_STATE"]
+    # The join snapshot predates SET_VIDEO, so only a resync can carry the video.
+    assert snapshots[-1]["payload"]["video_id"] == "abc"
+    assert snapshots[-1]["version"] == sent[-1]["version"]
+    assert sent[-1]["payload"]["time"] == 9
+
+
+def test_malformed_control_frames_are_ignored():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        broker = _broker(backend)
+        record = await broker.create_session(doctor_id="doc", patient_id="pat")
+        patient_ws = _FakeSocket()
+        await broker.join(session_id=record.session_id, role="patient", websocket=patient_ws)
+        for bad in ["1:20", {"at": 3}, [1], "nan", -5, True]:
+            await broker.handle_message(
+                session_id=record.session_id,
+                role="doctor",
+                data={"type": "CONTROL", "payload": {"command": "seek", "time": bad}},
+            )
+        await broker.handle_message(session_id=record.session_id, role="doctor", data={"type": "CONTROL", "payload": "x"})
+        await broker.handle_message(
+            session_id=record.session_id,
+            role="doctor",
+            data={"type": "CONTROL", "payload": {"command": "seek", "time": "12.5"}},
+        )
+        await asyncio.sleep(0.01)
+        return broker.control_events_in, patient_ws.sent
+
+    events_in, sent = asyncio.run(scenario())
+    assert events_in == 1
+    assert [frame["payload"] for frame in sent if frame["type"] == "CONTROL"] == [{"command": "seek", "time": 12.5}]
+
+
+def test_reconnect_with_current_version_skips_full_snapshot():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        broker = _broker(backend)
+        record = await broker.create_session(doctor_id="doc", patient_id="pat")
+        await broker.join(session_id=record.session_id, role="doctor", websocket=_FakeSocket())
+        await broker.handle_message(
+            session_id=record.session_id,
+            role="doctor",
+            data={"type": "SET_VIDEO", "payload": {"video_id": "abc"}},
+        )
+
+        stale_ws, fresh_ws = _FakeSocket(), _FakeSocket()
+        await broker.join(session_id=record.session_id, role="patient", websocket=stale_ws, known_version=0)
+        await asyncio.sleep(0.01)
+        await broker.join(session_id=record.session_id, role="patient", websocket=fresh_ws, known_version=1)
+        await asyncio.sleep(0.01)
+        return stale_ws.sent[0], fresh_ws.sent[0]
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale["payload"]["video_id"] == "abc"
+    assert stale["version"] == 1
+    assert fresh["unchanged"] is True
+    assert fresh["version"] == 1
+    assert "payload" not in fresh
+
+
+def test_abandoned_sessions_are_evicted_after_ttl():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        broker = _broker(backend, ttl_seconds=0.05, reconnect_grace_seconds=0.05)
+        abandoned = await broker.create_session(doctor_id="doc", patient_id="pat")
+        active = await broker.create_session(doctor_id="doc", patient_id="pat")
+        await broker.join(session_id=active.session_id, role="doctor", websocket=_FakeSocket())
+        await asyncio.sleep(0.1)
+
+        evicted = await broker.sweep()
+        rejected = await broker.join(session_id=abandoned.session_id, role="patient", websocket=_FakeSocket())
+        return evicted, rejected, await backend.get(active.session_id)
+
+    evicted, rejected, active_record = asyncio.run(scenario())
+    assert len(evicted) == 1
+    assert rejected is None
+    assert active_record is not None
+
+
+def test_scrubbing_is_coalesced_into_latest_seek_and_play_state():
+    async def scenario():
+        backend = InMemoryVRSessionBackend()
+        broker = _broker(backend, control_coalesce_seconds=0.05)
+        record = await broker.create_session(doctor_id="doc", patient_id="pat")
+        patient_ws = _FakeSocket()
+        await broker.join(session_id=record.session_id, role="patient", websocket=patient_ws)
+        await broker.join(session_id=record.session_id, role="doctor", websocket=_FakeSocket())
+
+        for second in range(30):
+            await broker.handle_message(
+                session_id=record.session_id,
+                role="doctor",
+                data={"type": "CONTROL", "payload": {"command": "seek", "time": second}},
+            )
+        await broker.handle_message(
+            session_id=record.session_id,
+            role="doctor",
+            data={"type": "CONTROL", "payload": {"command": "play"}},
+        )
+        await asyncio.sleep(0.1)
+        return broker, patient_ws.sent, await backend.get(record.session_id)
+
+    broker, sent, stored = asyncio.run(scenario())
+    controls = [frame for frame in sent if frame["type"] == "CONTROL"]
+    assert [frame["payload"]["command"] for frame in controls] == ["seek", "play"]
+    assert controls[0]["payload"]["time"] == 29
+    assert controls[-1]["clock"]["is_playing"] is True
+    assert broker.control_events_in == 31
+    assert broker.control_frames_out == 2
+    assert stored.version == 1
+    assert playback_position(stored.state, stored.state["anchor_at"] + 2) == 31
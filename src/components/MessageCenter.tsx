@@ -3,6 +3,7 @@ import { apiJson } from '../utils/api';
 
 type MessageItem = {
   id: string;
+  thread_id: string | null;
   sender_user_id: string;
   receiver_user_id: string;
   subject: string | null;
@@ -11,19 +12,45 @@ type MessageItem = {
   created_at: string;
 };
 
+type MessageThread = {
+  id: string;
+  peer_user_id: string;
+  last_message_id: string | null;
+  last_sender_user_id: string | null;
+  last_message_preview: string | null;
+  last_message_at: string;
+  unread_count: number;
+};
+
+type Page<T> = {
+  items: T[];
+  next_cursor: string | null;
+};
+
+type ThreadMessages = {
+  items: MessageItem[];
+  nextCursor: string | null;
+};
+
 type MessageCenterProps = {
   title?: string;
   className?: string;
+  // Contacts a new chat may be started with; existing threads are always listed.
   allowedPartnerIds?: string[];
   partnerNames?: Record<string, string>;
+  // Label for thread peers missing from ``partnerNames``.
+  partnerFallbackLabel?: (partnerId: string) => string;
   initialPartnerId?: string | null;
 };
 
-type ChatMessage = MessageItem & {
-  isOutgoing: boolean;
+type Conversation = {
   partnerId: string;
+  thread: MessageThread | null;
 };
 
+const THREAD_PAGE_SIZE = 20;
+const MESSAGE_PAGE_SIZE = 50;
+
 function formatDate(value: string): string {
   const date = new Date(value);
   if (Number.isNaN(date.getTime())) return value;
@@ -40,42 +67,72 @@ function fallbackPartnerLabel(partnerId: string): string {
   return `User #${partnerId.slice(0, 8)}`;
 }
 
+function pagePath(path: string, limit: number, cursor: string | null): string {
+  const query = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    query.set('cursor', cursor);
+  }
+  return `${path}?${query.toString()}`;
+}
+
+function mergeById<T extends { id: string }>(current: T[], incoming: T[]): T[] {
+  const byId = new Map(current.map((item) => [item.id, item]));
+  for (const item of incoming) {
+    byId.set(item.id, item);
+  }
+  return [...byId.values()];
+}
+
+function byLastMessageDesc(a: MessageThread, b: MessageThread): number {
+  return new Date(b.last_message_at).getTime() - new Date(a.last_message_at).getTime();
+}
+
+function byCreatedAsc(a: MessageItem, b: MessageItem): number {
+  return new Date(a.created_at).getTime() - new Date(b.created_at).getTime();
+}
+
 export default function MessageCenter({
   title = 'Messages',
   className = '',
   allowedPartnerIds,
   partnerNames,
+  partnerFallbackLabel = fallbackPartnerLabel,
   initialPartnerId = null
 }: MessageCenterProps) {
-  const [inbox, setInbox] = useState<MessageItem[]>([]);
-  const [outbox, setOutbox] = useState<MessageItem[]>([]);
+  const [threads, setThreads] = useState<MessageThread[]>([]);
+  const [threadsCursor, setThreadsCursor] = useState<string | null>(null);
+  const [messagesByThread, setMessagesByThread] = useState<Record<string, ThreadMessages>>({});
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
   const [selectedPartnerId, setSelectedPartnerId] = useState<string | null>(null);
   const [receiverInput, setReceiverInput] = useState('');
   const [body, setBody] = useState('');
   const [isSending, setIsSending] = useState(false);
 
-  const loadMessages = async (silent = false) => {
+  // Refreshes the newest page of threads; older pages fetched with "Load more" are kept.
+  const loadThreads = async (silent = false) => {
     if (!silent) {
       setIsLoading(true);
-    }
-    if (!silent) {
       setErrorMessage(null);
     }
     try {
-      const [inboxPayload, outboxPayload] = await Promise.all([
-        apiJson<MessageItem[]>('/messages?box=inbox', undefined, true, 'Failed to load inbox'),
-        apiJson<MessageItem[]>('/messages?box=outbox', undefined, true, 'Failed to load outbox')
-      ]);
-      setInbox(inboxPayload);
-      setOutbox(outboxPayload);
+      const page = await apiJson<Page<MessageThread>>(
+        pagePath('/messages/threads', THREAD_PAGE_SIZE, null),
+        undefined,
+        true,
+        'Failed to load chats'
+      );
+      setThreads((prev) => mergeById(prev, page.items).sort(byLastMessageDesc));
+      if (!silent) {
+        setThreadsCursor(page.next_cursor);
+      }
+      return page.items;
     } catch (error) {
       if (!silent) {
-        setErrorMessage(error instanceof Error ? error.message : 'Failed to load chat messages');
-        setInbox([]);
-        setOutbox([]);
+        setErrorMessage(error instanceof Error ? error.message : 'Failed to load chats');
       }
+      return [];
     } finally {
       if (!silent) {
         setIsLoading(false);
@@ -83,77 +140,64 @@ export default function MessageCenter({
     }
   };
 
-  useEffect(() => {
-    void loadMessages();
-  }, []);
+  const loadMoreThreads = async () => {
+    if (!threadsCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await apiJson<Page<MessageThread>>(
+        pagePath('/messages/threads', THREAD_PAGE_SIZE, threadsCursor),
+        undefined,
+        true,
+        'Failed to load chats'
+      );
+      setThreads((prev) => mergeById(prev, page.items).sort(byLastMessageDesc));
+      setThreadsCursor(page.next_cursor);
+    } catch (error) {
+      setErrorMessage(error instanceof Error ? error.message : 'Failed to load chats');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
+  // ``cursor`` null refreshes the newest messages; otherwise loads the page before it.
+  const loadThreadMessages = async (threadId: string, cursor: string | null = null) => {
+    try {
+      const page = await apiJson<Page<MessageItem>>(
+        pagePath(`/messages/threads/${threadId}/messages`, MESSAGE_PAGE_SIZE, cursor),
+        undefined,
+        true,
+        'Failed to load messages'
+      );
+      setMessagesByThread((prev) => {
+        const current = prev[threadId];
+        const nextCursor = cursor || !current ? page.next_cursor : current.nextCursor;
+        return {
+          ...prev,
+          [threadId]: {
+            items: mergeById(current?.items ?? [], page.items).sort(byCreatedAsc),
+            nextCursor
+          }
+        };
+      });
+    } catch (error) {
+      setErrorMessage(error instanceof Error ? error.message : 'Failed to load messages');
+    }
+  };
 
   useEffect(() => {
-    const intervalId = window.setInterval(() => {
-      void loadMessages(true);
-    }, 3000);
-    const onFocus = () => {
-      void loadMessages(true);
-    };
-    window.addEventListener('focus', onFocus);
-    return () => {
-      window.clearInterval(intervalId);
-      window.removeEventListener('focus', onFocus);
-    };
+    void loadThreads();
   }, []);
 
-  const conversations = useMemo(() => {
-    const all: ChatMessage[] = [
-      ...inbox.map((item) => ({ ...item, isOutgoing: false, partnerId: item.sender_user_id })),
-      ...outbox.map((item) => ({ ...item, isOutgoing: true, partnerId: item.receiver_user_id }))
-    ].sort((a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime());
-    const allowed = allowedPartnerIds ? new Set(allowedPartnerIds) : null;
-
-    const byPartner = new Map<
-      string,
-      {
-        partnerId: string;
-        messages: ChatMessage[];
-        unreadIncoming: number;
-      }
-    >();
-
-    for (const message of all) {
-      if (allowed && !allowed.has(message.partnerId)) {
-        continue;
-      }
-      const current = byPartner.get(message.partnerId) ?? {
-        partnerId: message.partnerId,
-        messages: [],
-        unreadIncoming: 0
-      };
-      current.messages.push(message);
-      if (!message.isOutgoing && !message.read_at) {
-        current.unreadIncoming += 1;
-      }
-      byPartner.set(message.partnerId, current);
-    }
-
-    if (allowed) {
-      for (const partnerId of allowed) {
-        if (!byPartner.has(partnerId)) {
-          byPartner.set(partnerId, {
-            partnerId,
-            messages: [],
-            unreadIncoming: 0
-          });
-        }
+  const conversations = useMemo<Conversation[]>(() => {
+    const items: Conversation[] = threads.map((thread) => ({ partnerId: thread.peer_user_id, thread }));
+    const withThread = new Set(items.map((item) => item.partnerId));
+    for (const partnerId of allowedPartnerIds ?? []) {
+      if (!withThread.has(partnerId)) {
+        items.push({ partnerId, thread: null });
       }
     }
-
-    return [...byPartner.values()].sort((a, b) => {
-      const aLast = a.messages[a.messages.length - 1];
-      const bLast = b.messages[b.messages.length - 1];
-      if (!aLast && !bLast) return 0;
-      if (!aLast) return 1;
-      if (!bLast) return -1;
-      return new Date(bLast.created_at).getTime() - new Date(aLast.created_at).getTime();
-    });
-  }, [inbox, outbox, allowedPartnerIds]);
+    return items;
+  }, [threads, allowedPartnerIds]);
 
   useEffect(() => {
     if (initialPartnerId && conversations.some((item) => item.partnerId === initialPartnerId)) {
@@ -169,17 +213,45 @@ export default function MessageCenter({
   }, [conversations, selectedPartnerId, initialPartnerId]);
 
   const selectedConversation = conversations.find((item) => item.partnerId === selectedPartnerId) ?? null;
+  const selectedThreadId = selectedConversation?.thread?.id ?? null;
+  const selectedMessages = selectedThreadId ? messagesByThread[selectedThreadId] : undefined;
+
+  useEffect(() => {
+    if (selectedThreadId) {
+      void loadThreadMessages(selectedThreadId);
+    }
+  }, [selectedThreadId]);
+
+  useEffect(() => {
+    const refresh = () => {
+      void loadThreads(true);
+      if (selectedThreadId) {
+        void loadThreadMessages(selectedThreadId);
+      }
+    };
+    const intervalId = window.setInterval(refresh, 3000);
+    window.addEventListener('focus', refresh);
+    return () => {
+      window.clearInterval(intervalId);
+      window.removeEventListener('focus', refresh);
+    };
+  }, [selectedThreadId]);
+
+  const canMessage = (partnerId: string) =>
+    !allowedPartnerIds ||
+    allowedPartnerIds.includes(partnerId) ||
+    threads.some((thread) => thread.peer_user_id === partnerId);
 
   const sendMessage = async () => {
     const receiver = (selectedPartnerId ?? receiverInput).trim();
     const content = body.trim();
     if (!receiver || !content) return;
-    if (allowedPartnerIds && !allowedPartnerIds.includes(receiver)) return;
+    if (!canMessage(receiver)) return;
 
     setIsSending(true);
     setErrorMessage(null);
     try {
-      await apiJson(
+      const sent = await apiJson<MessageItem>(
         '/messages',
         {
           method: 'POST',
@@ -196,7 +268,10 @@ export default function MessageCenter({
       setBody('');
       setReceiverInput('');
       setSelectedPartnerId(receiver);
-      await loadMessages();
+      await loadThreads(true);
+      if (sent.thread_id) {
+        await loadThreadMessages(sent.thread_id);
+      }
     } catch (error) {
       setErrorMessage(error instanceof Error ? error.message : 'Failed to send message');
     } finally {
@@ -205,20 +280,26 @@ export default function MessageCenter({
   };
 
   const markConversationRead = async () => {
-    if (!selectedConversation) return;
-    const unreadIds = selectedConversation.messages
-      .filter((item) => !item.isOutgoing && !item.read_at)
-      .map((item) => item.id);
-
-    if (unreadIds.length === 0) return;
+    const thread = selectedConversation?.thread;
+    if (!thread || thread.unread_count === 0) return;
 
     try {
-      await Promise.all(
-        unreadIds.map((id) =>
-          apiJson(`/messages/${id}/read`, { method: 'PATCH' }, true, 'Failed to mark message as read')
-        )
-      );
-      setInbox((prev) => prev.map((item) => (unreadIds.includes(item.id) ? { ...item, read_at: new Date().toISOString() } : item)));
+      await apiJson(`/messages/threads/${thread.id}/read`, { method: 'POST' }, true, 'Failed to mark chat as read');
+      const readAt = new Date().toISOString();
+      setThreads((prev) => prev.map((item) => (item.id === thread.id ? { ...item, unread_count: 0 } : item)));
+      setMessagesByThread((prev) => {
+        const current = prev[thread.id];
+        if (!current) return prev;
+        return {
+          ...prev,
+          [thread.id]: {
+            ...current,
+            items: current.items.map((item) =>
+              item.sender_user_id === thread.peer_user_id && !item.read_at ? { ...item, read_at: readAt } : item
+            )
+          }
+        };
+      });
     } catch {
       // non-blocking
     }
@@ -244,37 +325,49 @@ export default function MessageCenter({
           ) : conversations.length === 0 ? (
             <p className="mt-3 text-sm text-muted">No conversations yet.</p>
           ) : (
-            <ul className="mt-3 space-y-2">
-              {conversations.map((conversation) => {
-                const last = conversation.messages[conversation.messages.length - 1];
-                const active = selectedPartnerId === conversation.partnerId;
-                const partnerLabel = partnerNames?.[conversation.partnerId] ?? fallbackPartnerLabel(conversation.partnerId);
-                return (
-                  <li key={conversation.partnerId}>
-                    <button
-                      type="button"
-                      onClick={() => setSelectedPartnerId(conversation.partnerId)}
-                      className={`w-full rounded-xl border px-3 py-2 text-left transition ${
-                        active
-                          ? 'border-primary/40 bg-[#d9fdd3] text-textMain'
-                          : 'border-borderGray bg-white text-textMain hover:border-primary/30'
-                      }`}
-                    >
-                      <div className="flex items-center justify-between gap-2">
-                        <p className="text-xs font-bold text-textMain">{partnerLabel}</p>
-                        {conversation.unreadIncoming > 0 && (
-                          <span className="rounded-full bg-primary px-2 py-0.5 text-[10px] font-bold text-white">
-                            {conversation.unreadIncoming}
-                          </span>
-                        )}
-                      </div>
-                      <p className="mt-1 line-clamp-1 text-xs text-muted">{last?.body ?? 'No messages yet.'}</p>
-                      <p className="mt-1 text-[11px] text-muted">{last ? formatDate(last.created_at) : 'Ready to chat'}</p>
-                    </button>
-                  </li>
-                );
-              })}
-            </ul>
+            <>
+              <ul className="mt-3 space-y-2">
+                {conversations.map((conversation) => {
+                  const thread = conversation.thread;
+                  const active = selectedPartnerId === conversation.partnerId;
+                  const partnerLabel = partnerNames?.[conversation.partnerId] ?? partnerFallbackLabel(conversation.partnerId);
+                  return (
+                    <li key={conversation.partnerId}>
+                      <button
+                        type="button"
+                        onClick={() => setSelectedPartnerId(conversation.partnerId)}
+                        className={`w-full rounded-xl border px-3 py-2 text-left transition ${
+                          active
+                            ? 'border-primary/40 bg-[#d9fdd3] text-textMain'
+                            : 'border-borderGray bg-white text-textMain hover:border-primary/30'
+                        }`}
+                      >
+                        <div className="flex items-center justify-between gap-2">
+                          <p className="text-xs font-bold text-textMain">{partnerLabel}</p>
+                          {thread && thread.unread_count > 0 && (
+                            <span className="rounded-full bg-primary px-2 py-0.5 text-[10px] font-bold text-white">
+                              {thread.unread_count}
+                            </span>
+                          )}
+                        </div>
+                        <p className="mt-1 line-clamp-1 text-xs text-muted">{thread?.last_message_preview ?? 'No messages yet.'}</p>
+                        <p className="mt-1 text-[11px] text-muted">{thread ? formatDate(thread.last_message_at) : 'Ready to chat'}</p>
+                      </button>
+                    </li>
+                  );
+                })}
+              </ul>
+              {threadsCursor ? (
+                <button
+                  type="button"
+                  onClick={() => void loadMoreThreads()}
+                  disabled={isLoadingMore}
+                  className="mt-3 w-full rounded-lg border border-borderGray bg-white px-3 py-1.5 text-xs font-semibold text-textMain transition hover:border-primary/40 hover:text-primary disabled:opacity-60"
+                >
+                  {isLoadingMore ? 'Loading...' : 'Load older chats'}
+                </button>
+              ) : null}
+            </>
           )}
         </aside>
 
@@ -282,10 +375,10 @@ export default function MessageCenter({
           <div className="flex flex-wrap items-center justify-between gap-2 rounded-xl border border-borderGray bg-white px-3 py-2">
             <p className="text-sm font-bold text-textMain">
               {selectedConversation
-                ? `Chat with ${partnerNames?.[selectedConversation.partnerId] ?? fallbackPartnerLabel(selectedConversation.partnerId)}`
+                ? `Chat with ${partnerNames?.[selectedConversation.partnerId] ?? partnerFallbackLabel(selectedConversation.partnerId)}`
                 : 'Start a new chat'}
             </p>
-            {selectedConversation && selectedConversation.unreadIncoming > 0 && (
+            {selectedConversation?.thread && selectedConversation.thread.unread_count > 0 && (
               <button
                 type="button"
                 onClick={() => void markConversationRead()}
@@ -297,24 +390,40 @@ export default function MessageCenter({
           </div>
 
           <div className="mt-3 max-h-[420px] space-y-2 overflow-y-auto rounded-xl border border-borderGray bg-[#e5ddd5] p-3">
+            {selectedConversation && selectedThreadId && selectedMessages?.nextCursor ? (
+              <div className="flex justify-center">
+                <button
+                  type="button"
+                  onClick={() => void loadThreadMessages(selectedThreadId, selectedMessages.nextCursor ?? null)}
+                  className="rounded-lg border border-borderGray bg-white px-2 py-1 text-[11px] font-semibold text-textMain transition hover:border-primary/40 hover:text-primary"
+                >
+                  Load earlier messages
+                </button>
+              </div>
+            ) : null}
             {selectedConversation ? (
-              selectedConversation.messages.length > 0 ? (
-                selectedConversation.messages.map((message) => (
-                  <div key={message.id} className={`flex ${message.isOutgoing ? 'justify-end' : 'justify-start'}`}>
-                    <div
-                      className={`max-w-[82%] rounded-2xl px-3 py-2 text-sm shadow-sm ${
-                        message.isOutgoing
-                          ? 'rounded-br-md border border-primary/30 bg-[#dcf8c6] text-textMain'
-                          : 'rounded-bl-md border border-borderGray bg-white text-textMain'
-                      }`}
-                    >
-                      <p>{message.body}</p>
-                      <p className="mt-1 text-[10px] text-muted">
-                        {formatTime(message.created_at)}
-                      </p>
+              selectedMessages && selectedMessages.items.length > 0 ? (
+                selectedMessages.items.map((message) => {
+                  const isOutgoing = message.receiver_user_id === selectedConversation.partnerId;
+                  return (
+                    <div key={message.id} className={`flex ${isOutgoing ? 'justify-end' : 'justify-start'}`}>
+                      <div
+                        className={`max-w-[82%] rounded-2xl px-3 py-2 text-sm shadow-sm ${
+                          isOutgoing
+                            ? 'rounded-br-md border border-primary/30 bg-[#dcf8c6] text-textMain'
+                            : 'rounded-bl-md border border-borderGray bg-white text-textMain'
+                        }`}
+                      >
+                        <p>{message.body}</p>
+                        <p className="mt-1 text-[10px] text-muted">
+                          {formatTime(message.created_at)}
+                        </p>
+                      </div>
                     </div>
-                  </div>
-                ))
+                  );
+                })
+              ) : selectedThreadId && !selectedMessages ? (
+                <p className="text-sm text-muted">Loading messages...</p>
               ) : (
                 <p className="text-sm text-muted">No messages yet. Send the first message.</p>
               )
@@ -1,7 +1,7 @@
 import { type ReactNode, useEffect, useMemo, useState } from 'react';
 import Header from '../components/Header';
 import { useLanguage } from '../context/LanguageContext';
-import { apiJson, getBackendOrigin } from '../utils/api';
+import { apiJson, apiJsonPage, getBackendOrigin } from '../utils/api';
 
 type ApplicationStatus =
   | 'PENDING'
@@ -68,6 +68,7 @@ type DoctorApplication = {
 
 const STATUS_OPTIONS: Array<'ALL' | 'PENDING' | 'APPROVED' | 'REJECTED'> = ['ALL', 'PENDING', 'APPROVED', 'REJECTED'];
 const APPROVED_STATUSES: ApplicationStatus[] = ['APPROVED', 'APPROVED_MD', 'APPROVED_THERAPIST'];
+const APPLICATIONS_PAGE_SIZE = 50;
 
 function statusClass(status: ApplicationStatus): string {
   if (status === 'APPROVED' || status === 'APPROVED_MD' || status === 'APPROVED_THERAPIST') {
@@ -134,6 +135,7 @@ export default function AdminPage() {
             details: 'تفاصيل الطلب',
             loading: 'جاري تحميل الطلبات...',
             empty: 'لا توجد طلبات مطابقة لهذا الفلتر.',
+            loadMore: 'تحميل المزيد',
             selectHint: 'اختر طلباً لعرض التفاصيل.',
             saveNote: 'حفظ الملاحظة',
             approve: 'قبول',
@@ -162,6 +164,7 @@ export default function AdminPage() {
             details: 'Application Details',
             loading: 'Loading applications...',
             empty: 'No applications found for this filter.',
+            loadMore: 'Load more',
             selectHint: 'Select an application to view details.',
             saveNote: 'Save note',
             approve: 'Approve',
@@ -184,25 +187,32 @@ export default function AdminPage() {
   const [selectedStatus, setSelectedStatus] = useState<'ALL' | 'PENDING' | 'APPROVED' | 'REJECTED'>('PENDING');
   const [selectedApplicationId, setSelectedApplicationId] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [applicationsCursor, setApplicationsCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
   const [busyAction, setBusyAction] = useState<string | null>(null);
   const [adminNoteDraft, setAdminNoteDraft] = useState('');
   const [rejectionReason, setRejectionReason] = useState('');
 
+  // The listing is cursor-paginated; X-Next-Cursor points at the next page of the same filter.
+  const fetchApplicationsPage = async (status: 'ALL' | 'PENDING' | 'APPROVED' | 'REJECTED', cursor: string | null) => {
+    const query =
+      status === 'ALL' || status === 'APPROVED' ? '' : `&status=${encodeURIComponent(status)}`;
+    const page = await apiJsonPage<DoctorApplication>(
+      `/admin/applications?limit=${APPLICATIONS_PAGE_SIZE}${query}`,
+      cursor,
+      true,
+      isAr ? 'تعذر تحميل الطلبات' : 'Failed to load applications'
+    );
+    setApplicationsCursor(page.nextCursor);
+    return status === 'APPROVED' ? page.items.filter((item) => APPROVED_STATUSES.includes(item.status)) : page.items;
+  };
+
   const loadApplications = async (status: 'ALL' | 'PENDING' | 'APPROVED' | 'REJECTED' = selectedStatus) => {
     setIsLoading(true);
     setErrorMessage(null);
     try {
-      const query =
-        status === 'ALL' || status === 'APPROVED' ? '' : `?status=${encodeURIComponent(status)}`;
-      const payload = await apiJson<DoctorApplication[]>(
-        `/admin/applications${query}`,
-        undefined,
-        true,
-        isAr ? 'تعذر تحميل الطلبات' : 'Failed to load applications'
-      );
-      const normalized =
-        status === 'APPROVED' ? payload.filter((item) => APPROVED_STATUSES.includes(item.status)) : payload;
+      const normalized = await fetchApplicationsPage(status, null);
       setApplications(normalized);
       if (normalized.length > 0 && !selectedApplicationId) {
         setSelectedApplicationId(normalized[0].id);
@@ -217,6 +227,23 @@ export default function AdminPage() {
     }
   };
 
+  const loadMoreApplications = async () => {
+    if (!applicationsCursor) return;
+    setIsLoadingMore(true);
+    setErrorMessage(null);
+    try {
+      const nextApplications = await fetchApplicationsPage(selectedStatus, applicationsCursor);
+      setApplications((current) => [
+        ...current,
+        ...nextApplications.filter((item) => !current.some((existing) => existing.id === item.id))
+      ]);
+    } catch (error) {
+      setErrorMessage(error instanceof Error ? error.message : isAr ? 'تعذر تحميل الطلبات' : 'Failed to load applications');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     void loadApplications('PENDING');
   }, []);
@@ -513,6 +540,17 @@ export default function AdminPage() {
                 })}
               </div>
             )}
+
+            {!isLoading && applicationsCursor && (
+              <button
+                type="button"
+                onClick={() => void loadMoreApplications()}
+                disabled={isLoadingMore}
+                className="mt-4 w-full rounded-xl border border-borderGray bg-white px-4 py-2 text-sm font-semibold text-textMain transition hover:border-primary/40 hover:text-primary disabled:opacity-60"
+              >
+                {isLoadingMore ? copy.loading : copy.loadMore}
+              </button>
+            )}
           </section>
 
           <section className="min-w-0 rounded-hero border border-borderGray bg-white p-6 shadow-card">
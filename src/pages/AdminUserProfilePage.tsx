@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react';
 import Header from '../components/Header';
 import Footer from '../components/Footer';
-import { ApiError, apiJson } from '../utils/api';
+import { ApiError, apiJson, apiJsonPage } from '../utils/api';
 
 type UserStatus = 'ACTIVE' | 'SUSPENDED';
 type UserRole = 'USER' | 'DOCTOR' | 'ADMIN';
@@ -68,6 +68,8 @@ type ViewMode = 'list' | 'detail';
 
 type StatusFilter = 'ALL' | UserStatus;
 
+const USERS_PAGE_SIZE = 50;
+
 function formatDate(isoValue: string | null): string {
   if (!isoValue) {
     return 'N/A';
@@ -133,6 +135,9 @@ export default function AdminUserProfilePage() {
   const [searchQuery, setSearchQuery] = useState('');
   const [statusFilter, setStatusFilter] = useState<StatusFilter>('ALL');
   const [isListLoading, setIsListLoading] = useState(true);
+  const [usersQuery, setUsersQuery] = useState('');
+  const [usersCursor, setUsersCursor] = useState<string | null>(null);
+  const [isLoadingMoreUsers, setIsLoadingMoreUsers] = useState(false);
   const [isDetailLoading, setIsDetailLoading] = useState(false);
   const [isDeletingUser, setIsDeletingUser] = useState(false);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
@@ -183,12 +188,27 @@ export default function AdminUserProfilePage() {
     return Array.from(groups.values());
   }, [selectedUserDetail]);
 
+  const fetchUsersPage = async (query: string, cursor: string | null) => {
+    // The listing is cursor-paginated; X-Next-Cursor points at the next page of the same filters.
+    const page = await apiJsonPage<AdminUserListItem>(`/admin/users?${query}`, cursor, true, 'Failed to load users');
+    setUsersCursor(page.nextCursor);
+    return page.items;
+  };
+
+  const showUsersError = (error: unknown) => {
+    if (error instanceof ApiError && (error.status === 401 || error.status === 403)) {
+      setErrorMessage('Admin access is required to view users.');
+    } else {
+      setErrorMessage(error instanceof Error ? error.message : 'Failed to load users');
+    }
+  };
+
   const loadUsers = async () => {
     setIsListLoading(true);
     setErrorMessage(null);
 
     try {
-      const query = new URLSearchParams();
+      const query = new URLSearchParams({ limit: String(USERS_PAGE_SIZE) });
       if (statusFilter !== 'ALL') {
         query.set('status', statusFilter);
       }
@@ -196,25 +216,30 @@ export default function AdminUserProfilePage() {
         query.set('search', searchQuery.trim());
       }
 
-      const suffix = query.toString();
-      const payload = await apiJson<AdminUserListItem[]>(
-        suffix ? `/admin/users?${suffix}` : '/admin/users',
-        undefined,
-        true,
-        'Failed to load users'
-      );
-      setUsers(payload);
+      setUsersQuery(query.toString());
+      setUsers(await fetchUsersPage(query.toString(), null));
     } catch (error) {
-      if (error instanceof ApiError && (error.status === 401 || error.status === 403)) {
-        setErrorMessage('Admin access is required to view users.');
-      } else {
-        setErrorMessage(error instanceof Error ? error.message : 'Failed to load users');
-      }
+      showUsersError(error);
     } finally {
       setIsListLoading(false);
     }
   };
 
+  const loadMoreUsers = async () => {
+    if (!usersCursor) return;
+    setIsLoadingMoreUsers(true);
+    setErrorMessage(null);
+
+    try {
+      const nextUsers = await fetchUsersPage(usersQuery, usersCursor);
+      setUsers((current) => [...current, ...nextUsers.filter((user) => !current.some((item) => item.id === user.id))]);
+    } catch (error) {
+      showUsersError(error);
+    } finally {
+      setIsLoadingMoreUsers(false);
+    }
+  };
+
   useEffect(() => {
     void loadUsers();
   }, []);
@@ -385,6 +410,19 @@ export default function AdminUserProfilePage() {
                 </table>
               )}
             </div>
+
+            {!isListLoading && usersCursor && (
+              <div className="mt-4 flex justify-center">
+                <button
+                  type="button"
+                  onClick={() => void loadMoreUsers()}
+                  disabled={isLoadingMoreUsers}
+                  className="rounded-lg border border-borderGray bg-white px-4 py-2 text-sm font-semibold text-textMain transition hover:border-primary/40 hover:text-primary disabled:opacity-60"
+                >
+                  {isLoadingMoreUsers ? 'Loading...' : 'Load more users'}
+                </button>
+              </div>
+            )}
           </section>
         ) : (
           <section className="section-shell py-8">
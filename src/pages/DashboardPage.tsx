@@ -5,7 +5,7 @@ import { ApiError, apiJson } from '../utils/api';
 import { getStoredAuthEmail, navigateTo } from '../utils/auth';
 
 type AppointmentStatus = 'REQUESTED' | 'CONFIRMED' | 'CANCELLED' | 'COMPLETED' | 'NO_SHOW';
-type AppointmentCallStatus = 'NOT_READY' | 'READY' | 'LIVE' | 'ENDED';
+type AppointmentCallStatus = 'NOT_READY' | 'PROVISIONING' | 'READY' | 'LIVE' | 'ENDED';
 type TreatmentRequestStatus = 'PENDING' | 'ACCEPTED' | 'DECLINED';
 
 type Appointment = {
@@ -89,12 +89,9 @@ type TreatmentRequest = {
   updated_at: string;
 };
 
-type MessageItem = {
-  id: string;
-  sender_user_id: string;
-  receiver_user_id: string;
-  body: string;
-  created_at: string;
+type MessageThreadPage = {
+  items: Array<{ id: string; peer_user_id: string }>;
+  next_cursor: string | null;
 };
 
 const DISMISSED_USER_CANCELLED_APPOINTMENTS_KEY = 'user_dashboard_dismissed_cancelled_appointments';
@@ -170,6 +167,11 @@ function canJoinVideoNow(appointment: Appointment): boolean {
   return now >= start - 15 * 60 * 1000 && now <= end + 120 * 60 * 1000;
 }
 
+// PROVISIONING: paid, but the meeting is still being created, so there is nothing to join yet.
+function isVideoCallOpen(appointment: Appointment): boolean {
+  return appointment.call_status !== 'ENDED' && appointment.call_status !== 'PROVISIONING';
+}
+
 function isZoomAppointment(appointment: Appointment): boolean {
   return (appointment.call_provider ?? '').toUpperCase() === 'ZOOM' && Boolean(appointment.meeting_link);
 }
@@ -184,8 +186,8 @@ export default function DashboardPage() {
   const [appointments, setAppointments] = useState<Appointment[]>([]);
   const [doctors, setDoctors] = useState<PublicDoctor[]>([]);
   const [treatmentRequests, setTreatmentRequests] = useState<TreatmentRequest[]>([]);
-  const [inboxMessages, setInboxMessages] = useState<MessageItem[]>([]);
-  const [outboxMessages, setOutboxMessages] = useState<MessageItem[]>([]);
+  const [recentChatPeerIds, setRecentChatPeerIds] = useState<string[]>([]);
+  const [hasOlderChats, setHasOlderChats] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
   const [busyAppointmentId, setBusyAppointmentId] = useState<string | null>(null);
@@ -226,14 +228,7 @@ export default function DashboardPage() {
       map.set(request.doctor_id, fromRequest || fromDirectory || `Doctor ${request.doctor_id.slice(0, 8)}`);
     }
 
-    const partnerIds = new Set<string>();
-    for (const item of inboxMessages) {
-      partnerIds.add(item.sender_user_id);
-    }
-    for (const item of outboxMessages) {
-      partnerIds.add(item.receiver_user_id);
-    }
-    for (const partnerId of partnerIds) {
+    for (const partnerId of recentChatPeerIds) {
       if (!map.has(partnerId)) {
         const fromDirectory = doctorById.get(partnerId)?.display_name;
         map.set(partnerId, fromDirectory || `Doctor ${partnerId.slice(0, 8)}`);
@@ -241,7 +236,7 @@ export default function DashboardPage() {
     }
 
     return map;
-  }, [treatmentRequests, inboxMessages, outboxMessages, doctorById]);
+  }, [treatmentRequests, recentChatPeerIds, doctorById]);
   const upcomingCount = useMemo(
     () => appointments.filter((item) => item.status === 'REQUESTED' || item.status === 'CONFIRMED').length,
     [appointments]
@@ -285,19 +280,19 @@ export default function DashboardPage() {
     setErrorMessage(null);
 
     try {
-      const [appointmentPayload, doctorsPayload, requestPayload, inboxPayload, outboxPayload] = await Promise.all([
+      const [appointmentPayload, doctorsPayload, requestPayload, threadPage] = await Promise.all([
         apiJson<Appointment[]>('/appointments/my', undefined, true, 'Failed to load your appointments'),
         apiJson<PublicDoctor[]>('/doctors', undefined, false, 'Failed to load doctors'),
         apiJson<TreatmentRequest[]>('/treatment-requests/my', undefined, true, 'Failed to load doctor feedback'),
-        apiJson<MessageItem[]>('/messages?box=inbox', undefined, true, 'Failed to load inbox messages'),
-        apiJson<MessageItem[]>('/messages?box=outbox', undefined, true, 'Failed to load outbox messages'),
+        // Most recent chats only; the chats page pages through the rest.
+        apiJson<MessageThreadPage>('/messages/threads?limit=20', undefined, true, 'Failed to load chats'),
       ]);
 
       setAppointments(filterDismissedCancelledAppointments(appointmentPayload, dismissedCancelledAppointmentIds));
       setDoctors(doctorsPayload);
       setTreatmentRequests(requestPayload);
-      setInboxMessages(inboxPayload);
-      setOutboxMessages(outboxPayload);
+      setRecentChatPeerIds(threadPage.items.map((thread) => thread.peer_user_id));
+      setHasOlderChats(Boolean(threadPage.next_cursor));
     } catch (error) {
       if (error instanceof ApiError && error.status === 401) {
         setErrorMessage('Please log in again to load your dashboard.');
@@ -322,6 +317,21 @@ export default function DashboardPage() {
     };
   }, []);
 
+  const hasProvisioningCall = appointments.some((appointment) => appointment.call_status === 'PROVISIONING');
+
+  useEffect(() => {
+    if (!hasProvisioningCall) return;
+    // Meeting creation runs in the background; re-read appointments until the link is ready.
+    const intervalId = window.setInterval(() => {
+      void apiJson<Appointment[]>('/appointments/my', undefined, true, 'Failed to load your appointments')
+        .then((payload) => setAppointments(filterDismissedCancelledAppointments(payload, dismissedCancelledAppointmentIds)))
+        .catch(() => undefined);
+    }, 5_000);
+    return () => {
+      window.clearInterval(intervalId);
+    };
+  }, [hasProvisioningCall, dismissedCancelledAppointmentIds]);
+
   const cancelAppointment = async (appointmentId: string) => {
     setBusyAppointmentId(appointmentId);
     setErrorMessage(null);
@@ -572,7 +582,7 @@ export default function DashboardPage() {
                           <p className="mt-1 text-xs text-muted">{doctor?.headline ?? 'Therapy Session'}</p>
                           <p className="mt-2 text-sm text-textMain">{formatDate(appointment.start_at)}</p>
                           <p className="mt-1 text-xs text-muted">Timezone: {appointment.timezone}</p>
-                          {appointment.meeting_link && (
+                          {appointment.meeting_link && appointment.call_status !== 'PROVISIONING' && (
                             <a
                               href={appointment.meeting_link}
                               target="_blank"
@@ -625,7 +635,7 @@ export default function DashboardPage() {
                             </button>
                           )}
 
-                          {appointment.fee_paid && canCancel(appointment.status) && appointment.call_status !== 'ENDED' && isZoomAppointment(appointment) && appointment.meeting_link && (
+                          {appointment.fee_paid && canCancel(appointment.status) && isVideoCallOpen(appointment) && isZoomAppointment(appointment) && appointment.meeting_link && (
                             <a
                               href={appointment.meeting_link}
                               target="_blank"
@@ -636,7 +646,7 @@ export default function DashboardPage() {
                             </a>
                           )}
 
-                          {appointment.fee_paid && canCancel(appointment.status) && appointment.call_status !== 'ENDED' && !isZoomAppointment(appointment) && canJoinVideoNow(appointment) && (
+                          {appointment.fee_paid && canCancel(appointment.status) && isVideoCallOpen(appointment) && !isZoomAppointment(appointment) && canJoinVideoNow(appointment) && (
                             <button
                               type="button"
                               onClick={() => void joinVideoCall(appointment)}
@@ -646,7 +656,7 @@ export default function DashboardPage() {
                               {busyVideoId === appointment.id ? 'Joining...' : 'Join Meeting'}
                             </button>
                           )}
-                          {appointment.fee_paid && appointment.status === 'CONFIRMED' && appointment.call_status !== 'ENDED' && canJoinVideoNow(appointment) && (
+                          {appointment.fee_paid && appointment.status === 'CONFIRMED' && isVideoCallOpen(appointment) && canJoinVideoNow(appointment) && (
                             <button
                               type="button"
                               onClick={() => void endVideoCall(appointment)}
@@ -656,9 +666,12 @@ export default function DashboardPage() {
                               {busyEndId === appointment.id ? 'Ending...' : 'End Call'}
                             </button>
                           )}
-                          {appointment.fee_paid && canCancel(appointment.status) && appointment.call_status !== 'ENDED' && !isZoomAppointment(appointment) && !canJoinVideoNow(appointment) && (
+                          {appointment.fee_paid && canCancel(appointment.status) && isVideoCallOpen(appointment) && !isZoomAppointment(appointment) && !canJoinVideoNow(appointment) && (
                             <p className="text-[11px] text-muted">Video join opens near session start time.</p>
                           )}
+                          {appointment.fee_paid && canCancel(appointment.status) && appointment.call_status === 'PROVISIONING' && (
+                            <p className="text-[11px] text-muted">Preparing video link...</p>
+                          )}
                         </div>
                       </div>
 
@@ -792,6 +805,9 @@ export default function DashboardPage() {
               ))}
             </div>
           )}
+          {hasOlderChats ? (
+            <p className="mt-3 text-xs text-muted">Showing your most recent chats. Open Chats to see older conversations.</p>
+          ) : null}
         </section>
 
         <TimelineFeed className="mt-6" title="Therapy Community Feed" />
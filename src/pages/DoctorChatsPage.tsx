@@ -16,24 +16,17 @@ type TreatmentRequest = {
   user_id: string;
   status: TreatmentRequestStatus;
 };
-type MessageItem = {
-  id: string;
-  sender_user_id: string;
-  receiver_user_id: string;
-};
 
 export default function DoctorChatsPage() {
   const [appointments, setAppointments] = useState<DoctorAppointment[]>([]);
   const [treatmentRequests, setTreatmentRequests] = useState<TreatmentRequest[]>([]);
-  const [inboxMessages, setInboxMessages] = useState<MessageItem[]>([]);
-  const [outboxMessages, setOutboxMessages] = useState<MessageItem[]>([]);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
 
   useEffect(() => {
     async function load() {
       try {
         setErrorMessage(null);
-        const [appointmentPayload, requestPayload, inboxPayload, outboxPayload] = await Promise.all([
+        const [appointmentPayload, requestPayload] = await Promise.all([
           apiJson<DoctorAppointment[]>(
             '/doctor/appointments',
             undefined,
@@ -46,23 +39,9 @@ export default function DoctorChatsPage() {
             true,
             'Failed to load treatment requests'
           ),
-          apiJson<MessageItem[]>(
-            '/messages?box=inbox',
-            undefined,
-            true,
-            'Failed to load inbox messages'
-          ),
-          apiJson<MessageItem[]>(
-            '/messages?box=outbox',
-            undefined,
-            true,
-            'Failed to load outbox messages'
-          ),
         ]);
         setAppointments(appointmentPayload);
         setTreatmentRequests(requestPayload);
-        setInboxMessages(inboxPayload);
-        setOutboxMessages(outboxPayload);
       } catch (error) {
         setErrorMessage(error instanceof Error ? error.message : 'Failed to load chat users');
       }
@@ -76,15 +55,10 @@ export default function DoctorChatsPage() {
     () => new Set(treatmentRequests.filter((item) => item.status === 'ACCEPTED').map((item) => item.user_id)),
     [treatmentRequests]
   );
-  const messagePartnerIds = useMemo(() => {
-    const ids = new Set<string>();
-    for (const item of inboxMessages) ids.add(item.sender_user_id);
-    for (const item of outboxMessages) ids.add(item.receiver_user_id);
-    return ids;
-  }, [inboxMessages, outboxMessages]);
+  // Patients who already wrote are listed by MessageCenter from their threads.
   const allowedPartnerIds = useMemo(
-    () => Array.from(new Set([...appointmentPatientIds, ...acceptedRequestPatientIds, ...messagePartnerIds])),
-    [appointmentPatientIds, acceptedRequestPatientIds, messagePartnerIds]
+    () => Array.from(new Set([...appointmentPatientIds, ...acceptedRequestPatientIds])),
+    [appointmentPatientIds, acceptedRequestPatientIds]
   );
   const partnerNames = useMemo(() => {
     const map: Record<string, string> = {};
@@ -128,6 +102,7 @@ export default function DoctorChatsPage() {
             title=""
             allowedPartnerIds={allowedPartnerIds}
             partnerNames={partnerNames}
+            partnerFallbackLabel={(partnerId) => `Patient ${partnerId.slice(0, 8)}`}
             className="!rounded-xl !border-0 !bg-transparent !p-0 !shadow-none"
           />
         </section>
@@ -17,7 +17,7 @@ type ApplicationStatus =
   | 'NEEDS_CHANGES'
   | 'NEEDS_MORE_INFO';
 type AppointmentStatus = 'REQUESTED' | 'CONFIRMED' | 'CANCELLED' | 'COMPLETED' | 'NO_SHOW';
-type AppointmentCallStatus = 'NOT_READY' | 'READY' | 'LIVE' | 'ENDED';
+type AppointmentCallStatus = 'NOT_READY' | 'PROVISIONING' | 'READY' | 'LIVE' | 'ENDED';
 type TreatmentRequestStatus = 'PENDING' | 'ACCEPTED' | 'DECLINED';
 type PatientProfile = {
   shared_session_notes: Array<{
@@ -171,6 +171,16 @@ function appointmentStatusLabel(status: AppointmentStatus, isAr: boolean): strin
   return status;
 }
 
+function callStatusLabel(status: AppointmentCallStatus, isAr: boolean): string {
+  if (status === 'PROVISIONING') return isAr ? 'جارٍ تجهيز رابط الفيديو' : 'Preparing video link';
+  return status;
+}
+
+// PROVISIONING: paid, but the meeting is still being created, so there is nothing to join yet.
+function isVideoCallOpen(appointment: DoctorAppointment): boolean {
+  return appointment.call_status !== 'ENDED' && appointment.call_status !== 'PROVISIONING';
+}
+
 function canJoinVideoNow(appointment: DoctorAppointment): boolean {
   const start = new Date(appointment.start_at).getTime();
   const end = new Date(appointment.end_at).getTime();
@@ -393,6 +403,21 @@ export default function DoctorDashboardPage() {
     void loadDashboard();
   }, [dismissedCancelledAppointmentIds]);
 
+  const hasProvisioningCall = appointments.some((appointment) => appointment.call_status === 'PROVISIONING');
+
+  useEffect(() => {
+    if (!hasProvisioningCall) return;
+    // Meeting creation runs in the background; re-read appointments until the link is ready.
+    const intervalId = window.setInterval(() => {
+      void apiJson<DoctorAppointment[]>('/doctor/appointments', undefined, true, 'Failed to load appointments')
+        .then((payload) => setAppointments(filterDismissedCancelledAppointments(payload, dismissedCancelledAppointmentIds)))
+        .catch(() => undefined);
+    }, 5_000);
+    return () => {
+      window.clearInterval(intervalId);
+    };
+  }, [hasProvisioningCall, dismissedCancelledAppointmentIds]);
+
   const updateAppointment = async (appointmentId: string, action: 'confirm' | 'cancel') => {
     setBusyAction(`${action}_${appointmentId}`);
     setErrorMessage(null);
@@ -872,9 +897,9 @@ export default function DoctorDashboardPage() {
                       </p>
                       <p className="mt-1 text-xs text-muted">{formatDateTime(appointment.start_at, locale)}</p>
                       <p className="mt-1 text-xs text-muted">{isAr ? 'المنطقة الزمنية' : 'Timezone'}: {appointment.timezone}</p>
-                      <p className="mt-1 text-xs text-muted">{isAr ? 'الفيديو' : 'Video'}: {appointment.call_status}</p>
+                      <p className="mt-1 text-xs text-muted">{isAr ? 'الفيديو' : 'Video'}: {callStatusLabel(appointment.call_status, isAr)}</p>
                       <p className="mt-1 text-xs text-muted">{isAr ? 'الدفع' : 'Paid'}: {appointment.fee_paid ? (isAr ? 'نعم' : 'Yes') : (isAr ? 'لا' : 'No')}</p>
-                      {appointment.meeting_link && (
+                      {appointment.meeting_link && appointment.call_status !== 'PROVISIONING' && (
                         <a
                           href={appointment.meeting_link}
                           target="_blank"
@@ -921,7 +946,7 @@ export default function DoctorDashboardPage() {
                             {isAr ? 'إلغاء' : 'Cancel'}
                           </button>
                         )}
-                        {appointment.status === 'CONFIRMED' && appointment.fee_paid && appointment.call_status !== 'ENDED' && canJoinVideoNow(appointment) && (
+                        {appointment.status === 'CONFIRMED' && appointment.fee_paid && isVideoCallOpen(appointment) && canJoinVideoNow(appointment) && (
                           <button
                             type="button"
                             onClick={() => void joinVideoCall(appointment)}
@@ -933,7 +958,7 @@ export default function DoctorDashboardPage() {
                               : (isAr ? 'دخول الاجتماع' : 'Join Meeting')}
                           </button>
                         )}
-                        {appointment.status === 'CONFIRMED' && appointment.fee_paid && appointment.call_status !== 'ENDED' && canJoinVideoNow(appointment) && (
+                        {appointment.status === 'CONFIRMED' && appointment.fee_paid && isVideoCallOpen(appointment) && canJoinVideoNow(appointment) && (
                           <button
                             type="button"
                             onClick={() => {
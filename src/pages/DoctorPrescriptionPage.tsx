@@ -10,6 +10,8 @@ type PatientProfile = {
   country: string | null;
 };
 
+type PrescriptionDocumentStatus = 'PENDING' | 'READY' | 'FAILED';
+
 type PrescriptionResponse = {
   id: string;
   user_id: string;
@@ -19,11 +21,14 @@ type PrescriptionResponse = {
   quantity: string;
   issued_at: string;
   valid_until: string | null;
-  pdf_url: string;
+  pdf_url: string | null;
+  document_status: PrescriptionDocumentStatus;
   verification_url: string;
   verification_qr_data_url: string;
 };
 
+const DOCUMENT_POLL_MS = 3_000;
+
 function toAbsoluteUrl(pathOrUrl: string): string {
   if (/^https?:\/\//i.test(pathOrUrl)) return pathOrUrl;
   return `${getBackendOrigin()}${pathOrUrl.startsWith('/') ? pathOrUrl : `/${pathOrUrl}`}`;
@@ -59,6 +64,31 @@ export default function DoctorPrescriptionPage() {
     void loadPatient();
   }, [userId]);
 
+  useEffect(() => {
+    if (!created || created.document_status !== 'PENDING') return;
+    // The PDF renders in the background; re-read the prescription until it settles (a failed read retries).
+    const timeoutId = window.setTimeout(() => {
+      void apiJson<PrescriptionResponse[]>(
+        `/doctor/prescriptions?user_id=${encodeURIComponent(created.user_id)}`,
+        undefined,
+        true,
+        'Failed to load prescription'
+      )
+        .then((rows) => {
+          const latest = rows.find((row) => row.id === created.id);
+          setCreated((current) =>
+            current && latest && current.id === latest.id
+              ? { ...current, pdf_url: latest.pdf_url, document_status: latest.document_status }
+              : current
+          );
+        })
+        .catch(() => setCreated((current) => (current ? { ...current } : current)));
+    }, DOCUMENT_POLL_MS);
+    return () => {
+      window.clearTimeout(timeoutId);
+    };
+  }, [created]);
+
   const submitPrescription = async () => {
     setErrorMessage(null);
     setCreated(null);
@@ -189,9 +219,15 @@ export default function DoctorPrescriptionPage() {
             <h2 className="text-xl font-black text-textMain">Prescription Created</h2>
             <p className="mt-2 text-sm text-muted">ID: {created.id}</p>
             <div className="mt-3 flex flex-wrap gap-3">
-              <a href={toAbsoluteUrl(created.pdf_url)} target="_blank" rel="noreferrer" className="rounded-lg border border-borderGray px-3 py-2 text-xs font-semibold text-textMain hover:border-primary/40 hover:text-primary">
-                Open PDF
-              </a>
+              {created.document_status === 'READY' && created.pdf_url ? (
+                <a href={toAbsoluteUrl(created.pdf_url)} target="_blank" rel="noreferrer" className="rounded-lg border border-borderGray px-3 py-2 text-xs font-semibold text-textMain hover:border-primary/40 hover:text-primary">
+                  Open PDF
+                </a>
+              ) : created.document_status === 'FAILED' ? (
+                <p className="rounded-lg border border-red-100 bg-red-50 px-3 py-2 text-xs font-semibold text-red-700">PDF generation failed</p>
+              ) : (
+                <p className="rounded-lg border border-borderGray bg-slate-50 px-3 py-2 text-xs font-semibold text-muted">PDF is being generated...</p>
+              )}
               <a href={created.verification_url} target="_blank" rel="noreferrer" className="rounded-lg border border-borderGray px-3 py-2 text-xs font-semibold text-textMain hover:border-primary/40 hover:text-primary">
                 Open Verify Page
               </a>
@@ -2,6 +2,8 @@ import { useEffect, useMemo, useState } from 'react';
 import Header from '../components/Header';
 import { apiJson, getBackendOrigin } from '../utils/api';
 
+type PrescriptionDocumentStatus = 'PENDING' | 'READY' | 'FAILED';
+
 type VerifyPayload = {
   prescription_id: string;
   is_valid: boolean;
@@ -12,9 +14,12 @@ type VerifyPayload = {
   patient: { id: string; name: string | null; email: string | null };
   medication: { name: string; dosage: string; instructions: string; quantity: string };
   data_hash: string;
-  pdf_url: string;
+  pdf_url: string | null;
+  document_status: PrescriptionDocumentStatus;
 };
 
+const DOCUMENT_POLL_MS = 3_000;
+
 function absoluteUrl(pathOrUrl: string): string {
   if (/^https?:\/\//i.test(pathOrUrl)) return pathOrUrl;
   return `${getBackendOrigin()}${pathOrUrl.startsWith('/') ? pathOrUrl : `/${pathOrUrl}`}`;
@@ -53,6 +58,24 @@ export default function PrescriptionVerifyPage() {
     void load();
   }, [prescriptionId, code]);
 
+  useEffect(() => {
+    if (!payload || payload.document_status !== 'PENDING') return;
+    // The PDF copy renders in the background; re-verify until it settles (a failed read retries).
+    const timeoutId = window.setTimeout(() => {
+      void apiJson<VerifyPayload>(
+        `/prescriptions/verify/${prescriptionId}?code=${encodeURIComponent(code)}`,
+        undefined,
+        false,
+        'Failed to verify prescription',
+      )
+        .then((data) => setPayload(data))
+        .catch(() => setPayload((current) => (current ? { ...current } : current)));
+    }, DOCUMENT_POLL_MS);
+    return () => {
+      window.clearTimeout(timeoutId);
+    };
+  }, [payload, prescriptionId, code]);
+
   return (
     <div className="min-h-screen bg-gradient-to-b from-primary-50/30 via-white to-white text-textMain">
       <Header brandHref="/home" navItems={[{ labelKey: 'nav.home', href: '/home' }, { labelKey: 'nav.about', href: '/about' }]} />
@@ -97,9 +120,15 @@ export default function PrescriptionVerifyPage() {
                 <p className="mt-1 text-xs text-muted">Valid until: {payload.valid_until ? new Date(payload.valid_until).toLocaleString() : 'N/A'}</p>
               </article>
 
-              <a href={absoluteUrl(payload.pdf_url)} target="_blank" rel="noreferrer" className="inline-flex rounded-lg border border-borderGray px-3 py-2 text-xs font-semibold text-textMain hover:border-primary/40 hover:text-primary">
-                Open PDF Copy
-              </a>
+              {payload.document_status === 'READY' && payload.pdf_url ? (
+                <a href={absoluteUrl(payload.pdf_url)} target="_blank" rel="noreferrer" className="inline-flex rounded-lg border border-borderGray px-3 py-2 text-xs font-semibold text-textMain hover:border-primary/40 hover:text-primary">
+                  Open PDF Copy
+                </a>
+              ) : payload.document_status === 'FAILED' ? (
+                <p className="text-xs font-semibold text-red-700">The PDF copy could not be generated.</p>
+              ) : (
+                <p className="text-xs font-semibold text-muted">PDF copy is being generated...</p>
+              )}
             </div>
           )}
         </section>
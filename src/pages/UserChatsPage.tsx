@@ -12,11 +12,6 @@ type TreatmentRequest = {
   status: TreatmentRequestStatus;
   doctor_display_name: string | null;
 };
-type MessageItem = {
-  id: string;
-  sender_user_id: string;
-  receiver_user_id: string;
-};
 
 function getDoctorIdFromPath(): string | null {
   const params = new URLSearchParams(window.location.search);
@@ -26,8 +21,6 @@ function getDoctorIdFromPath(): string | null {
 
 export default function UserChatsPage() {
   const [requests, setRequests] = useState<TreatmentRequest[]>([]);
-  const [inboxMessages, setInboxMessages] = useState<MessageItem[]>([]);
-  const [outboxMessages, setOutboxMessages] = useState<MessageItem[]>([]);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
   const [selectedDoctorId, setSelectedDoctorId] = useState<string | null>(() => getDoctorIdFromPath());
 
@@ -43,29 +36,13 @@ export default function UserChatsPage() {
     async function load() {
       try {
         setErrorMessage(null);
-        const [requestPayload, inboxPayload, outboxPayload] = await Promise.all([
-          apiJson<TreatmentRequest[]>(
-            '/treatment-requests/my',
-            undefined,
-            true,
-            'Failed to load accepted doctors'
-          ),
-          apiJson<MessageItem[]>(
-            '/messages?box=inbox',
-            undefined,
-            true,
-            'Failed to load inbox messages'
-          ),
-          apiJson<MessageItem[]>(
-            '/messages?box=outbox',
-            undefined,
-            true,
-            'Failed to load outbox messages'
-          ),
-        ]);
+        const requestPayload = await apiJson<TreatmentRequest[]>(
+          '/treatment-requests/my',
+          undefined,
+          true,
+          'Failed to load accepted doctors'
+        );
         setRequests(requestPayload);
-        setInboxMessages(inboxPayload);
-        setOutboxMessages(outboxPayload);
       } catch (error) {
         setErrorMessage(error instanceof Error ? error.message : 'Failed to load accepted doctors');
       }
@@ -85,12 +62,6 @@ export default function UserChatsPage() {
     }
     return map;
   }, [requests]);
-  const messagePartnerIds = useMemo(() => {
-    const ids = new Set<string>();
-    for (const message of inboxMessages) ids.add(message.sender_user_id);
-    for (const message of outboxMessages) ids.add(message.receiver_user_id);
-    return ids;
-  }, [inboxMessages, outboxMessages]);
   const doctorDirectoryNames = useMemo(() => {
     const map = new Map<string, string>();
     for (const request of requests) {
@@ -101,19 +72,15 @@ export default function UserChatsPage() {
     return map;
   }, [requests]);
 
-  const allowedPartnerIds = useMemo(
-    () => Array.from(new Set([...acceptedDoctors.keys(), ...messagePartnerIds])),
-    [acceptedDoctors, messagePartnerIds]
-  );
+  // Doctors who already wrote are listed by MessageCenter from their threads.
+  const allowedPartnerIds = useMemo(() => Array.from(acceptedDoctors.keys()), [acceptedDoctors]);
   const partnerNames = useMemo(() => {
-    const merged = new Map<string, string>(acceptedDoctors);
-    for (const partnerId of messagePartnerIds) {
-      if (!merged.has(partnerId)) {
-        merged.set(partnerId, doctorDirectoryNames.get(partnerId) || `Doctor ${partnerId.slice(0, 8)}`);
-      }
+    const merged = new Map<string, string>(doctorDirectoryNames);
+    for (const [doctorId, name] of acceptedDoctors) {
+      merged.set(doctorId, name);
     }
     return Object.fromEntries(merged.entries());
-  }, [acceptedDoctors, messagePartnerIds, doctorDirectoryNames]);
+  }, [acceptedDoctors, doctorDirectoryNames]);
 
   return (
     <div className="min-h-screen bg-gradient-to-b from-primary-50/30 via-white to-white text-textMain">
@@ -153,6 +120,7 @@ export default function UserChatsPage() {
             title=""
             allowedPartnerIds={allowedPartnerIds}
             partnerNames={partnerNames}
+            partnerFallbackLabel={(partnerId) => `Doctor ${partnerId.slice(0, 8)}`}
             initialPartnerId={selectedDoctorId}
             className="!rounded-xl !border-0 !bg-transparent !p-0 !shadow-none"
           />
@@ -191,6 +191,12 @@ export async function apiRequest(path: string, init?: RequestInit, requiresAuth
   });
 }
 
+async function throwApiError(response: Response, defaultErrorMessage: string): Promise<never> {
+  const responseBody = await response.json().catch(() => null);
+  const message = buildErrorMessage(`${defaultErrorMessage} (${response.status})`, responseBody);
+  throw new ApiError(message, response.status);
+}
+
 export async function apiJson<T>(
   path: string,
   init?: RequestInit,
@@ -200,10 +206,35 @@ export async function apiJson<T>(
   const response = await apiRequest(path, init, requiresAuth);
 
   if (!response.ok) {
-    const responseBody = await response.json().catch(() => null);
-    const message = buildErrorMessage(`${defaultErrorMessage} (${response.status})`, responseBody);
-    throw new ApiError(message, response.status);
+    await throwApiError(response, defaultErrorMessage);
   }
 
   return (await response.json()) as T;
 }
+
+// Listings that keep a bare JSON array body return the next page cursor in this header.
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+export interface ApiPage<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+export async function apiJsonPage<T>(
+  path: string,
+  cursor: string | null = null,
+  requiresAuth = false,
+  defaultErrorMessage = 'Request failed'
+): Promise<ApiPage<T>> {
+  const separator = path.includes('?') ? '&' : '?';
+  const pagePath = cursor ? `${path}${separator}cursor=${encodeURIComponent(cursor)}` : path;
+  const response = await apiRequest(pagePath, undefined, requiresAuth);
+  if (!response.ok) {
+    await throwApiError(response, defaultErrorMessage);
+  }
+
+  return {
+    items: (await response.json()) as T[],
+    nextCursor: response.headers.get(NEXT_CURSOR_HEADER),
+  };
+}